@@ -0,0 +1,25 @@
+'use strict';
+
+
+module.exports = {
+  async up(queryInterface, Sequelize) {
+    const indexExists = async (tableName, indexName) => {
+      const [indexes] = await queryInterface.sequelize.query(`
+        SHOW INDEX FROM ${tableName} WHERE Key_name = '${indexName}'
+      `);
+      return indexes.length > 0;
+    };
+
+    
+    if (!(await indexExists('invoices', 'idx_invoices_status_created_total'))) {
+      await queryInterface.addIndex('invoices', ['paymentStatus', 'createdAt', 'totalAmount'], {
+        name: 'idx_invoices_status_created_total',
+        using: 'BTREE',
+      });
+    }
+  },
+
+  async down(queryInterface, Sequelize) {
+    await queryInterface.removeIndex('invoices', 'idx_invoices_status_created_total');
+  }
+};
@@ -0,0 +1,112 @@
+'use strict';
+
+
+module.exports = {
+  async up(queryInterface, Sequelize) {
+    await queryInterface.createTable('report_daily_invoices', {
+      day: {
+        type: Sequelize.DATEONLY,
+        allowNull: false,
+        primaryKey: true
+      },
+      doctorId: {
+        type: Sequelize.INTEGER.UNSIGNED,
+        allowNull: false,
+        primaryKey: true
+      },
+      paymentStatus: {
+        type: Sequelize.ENUM('UNPAID', 'PARTIALLY_PAID', 'PAID'),
+        allowNull: false,
+        primaryKey: true
+      },
+      invoiceCount: {
+        type: Sequelize.INTEGER.UNSIGNED,
+        allowNull: false,
+        defaultValue: 0
+      },
+      totalAmount: {
+        type: Sequelize.DECIMAL(15, 2),
+        allowNull: false,
+        defaultValue: 0
+      },
+      paidAmount: {
+        type: Sequelize.DECIMAL(15, 2),
+        allowNull: false,
+        defaultValue: 0
+      }
+    });
+
+    await queryInterface.createTable('report_daily_invoice_items', {
+      day: {
+        type: Sequelize.DATEONLY,
+        allowNull: false,
+        primaryKey: true
+      },
+      itemType: {
+        type: Sequelize.ENUM('EXAMINATION', 'MEDICINE'),
+        allowNull: false,
+        primaryKey: true
+      },
+      itemCount: {
+        type: Sequelize.INTEGER.UNSIGNED,
+        allowNull: false,
+        defaultValue: 0
+      },
+      subtotal: {
+        type: Sequelize.DECIMAL(15, 2),
+        allowNull: false,
+        defaultValue: 0
+      }
+    });
+
+    await queryInterface.createTable('report_daily_appointments', {
+      day: {
+        type: Sequelize.DATEONLY,
+        allowNull: false,
+        primaryKey: true
+      },
+      doctorId: {
+        type: Sequelize.INTEGER.UNSIGNED,
+        allowNull: false,
+        primaryKey: true
+      },
+      status: {
+        type: Sequelize.ENUM('WAITING', 'CHECKED_IN', 'IN_PROGRESS', 'COMPLETED', 'CANCELLED', 'NO_SHOW'),
+        allowNull: false,
+        primaryKey: true
+      },
+      appointmentCount: {
+        type: Sequelize.INTEGER.UNSIGNED,
+        allowNull: false,
+        defaultValue: 0
+      }
+    });
+
+    await queryInterface.createTable('report_daily_patients', {
+      day: {
+        type: Sequelize.DATEONLY,
+        allowNull: false,
+        primaryKey: true
+      },
+      newPatients: {
+        type: Sequelize.INTEGER.UNSIGNED,
+        allowNull: false,
+        defaultValue: 0
+      }
+    });
+
+    await queryInterface.addIndex('report_daily_invoices', ['doctorId', 'day'], {
+      name: 'idx_report_daily_invoices_doctor_day'
+    });
+    await queryInterface.addIndex('report_daily_appointments', ['doctorId', 'day'], {
+      name: 'idx_report_daily_appointments_doctor_day'
+    });
+  },
+
+  async down(queryInterface, Sequelize) {
+    await queryInterface.dropTable('report_daily_patients');
+    await queryInterface.dropTable('report_daily_appointments');
+    await queryInterface.dropTable('report_daily_invoice_items');
+    await queryInterface.dropTable('report_daily_invoices');
+  }
+};
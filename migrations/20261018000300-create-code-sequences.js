@@ -0,0 +1,30 @@
+'use strict';
+
+
+module.exports = {
+  async up(queryInterface, Sequelize) {
+    await queryInterface.createTable('code_sequences', {
+      scope: {
+        type: Sequelize.STRING(64),
+        allowNull: false,
+        primaryKey: true,
+        comment: 'Tiền tố mã, ví dụ INV-20261018-'
+      },
+      lastValue: {
+        type: Sequelize.INTEGER.UNSIGNED,
+        allowNull: false,
+        defaultValue: 0,
+        comment: 'Số thứ tự lớn nhất đã cấp phát'
+      },
+      updatedAt: {
+        allowNull: false,
+        type: Sequelize.DATE,
+        defaultValue: Sequelize.literal('CURRENT_TIMESTAMP')
+      }
+    });
+  },
+
+  async down(queryInterface, Sequelize) {
+    await queryInterface.dropTable('code_sequences');
+  }
+};
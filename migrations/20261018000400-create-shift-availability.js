@@ -0,0 +1,55 @@
+'use strict';
+
+
+module.exports = {
+  async up(queryInterface, Sequelize) {
+    await queryInterface.createTable('shift_availability', {
+      doctorShiftId: {
+        type: Sequelize.INTEGER.UNSIGNED,
+        allowNull: false,
+        primaryKey: true,
+        references: { model: 'doctor_shifts', key: 'id' },
+        onDelete: 'CASCADE'
+      },
+      doctorId: {
+        type: Sequelize.INTEGER.UNSIGNED,
+        allowNull: false
+      },
+      shiftId: {
+        type: Sequelize.INTEGER.UNSIGNED,
+        allowNull: false
+      },
+      workDate: {
+        type: Sequelize.STRING(10),
+        allowNull: false
+      },
+      specialtyId: {
+        type: Sequelize.INTEGER.UNSIGNED,
+        allowNull: true
+      },
+      capacity: {
+        type: Sequelize.INTEGER.UNSIGNED,
+        allowNull: false,
+        comment: 'Số lượt khám tối đa của ca'
+      },
+      bookedCount: {
+        type: Sequelize.INTEGER,
+        allowNull: false,
+        defaultValue: 0,
+        comment: 'Số lịch hẹn còn hiệu lực (không tính CANCELLED/NO_SHOW)'
+      }
+    });
+
+    await queryInterface.addIndex('shift_availability', ['doctorId', 'shiftId', 'workDate'], {
+      unique: true,
+      name: 'shift_availability_doctor_shift_date_unique'
+    });
+    await queryInterface.addIndex('shift_availability', ['workDate'], {
+      name: 'shift_availability_work_date_idx'
+    });
+  },
+
+  async down(queryInterface, Sequelize) {
+    await queryInterface.dropTable('shift_availability');
+  }
+};
@@ -0,0 +1,68 @@
+'use strict';
+
+
+module.exports = {
+  async up(queryInterface, Sequelize) {
+    await queryInterface.addColumn('shift_availability', 'lastSlotNumber', {
+      type: Sequelize.INTEGER,
+      allowNull: false,
+      defaultValue: 0,
+      comment: 'Số thứ tự slot lớn nhất đang được giữ'
+    });
+    await queryInterface.addColumn('shift_availability', 'lastQueueNumber', {
+      type: Sequelize.INTEGER,
+      allowNull: false,
+      defaultValue: 0,
+      comment: 'Số thứ tự hàng chờ đã cấp gần nhất'
+    });
+    await queryInterface.addColumn('shift_availability', 'freeSlots', {
+      type: Sequelize.JSON,
+      allowNull: true,
+      comment: 'Các slot đã được trả lại do hủy lịch'
+    });
+    await queryInterface.addColumn('shift_availability', 'version', {
+      type: Sequelize.INTEGER.UNSIGNED,
+      allowNull: false,
+      defaultValue: 0
+    });
+
+    await queryInterface.sequelize.query(`
+      UPDATE shift_availability sa
+      SET
+        lastSlotNumber = COALESCE((
+          SELECT MAX(a.slotNumber) FROM appointments a
+          WHERE a.doctorId = sa.doctorId AND a.shiftId = sa.shiftId
+            AND a.date = sa.workDate AND a.status <> 'CANCELLED'
+        ), 0),
+        lastQueueNumber = COALESCE((
+          SELECT MAX(a.queueNumber) FROM appointments a
+          WHERE a.doctorId = sa.doctorId AND a.shiftId = sa.shiftId AND a.date = sa.workDate
+        ), 0)
+    `);
+
+    await queryInterface.sequelize.query(`
+      ALTER TABLE appointments
+      ADD COLUMN activeSlotNumber INT
+      GENERATED ALWAYS AS (IF(status = 'CANCELLED', NULL, slotNumber)) STORED
+    `);
+    await queryInterface.addIndex('appointments', ['doctorId', 'shiftId', 'date', 'activeSlotNumber'], {
+      unique: true,
+      name: 'appointments_active_slot_unique'
+    });
+    await queryInterface.removeIndex('appointments', 'appointments_slot_unique');
+  },
+
+  async down(queryInterface, Sequelize) {
+    await queryInterface.addIndex('appointments', ['doctorId', 'shiftId', 'date', 'slotNumber'], {
+      unique: true,
+      name: 'appointments_slot_unique'
+    });
+    await queryInterface.removeIndex('appointments', 'appointments_active_slot_unique');
+    await queryInterface.removeColumn('appointments', 'activeSlotNumber');
+
+    await queryInterface.removeColumn('shift_availability', 'version');
+    await queryInterface.removeColumn('shift_availability', 'freeSlots');
+    await queryInterface.removeColumn('shift_availability', 'lastQueueNumber');
+    await queryInterface.removeColumn('shift_availability', 'lastSlotNumber');
+  }
+};
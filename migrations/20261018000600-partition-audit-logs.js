@@ -0,0 +1,122 @@
+'use strict';
+
+const FUTURE_MONTHS = 3;
+
+const partitionName = (date) =>
+  `p${date.getFullYear()}${String(date.getMonth() + 1).padStart(2, '0')}`;
+
+const monthBoundary = (date) =>
+  `${date.getFullYear()}-${String(date.getMonth() + 1).padStart(2, '0')}-01`;
+
+module.exports = {
+  async up(queryInterface, Sequelize) {
+    const [foreignKeys] = await queryInterface.sequelize.query(`
+      SELECT CONSTRAINT_NAME AS name FROM information_schema.KEY_COLUMN_USAGE
+      WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'audit_logs' AND REFERENCED_TABLE_NAME IS NOT NULL
+    `);
+    for (const { name } of foreignKeys) {
+      await queryInterface.removeConstraint('audit_logs', name);
+    }
+
+    await queryInterface.sequelize.query(
+      'ALTER TABLE audit_logs DROP PRIMARY KEY, ADD PRIMARY KEY (id, timestamp)'
+    );
+
+    const [[{ oldest }]] = await queryInterface.sequelize.query(
+      'SELECT MIN(timestamp) AS oldest FROM audit_logs'
+    );
+    const now = new Date();
+    const start = oldest ? new Date(oldest) : now;
+    const cursor = new Date(start.getFullYear(), start.getMonth(), 1);
+    const last = new Date(now.getFullYear(), now.getMonth() + FUTURE_MONTHS, 1);
+
+    const partitions = [];
+    while (cursor <= last) {
+      const next = new Date(cursor.getFullYear(), cursor.getMonth() + 1, 1);
+      partitions.push(
+        `PARTITION ${partitionName(cursor)} VALUES LESS THAN (TO_DAYS('${monthBoundary(next)}'))`
+      );
+      cursor.setMonth(cursor.getMonth() + 1);
+    }
+    partitions.push('PARTITION pmax VALUES LESS THAN MAXVALUE');
+
+    await queryInterface.sequelize.query(
+      `ALTER TABLE audit_logs PARTITION BY RANGE (TO_DAYS(timestamp)) (${partitions.join(', ')})`
+    );
+
+    await queryInterface.createTable('audit_logs_archive', {
+      id: {
+        type: Sequelize.INTEGER.UNSIGNED,
+        allowNull: false,
+        primaryKey: true,
+      },
+      userId: {
+        type: Sequelize.INTEGER.UNSIGNED,
+        allowNull: true,
+      },
+      action: {
+        type: Sequelize.ENUM('CREATE', 'UPDATE', 'DELETE', 'VIEW', 'LOGIN', 'LOGOUT', 'EXPORT'),
+        allowNull: false,
+      },
+      tableName: {
+        type: Sequelize.STRING(100),
+        allowNull: false,
+      },
+      recordId: {
+        type: Sequelize.INTEGER.UNSIGNED,
+        allowNull: true,
+      },
+      oldValue: {
+        type: Sequelize.JSON,
+        allowNull: true,
+      },
+      newValue: {
+        type: Sequelize.JSON,
+        allowNull: true,
+      },
+      ipAddress: {
+        type: Sequelize.STRING(45),
+        allowNull: true,
+      },
+      userAgent: {
+        type: Sequelize.TEXT,
+        allowNull: true,
+      },
+      timestamp: {
+        type: Sequelize.DATE,
+        allowNull: false,
+        primaryKey: true,
+      },
+      createdAt: {
+        type: Sequelize.DATE,
+        allowNull: false,
+      },
+      updatedAt: {
+        type: Sequelize.DATE,
+        allowNull: false,
+      },
+    });
+
+    await queryInterface.addIndex('audit_logs_archive', ['tableName', 'recordId'], {
+      name: 'idx_audit_archive_table_record',
+    });
+    await queryInterface.addIndex('audit_logs_archive', ['timestamp'], {
+      name: 'idx_audit_archive_timestamp',
+    });
+  },
+
+  async down(queryInterface) {
+    await queryInterface.dropTable('audit_logs_archive');
+    await queryInterface.sequelize.query('ALTER TABLE audit_logs REMOVE PARTITIONING');
+    await queryInterface.sequelize.query(
+      'ALTER TABLE audit_logs DROP PRIMARY KEY, ADD PRIMARY KEY (id)'
+    );
+    await queryInterface.addConstraint('audit_logs', {
+      fields: ['userId'],
+      type: 'foreign key',
+      references: { table: 'users', field: 'id' },
+      onUpdate: 'CASCADE',
+      onDelete: 'SET NULL',
+    });
+  },
+};
@@ -0,0 +1,23 @@
+'use strict';
+
+const INDEXES = [
+  ['patients', ['createdAt', 'id'], 'idx_patients_created_id'],
+  ['appointments', ['createdAt', 'id'], 'idx_appointments_created_id'],
+  ['invoices', ['createdAt', 'id'], 'idx_invoices_created_id'],
+  ['payrolls', ['createdAt', 'id'], 'idx_payrolls_created_id'],
+  ['audit_logs', ['timestamp', 'id'], 'idx_audit_timestamp_id'],
+];
+
+module.exports = {
+  async up(queryInterface) {
+    for (const [table, fields, name] of INDEXES) {
+      await queryInterface.addIndex(table, fields, { name });
+    }
+  },
+
+  async down(queryInterface) {
+    for (const [table, , name] of INDEXES) {
+      await queryInterface.removeIndex(table, name);
+    }
+  },
+};
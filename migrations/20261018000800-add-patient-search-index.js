@@ -0,0 +1,82 @@
+'use strict';
+
+const BATCH_SIZE = 1000;
+
+const normalize = (value) =>
+  (value || '')
+    .normalize('NFD')
+    .replace(/[\u0300-\u036f]/g, '')
+    .replace(/[đĐ]/g, 'd')
+    .toLowerCase()
+    .replace(/[^a-z0-9]+/g, ' ')
+    .trim();
+
+module.exports = {
+  async up(queryInterface, Sequelize) {
+    const { sequelize } = queryInterface;
+
+    await queryInterface.addColumn('patients', 'searchName', {
+      type: Sequelize.STRING(100),
+      allowNull: true,
+    });
+    await queryInterface.addColumn('patients', 'searchContacts', {
+      type: Sequelize.TEXT,
+      allowNull: true,
+    });
+
+    let lastId = 0;
+    for (;;) {
+      const [patients] = await sequelize.query(
+        'SELECT id, fullName FROM patients WHERE id > ? ORDER BY id LIMIT ?',
+        { replacements: [lastId, BATCH_SIZE] }
+      );
+      if (patients.length === 0) {
+        break;
+      }
+      lastId = patients[patients.length - 1].id;
+
+      const ids = patients.map((patient) => patient.id);
+      const [profiles] = await sequelize.query(
+        'SELECT patient_id AS patientId, value, ward, city FROM patient_profiles WHERE patient_id IN (?)',
+        { replacements: [ids] }
+      );
+      const contacts = new Map();
+      for (const profile of profiles) {
+        const text = normalize([profile.value, profile.ward, profile.city].filter(Boolean).join(' '));
+        contacts.set(profile.patientId, [contacts.get(profile.patientId), text].filter(Boolean).join(' '));
+      }
+
+      const cases = patients.map(() => 'WHEN ? THEN ?').join(' ');
+      await sequelize.query(
+        `UPDATE patients SET searchName = CASE id ${cases} END, searchContacts = CASE id ${cases} END WHERE id IN (?)`,
+        {
+          replacements: [
+            ...patients.flatMap((patient) => [patient.id, normalize(patient.fullName)]),
+            ...patients.flatMap((patient) => [patient.id, contacts.get(patient.id) || '']),
+            ids,
+          ],
+        }
+      );
+    }
+
+    await sequelize.query(
+      'ALTER TABLE patients ADD FULLTEXT INDEX ft_patients_search_name (searchName) WITH PARSER ngram'
+    );
+    await sequelize.query(
+      'ALTER TABLE patients ADD FULLTEXT INDEX ft_patients_search_contacts (searchContacts) WITH PARSER ngram'
+    );
+    await queryInterface.addIndex('patients', ['searchName'], { name: 'idx_patients_search_name' });
+    await queryInterface.addIndex('patient_profiles', ['type', 'value'], {
+      name: 'idx_patient_profiles_type_value',
+    });
+  },
+
+  async down(queryInterface) {
+    await queryInterface.removeIndex('patient_profiles', 'idx_patient_profiles_type_value');
+    await queryInterface.removeIndex('patients', 'idx_patients_search_name');
+    await queryInterface.removeIndex('patients', 'ft_patients_search_contacts');
+    await queryInterface.removeIndex('patients', 'ft_patients_search_name');
+    await queryInterface.removeColumn('patients', 'searchContacts');
+    await queryInterface.removeColumn('patients', 'searchName');
+  },
+};
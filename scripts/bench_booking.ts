@@ -0,0 +1,93 @@
+import { performance } from 'perf_hooks';
+import { sequelize, Doctor, Shift, DoctorShift, ShiftAvailability } from '../src/models';
+import { SlotAvailabilityService } from '../src/services/slotAvailability.service';
+
+const BOOKINGS = Number(process.env.BENCH_BOOKINGS) || 500;
+const CAPACITY = Number(process.env.BENCH_CAPACITY) || BOOKINGS;
+const WORK_DATE = process.env.BENCH_DATE || '2099-12-31';
+
+const percentile = (values: number[], p: number) => {
+  const sorted = [...values].sort((a, b) => a - b);
+  return sorted[Math.min(sorted.length - 1, Math.floor((p / 100) * sorted.length))] || 0;
+};
+
+async function bench() {
+  await sequelize.authenticate();
+
+  const doctor = await Doctor.findOne({ where: { isActive: true } });
+  const shift = await Shift.findOne();
+  if (!doctor || !shift) {
+    throw new Error('Seed at least one active doctor and one shift first (npm run seed:data)');
+  }
+
+  const [doctorShift] = await DoctorShift.findOrCreate({
+    where: { doctorId: doctor.id, shiftId: shift.id, workDate: WORK_DATE },
+    defaults: { doctorId: doctor.id, shiftId: shift.id, workDate: WORK_DATE, maxSlots: CAPACITY },
+  });
+  await doctorShift.update({ maxSlots: CAPACITY });
+  await ShiftAvailability.destroy({ where: { workDate: WORK_DATE } });
+  await SlotAvailabilityService.rebuildDay(WORK_DATE);
+
+  console.log(
+    ` Reserving ${BOOKINGS} slots in parallel on doctor ${doctor.id}, shift ${shift.id}, ${WORK_DATE} (capacity ${CAPACITY}, pool ${(sequelize.config as any).pool?.max})`
+  );
+
+  const latencies: number[] = [];
+  const errors = new Map<string, number>();
+  const slots: number[] = [];
+  const queues: number[] = [];
+
+  const startedAt = performance.now();
+  await Promise.all(
+    Array.from({ length: BOOKINGS }, async () => {
+      const begin = performance.now();
+      try {
+        const reservation = await SlotAvailabilityService.reserve(doctor.id, shift.id, WORK_DATE);
+        slots.push(reservation.slotNumber);
+        queues.push(reservation.queueNumber);
+      } catch (error: any) {
+        errors.set(error.message, (errors.get(error.message) || 0) + 1);
+      } finally {
+        latencies.push(performance.now() - begin);
+      }
+    })
+  );
+  const elapsed = performance.now() - startedAt;
+
+  const row = await ShiftAvailability.findOne({ where: { doctorShiftId: doctorShift.id } });
+  const uniqueSlots = new Set(slots).size;
+  const uniqueQueues = new Set(queues).size;
+
+  console.log(` Reserved:      ${slots.length}/${BOOKINGS} in ${elapsed.toFixed(0)}ms (${((slots.length / elapsed) * 1000).toFixed(0)} bookings/s)`);
+  console.log(` Latency:       p50 ${percentile(latencies, 50).toFixed(1)}ms, p95 ${percentile(latencies, 95).toFixed(1)}ms, p99 ${percentile(latencies, 99).toFixed(1)}ms`);
+  console.log(` Row version:   ${row?.version} (expected ${1 + slots.length})`);
+  console.log(` Unique slots:  ${uniqueSlots}, unique queue numbers: ${uniqueQueues}`);
+  for (const [message, count] of errors) {
+    console.log(` Rejected:      ${count} x ${message}`);
+  }
+
+  const expected = Math.min(BOOKINGS, CAPACITY);
+  const ok =
+    slots.length === expected &&
+    uniqueSlots === expected &&
+    uniqueQueues === expected &&
+    Math.max(0, ...slots) === expected &&
+    row?.bookedCount === expected &&
+    row?.version === 1 + expected;
+
+  await ShiftAvailability.destroy({ where: { doctorShiftId: doctorShift.id } });
+  await doctorShift.destroy();
+  await sequelize.close();
+
+  if (!ok) {
+    console.error(' FAILED: slots were double-booked or capacity was not respected');
+    process.exit(1);
+  }
+  console.log(' OK: every slot handed out exactly once');
+}
+
+bench().catch(async (error) => {
+  console.error(error);
+  await sequelize.close();
+  process.exit(1);
+});
@@ -0,0 +1,139 @@
+import net from 'net';
+import { performance } from 'perf_hooks';
+import { EmailService } from '../src/services/email.service';
+import { emailRenderers } from '../src/templates/emailTemplates';
+
+const MESSAGES = Number(process.env.BENCH_MESSAGES) || 1000;
+const CONNECTIONS = Number(process.env.BENCH_CONNECTIONS) || 5;
+const RATE_LIMIT = Number(process.env.BENCH_RATE_LIMIT) || 1000000;
+const LATENCY_MS = Number(process.env.BENCH_SMTP_LATENCY_MS) || 5;
+
+const startSink = () =>
+  new Promise<{ server: net.Server; port: number; received: () => number; connections: () => number }>((resolve) => {
+    let received = 0;
+    let connections = 0;
+
+    const server = net.createServer((socket) => {
+      connections++;
+      let inData = false;
+      let buffer = '';
+      const reply = (line: string) => setTimeout(() => socket.write(`${line}\r\n`), LATENCY_MS);
+
+      socket.write('220 bench-sink ESMTP\r\n');
+      socket.on('data', (chunk) => {
+        buffer += chunk.toString('utf8');
+        let index: number;
+        while ((index = buffer.indexOf('\r\n')) >= 0) {
+          const line = buffer.slice(0, index);
+          buffer = buffer.slice(index + 2);
+
+          if (inData) {
+            if (line === '.') {
+              inData = false;
+              received++;
+              reply('250 OK queued');
+            }
+            continue;
+          }
+
+          const command = line.slice(0, 4).toUpperCase();
+          if (command === 'EHLO') {
+            socket.write('250-bench-sink\r\n250-PIPELINING\r\n250 8BITMIME\r\n');
+          } else if (command === 'HELO' || command === 'MAIL' || command === 'RCPT' || command === 'RSET' || command === 'NOOP') {
+            reply('250 OK');
+          } else if (command === 'DATA') {
+            inData = true;
+            reply('354 End data with <CR><LF>.<CR><LF>');
+          } else if (command === 'QUIT') {
+            socket.end('221 Bye\r\n');
+          } else {
+            reply('502 Command not implemented');
+          }
+        }
+      });
+      socket.on('error', () => undefined);
+    });
+
+    server.listen(0, '127.0.0.1', () => {
+      const port = (server.address() as net.AddressInfo).port;
+      resolve({ server, port, received: () => received, connections: () => connections });
+    });
+  });
+
+const renderMessage = (i: number) =>
+  emailRenderers.appointmentReminder({
+    patientName: `Bệnh nhân ${i}`,
+    doctorName: 'BS. Nguyễn Văn A',
+    doctorSpecialty: 'Nội tổng quát',
+    appointmentDate: '2026-10-20',
+    shiftName: 'Ca sáng',
+    shiftTime: '07:00 - 11:30',
+    appointmentTime: '08:15',
+    slotNumber: (i % 40) + 1,
+    appointmentId: 100000 + i,
+  });
+
+async function run(label: string, pool: boolean, port: number) {
+  const service = new EmailService({
+    host: '127.0.0.1',
+    port,
+    user: 'bench@example.com',
+    password: 'bench',
+    pool,
+    maxConnections: CONNECTIONS,
+    maxMessages: 100,
+    rateLimit: RATE_LIMIT,
+  });
+
+  const startedAt = performance.now();
+  const results = await Promise.all(
+    Array.from({ length: MESSAGES }, (_, i) => {
+      const email = renderMessage(i);
+      return service.sendEmail({
+        to: `patient${i}@example.com`,
+        subject: 'Nhắc nhở lịch khám',
+        html: email.html,
+        text: email.text,
+      });
+    })
+  );
+  const elapsed = performance.now() - startedAt;
+  service.close();
+
+  const sent = results.filter(Boolean).length;
+  console.log(` ${label.padEnd(10)} ${sent}/${MESSAGES} in ${elapsed.toFixed(0)}ms (${((sent / elapsed) * 1000).toFixed(0)} msg/s)`);
+  return sent;
+}
+
+async function bench() {
+  const renderStart = performance.now();
+  for (let i = 0; i < MESSAGES; i++) {
+    renderMessage(i);
+  }
+  const renderMs = performance.now() - renderStart;
+  console.log(` Render:    ${MESSAGES} reminders in ${renderMs.toFixed(0)}ms (${((renderMs * 1000) / MESSAGES).toFixed(1)}µs each)`);
+
+  const sink = await startSink();
+  console.log(` SMTP sink on 127.0.0.1:${sink.port} (${LATENCY_MS}ms per reply), ${CONNECTIONS} pooled connections`);
+
+  const pooled = await run('Pooled', true, sink.port);
+  const pooledConnections = sink.connections();
+  console.log(`            ${pooledConnections} SMTP connections opened`);
+
+  const single = Number(process.env.BENCH_SKIP_UNPOOLED) ? 0 : await run('Unpooled', false, sink.port);
+  if (single) {
+    console.log(`            ${sink.connections() - pooledConnections} SMTP connections opened`);
+  }
+
+  sink.server.close();
+  if (pooled !== MESSAGES) {
+    console.error(' FAILED: not every message reached the sink');
+    process.exit(1);
+  }
+  console.log(` OK: sink received ${sink.received()} messages`);
+}
+
+bench().catch((error) => {
+  console.error(error);
+  process.exit(1);
+});
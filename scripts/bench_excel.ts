@@ -0,0 +1,72 @@
+import { performance } from 'perf_hooks';
+import { Writable } from 'stream';
+import { writeInvoiceDetailWorkbook } from '../src/modules/admin/reportExcel.service';
+import { InvoiceDetailRow } from '../src/modules/admin/report.service';
+
+const ROWS = Number(process.env.BENCH_ROWS) || 1_000_000;
+const CHUNK = Number(process.env.BENCH_CHUNK) || 2000;
+
+const mb = (bytes: number) => `${(bytes / 1024 / 1024).toFixed(1)}MB`;
+
+async function* syntheticRows(): AsyncGenerator<InvoiceDetailRow[]> {
+  const start = new Date(2026, 0, 1).getTime();
+  for (let offset = 0; offset < ROWS; offset += CHUNK) {
+    const rows: InvoiceDetailRow[] = [];
+    for (let id = offset + 1; id <= Math.min(offset + CHUNK, ROWS); id++) {
+      rows.push({
+        id,
+        invoiceCode: `HD2026${String(id).padStart(8, '0')}`,
+        createdAt: new Date(start + id * 30000),
+        patientCode: `BN${String(id % 200000).padStart(6, '0')}`,
+        patientName: `Nguyễn Văn ${id % 997}`,
+        doctorName: `BS. Trần Thị ${id % 40}`,
+        examinationFee: '150000.00',
+        medicineTotalAmount: String((id % 50) * 12000),
+        discount: '0.00',
+        totalAmount: String(150000 + (id % 50) * 12000),
+        paidAmount: String(150000 + (id % 50) * 12000),
+        paymentStatus: id % 7 === 0 ? 'UNPAID' : 'PAID',
+      });
+    }
+    await new Promise((resolve) => setImmediate(resolve));
+    yield rows;
+  }
+}
+
+async function bench() {
+  let bytes = 0;
+  const sink = new Writable({
+    write(chunk, _encoding, callback) {
+      bytes += chunk.length;
+      callback();
+    },
+  });
+
+  let peakRss = 0;
+  let peakHeap = 0;
+  let maxLagMs = 0;
+  let tick = performance.now();
+  const sampler = setInterval(() => {
+    const now = performance.now();
+    maxLagMs = Math.max(maxLagMs, now - tick - 50);
+    tick = now;
+    const usage = process.memoryUsage();
+    peakRss = Math.max(peakRss, usage.rss);
+    peakHeap = Math.max(peakHeap, usage.heapUsed);
+  }, 50);
+
+  const begin = performance.now();
+  const written = await writeInvoiceDetailWorkbook(sink, syntheticRows(), 'Invoices');
+  const seconds = (performance.now() - begin) / 1000;
+  clearInterval(sampler);
+
+  console.log(` Streamed ${written} rows in ${seconds.toFixed(1)}s (${Math.round(written / seconds)} rows/s)`);
+  console.log(` Output ${mb(bytes)}, peak RSS ${mb(peakRss)}, peak heap ${mb(peakHeap)}, max event-loop lag ${maxLagMs.toFixed(0)}ms`);
+}
+
+bench()
+  .then(() => process.exit(0))
+  .catch((error) => {
+    console.error(error);
+    process.exit(1);
+  });
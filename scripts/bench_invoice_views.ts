@@ -0,0 +1,66 @@
+import { performance } from 'perf_hooks';
+import { Op } from 'sequelize';
+import { sequelize } from '../src/models';
+import Invoice from '../src/models/Invoice';
+import { formatInvoice, invoiceAssociations } from '../src/modules/finance/invoice.service';
+import { InvoiceView, loadInvoiceViews } from '../src/modules/finance/invoiceProjection';
+
+const TOTAL = Number(process.env.BENCH_INVOICES) || 10000;
+const PAGE_SIZE = Number(process.env.BENCH_PAGE_SIZE) || 100;
+
+const chunk = <T>(values: T[], size: number) =>
+  Array.from({ length: Math.ceil(values.length / size) }, (_, i) => values.slice(i * size, (i + 1) * size));
+
+const run = async (label: string, ids: number[], load: (page: number[]) => Promise<any[]>) => {
+  let rows = 0;
+  let bytes = 0;
+  const begin = performance.now();
+  for (const page of chunk(ids, PAGE_SIZE)) {
+    const result = await load(page);
+    rows += result.length;
+    bytes += Buffer.byteLength(JSON.stringify(result));
+  }
+  const ms = performance.now() - begin;
+  console.log(
+    `   ${label.padEnd(22)} ${ms.toFixed(0).padStart(7)}ms  ${(bytes / 1024 / 1024).toFixed(1).padStart(6)}MB  (${rows} invoices)`
+  );
+};
+
+async function bench() {
+  await sequelize.authenticate();
+
+  const keys = await Invoice.findAll({
+    attributes: ['id'],
+    order: [['createdAt', 'DESC'], ['id', 'DESC']],
+    limit: TOTAL,
+    raw: true,
+  });
+  const ids = keys.map((row) => row.id);
+  console.log(` Loading ${ids.length} invoices in pages of ${PAGE_SIZE}`);
+
+  await run('include (before)', ids, async (page) => {
+    const rows = await Invoice.findAll({
+      where: { id: { [Op.in]: page } },
+      include: invoiceAssociations,
+      order: [['createdAt', 'DESC'], ['id', 'DESC']],
+    });
+    return rows.map((row) => formatInvoice(row));
+  });
+
+  for (const view of ['list', 'detail', 'pdf'] as InvoiceView[]) {
+    await run(`view:${view}`, ids, (page) => loadInvoiceViews(page, view));
+  }
+
+  if (ids.length < TOTAL) {
+    console.log(`   (only ${ids.length} invoices; seed more rows with npm run seed:data)`);
+  }
+
+  await sequelize.close();
+  process.exit(0);
+}
+
+bench().catch(async (error) => {
+  console.error(error);
+  await sequelize.close();
+  process.exit(1);
+});
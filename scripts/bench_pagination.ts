@@ -0,0 +1,60 @@
+import { performance } from 'perf_hooks';
+import { sequelize } from '../src/models';
+import { searchPatientsService } from '../src/modules/misc/search.service';
+
+const PAGES = Number(process.env.BENCH_PAGES) || 1000;
+const LIMIT = Number(process.env.BENCH_LIMIT) || 20;
+const OFFSET_SAMPLES = [1, 10, 100, 500, PAGES];
+
+const time = async <T>(fn: () => Promise<T>) => {
+  const begin = performance.now();
+  const result = await fn();
+  return { result, ms: performance.now() - begin };
+};
+
+const median = (values: number[]) => {
+  const sorted = [...values].sort((a, b) => a - b);
+  return sorted[Math.floor(sorted.length / 2)] || 0;
+};
+
+async function bench() {
+  await sequelize.authenticate();
+
+  console.log(` Offset pagination (limit ${LIMIT})`);
+  for (const page of OFFSET_SAMPLES) {
+    const { result, ms } = await time(() => searchPatientsService({ page, limit: LIMIT }));
+    console.log(`   page ${String(page).padStart(5)}: ${ms.toFixed(1)}ms (${result.patients.length} rows)`);
+  }
+
+  console.log(` Keyset pagination (limit ${LIMIT}), walking ${PAGES} pages`);
+  const latencies: number[] = [];
+  let cursor = '';
+  let walked = 0;
+  for (let page = 1; page <= PAGES; page++) {
+    const { result, ms } = await time(() => searchPatientsService({ limit: LIMIT, cursor }));
+    latencies.push(ms);
+    walked = page;
+    const next = 'nextCursor' in result.pagination ? result.pagination.nextCursor : null;
+    if (!next) {
+      break;
+    }
+    cursor = next;
+  }
+
+  const head = latencies.slice(1, 11);
+  const tail = latencies.slice(-10);
+  console.log(`   pages 2-11:  median ${median(head).toFixed(1)}ms`);
+  console.log(`   last 10 (${walked - 9}-${walked}): median ${median(tail).toFixed(1)}ms`);
+  if (walked < PAGES) {
+    console.log(`   (only ${walked} pages of data; seed more rows with npm run seed:data)`);
+  }
+
+  await sequelize.close();
+  process.exit(0);
+}
+
+bench().catch(async (error) => {
+  console.error(error);
+  await sequelize.close();
+  process.exit(1);
+});
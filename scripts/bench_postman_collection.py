@@ -0,0 +1,136 @@
+import argparse
+import hashlib
+import json
+import time
+import tracemalloc
+
+from generate_postman_collection import (
+    COLLECTION_INFO,
+    MODULE_ORDER,
+    ROLES_IN_ORDER,
+    build_collection,
+    build_event,
+    build_headers,
+    endpoints,
+    make_description,
+    write_collection,
+)
+
+
+def legacy_build_collection(registry):
+    # The previous builder: one registry scan per (role, module) pair, rendering every match again.
+    collection = {"info": dict(COLLECTION_INFO), "item": []}
+    for role in ROLES_IN_ORDER:
+        role_folder = {"name": role, "description": f"Requests available for role: {role}", "item": []}
+        for module in MODULE_ORDER:
+            module_items = []
+            for endpoint in registry:
+                if endpoint["module"] != module or role not in endpoint["roles"]:
+                    continue
+                raw_url = "{{baseUrl}}" + endpoint["path"]
+                headers = build_headers(endpoint["auth"], endpoint["body"])
+                description = make_description(
+                    endpoint["method"],
+                    raw_url,
+                    headers,
+                    endpoint["body"],
+                    endpoint["success"],
+                    endpoint["error"],
+                    endpoint["notes"],
+                )
+                request = {"method": endpoint["method"], "url": raw_url, "description": description}
+                if headers:
+                    request["header"] = headers
+                if endpoint["body"]:
+                    request["body"] = endpoint["body"]
+                item = {"name": endpoint["name"], "request": request}
+                event = build_event(extra_tests=endpoint["tests"], skip=endpoint["skip_tests"])
+                if event:
+                    item["event"] = event
+                module_items.append(item)
+            if module_items or module == "SYSTEM":
+                module_folder = {"name": module, "item": module_items}
+                if module == "SYSTEM":
+                    module_folder["description"] = "Chua trien khai"
+                role_folder["item"].append(module_folder)
+        collection["item"].append(role_folder)
+    return collection
+
+
+def synthetic_registry(size):
+    registry = []
+    for i in range(size):
+        template = endpoints[i % len(endpoints)]
+        clone = dict(template)
+        clone["name"] = f"{template['name']} #{i}"
+        clone["path"] = f"{template['path'].split('?', 1)[0]}/bench/{i}"
+        registry.append(clone)
+    return registry
+
+
+class DigestSink:
+    # Write target that keeps only a hash, so peak memory reflects the builder rather than the output.
+    def __init__(self):
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, chunk):
+        data = chunk.encode("ascii")
+        self.digest.update(data)
+        self.size += len(data)
+
+
+def measure(label, fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:<36} {best * 1000:>10.1f} ms {peak / (1024 * 1024):>10.1f} MiB peak")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Postman collection builder on a synthetic registry.")
+    parser.add_argument("--size", type=int, default=10000, help="Number of synthetic endpoints")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    registry = synthetic_registry(args.size)
+    print(f"Registry: {len(registry)} endpoints, {len(ROLES_IN_ORDER)} roles x {len(MODULE_ORDER)} modules")
+
+    def legacy_dump():
+        out = DigestSink()
+        json.dump(legacy_build_collection(registry), out, ensure_ascii=True, indent=2)
+        return out
+
+    def indexed_dump():
+        out = DigestSink()
+        json.dump(build_collection(registry), out, ensure_ascii=True, indent=2)
+        return out
+
+    def indexed_stream():
+        out = DigestSink()
+        write_collection(out, registry)
+        return out
+
+    measure("legacy build", lambda: legacy_build_collection(registry), args.repeat)
+    measure("indexed build", lambda: build_collection(registry), args.repeat)
+    legacy = measure("legacy build + json.dump", legacy_dump, args.repeat)
+    indexed = measure("indexed build + json.dump", indexed_dump, args.repeat)
+    streamed = measure("indexed build + streaming writer", indexed_stream, args.repeat)
+
+    digests = {sink.digest.hexdigest() for sink in (legacy, indexed, streamed)}
+    if len(digests) != 1:
+        raise SystemExit("Output mismatch between legacy and indexed builders")
+    print(f"Outputs identical ({streamed.size} bytes)")
+
+
+if __name__ == "__main__":
+    main()
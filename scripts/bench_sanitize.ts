@@ -0,0 +1,71 @@
+import { performance } from 'perf_hooks';
+import {
+  SanitizeMode,
+  sanitizeBodyFields,
+  sanitizeObject,
+  sanitizeString,
+} from '../src/middlewares/sanitize.middlewares';
+
+const ITERATIONS = Number(process.env.BENCH_ITERATIONS) || 2000;
+const MEDICINES = Number(process.env.BENCH_MEDICINES) || 40;
+const PRESCRIPTION_FIELDS = ['note', 'medicines.*.instruction'];
+
+const payload = () => ({
+  visitId: 1204,
+  patientId: 88,
+  note: 'Tái khám sau 7 ngày. <b>Uống nhiều nước</b> & nghỉ ngơi.',
+  medicines: Array.from({ length: MEDICINES }, (_, i) => ({
+    medicineId: i + 1,
+    quantity: 10 + i,
+    unit: 'VIEN',
+    dosageMorning: 1,
+    dosageNoon: 0,
+    dosageAfternoon: 1,
+    dosageEvening: 0,
+    days: 5,
+    instruction:
+      i % 4 === 0
+        ? 'Uống sau ăn <script>alert(1)</script><i>không</i> dùng với rượu'
+        : 'Uống sau ăn 30 phút, ngày 2 lần',
+  })),
+});
+
+const corpus = [
+  'plain text & symbols',
+  '<p>Viêm họng cấp</p>',
+  'x < y > z',
+  '<img src=x onerror=alert(1)>Sốt',
+  '<!-- note -->Ho khan',
+  '&lt;b&gt; escaped &amp; <i>mixed</i>',
+  '<svg><g>hidden</g></svg>shown',
+  '<a href="a>b">liên kết</a>',
+  '<style>p{}</style>Đau đầu&nbsp;nhẹ',
+];
+
+const run = (label: string, fn: () => unknown) => {
+  fn();
+  const begin = performance.now();
+  for (let i = 0; i < ITERATIONS; i++) {
+    fn();
+  }
+  const ms = performance.now() - begin;
+  console.log(`   ${label.padEnd(28)} ${(ITERATIONS / (ms / 1000)).toFixed(0).padStart(8)} req/s  (${(ms / ITERATIONS).toFixed(3)}ms/req)`);
+};
+
+function bench() {
+  const mismatches = corpus.filter(
+    (value) => sanitizeString(value, 'fast') !== sanitizeString(value, 'dompurify')
+  );
+  console.log(` Parity: ${corpus.length - mismatches.length}/${corpus.length} samples identical`);
+  mismatches.forEach((value) =>
+    console.log(`   ${JSON.stringify(value)}: fast=${JSON.stringify(sanitizeString(value, 'fast'))} dompurify=${JSON.stringify(sanitizeString(value, 'dompurify'))}`)
+  );
+
+  console.log(` Prescription body with ${MEDICINES} medicines, ${ITERATIONS} iterations`);
+  for (const mode of ['dompurify', 'fast'] as SanitizeMode[]) {
+    run(`${mode}, whole body`, () => sanitizeObject(payload(), mode));
+    run(`${mode}, field allowlist`, () => sanitizeBodyFields(payload(), PRESCRIPTION_FIELDS, mode));
+  }
+}
+
+bench();
@@ -2167,19 +2167,59 @@ add_endpoint(
 )
 
 
-def build_collection():
-    collection = {
-        "info": {
-            "name": "DemoApp Backend API (Role-based)",
-            "schema": "https://schema.getpostman.com/json/collection/v2.1.0/collection.json",
-            "description": "Role-based Postman collection grouped by module. Use environment variables for baseUrl and tokens.",
-        },
-        "item": [],
+ROLES_IN_ORDER = [ROLE_ADMIN, ROLE_DOCTOR, ROLE_RECEPTIONIST, ROLE_PATIENT]
+
+COLLECTION_INFO = {
+    "name": "DemoApp Backend API (Role-based)",
+    "schema": "https://schema.getpostman.com/json/collection/v2.1.0/collection.json",
+    "description": "Role-based Postman collection grouped by module. Use environment variables for baseUrl and tokens.",
+}
+
+
+def render_item(endpoint):
+    raw_url = "{{baseUrl}}" + endpoint["path"]
+    headers = build_headers(endpoint["auth"], endpoint["body"])
+    description = make_description(
+        endpoint["method"],
+        raw_url,
+        headers,
+        endpoint["body"],
+        endpoint["success"],
+        endpoint["error"],
+        endpoint["notes"],
+    )
+
+    request = {
+        "method": endpoint["method"],
+        "url": raw_url,
+        "description": description,
     }
+    if headers:
+        request["header"] = headers
+    if endpoint["body"]:
+        request["body"] = endpoint["body"]
+
+    item = {"name": endpoint["name"], "request": request}
+    event = build_event(extra_tests=endpoint["tests"], skip=endpoint["skip_tests"])
+    if event:
+        item["event"] = event
+    return item
 
-    roles_in_order = [ROLE_ADMIN, ROLE_DOCTOR, ROLE_RECEPTIONIST, ROLE_PATIENT]
 
-    for role in roles_in_order:
+def group_items(registry):
+    # One pass over the registry; each endpoint is rendered once and shared by every role folder it belongs to.
+    grouped = {}
+    for endpoint in registry:
+        item = render_item(endpoint)
+        for role in dict.fromkeys(endpoint["roles"]):
+            grouped.setdefault((role, endpoint["module"]), []).append(item)
+    return grouped
+
+
+def iter_role_folders(registry=None):
+    grouped = group_items(endpoints if registry is None else registry)
+
+    for role in ROLES_IN_ORDER:
         role_folder = {
             "name": role,
             "description": f"Requests available for role: {role}",
@@ -2187,51 +2227,46 @@ def build_collection():
         }
 
         for module in MODULE_ORDER:
-            module_items = []
-            for endpoint in endpoints:
-                if endpoint["module"] != module:
-                    continue
-                if role not in endpoint["roles"]:
-                    continue
-
-                raw_url = "{{baseUrl}}" + endpoint["path"]
-                headers = build_headers(endpoint["auth"], endpoint["body"])
-                description = make_description(
-                    endpoint["method"],
-                    raw_url,
-                    headers,
-                    endpoint["body"],
-                    endpoint["success"],
-                    endpoint["error"],
-                    endpoint["notes"],
-                )
-
-                request = {
-                    "method": endpoint["method"],
-                    "url": raw_url,
-                    "description": description,
-                }
-                if headers:
-                    request["header"] = headers
-                if endpoint["body"]:
-                    request["body"] = endpoint["body"]
-
-                item = {"name": endpoint["name"], "request": request}
-                event = build_event(extra_tests=endpoint["tests"], skip=endpoint["skip_tests"])
-                if event:
-                    item["event"] = event
-
-                module_items.append(item)
-
+            module_items = grouped.get((role, module), [])
             if module_items or module == "SYSTEM":
                 module_folder = {"name": module, "item": module_items}
                 if module == "SYSTEM":
                     module_folder["description"] = "Chua trien khai"
                 role_folder["item"].append(module_folder)
 
-        collection["item"].append(role_folder)
+        yield role_folder
+
+
+def build_collection(registry=None):
+    return {
+        "info": dict(COLLECTION_INFO),
+        "item": list(iter_role_folders(registry)),
+    }
+
+
+def write_collection(f, registry=None, indent=2):
+    # Emits the same bytes as json.dump(build_collection(), f, ensure_ascii=True, indent=indent),
+    # but only one role folder is encoded at a time. JSON strings never contain a raw newline,
+    # so nested values can be re-indented by rewriting "\n".
+    encoder = json.JSONEncoder(ensure_ascii=True, indent=indent)
+    pad = " " * indent
+
+    def write_nested(value, depth):
+        prefix = "\n" + pad * depth
+        for chunk in encoder.iterencode(value):
+            f.write(chunk.replace("\n", prefix))
+
+    f.write("{\n" + pad + '"info": ')
+    write_nested(COLLECTION_INFO, 1)
+    f.write(",\n" + pad + '"item": ')
 
-    return collection
+    first = True
+    for role_folder in iter_role_folders(registry):
+        f.write(("[\n" if first else ",\n") + pad * 2)
+        write_nested(role_folder, 2)
+        first = False
+    f.write("[]" if first else "\n" + pad + "]")
+    f.write("\n}")
 
 
 def build_environment():
@@ -2270,10 +2305,9 @@ def main():
     output_dir = "postman"
     os.makedirs(output_dir, exist_ok=True)
 
-    collection = build_collection()
     collection_path = os.path.join(output_dir, "DemoApp.postman_collection.json")
     with open(collection_path, "w", encoding="ascii") as f:
-        json.dump(collection, f, ensure_ascii=True, indent=2)
+        write_collection(f)
 
     env = build_environment()
     env_path = os.path.join(output_dir, "DemoApp.postman_environment.json")
@@ -0,0 +1,490 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import sys
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+from generate_postman_collection import (
+    ROLE_ADMIN,
+    ROLE_DOCTOR,
+    ROLE_PATIENT,
+    ROLE_RECEPTIONIST,
+    build_environment,
+    endpoints,
+)
+
+DEFAULT_BASE_URL = "http://localhost:3000"
+
+# Clinic morning: patients and reception dominate, admins barely touch the API.
+DEFAULT_ROLE_MIX = {
+    ROLE_ADMIN: 1,
+    ROLE_DOCTOR: 3,
+    ROLE_RECEPTIONIST: 4,
+    ROLE_PATIENT: 6,
+}
+
+DEFAULT_METHODS = ["GET"]
+DEFAULT_EXCLUDE = [r"/api/auth/oauth/"]
+
+VARIABLE_PATTERN = re.compile(r"\{\{(\w+)\}\}")
+
+
+class HttpResponse:
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def json(self):
+        return json.loads(self.body.decode("utf-8"))
+
+
+class HttpClient:
+    def __init__(self, base_url, max_connections=64, timeout=30.0):
+        parts = urlsplit(base_url)
+        if parts.scheme not in ("http", ""):
+            raise ValueError(f"Only plain http is supported, got {base_url}")
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 80
+        self.host_header = parts.netloc or self.host
+        self.timeout = timeout
+        self._idle = []
+        self._slots = asyncio.Semaphore(max_connections)
+
+    async def _connect(self):
+        if self._idle:
+            return self._idle.pop()
+        return await asyncio.open_connection(self.host, self.port)
+
+    async def _read_body(self, reader, headers):
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size_line = await reader.readline()
+                size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            return b"".join(chunks)
+        if "content-length" in headers:
+            return await reader.readexactly(int(headers["content-length"]))
+        return await reader.read()
+
+    async def _exchange(self, conn, payload):
+        reader, writer = conn
+        writer.write(payload)
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Connection closed by server")
+        status = int(status_line.split(b" ", 2)[1])
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            headers[key.strip().lower()] = value.strip()
+
+        body = await self._read_body(reader, headers)
+        return HttpResponse(status, headers, body)
+
+    async def request(self, method, path, headers=None, body=None):
+        lines = [
+            f"{method} {path} HTTP/1.1",
+            f"Host: {self.host_header}",
+            "Connection: keep-alive",
+            "Accept: application/json",
+        ]
+        for key, value in (headers or {}).items():
+            lines.append(f"{key}: {value}")
+        data = body.encode("utf-8") if isinstance(body, str) else (body or b"")
+        if data or method in ("POST", "PUT", "PATCH"):
+            lines.append(f"Content-Length: {len(data)}")
+        payload = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + data
+
+        async with self._slots:
+            conn = await self._connect()
+            try:
+                response = await asyncio.wait_for(self._exchange(conn, payload), self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # A pooled keep-alive socket may have been closed by the server; retry once fresh.
+                conn[1].close()
+                conn = await asyncio.open_connection(self.host, self.port)
+                try:
+                    response = await asyncio.wait_for(self._exchange(conn, payload), self.timeout)
+                except BaseException:
+                    conn[1].close()
+                    raise
+            except BaseException:
+                conn[1].close()
+                raise
+
+            if response.headers.get("connection", "").lower() == "close":
+                conn[1].close()
+            else:
+                self._idle.append(conn)
+            return response
+
+    async def close(self):
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100.0 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+class LatencyStats:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.failures = defaultdict(int)
+        self.meta = {}
+
+    def record(self, key, meta, latency_ms, status=None):
+        self.meta.setdefault(key, meta)
+        self.latencies[key].append(latency_ms)
+        if status is None:
+            self.failures[key] += 1
+        else:
+            self.statuses[key][status] += 1
+
+    def summary(self, key):
+        values = sorted(self.latencies[key])
+        total = len(values)
+        statuses = self.statuses[key]
+        errors = self.failures[key] + sum(n for code, n in statuses.items() if code >= 400)
+        server_errors = self.failures[key] + sum(n for code, n in statuses.items() if code >= 500)
+        return {
+            **self.meta[key],
+            "count": total,
+            "errors": errors,
+            "errorRate": errors / total if total else 0.0,
+            "serverErrors": server_errors,
+            "transportFailures": self.failures[key],
+            "statuses": {str(code): n for code, n in sorted(statuses.items())},
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+            "p99": percentile(values, 99),
+            "max": values[-1] if values else 0.0,
+        }
+
+    def summaries(self):
+        return [self.summary(key) for key in self.latencies]
+
+
+def parse_mix(value, defaults=None):
+    mix = dict(defaults or {})
+    if not value:
+        return mix
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip().upper()
+        if not name:
+            continue
+        mix[name] = float(weight) if weight else 1.0
+    return mix
+
+
+def parse_vars(pairs):
+    values = {}
+    for pair in pairs or []:
+        key, _, value = pair.partition("=")
+        values[key.strip()] = value
+    return values
+
+
+def default_variables():
+    values = {}
+    for entry in build_environment()["values"]:
+        values[entry["key"]] = entry["value"] or "1"
+    return values
+
+
+def substitute(text, variables):
+    return VARIABLE_PATTERN.sub(lambda match: str(variables.get(match.group(1), match.group(0))), text)
+
+
+def endpoint_key(endpoint):
+    return f"{endpoint['method']} {endpoint['path'].split('?', 1)[0]} [{endpoint['name']}]"
+
+
+def select_endpoints(registry, methods, modules=None, exclude=None):
+    patterns = [re.compile(pattern) for pattern in (exclude or [])]
+    selected = []
+    for endpoint in registry:
+        if endpoint["method"] not in methods:
+            continue
+        if modules and endpoint["module"] not in modules:
+            continue
+        body = endpoint["body"]
+        if body and body.get("mode") == "formdata":
+            continue
+        if any(pattern.search(endpoint["path"]) for pattern in patterns):
+            continue
+        selected.append(endpoint)
+    return selected
+
+
+def build_plan(selected, role_mix, module_mix, token_pools):
+    plan = []
+    for role, role_weight in role_mix.items():
+        if role_weight <= 0:
+            continue
+        candidates = []
+        weights = []
+        for endpoint in selected:
+            if role not in endpoint["roles"]:
+                continue
+            if endpoint["auth"] and not token_pools.get(role):
+                continue
+            weight = module_mix.get(endpoint["module"], module_mix.get("*", 1.0))
+            if weight <= 0:
+                continue
+            candidates.append(endpoint)
+            weights.append(weight)
+        if candidates:
+            plan.append((role, role_weight, candidates, weights))
+    return plan
+
+
+def load_identities(path):
+    if not path:
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+
+    identities = {}
+    for role, entries in raw.items():
+        role = role.upper()
+        identities[role] = []
+        for entry in entries:
+            if isinstance(entry, str):
+                identities[role].append({"token": entry})
+            else:
+                identities[role].append(dict(entry))
+    return identities
+
+
+async def login(client, email, password):
+    response = await client.request(
+        "POST",
+        "/api/auth/login",
+        headers={"Content-Type": "application/json"},
+        body=json.dumps({"email": email, "password": password}),
+    )
+    if response.status != 200:
+        raise RuntimeError(f"Login failed for {email}: HTTP {response.status}")
+    data = response.json()
+    user = data.get("user") or {}
+    claims = {}
+    for key in ("userId", "patientId", "doctorId"):
+        if user.get(key) is not None:
+            claims[key] = str(user[key])
+    return {"token": data["tokens"]["accessToken"], "vars": claims}
+
+
+async def build_token_pools(client, identities):
+    pools = {}
+    for role, entries in identities.items():
+        pool = []
+        for entry in entries:
+            if entry.get("token"):
+                pool.append({"token": entry["token"], "vars": entry.get("vars", {})})
+                continue
+            session = await login(client, entry["email"], entry["password"])
+            session["vars"].update(entry.get("vars", {}))
+            pool.append(session)
+        pools[role] = pool
+    return pools
+
+
+def pick(plan, token_pools, rng):
+    role, _, candidates, weights = rng.choices(plan, weights=[item[1] for item in plan])[0]
+    endpoint = rng.choices(candidates, weights=weights)[0]
+    pool = token_pools.get(role) or []
+    session = rng.choice(pool) if pool else None
+    return role, endpoint, session
+
+
+async def fire(client, stats, endpoint, session, variables, recorded=True):
+    scoped = dict(variables)
+    headers = {}
+    if session:
+        scoped.update(session["vars"])
+        if endpoint["auth"]:
+            headers["Authorization"] = f"Bearer {session['token']}"
+
+    body = None
+    if endpoint["body"] and endpoint["body"].get("mode") == "raw":
+        body = substitute(endpoint["body"]["raw"], scoped)
+        headers["Content-Type"] = "application/json"
+
+    path = substitute(endpoint["path"], scoped)
+    meta = {"endpoint": endpoint_key(endpoint), "module": endpoint["module"]}
+
+    start = time.perf_counter()
+    try:
+        response = await client.request(endpoint["method"], path, headers=headers, body=body)
+        status = response.status
+    except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+        status = None
+    latency_ms = (time.perf_counter() - start) * 1000.0
+
+    if recorded:
+        stats.record(meta["endpoint"], meta, latency_ms, status)
+
+
+async def run_load(client, plan, token_pools, variables, rate, duration, concurrency, warmup, seed):
+    rng = random.Random(seed)
+    stats = LatencyStats()
+    in_flight = asyncio.Semaphore(concurrency)
+    tasks = set()
+
+    started = time.perf_counter()
+    measure_from = started + warmup
+    deadline = measure_from + duration
+    interval = 1.0 / rate
+    sent = 0
+    lagged = 0
+
+    async def guarded(endpoint, session, recorded):
+        try:
+            await fire(client, stats, endpoint, session, variables, recorded)
+        finally:
+            in_flight.release()
+
+    while True:
+        scheduled = started + sent * interval
+        if scheduled >= deadline:
+            break
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        elif delay < -interval:
+            lagged += 1
+
+        await in_flight.acquire()
+        _, endpoint, session = pick(plan, token_pools, rng)
+        task = asyncio.create_task(guarded(endpoint, session, scheduled >= measure_from))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        sent += 1
+
+    if tasks:
+        await asyncio.gather(*tasks)
+
+    elapsed = time.perf_counter() - measure_from
+    measured = sum(len(values) for values in stats.latencies.values())
+    return stats, {
+        "targetRate": rate,
+        "achievedRate": measured / elapsed if elapsed > 0 else 0.0,
+        "sent": sent,
+        "measured": measured,
+        "lagged": lagged,
+        "durationSeconds": round(elapsed, 3),
+    }
+
+
+def format_report(summaries, run_info, sort_key="p99"):
+    rows = sorted(summaries, key=lambda row: row[sort_key], reverse=True)
+    header = f"{'ENDPOINT':<72} {'MODULE':<24} {'N':>6} {'ERR%':>6} {'5XX':>5} {'P50':>8} {'P95':>8} {'P99':>8}"
+    lines = [header, "-" * len(header)]
+    for row in rows:
+        lines.append(
+            f"{row['endpoint'][:72]:<72} {row['module'][:24]:<24} {row['count']:>6} "
+            f"{row['errorRate'] * 100:>5.1f}% {row['serverErrors']:>5} "
+            f"{row['p50']:>8.1f} {row['p95']:>8.1f} {row['p99']:>8.1f}"
+        )
+    lines.append("")
+    lines.append(
+        f"Target {run_info['targetRate']:.1f} req/s, achieved {run_info['achievedRate']:.1f} req/s "
+        f"over {run_info['durationSeconds']}s ({run_info['measured']} measured, "
+        f"{run_info['lagged']} late dispatches)"
+    )
+    return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Drive weighted concurrent traffic at a local server using the Postman endpoint registry."
+    )
+    parser.add_argument("--base-url", default=os.environ.get("BASE_URL", DEFAULT_BASE_URL))
+    parser.add_argument("--identities", help="JSON file mapping role -> list of tokens or {email, password}")
+    parser.add_argument("--rate", type=float, default=20.0, help="Target requests per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Unmeasured seconds before the run")
+    parser.add_argument("--concurrency", type=int, default=64, help="Maximum in-flight requests")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--role-mix", help="e.g. PATIENT=6,RECEPTIONIST=4,DOCTOR=3,ADMIN=1")
+    parser.add_argument("--module-mix", help="e.g. APPOINTMENT=5,DOCTOR=3,*=1")
+    parser.add_argument("--modules", help="Comma-separated modules to include")
+    parser.add_argument("--methods", default=",".join(DEFAULT_METHODS), help="Comma-separated HTTP methods")
+    parser.add_argument("--exclude", action="append", help="Regex on path to skip (repeatable)")
+    parser.add_argument("--var", action="append", help="Override a {{variable}}, e.g. patientId=12")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", dest="json_path", help="Write the full report to this path")
+    return parser.parse_args(argv)
+
+
+async def main_async(args):
+    methods = [method.strip().upper() for method in args.methods.split(",") if method.strip()]
+    modules = [module.strip().upper() for module in args.modules.split(",")] if args.modules else None
+    selected = select_endpoints(endpoints, methods, modules, args.exclude or DEFAULT_EXCLUDE)
+
+    variables = default_variables()
+    variables.update(parse_vars(args.var))
+
+    client = HttpClient(args.base_url, max_connections=args.concurrency, timeout=args.timeout)
+    try:
+        token_pools = await build_token_pools(client, load_identities(args.identities))
+        plan = build_plan(selected, parse_mix(args.role_mix, DEFAULT_ROLE_MIX), parse_mix(args.module_mix), token_pools)
+        if not plan:
+            print("No endpoints to exercise: check --identities, --methods and --modules", file=sys.stderr)
+            return 2
+
+        print(f"Exercising {len(selected)} endpoints across roles: {', '.join(item[0] for item in plan)}")
+        stats, run_info = await run_load(
+            client,
+            plan,
+            token_pools,
+            variables,
+            args.rate,
+            args.duration,
+            args.concurrency,
+            args.warmup,
+            args.seed,
+        )
+    finally:
+        await client.close()
+
+    summaries = stats.summaries()
+    print(format_report(summaries, run_info))
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"run": run_info, "endpoints": summaries}, f, indent=2)
+        print("Wrote:", args.json_path)
+    return 0
+
+
+def main(argv=None):
+    return asyncio.run(main_async(parse_args(argv)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,442 @@
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+import time
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from generate_postman_collection import endpoints
+from load_test import (
+    DEFAULT_BASE_URL,
+    HttpClient,
+    LatencyStats,
+    build_token_pools,
+    load_identities,
+    percentile,
+)
+
+UNMATCHED = "UNMATCHED"
+
+ANSI_PATTERN = re.compile(r"\x1b\[[0-9;]*m")
+TIMESTAMP_PATTERN = re.compile(r"^\[?(\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?)\]?:?\s*")
+METHOD = r"(GET|POST|PUT|PATCH|DELETE|HEAD|OPTIONS)"
+# morgan("dev"): "GET /api/patients?page=1 200 12.345 ms - 512"
+MORGAN_PATTERN = re.compile(METHOD + r" (\S+) (\d{3}) ([\d.]+) ms")
+# Legacy request logger: "INCOMING: GET /api/patients" / "RESPONSE: GET /api/patients - 200 (12ms)"
+INCOMING_PATTERN = re.compile(r"INCOMING: " + METHOD + r" (\S+)")
+RESPONSE_PATTERN = re.compile(r"RESPONSE: " + METHOD + r" (\S+) - (\d{3}) \((\d+)ms\)")
+
+
+class RecordedRequest:
+    def __init__(self, offset, method, path, status=None, latency_ms=None, headers=None, body=None):
+        self.offset = offset
+        self.method = method
+        self.path = path
+        self.status = status
+        self.latency_ms = latency_ms
+        self.headers = headers or {}
+        self.body = body
+
+
+class EndpointMatcher:
+    def __init__(self, registry):
+        routes = []
+        for endpoint in registry:
+            template = endpoint["path"].split("?", 1)[0]
+            variables = template.count("{{")
+            pattern = re.escape(template)
+            pattern = re.sub(r"\\\{\\\{\w+\\\}\\\}", "[^/]+", pattern)
+            routes.append((variables, -len(template), endpoint["method"], re.compile(f"^{pattern}/?$"), endpoint))
+        # Literal routes (e.g. /appointments/my) must win over parameterised siblings (/appointments/{{id}}).
+        routes.sort(key=lambda route: (route[0], route[1]))
+        self.routes = routes
+        self._cache = {}
+
+    def match(self, method, path):
+        route_path = path.split("?", 1)[0]
+        cache_key = (method, route_path)
+        if cache_key not in self._cache:
+            found = None
+            for _, _, route_method, pattern, endpoint in self.routes:
+                if route_method == method and pattern.match(route_path):
+                    found = endpoint
+                    break
+            self._cache[cache_key] = found
+        return self._cache[cache_key]
+
+
+def parse_timestamp(value):
+    value = value.replace(" ", "T")
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value).timestamp()
+
+
+def parse_access_entry(line):
+    # ACCESS_LOG_FORMAT=json: {"time": "...", "method": "GET", "url": "/api/patients", "status": 200, "durationMs": 12, ...}
+    if not line.startswith("{"):
+        return None
+    try:
+        entry = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(entry, dict) or "method" not in entry or "url" not in entry:
+        return None
+    return entry
+
+
+def parse_log(path, default_interval_ms):
+    # Each line may carry a leading ISO timestamp (pm2 --time, docker logs -t); without one,
+    # requests are spaced default_interval_ms apart in log order.
+    records = []
+    pending = {}
+    synthetic_clock = 0.0
+    first_stamp = None
+
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for raw_line in f:
+            line = ANSI_PATTERN.sub("", raw_line).strip()
+            if not line:
+                continue
+
+            stamp = None
+            stamp_match = TIMESTAMP_PATTERN.match(line)
+            if stamp_match:
+                try:
+                    stamp = parse_timestamp(stamp_match.group(1))
+                except ValueError:
+                    stamp = None
+                line = line[stamp_match.end():]
+
+            entry = parse_access_entry(line)
+            if entry is not None and entry.get("time"):
+                try:
+                    # "time" is when the request started, so it beats any line prefix stamped at finish.
+                    stamp = parse_timestamp(entry["time"])
+                except ValueError:
+                    pass
+
+            if stamp is not None:
+                if first_stamp is None:
+                    first_stamp = stamp
+                offset = stamp - first_stamp
+            else:
+                offset = synthetic_clock
+
+            if entry is not None:
+                status = entry.get("status")
+                latency_ms = entry.get("durationMs")
+                records.append(
+                    RecordedRequest(
+                        max(offset, 0.0),
+                        str(entry["method"]).upper(),
+                        entry["url"],
+                        int(status) if status is not None else None,
+                        float(latency_ms) if latency_ms is not None else None,
+                    )
+                )
+                synthetic_clock += default_interval_ms / 1000.0
+                continue
+
+            incoming = INCOMING_PATTERN.search(line)
+            if incoming:
+                key = (incoming.group(1), incoming.group(2))
+                pending.setdefault(key, []).append(len(records))
+                records.append(RecordedRequest(offset, key[0], key[1]))
+                synthetic_clock += default_interval_ms / 1000.0
+                continue
+
+            response = RESPONSE_PATTERN.search(line)
+            if response:
+                key = (response.group(1), response.group(2))
+                if pending.get(key):
+                    record = records[pending[key].pop(0)]
+                    record.status = int(response.group(3))
+                    record.latency_ms = float(response.group(4))
+                continue
+
+            morgan = MORGAN_PATTERN.search(line)
+            if morgan:
+                # Both loggers run on every request; morgan lines are only used when INCOMING lines are absent.
+                if pending:
+                    continue
+                key = (morgan.group(1), morgan.group(2))
+                latency_ms = float(morgan.group(4))
+                start = offset - latency_ms / 1000.0 if stamp is not None else offset
+                records.append(
+                    RecordedRequest(max(start, 0.0), key[0], key[1], int(morgan.group(3)), latency_ms)
+                )
+                synthetic_clock += default_interval_ms / 1000.0
+
+    records.sort(key=lambda record: record.offset)
+    return records
+
+
+def parse_har(path):
+    with open(path, "r", encoding="utf-8") as f:
+        har = json.load(f)
+
+    records = []
+    first_stamp = None
+    for entry in har.get("log", {}).get("entries", []):
+        request = entry["request"]
+        parts = urlsplit(request["url"])
+        target = parts.path + (f"?{parts.query}" if parts.query else "")
+        stamp = parse_timestamp(entry["startedDateTime"])
+        if first_stamp is None or stamp < first_stamp:
+            first_stamp = stamp
+        headers = {
+            header["name"].title(): header["value"]
+            for header in request.get("headers", [])
+            if header["name"].lower() in ("authorization", "content-type")
+        }
+        body = (request.get("postData") or {}).get("text")
+        status = entry.get("response", {}).get("status")
+        records.append(
+            RecordedRequest(stamp, request["method"].upper(), target, status, entry.get("time"), headers, body)
+        )
+
+    for record in records:
+        record.offset -= first_stamp
+    records.sort(key=lambda record: record.offset)
+    return records
+
+
+def load_recording(path, default_interval_ms):
+    if path.lower().endswith(".har"):
+        return parse_har(path)
+    return parse_log(path, default_interval_ms)
+
+
+def pick_session(endpoint, token_pools, counter):
+    if endpoint is None:
+        return None
+    for role in endpoint["roles"]:
+        pool = token_pools.get(role)
+        if pool:
+            return pool[counter % len(pool)]
+    return None
+
+
+async def replay(client, records, matcher, token_pools, speedup, concurrency, keep_auth):
+    module_stats = LatencyStats()
+    endpoint_stats = LatencyStats()
+    in_flight = asyncio.Semaphore(concurrency)
+    tasks = set()
+    lagged = 0
+
+    async def send(index, record):
+        endpoint = matcher.match(record.method, record.path)
+        module = endpoint["module"] if endpoint else UNMATCHED
+        headers = {}
+        if record.headers.get("Content-Type") or record.body:
+            headers["Content-Type"] = record.headers.get("Content-Type", "application/json")
+        if keep_auth and record.headers.get("Authorization"):
+            headers["Authorization"] = record.headers["Authorization"]
+        elif endpoint is None or endpoint["auth"]:
+            session = pick_session(endpoint, token_pools, index)
+            if session:
+                headers["Authorization"] = f"Bearer {session['token']}"
+
+        start = time.perf_counter()
+        try:
+            response = await client.request(record.method, record.path, headers=headers, body=record.body)
+            status = response.status
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+            status = None
+        latency_ms = (time.perf_counter() - start) * 1000.0
+
+        label = endpoint["name"] if endpoint else record.path.split("?", 1)[0]
+        module_stats.record(module, {"module": module}, latency_ms, status)
+        endpoint_stats.record(
+            f"{record.method} {label}", {"endpoint": f"{record.method} {label}", "module": module}, latency_ms, status
+        )
+
+    async def guarded(index, record):
+        try:
+            await send(index, record)
+        finally:
+            in_flight.release()
+
+    started = time.perf_counter()
+    for index, record in enumerate(records):
+        delay = started + record.offset / speedup - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        elif delay < -0.05:
+            lagged += 1
+        await in_flight.acquire()
+        task = asyncio.create_task(guarded(index, record))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    if tasks:
+        await asyncio.gather(*tasks)
+
+    return module_stats, endpoint_stats, {
+        "requests": len(records),
+        "speedup": speedup,
+        "lagged": lagged,
+        "durationSeconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def build_report(module_stats, endpoint_stats, run_info, label):
+    modules = {}
+    for summary in module_stats.summaries():
+        module = summary["module"]
+        summary["samples"] = sorted(module_stats.latencies[module])
+        modules[module] = summary
+    return {
+        "label": label,
+        "run": run_info,
+        "modules": modules,
+        "endpoints": endpoint_stats.summaries(),
+    }
+
+
+def format_modules(report):
+    header = f"{'MODULE':<26} {'N':>6} {'ERR%':>6} {'P50':>8} {'P95':>8} {'P99':>8}"
+    lines = [header, "-" * len(header)]
+    for module, row in sorted(report["modules"].items()):
+        lines.append(
+            f"{module[:26]:<26} {row['count']:>6} {row['errorRate'] * 100:>5.1f}% "
+            f"{row['p50']:>8.1f} {row['p95']:>8.1f} {row['p99']:>8.1f}"
+        )
+    return "\n".join(lines)
+
+
+def compare_reports(baseline, candidate, percentiles, threshold_pct, min_delta_ms, min_samples, max_error_increase):
+    rows = []
+    regressions = []
+    for module, base in sorted(baseline["modules"].items()):
+        current = candidate["modules"].get(module)
+        if current is None or base["count"] < min_samples or current["count"] < min_samples:
+            continue
+        for pct in percentiles:
+            before = percentile(base["samples"], pct)
+            after = percentile(current["samples"], pct)
+            change_pct = (after - before) / before * 100.0 if before > 0 else 0.0
+            regressed = after - before > min_delta_ms and change_pct > threshold_pct
+            rows.append((module, f"p{pct:g}", before, after, change_pct, regressed))
+            if regressed:
+                regressions.append(f"{module} p{pct:g}: {before:.1f} ms -> {after:.1f} ms (+{change_pct:.1f}%)")
+
+        error_delta = current["errorRate"] - base["errorRate"]
+        if error_delta > max_error_increase:
+            regressions.append(
+                f"{module} error rate: {base['errorRate'] * 100:.1f}% -> {current['errorRate'] * 100:.1f}%"
+            )
+    return rows, regressions
+
+
+def format_comparison(rows, baseline, candidate):
+    header = f"{'MODULE':<26} {'PCT':>5} {baseline['label'][:10]:>10} {candidate['label'][:10]:>10} {'CHANGE':>8}"
+    lines = [header, "-" * len(header)]
+    for module, pct, before, after, change_pct, regressed in rows:
+        marker = "  REGRESSION" if regressed else ""
+        lines.append(f"{module[:26]:<26} {pct:>5} {before:>10.1f} {after:>10.1f} {change_pct:>+7.1f}%{marker}")
+    return "\n".join(lines)
+
+
+async def run_command(args):
+    records = load_recording(args.recording, args.default_interval)
+    if args.methods:
+        methods = {method.strip().upper() for method in args.methods.split(",")}
+        records = [record for record in records if record.method in methods]
+    if args.limit:
+        records = records[: args.limit]
+    if not records:
+        print("No requests found in recording", file=sys.stderr)
+        return 2
+
+    matcher = EndpointMatcher(endpoints)
+    client = HttpClient(args.base_url, max_connections=args.concurrency, timeout=args.timeout)
+    try:
+        token_pools = await build_token_pools(client, load_identities(args.identities))
+        print(f"Replaying {len(records)} requests at {args.speedup:g}x against {args.base_url}")
+        module_stats, endpoint_stats, run_info = await replay(
+            client, records, matcher, token_pools, args.speedup, args.concurrency, args.keep_auth
+        )
+    finally:
+        await client.close()
+
+    report = build_report(module_stats, endpoint_stats, run_info, args.label)
+    print(format_modules(report))
+
+    output = args.output or f"replay-{args.label}.json"
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print("Wrote:", output)
+    return 0
+
+
+def compare_command(args):
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.candidate, "r", encoding="utf-8") as f:
+        candidate = json.load(f)
+
+    percentiles = [float(value) for value in args.percentiles.split(",")]
+    rows, regressions = compare_reports(
+        baseline,
+        candidate,
+        percentiles,
+        args.threshold,
+        args.min_delta_ms,
+        args.min_samples,
+        args.max_error_increase / 100.0,
+    )
+    print(format_comparison(rows, baseline, candidate))
+
+    if regressions:
+        print("\nPerformance regressions:", file=sys.stderr)
+        for line in regressions:
+            print(f"- {line}", file=sys.stderr)
+        return 1
+    print("\nNo module regressed past the threshold")
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Replay recorded API traffic and gate on per-module latency regressions.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Replay a request log or HAR file and write a latency report")
+    run.add_argument("recording", help="JSON access log, morgan / INCOMING-RESPONSE log file, or a .har export")
+    run.add_argument("--base-url", default=os.environ.get("BASE_URL", DEFAULT_BASE_URL))
+    run.add_argument("--label", default="candidate", help="Build label stored in the report")
+    run.add_argument("--output", help="Report path (default: replay-<label>.json)")
+    run.add_argument("--identities", help="JSON file mapping role -> list of tokens or {email, password}")
+    run.add_argument("--keep-auth", action="store_true", help="Reuse Authorization headers recorded in a HAR")
+    run.add_argument("--speedup", type=float, default=1.0, help="Replay N times faster than recorded")
+    run.add_argument("--default-interval", type=float, default=100.0, help="ms between untimestamped log lines")
+    run.add_argument("--methods", default="GET", help="Comma-separated methods to replay (empty for all)")
+    run.add_argument("--limit", type=int, default=0)
+    run.add_argument("--concurrency", type=int, default=64)
+    run.add_argument("--timeout", type=float, default=30.0)
+
+    compare = commands.add_parser("compare", help="Compare two replay reports; exit 1 on regression")
+    compare.add_argument("baseline")
+    compare.add_argument("candidate")
+    compare.add_argument("--percentiles", default="50,95,99")
+    compare.add_argument("--threshold", type=float, default=10.0, help="Allowed slowdown in percent")
+    compare.add_argument("--min-delta-ms", type=float, default=5.0, help="Ignore absolute changes below this")
+    compare.add_argument("--min-samples", type=int, default=20, help="Skip modules with fewer samples")
+    compare.add_argument("--max-error-increase", type=float, default=1.0, help="Allowed error-rate increase in points")
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == "compare":
+        return compare_command(args)
+    return asyncio.run(run_command(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,6 @@
 import express, { Application, Request, Response, NextFunction } from "express";
 import cors from "cors";
 import helmet from "helmet";
-import morgan from "morgan";
 import rateLimit from "express-rate-limit";
 import path from "path";
 import userRoutes from "./modules/user/user.routes";
@@ -31,6 +30,8 @@ import auditLogRoutes from "./modules/admin/auditLog.routes";
 import jobRoutes from "./modules/misc/job.routes";
 import systemRoutes from "./modules/admin/system.routes";
 import { checkMaintenance } from "./middlewares/maintenance.middlewares";
+import { requestContext } from "./middlewares/requestContext.middlewares";
+import { accessLog } from "./middlewares/accessLog.middlewares";
 
 const rateLimitWindowMsEnv = Number(process.env.RATE_LIMIT_WINDOW_MS);
 const rateLimitMaxEnv = Number(process.env.RATE_LIMIT_MAX_REQUESTS);
@@ -47,22 +48,8 @@ const app: Application = express();
 app.set("trust proxy", 1);
 
 
-app.use(morgan("dev"));
-
-
-app.use((req, res, next) => {
-  const start = Date.now();
-  console.log(`\nINCOMING: ${req.method} ${req.url}`);
-
-  res.on("finish", () => {
-    const duration = Date.now() - start;
-    console.log(
-      `RESPONSE: ${req.method} ${req.url} - ${res.statusCode} (${duration}ms)\n`
-    );
-  });
-
-  next();
-});
+app.use(requestContext);
+app.use(accessLog());
 
 
 app.use(helmet({
@@ -1,4 +1,5 @@
 import Redis from "ioredis";
+import { LRUCache } from "../utils/lruCache";
 
 const redisConfig = {
   host: process.env.REDIS_HOST || "localhost",
@@ -26,12 +27,28 @@ redisClient.on("reconnecting", () => {
 
 export class TokenBlacklistService {
   private static readonly PREFIX = "blacklist:token:";
+  private static readonly INDEX_KEY = "blacklist:index";
+  private static readonly UNLINK_BATCH = 500;
+  private static readonly CHANNEL = "blacklist:revoked";
+  private static readonly NEGATIVE_TTL_MS = 30 * 1000;
+
+  private static readonly revoked = new LRUCache<string, true>(10000);
+  private static readonly notRevoked = new LRUCache<string, true>(50000, TokenBlacklistService.NEGATIVE_TTL_MS);
+  private static subscriber: Redis | null = null;
   
   static async addToBlacklist(token: string, expiresIn: number): Promise<void> {
     try {
       const key = this.PREFIX + token;
       
-      await redisClient.setex(key, expiresIn, "revoked");
+      const now = Date.now();
+      await redisClient
+        .pipeline()
+        .setex(key, expiresIn, "revoked")
+        .zadd(this.INDEX_KEY, now + expiresIn * 1000, key)
+        .zremrangebyscore(this.INDEX_KEY, 0, now)
+        .publish(this.CHANNEL, token)
+        .exec();
+      this.markRevoked(token, expiresIn * 1000);
     } catch (error) {
       console.error("Error adding token to blacklist:", error);
       throw new Error("Failed to revoke token");
@@ -39,21 +56,35 @@ export class TokenBlacklistService {
   }
   
   static async isBlacklisted(token: string): Promise<boolean> {
+    this.subscribe();
+    if (this.revoked.get(token)) {
+      return true;
+    }
+    if (this.notRevoked.get(token)) {
+      return false;
+    }
+
     try {
       const key = this.PREFIX + token;
       const result = await redisClient.get(key);
-      return result === "revoked";
+      if (result === "revoked") {
+        this.revoked.set(token, true);
+        return true;
+      }
+      this.notRevoked.set(token, true);
+      return false;
     } catch (error) {
       console.error("Error checking token blacklist:", error);
       
       return false;
     }
   }
-  
+
   static async removeFromBlacklist(token: string): Promise<void> {
     try {
       const key = this.PREFIX + token;
-      await redisClient.del(key);
+      await redisClient.pipeline().del(key).zrem(this.INDEX_KEY, key).exec();
+      this.revoked.delete(token);
     } catch (error) {
       console.error("Error removing token from blacklist:", error);
     }
@@ -62,19 +93,71 @@ export class TokenBlacklistService {
         
   static async clearAll(): Promise<void> {
     try {
-      const keys = await redisClient.keys(this.PREFIX + "*");
-      if (keys.length > 0) {
-        await redisClient.del(...keys);
+      const keys = await redisClient.zrange(this.INDEX_KEY, 0, -1);
+      const pipeline = redisClient.pipeline();
+      for (let i = 0; i < keys.length; i += this.UNLINK_BATCH) {
+        pipeline.unlink(...keys.slice(i, i + this.UNLINK_BATCH));
+      }
+      pipeline.unlink(this.INDEX_KEY);
+      await pipeline.exec();
+
+      
+      const stream = redisClient.scanStream({ match: this.PREFIX + "*", count: 1000 });
+      for await (const legacyKeys of stream) {
+        if ((legacyKeys as string[]).length > 0) {
+          await redisClient.unlink(...(legacyKeys as string[]));
+        }
       }
+      this.revoked.clear();
     } catch (error) {
       console.error("Error clearing blacklist:", error);
     }
   }
+
+  static async close(): Promise<void> {
+    if (this.subscriber) {
+      await this.subscriber.quit();
+      this.subscriber = null;
+    }
+  }
+
+  private static markRevoked(token: string, ttlMs: number): void {
+    this.notRevoked.delete(token);
+    this.revoked.set(token, true, ttlMs);
+  }
+
+  private static subscribe(): void {
+    if (this.subscriber) {
+      return;
+    }
+
+    const subscriber = redisClient.duplicate();
+    this.subscriber = subscriber;
+
+    subscriber.on("message", (channel: string, token: string) => {
+      if (channel === this.CHANNEL) {
+        this.markRevoked(token, 0);
+      }
+    });
+
+    subscriber.on("ready", () => {
+      this.notRevoked.clear();
+    });
+
+    subscriber.on("error", (err) => {
+      console.error(" Redis blacklist subscriber error:", err.message);
+    });
+
+    subscriber.subscribe(this.CHANNEL).catch((error) => {
+      console.error("Error subscribing to blacklist channel:", error);
+    });
+  }
 }
 
 
 export const closeRedisConnection = async (): Promise<void> => {
   try {
+    await TokenBlacklistService.close();
     await redisClient.quit();
     console.log(" Redis connection closed");
   } catch (error) {
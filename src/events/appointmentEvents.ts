@@ -3,7 +3,13 @@ import {
   sendAppointmentConfirmation,
   sendAppointmentCancellation,
   sendDoctorChangeNotification,
+  sendAppointmentRescheduleNotification,
+  sendEmailNow,
 } from "../modules/notification/notification.service";
+import { JobQueueService, JobQueues } from "../services/jobQueue.service";
+import { NotificationJobs } from "../jobs/notificationQueue.job";
+
+const DIRECT_DELIVERY = { sendEmail: sendEmailNow };
 
 class AppointmentEventEmitter extends EventEmitter {
   constructor() {
@@ -12,40 +18,42 @@ class AppointmentEventEmitter extends EventEmitter {
   }
 
 
+  private async dispatch<T>(type: string, payload: T, fallback: () => Promise<void>) {
+    try {
+      await JobQueueService.enqueue(JobQueues.NOTIFICATIONS, type, payload);
+    } catch (error) {
+      console.error(`Failed to enqueue ${type}, sending in-process:`, error);
+      fallback().catch((fallbackError) =>
+        console.error(`Failed to send ${type} notification:`, fallbackError)
+      );
+    }
+  }
+
+
   private setupListeners() {
     
-    this.on("appointment:created", async (appointmentId: number) => {
+    this.on("appointment:created", (appointmentId: number) => {
       console.log(` Event: appointment:created - ID: ${appointmentId}`);
-      try {
-        await sendAppointmentConfirmation(appointmentId);
-      } catch (error) {
-        console.error(
-          `Failed to send appointment confirmation for ${appointmentId}:`,
-          error
-        );
-      }
+      return this.dispatch(NotificationJobs.APPOINTMENT_CREATED, { appointmentId }, () =>
+        sendAppointmentConfirmation(appointmentId, DIRECT_DELIVERY)
+      );
     });
 
     this.on(
       "appointment:cancelled",
-      async (data: { appointmentId: number; reason?: string }) => {
+      (data: { appointmentId: number; reason?: string }) => {
         console.log(
           ` Event: appointment:cancelled - ID: ${data.appointmentId}`
         );
-        try {
-          await sendAppointmentCancellation(data.appointmentId, data.reason);
-        } catch (error) {
-          console.error(
-            `Failed to send cancellation notification for ${data.appointmentId}:`,
-            error
-          );
-        }
+        return this.dispatch(NotificationJobs.APPOINTMENT_CANCELLED, data, () =>
+          sendAppointmentCancellation(data.appointmentId, data.reason, DIRECT_DELIVERY)
+        );
       }
     );
   
     this.on(
       "appointment:doctor_changed",
-      async (data: {
+      (data: {
         appointmentId: number;
         oldDoctorId: number;
         newDoctorId: number;
@@ -54,19 +62,34 @@ class AppointmentEventEmitter extends EventEmitter {
         console.log(
           ` Event: appointment:doctor_changed - ID: ${data.appointmentId}`
         );
-        try {
-          await sendDoctorChangeNotification(
+        return this.dispatch(NotificationJobs.DOCTOR_CHANGED, data, () =>
+          sendDoctorChangeNotification(
             data.appointmentId,
             data.oldDoctorId,
             data.newDoctorId,
-            data.reason
-          );
-        } catch (error) {
-          console.error(
-            `Failed to send doctor change notification for ${data.appointmentId}:`,
-            error
-          );
-        }
+            data.reason,
+            DIRECT_DELIVERY
+          )
+        );
+      }
+    );
+
+    this.on(
+      "appointment:rescheduled",
+      (data: {
+        appointmentId: number;
+        oldDetails: { doctorId: number; shiftId: number; date: Date | string };
+      }) => {
+        console.log(
+          ` Event: appointment:rescheduled - ID: ${data.appointmentId}`
+        );
+        return this.dispatch(NotificationJobs.APPOINTMENT_RESCHEDULED, data, () =>
+          sendAppointmentRescheduleNotification(
+            data.appointmentId,
+            { ...data.oldDetails, date: new Date(data.oldDetails.date) },
+            DIRECT_DELIVERY
+          )
+        );
       }
     );
   }
@@ -92,6 +115,13 @@ class AppointmentEventEmitter extends EventEmitter {
       reason,
     });
   }
+
+  emitAppointmentRescheduled(
+    appointmentId: number,
+    oldDetails: { doctorId: number; shiftId: number; date: Date | string }
+  ) {
+    this.emit("appointment:rescheduled", { appointmentId, oldDetails });
+  }
 }
 
 export const appointmentEvents = new AppointmentEventEmitter();
@@ -117,3 +147,9 @@ export function notifyDoctorChanged(
     reason
   );
 }
+export function notifyAppointmentRescheduled(
+  appointmentId: number,
+  oldDetails: { doctorId: number; shiftId: number; date: Date | string }
+) {
+  appointmentEvents.emitAppointmentRescheduled(appointmentId, oldDetails);
+}
@@ -0,0 +1,130 @@
+import { QueryTypes } from "sequelize";
+import sequelize from "../config/database";
+import { AuditLogWriter } from "../services/auditLogWriter.service";
+import { toDayKey } from "../services/reportRollup.service";
+
+const RETENTION_MONTHS = parseInt(process.env.AUDIT_RETENTION_MONTHS || "12", 10);
+const FUTURE_MONTHS = 3;
+const DELETE_BATCH_SIZE = 5000;
+const COLUMNS =
+  "id, userId, action, tableName, recordId, oldValue, newValue, ipAddress, userAgent, timestamp, createdAt, updatedAt";
+
+const partitionName = (month: Date) =>
+  `p${month.getFullYear()}${String(month.getMonth() + 1).padStart(2, "0")}`;
+
+const addMonths = (date: Date, months: number) =>
+  new Date(date.getFullYear(), date.getMonth() + months, 1);
+
+const archiveEnabled = () => process.env.AUDIT_ARCHIVE !== "false";
+
+async function listPartitions(): Promise<string[]> {
+  const rows = await sequelize.query<{ name: string }>(
+    `SELECT PARTITION_NAME AS name FROM information_schema.PARTITIONS
+     WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'audit_logs' AND PARTITION_NAME IS NOT NULL
+     ORDER BY PARTITION_ORDINAL_POSITION`,
+    { type: QueryTypes.SELECT }
+  );
+  return rows.map((row) => row.name);
+}
+
+async function addFuturePartitions(partitions: string[]): Promise<string[]> {
+  const added: string[] = [];
+  const existing = new Set(partitions);
+  const now = new Date();
+
+  for (let offset = 0; offset <= FUTURE_MONTHS; offset++) {
+    const month = addMonths(now, offset);
+    const name = partitionName(month);
+    if (existing.has(name)) {
+      continue;
+    }
+
+    await sequelize.query(
+      `ALTER TABLE audit_logs REORGANIZE PARTITION pmax INTO (
+        PARTITION ${name} VALUES LESS THAN (TO_DAYS('${toDayKey(addMonths(month, 1))}')),
+        PARTITION pmax VALUES LESS THAN MAXVALUE
+      )`
+    );
+    added.push(name);
+  }
+  return added;
+}
+
+async function expirePartitions(partitions: string[], cutoff: Date): Promise<string[]> {
+  const expired = partitions.filter((name) => {
+    const match = /^p(\d{4})(\d{2})$/.exec(name);
+    return match && addMonths(new Date(Number(match[1]), Number(match[2]) - 1, 1), 1) <= cutoff;
+  });
+
+  for (const name of expired) {
+    if (archiveEnabled()) {
+      await sequelize.query(
+        `INSERT IGNORE INTO audit_logs_archive (${COLUMNS}) SELECT ${COLUMNS} FROM audit_logs PARTITION (${name})`
+      );
+    }
+    await sequelize.query(`ALTER TABLE audit_logs DROP PARTITION ${name}`);
+  }
+  return expired;
+}
+
+async function expireRows(cutoff: Date): Promise<number> {
+  if (archiveEnabled()) {
+    await sequelize.query(
+      `INSERT IGNORE INTO audit_logs_archive (${COLUMNS}) SELECT ${COLUMNS} FROM audit_logs WHERE timestamp < :cutoff`,
+      { replacements: { cutoff } }
+    );
+  }
+
+  let deleted = 0;
+  for (;;) {
+    const [result] = (await sequelize.query(
+      `DELETE FROM audit_logs WHERE timestamp < :cutoff LIMIT ${DELETE_BATCH_SIZE}`,
+      { replacements: { cutoff } }
+    )) as [any, unknown];
+    const affected = result?.affectedRows ?? 0;
+    deleted += affected;
+    if (affected < DELETE_BATCH_SIZE) {
+      return deleted;
+    }
+  }
+}
+
+export async function runAuditLogRetentionJob(): Promise<{
+  success: boolean;
+  cutoff: string;
+  addedPartitions: string[];
+  expiredPartitions: string[];
+  deletedRows: number;
+  durationMs: number;
+  error?: string;
+}> {
+  const startedAt = Date.now();
+  const cutoff = addMonths(new Date(), -RETENTION_MONTHS);
+  const result = {
+    success: true,
+    cutoff: toDayKey(cutoff),
+    addedPartitions: [] as string[],
+    expiredPartitions: [] as string[],
+    deletedRows: 0,
+    durationMs: 0,
+  };
+
+  try {
+    await AuditLogWriter.flush();
+
+    const partitions = await listPartitions();
+    if (partitions.length > 0) {
+      result.addedPartitions = await addFuturePartitions(partitions);
+      result.expiredPartitions = await expirePartitions(partitions, cutoff);
+    } else {
+      result.deletedRows = await expireRows(cutoff);
+    }
+
+    result.durationMs = Date.now() - startedAt;
+    console.log(`[AuditRetention] Completed ${JSON.stringify(result)}`);
+    return result;
+  } catch (error: any) {
+    console.error("[AuditRetention] Job failed:", error);
+    return { ...result, success: false, durationMs: Date.now() - startedAt, error: error.message };
+  }
+}
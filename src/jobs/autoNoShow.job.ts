@@ -1,15 +1,21 @@
-import { Op } from "sequelize";
+import { Op, literal } from "sequelize";
 import Appointment from "../models/Appointment";
+import Patient from "../models/Patient";
 import Shift from "../models/Shift";
+import sequelize from "../config/database";
 import { BOOKING_CONFIG } from "../config/booking.config";
+import { toDayKey } from "../services/reportRollup.service";
+
+const NO_SHOW_THRESHOLD_MINUTES = 30;
+const UPDATE_CHUNK_SIZE = 1000;
 
 function calculateAppointmentTime(
-  date: Date,
+  date: string,
   shiftStartTime: string,
   slotNumber: number
 ): Date {
   const [hours, minutes] = shiftStartTime.split(":").map(Number);
-  const appointmentTime = new Date(date);
+  const appointmentTime = new Date(`${toDayKey(date)}T00:00:00`);
   appointmentTime.setHours(hours, minutes, 0, 0);
 
   const minutesToAdd = (slotNumber - 1) * BOOKING_CONFIG.SLOT_MINUTES;
@@ -18,103 +24,135 @@ function calculateAppointmentTime(
   return appointmentTime;
 }
 
+const chunk = <T>(values: T[], size: number): T[][] => {
+  const chunks: T[][] = [];
+  for (let i = 0; i < values.length; i += size) {
+    chunks.push(values.slice(i, i + size));
+  }
+  return chunks;
+};
+
 export async function runAutoNoShowJob(): Promise<{
   success: boolean;
   processedCount: number;
   markedAsNoShow: number;
+  patientsUpdated: number;
+  durationMs: number;
   errors: string[];
 }> {
+  const startedAt = Date.now();
   const errors: string[] = [];
   let processedCount = 0;
   let markedAsNoShow = 0;
+  let patientsUpdated = 0;
 
   try {
     console.log("[AutoNoShow] Starting auto no-show job...");
 
     const today = new Date();
-    today.setHours(0, 0, 0, 0);
-
     const yesterday = new Date(today);
     yesterday.setDate(yesterday.getDate() - 1);
 
-    const appointments = await Appointment.findAll({
-      where: {
-        status: "WAITING",
-        date: {
-          [Op.gte]: yesterday, 
-          [Op.lte]: today, 
-        },
-      },
-      include: [
-        {
-          model: Shift,
-          as: "shift",
-          attributes: ["id", "name", "startTime", "endTime"],
+    const [appointments, shifts] = await Promise.all([
+      Appointment.findAll({
+        attributes: ["id", "shiftId", "date", "slotNumber"],
+        where: {
+          status: "WAITING",
+          date: { [Op.between]: [toDayKey(yesterday), toDayKey(today)] },
         },
-      ],
-    });
+        raw: true,
+      }) as unknown as Promise<Array<{ id: number; shiftId: number; date: string; slotNumber: number }>>,
+      Shift.findAll({ attributes: ["id", "startTime"], raw: true }) as unknown as Promise<
+        Array<{ id: number; startTime: string }>
+      >,
+    ]);
+    processedCount = appointments.length;
+
+    const shiftStarts = new Map(shifts.map((shift) => [shift.id, shift.startTime]));
+    const now = Date.now();
+    const overdueIds: number[] = [];
 
-    console.log(`[AutoNoShow] Found ${appointments.length} WAITING appointments to check`);
+    for (const appointment of appointments) {
+      const startTime = shiftStarts.get(appointment.shiftId);
+      if (!startTime) {
+        errors.push(`Appointment ${appointment.id}: Shift not found`);
+        continue;
+      }
 
-    const now = new Date();
-    const NO_SHOW_THRESHOLD_MINUTES = 30; 
+      const deadline =
+        calculateAppointmentTime(appointment.date, startTime, appointment.slotNumber).getTime() +
+        NO_SHOW_THRESHOLD_MINUTES * 60 * 1000;
+      if (now > deadline) {
+        overdueIds.push(appointment.id);
+      }
+    }
 
-    for (const appointment of appointments) {
-      processedCount++;
+    if (overdueIds.length > 0) {
+      await sequelize.transaction(async (transaction) => {
+        const noShowCounts = new Map<number, number>();
+
+        for (const ids of chunk(overdueIds, UPDATE_CHUNK_SIZE)) {
+          const locked = (await Appointment.findAll({
+            attributes: ["id", "patientId"],
+            where: { id: { [Op.in]: ids }, status: "WAITING" },
+            lock: transaction.LOCK.UPDATE,
+            raw: true,
+            transaction,
+          })) as unknown as Array<{ id: number; patientId: number }>;
+          if (locked.length === 0) {
+            continue;
+          }
 
-      try {
-        const shift = (appointment as any).shift;
-        if (!shift) {
-          errors.push(`Appointment ${appointment.id}: Shift not found`);
-          continue;
-        }
+          const [updated] = await Appointment.update(
+            { status: "NO_SHOW" },
+            { where: { id: { [Op.in]: locked.map((row) => row.id) } }, transaction }
+          );
+          markedAsNoShow += updated;
 
-        const appointmentTime = calculateAppointmentTime(
-          new Date(appointment.date),
-          shift.startTime,
-          appointment.slotNumber
-        );
-
-        const noShowDeadline = new Date(
-          appointmentTime.getTime() + NO_SHOW_THRESHOLD_MINUTES * 60 * 1000
-        );
-
-        
-        if (now > noShowDeadline) {
-          await appointment.update({ status: "NO_SHOW" });
-
-          const Patient = (await import("../models/Patient")).default;
-          const patient = await Patient.findByPk(appointment.patientId);
-          if (patient) {
-            patient.noShowCount = (patient.noShowCount || 0) + 1;
-            patient.lastNoShowDate = new Date();
-            await patient.save();
+          for (const row of locked) {
+            noShowCounts.set(row.patientId, (noShowCounts.get(row.patientId) || 0) + 1);
           }
+        }
 
-          markedAsNoShow++;
+        const patientsByCount = new Map<number, number[]>();
+        for (const [patientId, count] of noShowCounts) {
+          patientsByCount.set(count, [...(patientsByCount.get(count) || []), patientId]);
+        }
 
-          console.log(
-            `[AutoNoShow] Marked appointment ${appointment.id} as NO_SHOW ` +
-            `(scheduled: ${appointmentTime.toISOString()}, ` +
-            `deadline: ${noShowDeadline.toISOString()}, ` +
-            `patient noShowCount: ${patient?.noShowCount || 0})`
-          );
+        const lastNoShowDate = new Date();
+        for (const [count, patientIds] of patientsByCount) {
+          for (const ids of chunk(patientIds, UPDATE_CHUNK_SIZE)) {
+            const [updated] = await Patient.update(
+              {
+                noShowCount: literal(`COALESCE(noShowCount, 0) + ${Number(count)}`) as any,
+                lastNoShowDate,
+              },
+              { where: { id: { [Op.in]: ids } }, transaction }
+            );
+            patientsUpdated += updated;
+          }
         }
-      } catch (err: any) {
-        errors.push(`Appointment ${appointment.id}: ${err.message}`);
-        console.error(`[AutoNoShow] Error processing appointment ${appointment.id}:`, err);
-      }
+      });
     }
 
+    const durationMs = Date.now() - startedAt;
     console.log(
-      `[AutoNoShow] Job completed. Processed: ${processedCount}, ` +
-      `Marked as NO_SHOW: ${markedAsNoShow}, Errors: ${errors.length}`
+      `[AutoNoShow] Job completed. ${JSON.stringify({
+        scanned: processedCount,
+        overdue: overdueIds.length,
+        markedAsNoShow,
+        patientsUpdated,
+        errors: errors.length,
+        durationMs,
+      })}`
     );
 
     return {
       success: true,
       processedCount,
       markedAsNoShow,
+      patientsUpdated,
+      durationMs,
       errors,
     };
   } catch (error: any) {
@@ -122,8 +160,10 @@ export async function runAutoNoShowJob(): Promise<{
     return {
       success: false,
       processedCount,
-      markedAsNoShow,
-      errors: [error.message],
+      markedAsNoShow: 0,
+      patientsUpdated: 0,
+      durationMs: Date.now() - startedAt,
+      errors: [...errors, error.message],
     };
   }
 }
@@ -0,0 +1,106 @@
+import { Op } from "sequelize";
+import Notification from "../models/Notification";
+import { emailService, EmailJobPayload, EMAIL_JOB } from "../services/email.service";
+import { Job, JobQueueService, JobQueues } from "../services/jobQueue.service";
+import { contentOf, renderDigest } from "../templates/emailTemplates";
+import {
+  sendAppointmentConfirmation,
+  sendAppointmentCancellation,
+  sendDoctorChangeNotification,
+  sendAppointmentRescheduleNotification,
+} from "../modules/notification/notification.service";
+
+export const NotificationJobs = {
+  APPOINTMENT_CREATED: "appointment:created",
+  APPOINTMENT_CANCELLED: "appointment:cancelled",
+  DOCTOR_CHANGED: "appointment:doctor_changed",
+  APPOINTMENT_RESCHEDULED: "appointment:rescheduled",
+} as const;
+
+const recipientKey = (to: string | string[]) =>
+  (Array.isArray(to) ? [...to].sort().join(",") : to).trim().toLowerCase();
+
+
+export function mergeEmails(payloads: EmailJobPayload[]): EmailJobPayload {
+  if (payloads.length === 1) {
+    return payloads[0];
+  }
+
+  const digest = renderDigest(payloads.map((payload) => payload.content || contentOf(payload.html)));
+  return {
+    to: payloads[0].to,
+    subject: `Bạn có ${payloads.length} thông báo mới - Hệ thống Phòng khám`,
+    html: digest.html,
+    text: digest.text,
+    notificationIds: payloads.flatMap((payload) => payload.notificationIds || []),
+  };
+}
+
+export async function sendEmailBatch(jobs: Job<EmailJobPayload>[]): Promise<Map<string, Error>> {
+  const failures = new Map<string, Error>();
+  const byRecipient = new Map<string, Job<EmailJobPayload>[]>();
+  for (const job of jobs) {
+    const key = recipientKey(job.payload.to);
+    byRecipient.set(key, [...(byRecipient.get(key) || []), job]);
+  }
+
+  const deliveredNotificationIds: number[] = [];
+  await Promise.all(
+    [...byRecipient.values()].map(async (group) => {
+      const email = mergeEmails(group.map((job) => job.payload));
+      try {
+        if (await emailService.deliver(email)) {
+          deliveredNotificationIds.push(...(email.notificationIds || []));
+        }
+      } catch (error: any) {
+        group.forEach((job) => failures.set(job.id, error));
+      }
+    })
+  );
+
+  if (deliveredNotificationIds.length > 0) {
+    await Notification.update(
+      { emailSent: true, emailSentAt: new Date() },
+      { where: { id: { [Op.in]: deliveredNotificationIds } } }
+    );
+  }
+
+  console.log(
+    `[EmailQueue] ${jobs.length} emails -> ${byRecipient.size} recipients, ${failures.size} failed`
+  );
+  return failures;
+}
+
+export function registerNotificationJobHandlers(): void {
+  JobQueueService.registerHandler<{ appointmentId: number }>(
+    NotificationJobs.APPOINTMENT_CREATED,
+    ({ appointmentId }, job) =>
+      sendAppointmentConfirmation(appointmentId, { since: new Date(job.createdAt) })
+  );
+  JobQueueService.registerHandler<{ appointmentId: number; reason?: string }>(
+    NotificationJobs.APPOINTMENT_CANCELLED,
+    ({ appointmentId, reason }, job) =>
+      sendAppointmentCancellation(appointmentId, reason, { since: new Date(job.createdAt) })
+  );
+  JobQueueService.registerHandler<{
+    appointmentId: number;
+    oldDoctorId: number;
+    newDoctorId: number;
+    reason?: string;
+  }>(NotificationJobs.DOCTOR_CHANGED, ({ appointmentId, oldDoctorId, newDoctorId, reason }, job) =>
+    sendDoctorChangeNotification(appointmentId, oldDoctorId, newDoctorId, reason, {
+      since: new Date(job.createdAt),
+    })
+  );
+  JobQueueService.registerHandler<{
+    appointmentId: number;
+    oldDetails: { doctorId: number; shiftId: number; date: string };
+  }>(NotificationJobs.APPOINTMENT_RESCHEDULED, ({ appointmentId, oldDetails }, job) =>
+    sendAppointmentRescheduleNotification(
+      appointmentId,
+      { ...oldDetails, date: new Date(oldDetails.date) },
+      { since: new Date(job.createdAt) }
+    )
+  );
+  JobQueueService.registerBatchHandler<EmailJobPayload>(EMAIL_JOB, sendEmailBatch);
+}
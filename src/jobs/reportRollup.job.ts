@@ -0,0 +1,42 @@
+import { ReportRollupService, toDbDayKey } from "../services/reportRollup.service";
+
+const RECONCILE_DAYS = 40;
+
+export async function runReportRollupReconcileJob(days: number = RECONCILE_DAYS): Promise<{
+  success: boolean;
+  startDay: string;
+  endDay: string;
+  durationMs: number;
+  error?: string;
+}> {
+  const startedAt = Date.now();
+
+  const end = new Date();
+  end.setDate(end.getDate() + RECONCILE_DAYS);
+  const start = new Date();
+  start.setDate(start.getDate() - days);
+
+  const startDay = toDbDayKey(start);
+  const endDay = toDbDayKey(end);
+
+  try {
+    console.log(`[ReportRollup] Reconciling rollups ${startDay}..${endDay}`);
+
+    await ReportRollupService.flush();
+    await ReportRollupService.refreshRange(startDay, endDay);
+
+    const durationMs = Date.now() - startedAt;
+    console.log(`[ReportRollup] Reconciliation completed in ${durationMs}ms`);
+
+    return { success: true, startDay, endDay, durationMs };
+  } catch (error: any) {
+    console.error("[ReportRollup] Reconciliation failed:", error);
+    return {
+      success: false,
+      startDay,
+      endDay,
+      durationMs: Date.now() - startedAt,
+      error: error.message,
+    };
+  }
+}
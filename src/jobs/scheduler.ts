@@ -1,6 +1,9 @@
 import cron from "node-cron";
 import { runAutoNoShowJob } from "./autoNoShow.job";
 import { startAttendanceJobs } from "./attendance.job";
+import { runReportRollupReconcileJob } from "./reportRollup.job";
+import { runSlotAvailabilityReconcileJob } from "./slotAvailability.job";
+import { runAuditLogRetentionJob } from "./auditLogRetention.job";
 
 export function initializeScheduler() {
   console.log("[Scheduler] Initializing job scheduler...");
@@ -16,6 +19,27 @@ export function initializeScheduler() {
   console.log(`[Scheduler] Auto no-show job scheduled: ${autoNoShowSchedule} (every 30 minutes)`);
   startAttendanceJobs();
 
+  const reportRollupSchedule = "30 1 * * *";
+  cron.schedule(reportRollupSchedule, async () => {
+    console.log(`[Scheduler] Triggered report rollup reconciliation at ${new Date().toISOString()}`);
+    await runReportRollupReconcileJob();
+  });
+  console.log(`[Scheduler] Report rollup reconciliation scheduled: ${reportRollupSchedule} (daily at 01:30)`);
+
+  const slotAvailabilitySchedule = "15 0 * * *";
+  cron.schedule(slotAvailabilitySchedule, async () => {
+    console.log(`[Scheduler] Triggered slot availability reconciliation at ${new Date().toISOString()}`);
+    await runSlotAvailabilityReconcileJob();
+  });
+  console.log(`[Scheduler] Slot availability reconciliation scheduled: ${slotAvailabilitySchedule} (daily at 00:15)`);
+
+  const auditRetentionSchedule = "45 2 * * *";
+  cron.schedule(auditRetentionSchedule, async () => {
+    console.log(`[Scheduler] Triggered audit log retention at ${new Date().toISOString()}`);
+    await runAuditLogRetentionJob();
+  });
+  console.log(`[Scheduler] Audit log retention scheduled: ${auditRetentionSchedule} (daily at 02:45)`);
+
   console.log("[Scheduler] All jobs initialized successfully");
 }
 
@@ -0,0 +1,29 @@
+import { SlotAvailabilityService } from "../services/slotAvailability.service";
+
+export async function runSlotAvailabilityReconcileJob(): Promise<{
+  success: boolean;
+  days: number;
+  durationMs: number;
+  error?: string;
+}> {
+  const startedAt = Date.now();
+
+  try {
+    console.log("[SlotAvailability] Rebuilding availability index for upcoming shifts");
+
+    const days = await SlotAvailabilityService.rebuildUpcoming();
+
+    const durationMs = Date.now() - startedAt;
+    console.log(`[SlotAvailability] Rebuilt ${days} days in ${durationMs}ms`);
+
+    return { success: true, days, durationMs };
+  } catch (error: any) {
+    console.error("[SlotAvailability] Reconciliation failed:", error);
+    return {
+      success: false,
+      days: 0,
+      durationMs: Date.now() - startedAt,
+      error: error.message,
+    };
+  }
+}
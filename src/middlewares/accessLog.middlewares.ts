@@ -0,0 +1,63 @@
+import { Request, Response, NextFunction, RequestHandler } from "express";
+import morgan from "morgan";
+import { AccessLogWriter } from "../services/accessLogWriter.service";
+import { getRequestContext } from "./requestContext.middlewares";
+
+export type AccessLogFormat = "dev" | "json" | "off";
+
+const sampleRateEnv = Number(process.env.ACCESS_LOG_SAMPLE_RATE);
+const SAMPLE_RATE = Number.isFinite(sampleRateEnv) ? Math.min(Math.max(sampleRateEnv, 0), 1) : 1;
+const SLOW_MS = parseInt(process.env.ACCESS_LOG_SLOW_MS || "1000", 10);
+
+export const resolveAccessLogFormat = (env: NodeJS.ProcessEnv = process.env): AccessLogFormat => {
+  const configured = env.ACCESS_LOG_FORMAT;
+  if (configured === "dev" || configured === "json" || configured === "off") {
+    return configured;
+  }
+  return env.NODE_ENV === "production" ? "json" : "dev";
+};
+
+
+export const shouldLogRequest = (
+  status: number,
+  durationMs: number,
+  sampleRate: number = SAMPLE_RATE,
+  random: () => number = Math.random
+): boolean => status >= 400 || durationMs >= SLOW_MS || random() < sampleRate;
+
+export const jsonAccessLog = (req: Request, res: Response, next: NextFunction) => {
+  const context = getRequestContext(req);
+
+  res.on("finish", () => {
+    const durationMs = Date.now() - context.startedAt;
+    if (!shouldLogRequest(res.statusCode, durationMs)) {
+      return;
+    }
+
+    AccessLogWriter.write({
+      time: new Date(context.startedAt).toISOString(),
+      requestId: context.requestId,
+      method: req.method,
+      url: req.originalUrl,
+      status: res.statusCode,
+      durationMs,
+      contentLength: Number(res.getHeader("content-length")) || undefined,
+      userId: req.user?.userId,
+      roleId: req.user?.roleId,
+      ip: req.ip,
+      sampleRate: SAMPLE_RATE,
+    });
+  });
+
+  next();
+};
+
+export const accessLog = (format: AccessLogFormat = resolveAccessLogFormat()): RequestHandler => {
+  if (format === "dev") {
+    return morgan("dev");
+  }
+  if (format === "json") {
+    return jsonAccessLog;
+  }
+  return (req, res, next) => next();
+};
@@ -1,23 +1,51 @@
 import { Request, Response, NextFunction } from "express";
-import jwt from "jsonwebtoken";
 import { JwtUserPayload } from "../types/auth";
-import Patient from "../models/Patient";
-import Doctor from "../models/Doctor";
 import { RoleCode } from "../constant/role";
 import { TokenBlacklistService } from "../config/redis.config";
+import { resolveIdentityClaims } from "../utils/jwt";
+import { LRUCache } from "../utils/lruCache";
+import { getRequestContext, getTokenClaims } from "./requestContext.middlewares";
+
+
+const identityCache = new LRUCache<string, number>(10000);
+
+const resolveProfileId = async (
+  decoded: JwtUserPayload,
+  claim: "patientId" | "doctorId"
+): Promise<number | null> => {
+  if (typeof decoded[claim] === "number") {
+    return decoded[claim] as number;
+  }
+
+  const cacheKey = `${claim}:${decoded.userId}`;
+  const cached = identityCache.get(cacheKey);
+  if (cached !== undefined) {
+    return cached;
+  }
+
+  const id = (await resolveIdentityClaims(decoded.userId, decoded.roleId))[claim];
+  if (id !== null) {
+    identityCache.set(cacheKey, id);
+  }
+  return id;
+};
 
 export const verifyToken = async (
   req: Request,
   res: Response,
   next: NextFunction
 ) => {
-  const authHeader = req.headers.authorization;
+  const { token } = getRequestContext(req);
 
-  if (!authHeader?.startsWith("Bearer ")) {
+  if (!token) {
     return res.status(401).json({ success: false, message: "NO_TOKEN" });
   }
-  const token = authHeader.split(" ")[1];
   try {
+    const decoded = getTokenClaims(req);
+    if (!decoded) {
+      return res.status(401).json({ success: false, message: "INVALID_TOKEN" });
+    }
+
     const isBlacklisted = await TokenBlacklistService.isBlacklisted(token);
     if (isBlacklisted) {
       return res.status(401).json({
@@ -25,27 +53,15 @@ export const verifyToken = async (
         message: "TOKEN_REVOKED",
       });
     }
-    const decoded = jwt.verify(
-      token,
-      process.env.JWT_SECRET as string
-    ) as JwtUserPayload;
     req.user = decoded;
     (req as any).token = token;
 
     if (decoded.roleId === RoleCode.PATIENT) {
-      const patient = await Patient.findOne({
-        where: { userId: decoded.userId },
-        attributes: ["id"],
-      });
-      (req.user as any).patientId = patient?.id ?? null;
+      (req.user as any).patientId = await resolveProfileId(decoded, "patientId");
     }
 
     if (decoded.roleId === RoleCode.DOCTOR) {
-      const doctor = await Doctor.findOne({
-        where: { userId: decoded.userId },
-        attributes: ["id"],
-      });
-      (req.user as any).doctorId = doctor?.id ?? null;
+      (req.user as any).doctorId = await resolveProfileId(decoded, "doctorId");
     }
     
     next();
@@ -1,61 +1,194 @@
+import crypto from "crypto";
 import { Request, Response, NextFunction } from "express";
+import { CacheService, CacheTags } from "../services/cache.service";
+import { LRUCache } from "../utils/lruCache";
 
 interface CacheEntry {
-  data: any;
-  timestamp: number;
-  expiresAt: number;
+  body: any;
+  etag: string;
+  freshUntil: number;
+  staleUntil: number;
+  tags: string[];
 }
 
-const cache = new Map<string, CacheEntry>();
-const DEFAULT_TTL = 5 * 60 * 1000; 
+interface CacheOptions {
+  ttl?: number;
+  staleTtl?: number;
+  tags?: string[] | ((req: Request) => string[]);
+  shared?: boolean;
+  condition?: (req: Request) => boolean;
+  load?: (req: Request) => Promise<any>;
+}
 
-setInterval(() => {
-  const now = Date.now();
-  for (const [key, entry] of cache.entries()) {
-    if (entry.expiresAt < now) {
-      cache.delete(key);
+const DEFAULT_TTL = 5 * 60 * 1000;
+const DEFAULT_STALE_TTL = 60 * 1000;
+
+const localCache = new LRUCache<string, CacheEntry>(
+  Number(process.env.HTTP_CACHE_MAX_ENTRIES) || 1000
+);
+const revalidating = new Set<string>();
+let listening = false;
+
+
+const canonicalize = (value: any): string => {
+  if (Array.isArray(value)) {
+    return `[${value.map(canonicalize).join(",")}]`;
+  }
+  if (value && typeof value === "object") {
+    return `{${Object.keys(value)
+      .sort()
+      .map((key) => `${JSON.stringify(key)}:${canonicalize(value[key])}`)
+      .join(",")}}`;
+  }
+  return JSON.stringify(value ?? null);
+};
+
+const generateCacheKey = (req: Request, shared: boolean): string => {
+  const scope = shared ? "shared" : `user:${req.user?.userId || "anonymous"}`;
+  const raw = `${scope}:${req.baseUrl}${req.path}:${canonicalize(req.query)}`;
+  return `http:${crypto.createHash("sha1").update(raw).digest("hex")}`;
+};
+
+const generateEtag = (body: any): string =>
+  `W/"${crypto.createHash("sha1").update(JSON.stringify(body)).digest("base64url")}"`;
+
+const dropLocalEntries = (tags: string[]) => {
+  const dropped = new Set(tags);
+  for (const key of [...localCache.keys()]) {
+    const entry = localCache.peek(key);
+    if (!entry || entry.tags.some((tag) => dropped.has(tag))) {
+      localCache.delete(key);
     }
   }
-}, 60 * 1000); 
+};
+
+const listenForInvalidations = () => {
+  if (listening) {
+    return;
+  }
+  listening = true;
+  CacheService.onInvalidate(dropLocalEntries);
+};
 
-const generateCacheKey = (req: Request): string => {
-  const path = req.path;
-  const query = JSON.stringify(req.query);
-  const user = req.user?.userId || "anonymous";
-  return `${user}:${path}:${query}`;
+const remember = (key: string, entry: CacheEntry) => {
+  const ttl = entry.staleUntil - Date.now();
+  if (ttl > 0) {
+    localCache.set(key, entry, ttl);
+  }
 };
 
-export const cacheMiddleware = (
-  ttl: number = DEFAULT_TTL,
-  condition?: (req: Request) => boolean
+const lookup = async (key: string): Promise<CacheEntry | null> => {
+  const local = localCache.get(key);
+  if (local) {
+    CacheService.recordStat(key, "hits");
+    return local;
+  }
+  const shared = await CacheService.get<CacheEntry>(key);
+  if (shared && shared.staleUntil > Date.now()) {
+    remember(key, shared);
+    return shared;
+  }
+  return null;
+};
+
+const store = (
+  key: string,
+  body: any,
+  ttl: number,
+  staleTtl: number,
+  tags: string[]
+): CacheEntry => {
+  const now = Date.now();
+  const entry: CacheEntry = {
+    body,
+    etag: generateEtag(body),
+    freshUntil: now + ttl,
+    staleUntil: now + ttl + staleTtl,
+    tags,
+  };
+  remember(key, entry);
+  void CacheService.setTagged(key, entry, Math.ceil((ttl + staleTtl) / 1000), tags);
+  return entry;
+};
+
+const refresh = (
+  key: string,
+  loader: () => Promise<any>,
+  ttl: number,
+  staleTtl: number,
+  tags: string[]
 ) => {
-  return (req: Request, res: Response, next: NextFunction) => {
-    
+  revalidating.add(key);
+  loader()
+    .then((body) => {
+      store(key, body, ttl, staleTtl, tags);
+    })
+    .catch((error) => console.error(`Failed to refresh cached response ${key}:`, error))
+    .finally(() => revalidating.delete(key));
+};
+
+const sendEntry = (req: Request, res: Response, entry: CacheEntry, state: string) => {
+  res.setHeader("ETag", entry.etag);
+  res.setHeader("Cache-Control", "private, no-cache");
+  res.setHeader("X-Cache", state);
+
+  const ifNoneMatch = req.headers["if-none-match"];
+  if (ifNoneMatch && ifNoneMatch.split(",").some((tag) => tag.trim() === entry.etag)) {
+    return res.status(304).end();
+  }
+  return res.json(entry.body);
+};
+
+export const cacheMiddleware = (options: CacheOptions = {}) => {
+  const {
+    ttl = DEFAULT_TTL,
+    staleTtl = DEFAULT_STALE_TTL,
+    shared = false,
+    condition,
+    load,
+  } = options;
+
+  return async (req: Request, res: Response, next: NextFunction) => {
+
     if (req.method !== "GET") {
       return next();
     }
- 
+
     if (condition && !condition(req)) {
       return next();
     }
 
-    const cacheKey = generateCacheKey(req);
-    const cached = cache.get(cacheKey);
+    listenForInvalidations();
+
+    const tags = [
+      CacheTags.HTTP,
+      ...(typeof options.tags === "function" ? options.tags(req) : options.tags || []),
+      ...(shared ? [] : [CacheTags.USER(req.user?.userId || "anonymous")]),
+    ];
+    const cacheKey = generateCacheKey(req, shared);
+    const cached = await lookup(cacheKey);
+    const now = Date.now();
+
+    if (cached && cached.freshUntil > now) {
+      return sendEntry(req, res, cached, "HIT");
+    }
 
-    if (cached && cached.expiresAt > Date.now()) {
-      return res.json(cached.data);
+    if (cached && load) {
+      if (!revalidating.has(cacheKey)) {
+        refresh(cacheKey, () => load(req), ttl, staleTtl, tags);
+      }
+      return sendEntry(req, res, cached, "STALE");
     }
- 
+
     const originalJson = res.json.bind(res);
     res.json = function (body: any) {
-      
+
       if (res.statusCode >= 200 && res.statusCode < 300) {
-        cache.set(cacheKey, {
-          data: body,
-          timestamp: Date.now(),
-          expiresAt: Date.now() + ttl,
-        });
+        const entry = store(cacheKey, body, ttl, staleTtl, tags);
+        res.setHeader("ETag", entry.etag);
+        res.setHeader("Cache-Control", "private, no-cache");
       }
+      res.setHeader("X-Cache", "MISS");
       return originalJson(body);
     };
 
@@ -63,20 +196,12 @@ export const cacheMiddleware = (
   };
 };
 
-export const clearCache = (pattern?: string) => {
-  if (!pattern) {
-    cache.clear();
-    return;
-  }
-  for (const key of cache.keys()) {
-    if (key.includes(pattern)) {
-      cache.delete(key);
-    }
-  }
+export const clearCache = () => {
+  localCache.clear();
+  return CacheService.invalidateTags([CacheTags.HTTP]);
 };
 
 export const clearUserCache = (userId: number) => {
-  const pattern = `${userId}:`;
-  clearCache(pattern);
+  return CacheService.invalidateTags([CacheTags.USER(userId)]);
 };
 export default cacheMiddleware;
@@ -1,8 +1,8 @@
 import { Request, Response, NextFunction } from "express";
-import jwt from "jsonwebtoken";
 import SystemSettings from "../models/SystemSettings";
 import { RoleCode } from "../constant/role";
 import logger from "../utils/logger";
+import { getTokenClaims } from "./requestContext.middlewares";
 
 let maintenanceMode: boolean | null = null;
 let lastCheck: number = 0;
@@ -29,27 +29,15 @@ export const clearMaintenanceCache = () => {
 };
 
 const getRoleIdFromToken = (req: Request): number | null => {
-  try {
-    const authHeader = req.headers.authorization;
-    if (!authHeader?.startsWith("Bearer ")) {
-      return null;
-    }
-    const token = authHeader.split(" ")[1];
-    const decoded = jwt.verify(
-      token,
-      process.env.JWT_SECRET as string
-    ) as { roleId?: number | string };
-    if (decoded.roleId !== undefined && decoded.roleId !== null) {
-      const num =
-        typeof decoded.roleId === "string"
-          ? parseInt(decoded.roleId, 10)
-          : decoded.roleId;
-      return !isNaN(num) ? num : null;
-    }
-    return null;
-  } catch {
-    return null;
+  const decoded = getTokenClaims(req) as { roleId?: number | string } | null;
+  if (decoded && decoded.roleId !== undefined && decoded.roleId !== null) {
+    const num =
+      typeof decoded.roleId === "string"
+        ? parseInt(decoded.roleId, 10)
+        : decoded.roleId;
+    return !isNaN(num) ? num : null;
   }
+  return null;
 };
 export const checkMaintenance = async (
   req: Request,
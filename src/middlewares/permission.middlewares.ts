@@ -1,6 +1,5 @@
 import { Request, Response, NextFunction } from "express";
-import Role from "../models/Role";
-import Permission from "../models/Permission";
+import { PermissionCacheService } from "../services/permissionCache.service";
    
 export const requirePermission = (permissionName: string) => {
   return async (req: Request, res: Response, next: NextFunction) => {
@@ -12,25 +11,14 @@ export const requirePermission = (permissionName: string) => {
           message: "Authentication required",
         });
       }    
-      const role = await Role.findByPk(user.roleId, {
-        include: [
-          {
-            model: Permission,
-            as: "permissions",
-            where: { name: permissionName },
-            required: false,
-          },
-        ],
-      });
-      if (!role) {
+      const rolePermissions = await PermissionCacheService.getRolePermissions(user.roleId);
+      if (!rolePermissions) {
         return res.status(403).json({
           success: false,
           message: "Role not found",
         });
-      }   
-      const hasPermission = (role as any).permissions?.some(
-        (p: Permission) => p.name === permissionName
-      );
+      }
+      const hasPermission = rolePermissions.has(permissionName);
 
       if (!hasPermission) {
         return res.status(403).json({
@@ -59,22 +47,15 @@ export const requireAnyPermission = (permissions: string[]) => {
           message: "Authentication required",
         });
       }
-      const role = await Role.findByPk(user.roleId, {
-        include: [
-          {
-            model: Permission,
-            as: "permissions",
-          },
-        ],
-      });
-      if (!role) {
+      const rolePermissions = await PermissionCacheService.getRolePermissions(user.roleId);
+      if (!rolePermissions) {
         return res.status(403).json({
           success: false,
           message: "Role not found",
         });
-      }  
-      const hasAnyPermission = (role as any).permissions?.some((p: Permission) =>
-        permissions.includes(p.name)
+      }
+      const hasAnyPermission = permissions.some((permission) =>
+        rolePermissions.has(permission)
       );
 
       if (!hasAnyPermission) {
@@ -106,32 +87,23 @@ export const requireAllPermissions = (permissions: string[]) => {
         });
       }
 
-      const role = await Role.findByPk(user.roleId, {
-        include: [
-          {
-            model: Permission,
-            as: "permissions",
-          },
-        ],
-      });
+      const rolePermissions = await PermissionCacheService.getRolePermissions(user.roleId);
 
-      if (!role) {
+      if (!rolePermissions) {
         return res.status(403).json({
           success: false,
           message: "Role not found",
         });
       }
 
-      const userPermissions = (role as any).permissions?.map((p: Permission) => p.name) || [];
-
       
       const hasAllPermissions = permissions.every((permission) =>
-        userPermissions.includes(permission)
+        rolePermissions.has(permission)
       );
 
       if (!hasAllPermissions) {
         const missingPermissions = permissions.filter(
-          (p) => !userPermissions.includes(p)
+          (p) => !rolePermissions.has(p)
         );
         return res.status(403).json({
           success: false,
@@ -151,18 +123,6 @@ export const requireAllPermissions = (permissions: string[]) => {
 
 
 export const getUserPermissions = async (roleId: number): Promise<string[]> => {
-  const role = await Role.findByPk(roleId, {
-    include: [
-      {
-        model: Permission,
-        as: "permissions",
-      },
-    ],
-  });
-
-  if (!role) {
-    return [];
-  }
-
-  return (role as any).permissions?.map((p: Permission) => p.name) || [];
-};
\ No newline at end of file
+  const rolePermissions = await PermissionCacheService.getRolePermissions(roleId);
+  return rolePermissions ? Array.from(rolePermissions) : [];
+};
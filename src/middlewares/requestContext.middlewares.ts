@@ -0,0 +1,45 @@
+import { Request, Response, NextFunction } from "express";
+import { randomUUID } from "crypto";
+import jwt from "jsonwebtoken";
+import { JwtUserPayload, RequestContext } from "../types/auth";
+
+const REQUEST_ID_PATTERN = /^[\w.:-]{1,128}$/;
+
+const createContext = (req: Request): RequestContext => {
+  const header = req.headers["x-request-id"];
+  const authHeader = req.headers.authorization;
+
+  return {
+    requestId: typeof header === "string" && REQUEST_ID_PATTERN.test(header) ? header : randomUUID(),
+    startedAt: Date.now(),
+    token: authHeader?.startsWith("Bearer ") ? authHeader.split(" ")[1] || null : null,
+  };
+};
+
+export const getRequestContext = (req: Request): RequestContext => {
+  if (!req.context) {
+    req.context = createContext(req);
+  }
+  return req.context;
+};
+
+
+export const getTokenClaims = (req: Request): JwtUserPayload | null => {
+  const context = getRequestContext(req);
+
+  if (context.claims === undefined) {
+    try {
+      context.claims = context.token
+        ? (jwt.verify(context.token, process.env.JWT_SECRET as string) as JwtUserPayload)
+        : null;
+    } catch {
+      context.claims = null;
+    }
+  }
+  return context.claims;
+};
+
+export const requestContext = (req: Request, res: Response, next: NextFunction) => {
+  res.setHeader("X-Request-Id", getRequestContext(req).requestId);
+  next();
+};
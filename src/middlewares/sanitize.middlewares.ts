@@ -1,34 +1,48 @@
 import { Request, Response, NextFunction } from "express";
-import DOMPurify from "isomorphic-dompurify";
+import { stripHtml } from "../utils/stripHtml";
 
-const sanitizeString = (value: any): string => {
+export type SanitizeMode = "fast" | "dompurify";
+
+const SANITIZE_MODE: SanitizeMode = process.env.SANITIZE_MODE === "dompurify" ? "dompurify" : "fast";
+
+let purifier: any = null;
+
+const purify = (value: string): string => {
+  if (!purifier) {
+    const module = require("isomorphic-dompurify");
+    purifier = module.default || module;
+  }
+  return purifier.sanitize(value, {
+    ALLOWED_TAGS: [],
+    ALLOWED_ATTR: [],
+  });
+};
+
+export const sanitizeString = (value: any, mode: SanitizeMode = SANITIZE_MODE): string => {
   if (typeof value !== "string") {
     return value;
   }
-  return DOMPurify.sanitize(value, {
-    ALLOWED_TAGS: [], 
-    ALLOWED_ATTR: [], 
-  });
+  return mode === "fast" ? stripHtml(value) : purify(value);
 };
 
-const sanitizeObject = (obj: any): any => {
+export const sanitizeObject = (obj: any, mode: SanitizeMode = SANITIZE_MODE): any => {
   if (obj === null || obj === undefined) {
     return obj;
   }
 
   if (typeof obj === "string") {
-    return sanitizeString(obj);
+    return sanitizeString(obj, mode);
   }
 
   if (Array.isArray(obj)) {
-    return obj.map((item) => sanitizeObject(item));
+    return obj.map((item) => sanitizeObject(item, mode));
   }
 
   if (typeof obj === "object") {
     const sanitized: any = {};
     for (const key in obj) {
       if (Object.prototype.hasOwnProperty.call(obj, key)) {
-        sanitized[key] = sanitizeObject(obj[key]);
+        sanitized[key] = sanitizeObject(obj[key], mode);
       }
     }
     return sanitized;
@@ -53,6 +67,44 @@ export const sanitizeInput = (
 };
 
 
+const sanitizePath = (target: any, path: string[], mode: SanitizeMode): void => {
+  if (target === null || typeof target !== "object") {
+    return;
+  }
+
+  const [key, ...rest] = path;
+  const keys = key === "*" ? Object.keys(target) : [key];
+  for (const current of keys) {
+    if (!Object.prototype.hasOwnProperty.call(target, current)) {
+      continue;
+    }
+    if (rest.length === 0) {
+      target[current] = sanitizeObject(target[current], mode);
+    } else {
+      sanitizePath(target[current], rest, mode);
+    }
+  }
+};
+
+export const sanitizeBodyFields = (
+  body: any,
+  fields: string[],
+  mode: SanitizeMode = SANITIZE_MODE
+): any => {
+  fields.forEach((field) => sanitizePath(body, field.split("."), mode));
+  return body;
+};
+
+export const sanitizeFields = (...fields: string[]) => {
+  return (req: Request, res: Response, next: NextFunction) => {
+    if (req.body && typeof req.body === "object") {
+      sanitizeBodyFields(req.body, fields);
+    }
+    next();
+  };
+};
+
+
 export const sanitizeField = (field: string, value: any): any => {
   if (typeof value === "string") {
     return sanitizeString(value);
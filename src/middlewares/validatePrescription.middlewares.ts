@@ -35,7 +35,7 @@ export const validateCreatePrescription = (
       });
     }
 
-    if (!medicine.quantity || medicine.quantity <= 0) {
+    if (!Number.isSafeInteger(Number(medicine.quantity)) || Number(medicine.quantity) <= 0) {
       return res.status(400).json({
         success: false,
         message: `Valid quantity is required for medicine at index ${i}`,
@@ -89,7 +89,7 @@ export const validateUpdatePrescription = (
         });
       }
 
-      if (!medicine.quantity || medicine.quantity <= 0) {
+      if (!Number.isSafeInteger(Number(medicine.quantity)) || Number(medicine.quantity) <= 0) {
         return res.status(400).json({
           success: false,
           message: `Valid quantity is required for medicine at index ${i}`,
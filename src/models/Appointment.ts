@@ -28,6 +28,7 @@ export default class Appointment extends Model {
     | "COMPLETED"
     | "CANCELLED"
     | "NO_SHOW";
+  declare readonly activeSlotNumber?: number | null;
 }
 
 Appointment.init(
@@ -70,6 +71,9 @@ Appointment.init(
       ),
       defaultValue: "WAITING",
     },
+    activeSlotNumber: {
+      type: "INT GENERATED ALWAYS AS (IF(status = 'CANCELLED', NULL, slotNumber)) STORED",
+    },
   },
   {
     sequelize,
@@ -78,8 +82,8 @@ Appointment.init(
     indexes: [
       {
         unique: true,
-        fields: ["doctorId", "shiftId", "date", "slotNumber"],
-        name: "appointments_slot_unique",
+        fields: ["doctorId", "shiftId", "date", "activeSlotNumber"],
+        name: "appointments_active_slot_unique",
       },
     ],
   }
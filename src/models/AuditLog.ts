@@ -26,7 +26,7 @@ interface AuditLogAttributes {
   updatedAt?: Date;
 }
 
-interface AuditLogCreationAttributes
+export interface AuditLogCreationAttributes
   extends Optional<
     AuditLogAttributes,
     | "id"
@@ -67,10 +67,6 @@ AuditLog.init(
     userId: {
       type: DataTypes.INTEGER.UNSIGNED,
       allowNull: true,
-      references: {
-        model: "users",
-        key: "id",
-      },
       comment: "User who performed the action (NULL for system actions)",
     },
     action: {
@@ -110,7 +106,9 @@ AuditLog.init(
     timestamp: {
       type: DataTypes.DATE,
       allowNull: false,
+      primaryKey: true,
       defaultValue: DataTypes.NOW,
+      comment: "Partition key (monthly RANGE partitions)",
     },
   },
   {
@@ -0,0 +1,40 @@
+import { Model, DataTypes } from "sequelize";
+import sequelize from "../config/database";
+
+interface CodeSequenceAttributes {
+  scope: string;
+  lastValue: number;
+  updatedAt?: Date;
+}
+
+class CodeSequence
+  extends Model<CodeSequenceAttributes>
+  implements CodeSequenceAttributes
+{
+  public scope!: string;
+  public lastValue!: number;
+  public readonly updatedAt!: Date;
+}
+
+CodeSequence.init(
+  {
+    scope: {
+      type: DataTypes.STRING(64),
+      allowNull: false,
+      primaryKey: true,
+    },
+    lastValue: {
+      type: DataTypes.INTEGER.UNSIGNED,
+      allowNull: false,
+      defaultValue: 0,
+    },
+  },
+  {
+    sequelize,
+    tableName: "code_sequences",
+    timestamps: true,
+    createdAt: false,
+  }
+);
+
+export default CodeSequence;
@@ -2,6 +2,7 @@ import { DataTypes, Model, Optional } from "sequelize";
 import sequelize from "../config/database";
 import User from "./User";
 import Specialty from "./Specialty";
+import { PatientSearchIndex } from "../services/patientSearch.service";
 
 interface EmployeeAttributes {
   id: number;
@@ -183,6 +184,7 @@ Employee.init(
                 isPrimary: true
               }, { hooks: false } as any);
             }
+            await PatientSearchIndex.refreshContacts([(patient as any).id], options.transaction);
           }
         }
       }
@@ -2,6 +2,7 @@ import { DataTypes, Model, Optional } from "sequelize";
 import sequelize from "../config/database";
 import PatientProfile from "./PatientProfile";
 import User from "./User";
+import { normalizeSearchText } from "../utils/searchText";
 
 interface PatientAttributes {
   id: number;
@@ -20,6 +21,8 @@ interface PatientAttributes {
   allergies?: string[] | null;
   noShowCount?: number;
   lastNoShowDate?: Date | null;
+  searchName?: string | null;
+  searchContacts?: string | null;
 }
 
 interface PatientCreationAttributes
@@ -45,6 +48,8 @@ class Patient
   public allergies?: string[] | null;
   noShowCount?: number;
   lastNoShowDate?: Date | null;
+  searchName?: string | null;
+  searchContacts?: string | null;
   
   declare profiles?: PatientProfile[];
 }
@@ -139,12 +144,30 @@ Patient.init(
       field: "lastNoShowDate",
       comment: "Date of most recent no-show incident",
     },
+    searchName: {
+      type: DataTypes.STRING(100),
+      allowNull: true,
+      field: "searchName",
+    },
+    searchContacts: {
+      type: DataTypes.TEXT,
+      allowNull: true,
+      field: "searchContacts",
+    },
   },
   {
     sequelize,
     tableName: "patients",
     timestamps: true,
+    defaultScope: {
+      attributes: { exclude: ["searchName", "searchContacts"] },
+    },
     hooks: {
+      beforeSave: (patient: Patient) => {
+        if (patient.isNewRecord || patient.changed("fullName")) {
+          patient.searchName = normalizeSearchText(patient.fullName);
+        }
+      },
       afterUpdate: async (patient: Patient, options: any) => {
         if (options.syncing || !patient.userId) return;
         if (patient.changed("isActive")) {
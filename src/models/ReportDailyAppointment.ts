@@ -0,0 +1,60 @@
+import { Model, DataTypes } from "sequelize";
+import sequelize from "../config/database";
+
+export const APPOINTMENT_STATUSES = [
+  "WAITING",
+  "CHECKED_IN",
+  "IN_PROGRESS",
+  "COMPLETED",
+  "CANCELLED",
+  "NO_SHOW",
+] as const;
+
+interface ReportDailyAppointmentAttributes {
+  day: string;
+  doctorId: number;
+  status: (typeof APPOINTMENT_STATUSES)[number];
+  appointmentCount: number;
+}
+
+class ReportDailyAppointment
+  extends Model<ReportDailyAppointmentAttributes>
+  implements ReportDailyAppointmentAttributes
+{
+  public day!: string;
+  public doctorId!: number;
+  public status!: (typeof APPOINTMENT_STATUSES)[number];
+  public appointmentCount!: number;
+}
+
+ReportDailyAppointment.init(
+  {
+    day: {
+      type: DataTypes.DATEONLY,
+      allowNull: false,
+      primaryKey: true,
+    },
+    doctorId: {
+      type: DataTypes.INTEGER.UNSIGNED,
+      allowNull: false,
+      primaryKey: true,
+    },
+    status: {
+      type: DataTypes.ENUM(...APPOINTMENT_STATUSES),
+      allowNull: false,
+      primaryKey: true,
+    },
+    appointmentCount: {
+      type: DataTypes.INTEGER.UNSIGNED,
+      allowNull: false,
+      defaultValue: 0,
+    },
+  },
+  {
+    sequelize,
+    tableName: "report_daily_appointments",
+    timestamps: false,
+  }
+);
+
+export default ReportDailyAppointment;
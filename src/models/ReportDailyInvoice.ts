@@ -0,0 +1,66 @@
+import { Model, DataTypes } from "sequelize";
+import sequelize from "../config/database";
+import { PaymentStatus } from "./Invoice";
+
+interface ReportDailyInvoiceAttributes {
+  day: string;
+  doctorId: number;
+  paymentStatus: PaymentStatus;
+  invoiceCount: number;
+  totalAmount: number;
+  paidAmount: number;
+}
+
+class ReportDailyInvoice
+  extends Model<ReportDailyInvoiceAttributes>
+  implements ReportDailyInvoiceAttributes
+{
+  public day!: string;
+  public doctorId!: number;
+  public paymentStatus!: PaymentStatus;
+  public invoiceCount!: number;
+  public totalAmount!: number;
+  public paidAmount!: number;
+}
+
+ReportDailyInvoice.init(
+  {
+    day: {
+      type: DataTypes.DATEONLY,
+      allowNull: false,
+      primaryKey: true,
+    },
+    doctorId: {
+      type: DataTypes.INTEGER.UNSIGNED,
+      allowNull: false,
+      primaryKey: true,
+    },
+    paymentStatus: {
+      type: DataTypes.ENUM(...Object.values(PaymentStatus)),
+      allowNull: false,
+      primaryKey: true,
+    },
+    invoiceCount: {
+      type: DataTypes.INTEGER.UNSIGNED,
+      allowNull: false,
+      defaultValue: 0,
+    },
+    totalAmount: {
+      type: DataTypes.DECIMAL(15, 2),
+      allowNull: false,
+      defaultValue: 0,
+    },
+    paidAmount: {
+      type: DataTypes.DECIMAL(15, 2),
+      allowNull: false,
+      defaultValue: 0,
+    },
+  },
+  {
+    sequelize,
+    tableName: "report_daily_invoices",
+    timestamps: false,
+  }
+);
+
+export default ReportDailyInvoice;
@@ -0,0 +1,52 @@
+import { Model, DataTypes } from "sequelize";
+import sequelize from "../config/database";
+import { ItemType } from "./InvoiceItem";
+
+interface ReportDailyInvoiceItemAttributes {
+  day: string;
+  itemType: ItemType;
+  itemCount: number;
+  subtotal: number;
+}
+
+class ReportDailyInvoiceItem
+  extends Model<ReportDailyInvoiceItemAttributes>
+  implements ReportDailyInvoiceItemAttributes
+{
+  public day!: string;
+  public itemType!: ItemType;
+  public itemCount!: number;
+  public subtotal!: number;
+}
+
+ReportDailyInvoiceItem.init(
+  {
+    day: {
+      type: DataTypes.DATEONLY,
+      allowNull: false,
+      primaryKey: true,
+    },
+    itemType: {
+      type: DataTypes.ENUM(...Object.values(ItemType)),
+      allowNull: false,
+      primaryKey: true,
+    },
+    itemCount: {
+      type: DataTypes.INTEGER.UNSIGNED,
+      allowNull: false,
+      defaultValue: 0,
+    },
+    subtotal: {
+      type: DataTypes.DECIMAL(15, 2),
+      allowNull: false,
+      defaultValue: 0,
+    },
+  },
+  {
+    sequelize,
+    tableName: "report_daily_invoice_items",
+    timestamps: false,
+  }
+);
+
+export default ReportDailyInvoiceItem;
@@ -0,0 +1,37 @@
+import { Model, DataTypes } from "sequelize";
+import sequelize from "../config/database";
+
+interface ReportDailyPatientAttributes {
+  day: string;
+  newPatients: number;
+}
+
+class ReportDailyPatient
+  extends Model<ReportDailyPatientAttributes>
+  implements ReportDailyPatientAttributes
+{
+  public day!: string;
+  public newPatients!: number;
+}
+
+ReportDailyPatient.init(
+  {
+    day: {
+      type: DataTypes.DATEONLY,
+      allowNull: false,
+      primaryKey: true,
+    },
+    newPatients: {
+      type: DataTypes.INTEGER.UNSIGNED,
+      allowNull: false,
+      defaultValue: 0,
+    },
+  },
+  {
+    sequelize,
+    tableName: "report_daily_patients",
+    timestamps: false,
+  }
+);
+
+export default ReportDailyPatient;
@@ -0,0 +1,104 @@
+import { Model, DataTypes, Optional } from "sequelize";
+import sequelize from "../config/database";
+
+export interface ShiftAvailabilityAttributes {
+  doctorShiftId: number;
+  doctorId: number;
+  shiftId: number;
+  workDate: string;
+  specialtyId: number | null;
+  capacity: number;
+  bookedCount: number;
+  lastSlotNumber: number;
+  lastQueueNumber: number;
+  freeSlots: number[] | null;
+  version: number;
+}
+
+interface ShiftAvailabilityCreationAttributes
+  extends Optional<
+    ShiftAvailabilityAttributes,
+    "bookedCount" | "lastSlotNumber" | "lastQueueNumber" | "freeSlots" | "version"
+  > {}
+
+class ShiftAvailability
+  extends Model<ShiftAvailabilityAttributes, ShiftAvailabilityCreationAttributes>
+  implements ShiftAvailabilityAttributes
+{
+  public doctorShiftId!: number;
+  public doctorId!: number;
+  public shiftId!: number;
+  public workDate!: string;
+  public specialtyId!: number | null;
+  public capacity!: number;
+  public bookedCount!: number;
+  public lastSlotNumber!: number;
+  public lastQueueNumber!: number;
+  public freeSlots!: number[] | null;
+  public version!: number;
+}
+
+ShiftAvailability.init(
+  {
+    doctorShiftId: {
+      type: DataTypes.INTEGER.UNSIGNED,
+      allowNull: false,
+      primaryKey: true,
+    },
+    doctorId: {
+      type: DataTypes.INTEGER.UNSIGNED,
+      allowNull: false,
+    },
+    shiftId: {
+      type: DataTypes.INTEGER.UNSIGNED,
+      allowNull: false,
+    },
+    workDate: {
+      type: DataTypes.STRING(10),
+      allowNull: false,
+    },
+    specialtyId: {
+      type: DataTypes.INTEGER.UNSIGNED,
+      allowNull: true,
+    },
+    capacity: {
+      type: DataTypes.INTEGER.UNSIGNED,
+      allowNull: false,
+    },
+    bookedCount: {
+      type: DataTypes.INTEGER,
+      allowNull: false,
+      defaultValue: 0,
+    },
+    lastSlotNumber: {
+      type: DataTypes.INTEGER,
+      allowNull: false,
+      defaultValue: 0,
+    },
+    lastQueueNumber: {
+      type: DataTypes.INTEGER,
+      allowNull: false,
+      defaultValue: 0,
+    },
+    freeSlots: {
+      type: DataTypes.JSON,
+      allowNull: true,
+    },
+    version: {
+      type: DataTypes.INTEGER.UNSIGNED,
+      allowNull: false,
+      defaultValue: 0,
+    },
+  },
+  {
+    sequelize,
+    tableName: "shift_availability",
+    timestamps: false,
+    indexes: [
+      { unique: true, fields: ["doctorId", "shiftId", "workDate"] },
+      { fields: ["workDate"] },
+    ],
+  }
+);
+
+export default ShiftAvailability;
@@ -160,7 +160,7 @@ export const setupAssociations = () => {
   Doctor.hasMany(Visit, { foreignKey: "doctorId", as: "visits" });
   Appointment.hasOne(Visit, { foreignKey: "appointmentId", as: "visit" });
 
-  AuditLog.belongsTo(User, { foreignKey: "userId", as: "user" });
+  AuditLog.belongsTo(User, { foreignKey: "userId", as: "user", constraints: false });
   User.hasMany(AuditLog, { foreignKey: "userId", as: "auditLogs" });
 
   NotificationSetting.belongsTo(User, {
@@ -30,6 +30,12 @@ import Diagnosis from "./Diagnosis";
 import Refund from "./Refund";
 import Employee from "./Employee";
 import SystemSettings from "./SystemSettings";
+import ReportDailyInvoice from "./ReportDailyInvoice";
+import ReportDailyInvoiceItem from "./ReportDailyInvoiceItem";
+import ReportDailyAppointment from "./ReportDailyAppointment";
+import ReportDailyPatient from "./ReportDailyPatient";
+import CodeSequence from "./CodeSequence";
+import ShiftAvailability from "./ShiftAvailability";
 import { setupAssociations } from "./associations";
 setupAssociations();
 
@@ -66,4 +72,10 @@ export {
   Refund,
   Employee,
   SystemSettings,
+  ReportDailyInvoice,
+  ReportDailyInvoiceItem,
+  ReportDailyAppointment,
+  ReportDailyPatient,
+  CodeSequence,
+  ShiftAvailability,
 };
@@ -28,6 +28,7 @@ export const getAllAuditLogs = async (req: Request, res: Response) => {
       recordId: recordId ? parseInt(recordId as string) : undefined,
       fromDate: fromDate ? new Date(fromDate as string) : undefined,
       toDate: toDate ? new Date(toDate as string) : undefined,
+      cursor: typeof req.query.cursor === "string" ? req.query.cursor : undefined,
     };
 
     const result = await getAuditLogs(filters);
@@ -39,7 +40,7 @@ export const getAllAuditLogs = async (req: Request, res: Response) => {
       pagination: result.pagination,
     });
   } catch (error: any) {
-    return res.status(500).json({
+    return res.status(error?.status || 500).json({
       success: false,
       message: error?.message || "Failed to retrieve audit logs",
     });
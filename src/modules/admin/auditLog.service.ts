@@ -2,6 +2,14 @@ import { Request } from "express";
 import AuditLog, { AuditAction } from "../../models/AuditLog";
 import User from "../../models/User";
 import { Op } from "sequelize";
+import { AuditLogWriter } from "../../services/auditLogWriter.service";
+import {
+  applyKeyset,
+  buildKeysetPage,
+  cachedCount,
+  decodeCursor,
+  keysetOrder,
+} from "../../utils/keysetPagination";
 
 export const createAuditLog = async (data: {
   userId?: number;
@@ -13,7 +21,7 @@ export const createAuditLog = async (data: {
   ipAddress?: string;
   userAgent?: string;
 }) => {
-  return await AuditLog.create({
+  return AuditLogWriter.write({
     userId: data.userId,
     action: data.action,
     tableName: data.tableName,
@@ -153,6 +161,7 @@ export const getAuditLogs = async (filters: {
   recordId?: number;
   fromDate?: Date;
   toDate?: Date;
+  cursor?: string;
 }) => {
   const page = filters.page || 1;
   const limit = filters.limit || 50;
@@ -186,19 +195,39 @@ export const getAuditLogs = async (filters: {
     }
   }
 
-  const { count, rows } = await AuditLog.findAndCountAll({
-    where,
-    include: [
-      {
-        model: User,
-        as: "user",
-        attributes: ["id", "fullName", "email"],
-      },
-    ],
-    order: [["timestamp", "DESC"]],
-    limit,
-    offset,
-  });
+  const include = [
+    {
+      model: User,
+      as: "user",
+      attributes: ["id", "fullName", "email"],
+    },
+  ];
+
+  if (filters.cursor !== undefined) {
+    const cursor = decodeCursor(filters.cursor);
+    const [total, rows] = await Promise.all([
+      cachedCount("audit_logs", where, () => AuditLog.count({ where })),
+      AuditLog.findAll({
+        where: applyKeyset(where, cursor, "timestamp"),
+        include,
+        order: keysetOrder("timestamp"),
+        limit: limit + 1,
+      }),
+    ]);
+    const result = buildKeysetPage(rows, limit, "timestamp", total);
+    return { logs: result.rows, pagination: result.pagination };
+  }
+
+  const [count, rows] = await Promise.all([
+    AuditLog.count({ where }),
+    AuditLog.findAll({
+      where,
+      include,
+      order: [["timestamp", "DESC"]],
+      limit,
+      offset,
+    }),
+  ]);
 
   return {
     logs: rows,
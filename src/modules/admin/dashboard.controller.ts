@@ -150,14 +150,18 @@ export const getSystemAlerts = async (req: Request, res: Response) => {
   }
 };
 
+export const buildLandingStatsResponse = async () => {
+  const stats = await getLandingStatsService();
+  return {
+    success: true,
+    message: "Landing stats retrieved successfully",
+    data: stats,
+  };
+};
+
 export const getLandingStats = async (req: Request, res: Response): Promise<any> => {
   try {
-    const stats = await getLandingStatsService();
-    return res.json({
-      success: true,
-      message: "Landing stats retrieved successfully",
-      data: stats,
-    });
+    return res.json(await buildLandingStatsResponse());
   } catch (error: any) {
     return res.status(500).json({
       success: false,
@@ -1,5 +1,6 @@
 import express from "express";
 import {
+  buildLandingStatsResponse,
   getDashboardData,
   getDashboardStats,
   getDashboardAppointmentsByDate,
@@ -12,10 +13,15 @@ import {
 import { verifyToken } from "../../middlewares/auth.middlewares";
 import { requireRole } from "../../middlewares/roleCheck.middlewares";
 import { RoleCode } from "../../constant/role";
+import { cacheMiddleware } from "../../middlewares/cache.middlewares";
 
 const router = express.Router();
 
-router.get("/public/landing-stats", getLandingStats);
+router.get(
+  "/public/landing-stats",
+  cacheMiddleware({ shared: true, load: () => buildLandingStatsResponse() }),
+  getLandingStats
+);
 router.get("/stats", verifyToken, requireRole(RoleCode.ADMIN), getDashboardStats);
 router.get("/appointments/:date", verifyToken, requireRole(RoleCode.ADMIN), getDashboardAppointmentsByDate);
 router.get("/overview", verifyToken, requireRole(RoleCode.ADMIN), getDashboardOverview);
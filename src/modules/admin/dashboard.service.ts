@@ -5,7 +5,34 @@ import Appointment from "../../models/Appointment";
 import Patient from "../../models/Patient";
 import Doctor from "../../models/Doctor";
 import User from "../../models/User";
-import { CacheService, CacheKeys } from "../../services/cache.service";
+import { CacheService, CacheKeys, CacheTags } from "../../services/cache.service";
+import { dbDayStart, toDayKey } from "../../services/reportRollup.service";
+
+
+export const getDailyRevenueService = async (
+  startDate: Date,
+  endDate: Date
+): Promise<Map<string, number>> => {
+  const dayExpr = fn("DATE_FORMAT", col("createdAt"), "%Y-%m-%d");
+  const rows = (await Invoice.findAll({
+    attributes: [
+      [dayExpr, "day"],
+      [fn("SUM", col("totalAmount")), "revenue"],
+    ],
+    where: {
+      createdAt: { [Op.gte]: startDate, [Op.lt]: endDate },
+      paymentStatus: "PAID",
+    },
+    group: [dayExpr],
+    raw: true,
+  })) as unknown as Array<{ day: string; revenue: string | number | null }>;
+
+  const revenueByDay = new Map<string, number>();
+  for (const row of rows) {
+    revenueByDay.set(row.day, Number(row.revenue) || 0);
+  }
+  return revenueByDay;
+};
 
 
 export const getDashboardDataService = async (days: number = 7, month?: number, year?: number) => {
@@ -16,83 +43,81 @@ export const getDashboardDataService = async (days: number = 7, month?: number,
   const nextMonth = new Date(filterYear, filterMonth, 1);
   const daysInMonth = new Date(filterYear, filterMonth, 0).getDate();
 
-  const [stats, overview, recentActivities, quickStats, alerts] = await Promise.all([
-    getDashboardStatsService(),
-    getDashboardOverviewService(),
-    getRecentActivitiesService(10),
-    getQuickStatsService(),
-    getSystemAlertsService(),
-  ]);
+  const todayStart = new Date();
+  todayStart.setHours(0,0,0,0);
 
-  const dailyRevenue = [];
-  
+  const chartDays: Array<{ date: Date; name: string }> = [];
   if (month !== undefined) {
-  
     for (let i = 1; i <= daysInMonth; i++) {
-        const date = new Date(filterYear, filterMonth - 1, i);
-        const nextDate = new Date(filterYear, filterMonth - 1, i + 1);
-        const revenue = await Invoice.sum("totalAmount", {
-            where: {
-                createdAt: { [Op.gte]: date, [Op.lt]: nextDate },
-                paymentStatus: "PAID",
-            },
-        });
-
-        dailyRevenue.push({
-            name: `${i}/${filterMonth}`,
-            date: date.toISOString().split("T")[0],
-            revenue: revenue || 0,
-        });
+      chartDays.push({
+        date: new Date(filterYear, filterMonth - 1, i),
+        name: `${i}/${filterMonth}`,
+      });
     }
-  } else {    
-    const todayStart = new Date();
-    todayStart.setHours(0,0,0,0);
+  } else {
     for (let i = days - 1; i >= 0; i--) {
-        const date = new Date(todayStart);
-        date.setDate(date.getDate() - i);
-        const nextDate = new Date(date);
-        nextDate.setDate(nextDate.getDate() + 1);
-        const revenue = await Invoice.sum("totalAmount", {
-            where: {
-                createdAt: { [Op.gte]: date, [Op.lt]: nextDate },
-                paymentStatus: "PAID",
-            },
-        });
-        dailyRevenue.push({
-            name: date.toLocaleDateString("vi-VN", { 
-                weekday: days <= 7 ? "short" : undefined, 
-                day: "2-digit", 
-                month: "2-digit" 
-            }),
-            date: date.toISOString().split("T")[0],
-            revenue: revenue || 0,
-        });
+      const date = new Date(todayStart);
+      date.setDate(date.getDate() - i);
+      chartDays.push({
+        date,
+        name: date.toLocaleDateString("vi-VN", { 
+          weekday: days <= 7 ? "short" : undefined, 
+          day: "2-digit", 
+          month: "2-digit" 
+        }),
+      });
     }
   }
 
-  const todayStart = new Date();
-  todayStart.setHours(0,0,0,0);
-  const todayStatusDist = await Appointment.findAll({
-    attributes: [
-      'status',
-      [fn('COUNT', col('id')), 'count']
-    ],
-    where: {
-      date: { [Op.gte]: todayStart, [Op.lt]: new Date(todayStart.getTime() + 24 * 60 * 60 * 1000) }
-    },
-    group: ['status']
-  });
+  const dayKeys = chartDays.map(({ date }) => toDayKey(date));
+  const firstDay = dayKeys[0] ?? toDayKey(todayStart);
+  const lastDay = dayKeys[dayKeys.length - 1] ?? firstDay;
+  const revenueStart = dbDayStart(firstDay);
+  const revenueEnd = new Date(dbDayStart(lastDay).getTime() + 24 * 60 * 60 * 1000);
 
-  const monthlyStatusDist = await Appointment.findAll({
-    attributes: [
-      'status',
-      [fn('COUNT', col('id')), 'count']
-    ],
-    where: {
-      date: { [Op.gte]: baseDate, [Op.lt]: nextMonth }
-    },
-    group: ['status']
-  });
+  const [
+    stats,
+    overview,
+    recentActivities,
+    quickStats,
+    alerts,
+    revenueByDay,
+    todayStatusDist,
+    monthlyStatusDist,
+  ] = await Promise.all([
+    getDashboardStatsService(),
+    getDashboardOverviewService(),
+    getRecentActivitiesService(10),
+    getQuickStatsService(),
+    getSystemAlertsService(),
+    getDailyRevenueService(revenueStart, revenueEnd),
+    Appointment.findAll({
+      attributes: [
+        'status',
+        [fn('COUNT', col('id')), 'count']
+      ],
+      where: {
+        date: { [Op.gte]: todayStart, [Op.lt]: new Date(todayStart.getTime() + 24 * 60 * 60 * 1000) }
+      },
+      group: ['status']
+    }),
+    Appointment.findAll({
+      attributes: [
+        'status',
+        [fn('COUNT', col('id')), 'count']
+      ],
+      where: {
+        date: { [Op.gte]: baseDate, [Op.lt]: nextMonth }
+      },
+      group: ['status']
+    }),
+  ]);
+
+  const dailyRevenue = chartDays.map(({ date, name }, index) => ({
+    name,
+    date: date.toISOString().split("T")[0],
+    revenue: revenueByDay.get(dayKeys[index]) || 0,
+  }));
 
   return {
     stats,
@@ -164,10 +189,54 @@ export const getDashboardAppointmentsByDateService = async (date: string) => {
     symptomInitial: apt.symptomInitial,
     bookingType: apt.bookingType,
   }));
-  await CacheService.set(cacheKey, result, 120);
+  await CacheService.setTagged(cacheKey, result, 120, [
+    CacheTags.DASHBOARD,
+    CacheTags.APPOINTMENTS(toDayKey(date)),
+  ]);
   return result;
 };
 
+let dashboardHooksRegistered = false;
+
+
+export const registerDashboardCacheInvalidation = (): void => {
+  if (dashboardHooksRegistered) {
+    return;
+  }
+  dashboardHooksRegistered = true;
+
+  const invalidate = (options: any, tags: string[]) => {
+    const run = () => void CacheService.invalidateTags(tags);
+    if (options?.transaction) {
+      options.transaction.afterCommit(run);
+    } else {
+      run();
+    }
+  };
+
+  const invalidateAppointment = (appointment: any, options: any) => {
+    const days = new Set(
+      [appointment.date, appointment.previous("date")]
+        .filter(Boolean)
+        .map((day: Date | string) => CacheTags.APPOINTMENTS(toDayKey(day)))
+    );
+    invalidate(options, [...days]);
+  };
+
+  Appointment.addHook("afterCreate", "dashboardCache", invalidateAppointment);
+  Appointment.addHook("afterUpdate", "dashboardCache", invalidateAppointment);
+  Appointment.addHook("afterDestroy", "dashboardCache", invalidateAppointment);
+  Appointment.addHook("afterBulkCreate", "dashboardCache", (_appointments: any[], options: any) =>
+    invalidate(options, [CacheTags.DASHBOARD])
+  );
+  Appointment.addHook("afterBulkUpdate", "dashboardCache", (options: any) =>
+    invalidate(options, [CacheTags.DASHBOARD])
+  );
+  Appointment.addHook("afterBulkDestroy", "dashboardCache", (options: any) =>
+    invalidate(options, [CacheTags.DASHBOARD])
+  );
+};
+
 export const getDashboardStatsService = async () => {
   const today = new Date();
   today.setHours(0, 0, 0, 0);
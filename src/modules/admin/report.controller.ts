@@ -15,6 +15,7 @@ import {
   generateProfitReportExcel,
   generateAppointmentReportExcel,
   generatePatientStatisticsExcel,
+  generateInvoiceDetailExcel,
 } from "./reportExcel.service";
 import {
   generateRevenueReportPDF,
@@ -129,6 +130,21 @@ export const getRevenueReportExcel = async (req: Request, res: Response) => {
   }
 };
 
+export const getInvoiceDetailExcel = async (req: Request, res: Response) => {
+  try {
+    const { year, month } = req.query;
+    await generateInvoiceDetailExcel(res, {
+      year: Number(year) || new Date().getFullYear(),
+      month: month ? Number(month) : undefined,
+    });
+  } catch (error: any) {
+    if (!res.headersSent) {
+      return res.status(500).json({ success: false, message: error.message });
+    }
+    res.destroy(error);
+  }
+};
+
 export const getExpenseReportPDF = async (req: Request, res: Response) => {
   try {
     const { year, month } = req.query;
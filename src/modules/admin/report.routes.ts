@@ -8,6 +8,7 @@ import {
   getProfitReport,
   getRevenueReportPDF,
   getRevenueReportExcel,
+  getInvoiceDetailExcel,
   getExpenseReportPDF,
   getExpenseReportExcel,
   getProfitReportPDF,
@@ -36,6 +37,7 @@ router.get("/patients-by-gender", verifyToken, requireRole(RoleCode.ADMIN), getP
 router.get("/profit", verifyToken, requireRole(RoleCode.ADMIN), getProfitReport);
 router.get("/revenue/pdf", verifyToken, requireRole(RoleCode.ADMIN), getRevenueReportPDF);
 router.get("/revenue/excel", verifyToken, requireRole(RoleCode.ADMIN), getRevenueReportExcel);
+router.get("/revenue/invoices/excel", verifyToken, requireRole(RoleCode.ADMIN), getInvoiceDetailExcel);
 router.get("/expense/pdf", verifyToken, requireRole(RoleCode.ADMIN), getExpenseReportPDF);
 router.get("/expense/excel", verifyToken, requireRole(RoleCode.ADMIN), getExpenseReportExcel);
 router.get("/profit/pdf", verifyToken, requireRole(RoleCode.ADMIN), getProfitReportPDF);
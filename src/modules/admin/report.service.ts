@@ -1,15 +1,17 @@
-import { Op, fn, col, literal } from "sequelize";
-import Invoice from "../../models/Invoice";
-import InvoiceItem from "../../models/InvoiceItem";
+import { Op, QueryTypes, fn, col, literal } from "sequelize";
+import sequelize from "../../config/database";
 import Payroll from "../../models/Payroll";
 import Medicine from "../../models/Medicine";
 import Patient from "../../models/Patient";
 import PrescriptionDetail from "../../models/PrescriptionDetail";
-import Appointment from "../../models/Appointment";
 import Visit from "../../models/Visit";
 import User from "../../models/User";
 import Role from "../../models/Role";
 import Doctor from "../../models/Doctor";
+import ReportDailyInvoice from "../../models/ReportDailyInvoice";
+import ReportDailyInvoiceItem from "../../models/ReportDailyInvoiceItem";
+import ReportDailyAppointment from "../../models/ReportDailyAppointment";
+import ReportDailyPatient from "../../models/ReportDailyPatient";
 
 interface RevenueReportFilters {
   year: number;
@@ -21,129 +23,153 @@ interface ExpenseReportFilters {
   month?: number;
 }
 
-export const getRevenueReportService = async (filters: RevenueReportFilters) => {
-  const { year, month } = filters;
-
-  let startDate: Date;
-  let endDate: Date;
-
-  if (month) {
-    
-    startDate = new Date(year, month - 1, 1);
-    endDate = new Date(year, month, 1);
-  } else {
-    
-    startDate = new Date(year, 0, 1);
-    endDate = new Date(year + 1, 0, 1);
-  }
-
-  
-  const totalRevenue = await Invoice.sum("totalAmount", {
-    where: {
-      createdAt: {
-        [Op.gte]: startDate,
-        [Op.lt]: endDate,
-      },
-      paymentStatus: "PAID",
-    },
-  });
-
-  
-  const collectedRevenue = await Invoice.sum("paidAmount", {
-    where: {
-      createdAt: {
-        [Op.gte]: startDate,
-        [Op.lt]: endDate,
-      },
-    },
-  });
+export interface InvoiceDetailRow {
+  id: number;
+  invoiceCode: string;
+  createdAt: Date;
+  patientCode: string | null;
+  patientName: string | null;
+  doctorName: string | null;
+  examinationFee: string | number;
+  medicineTotalAmount: string | number;
+  discount: string | number;
+  totalAmount: string | number;
+  paidAmount: string | number;
+  paymentStatus: string;
+}
 
-  
-  const uncollectedRevenue = (totalRevenue || 0) - (collectedRevenue || 0);
+const INVOICE_DETAIL_CHUNK_SIZE = 2000;
 
-  
-  const totalInvoices = await Invoice.count({
-    where: {
-      createdAt: {
-        [Op.gte]: startDate,
-        [Op.lt]: endDate,
-      },
-    },
-  });
+const INVOICE_DETAIL_SQL = `
+  SELECT i.id, i.invoiceCode, i.createdAt, p.patientCode, p.fullName AS patientName,
+         u.fullName AS doctorName, i.examinationFee, i.medicineTotalAmount, i.discount,
+         i.totalAmount, i.paidAmount, i.paymentStatus
+  FROM invoices i
+  LEFT JOIN patients p ON p.id = i.patientId
+  LEFT JOIN doctors d ON d.id = i.doctorId
+  LEFT JOIN users u ON u.id = d.userId
+  WHERE (i.createdAt, i.id) > (:afterCreatedAt, :afterId) AND i.createdAt < :end
+  ORDER BY i.createdAt, i.id
+  LIMIT :limit
+`;
 
-  
-  const revenueByStatus = await Invoice.findAll({
-    attributes: [
-      "paymentStatus",
-      [fn("COUNT", col("Invoice.id")), "count"],
-      [fn("SUM", col("Invoice.totalAmount")), "totalAmount"],
-      [fn("SUM", col("Invoice.paidAmount")), "paidAmount"],
-    ],
-    where: {
-      createdAt: {
-        [Op.gte]: startDate,
-        [Op.lt]: endDate,
-      },
-    },
-    group: ["paymentStatus"],
-    raw: true,
-  });
+const pad = (value: number) => String(value).padStart(2, "0");
 
-  
-  let revenueOverTime: any[] = [];
+const getPeriodBounds = (year: number, month?: number) => {
+  if (month) {
+    const daysInMonth = new Date(year, month, 0).getDate();
+    return {
+      startDay: `${year}-${pad(month)}-01`,
+      endDay: `${year}-${pad(month)}-${pad(daysInMonth)}`,
+    };
+  }
+  return { startDay: `${year}-01-01`, endDay: `${year}-12-31` };
+};
 
+const listPeriods = (year: number, month?: number): string[] => {
+  const periods: string[] = [];
   if (month) {
-    
     const daysInMonth = new Date(year, month, 0).getDate();
     for (let day = 1; day <= daysInMonth; day++) {
-      const dayStart = new Date(year, month - 1, day);
-      const dayEnd = new Date(year, month - 1, day + 1);
-
-      const revenue = await Invoice.sum("totalAmount", {
-        where: {
-          createdAt: {
-            [Op.gte]: dayStart,
-            [Op.lt]: dayEnd,
-          },
-          paymentStatus: "PAID",
-        },
-      });
-
-      revenueOverTime.push({
-        period: `${year}-${String(month).padStart(2, "0")}-${String(day).padStart(2, "0")}`,
-        revenue: revenue || 0,
-      });
+      periods.push(`${year}-${pad(month)}-${pad(day)}`);
     }
   } else {
-    
     for (let m = 1; m <= 12; m++) {
-      const monthStart = new Date(year, m - 1, 1);
-      const monthEnd = new Date(year, m, 1);
-
-      const revenue = await Invoice.sum("totalAmount", {
-        where: {
-          createdAt: {
-            [Op.gte]: monthStart,
-            [Op.lt]: monthEnd,
-          },
-          paymentStatus: "PAID",
-        },
-      });
+      periods.push(`${year}-${pad(m)}`);
+    }
+  }
+  return periods;
+};
+
+const periodOf = (month?: number) =>
+  fn("DATE_FORMAT", col("day"), month ? "%Y-%m-%d" : "%Y-%m");
+
+export async function* streamInvoiceDetailRows(
+  filters: RevenueReportFilters,
+  chunkSize: number = INVOICE_DETAIL_CHUNK_SIZE
+): AsyncGenerator<InvoiceDetailRow[]> {
+  const { year, month } = filters;
+  const end = month ? new Date(year, month, 1) : new Date(year + 1, 0, 1);
+  let afterCreatedAt = new Date(year, month ? month - 1 : 0, 1);
+  let afterId = 0;
+
+  for (;;) {
+    const rows = await sequelize.query<InvoiceDetailRow>(INVOICE_DETAIL_SQL, {
+      replacements: { afterCreatedAt, afterId, end, limit: chunkSize },
+      type: QueryTypes.SELECT,
+    });
+    if (rows.length === 0) {
+      return;
+    }
 
-      revenueOverTime.push({
-        period: `${year}-${String(m).padStart(2, "0")}`,
-        revenue: revenue || 0,
-      });
+    yield rows;
+
+    if (rows.length < chunkSize) {
+      return;
+    }
+    const last = rows[rows.length - 1];
+    afterCreatedAt = last.createdAt;
+    afterId = last.id;
+  }
+}
+
+export const getRevenueReportService = async (filters: RevenueReportFilters) => {
+  const { year, month } = filters;
+  const { startDay, endDay } = getPeriodBounds(year, month);
+  const where = { day: { [Op.between]: [startDay, endDay] } };
+
+  const [revenueByStatus, paidByPeriod] = await Promise.all([
+    ReportDailyInvoice.findAll({
+      attributes: [
+        "paymentStatus",
+        [fn("SUM", col("invoiceCount")), "count"],
+        [fn("SUM", col("totalAmount")), "totalAmount"],
+        [fn("SUM", col("paidAmount")), "paidAmount"],
+      ],
+      where,
+      group: ["paymentStatus"],
+      raw: true,
+    }) as unknown as Promise<any[]>,
+    ReportDailyInvoice.findAll({
+      attributes: [
+        [periodOf(month), "period"],
+        [fn("SUM", col("totalAmount")), "revenue"],
+      ],
+      where: { ...where, paymentStatus: "PAID" },
+      group: ["period"],
+      raw: true,
+    }) as unknown as Promise<any[]>,
+  ]);
+
+  let totalRevenue = 0;
+  let collectedRevenue = 0;
+  let totalInvoices = 0;
+  for (const row of revenueByStatus) {
+    row.count = Number(row.count) || 0;
+    totalInvoices += row.count;
+    collectedRevenue += Number(row.paidAmount) || 0;
+    if (row.paymentStatus === "PAID") {
+      totalRevenue += Number(row.totalAmount) || 0;
     }
   }
 
+  const uncollectedRevenue = totalRevenue - collectedRevenue;
+
+  const revenueMap = new Map<string, number>(
+    paidByPeriod.map((row) => [row.period, Number(row.revenue) || 0])
+  );
+  const revenueOverTime = listPeriods(year, month).map((period) => ({
+    period,
+    revenue: revenueMap.get(period) || 0,
+  }));
+
   return {
     summary: {
-      totalRevenue: totalRevenue || 0,
-      collectedRevenue: collectedRevenue || 0,
+      totalRevenue,
+      collectedRevenue,
       uncollectedRevenue,
       totalInvoices,
-      averageInvoiceValue: totalInvoices > 0 ? (totalRevenue || 0) / totalInvoices : 0,
+      averageInvoiceValue: totalInvoices > 0 ? totalRevenue / totalInvoices : 0,
     },
     byStatus: revenueByStatus,
     overTime: revenueOverTime,
@@ -153,152 +179,106 @@ export const getRevenueReportService = async (filters: RevenueReportFilters) =>
 
 export const getExpenseReportService = async (filters: ExpenseReportFilters) => {
   const { year, month } = filters;
+  const { startDay, endDay } = getPeriodBounds(year, month);
 
-  let startDate: Date;
-  let endDate: Date;
-
-  if (month) {
-    startDate = new Date(year, month - 1, 1);
-    endDate = new Date(year, month, 1);
-  } else {
-    startDate = new Date(year, 0, 1);
-    endDate = new Date(year + 1, 0, 1);
-  }
-
-  
-  const medicineExpense = await InvoiceItem.sum("subtotal", {
-    where: {
-      itemType: "MEDICINE",
-      createdAt: {
-        [Op.gte]: startDate,
-        [Op.lt]: endDate,
-      },
+  const payrollWhere = {
+    year,
+    ...(month && { month }),
+    status: {
+      [Op.in]: ["APPROVED", "PAID"],
     },
-  });
+  };
 
-  
-  const salaryExpense = await Payroll.sum("netSalary", {
-    where: {
-      year: year,
-      ...(month && { month }),
-      status: {
-        [Op.in]: ["APPROVED", "PAID"],
+  const [medicineByPeriod, salaryByMonth, salaryExpenseByRole] = await Promise.all([
+    ReportDailyInvoiceItem.findAll({
+      attributes: [
+        [periodOf(month), "period"],
+        [fn("SUM", col("subtotal")), "subtotal"],
+      ],
+      where: {
+        day: { [Op.between]: [startDay, endDay] },
+        itemType: "MEDICINE",
       },
-    },
-  });
+      group: ["period"],
+      raw: true,
+    }) as unknown as Promise<any[]>,
+    Payroll.findAll({
+      attributes: ["month", [fn("SUM", col("netSalary")), "netSalary"]],
+      where: payrollWhere,
+      group: ["month"],
+      raw: true,
+    }) as unknown as Promise<any[]>,
+    Payroll.findAll({
+      attributes: [
+        [col("user.role.name"), "roleName"],
+        [fn("SUM", col("Payroll.netSalary")), "totalSalary"],
+        [fn("COUNT", col("Payroll.id")), "count"],
+      ],
+      where: payrollWhere,
+      include: [
+        {
+          model: User,
+          as: "user",
+          attributes: [],
+          include: [
+            {
+              model: Role,
+              as: "role",
+              attributes: [],
+            },
+          ],
+        },
+      ],
+      group: ["user.role.name"],
+      subQuery: false,
+      raw: true,
+    }),
+  ]);
 
-  
-  const totalExpense = (medicineExpense || 0) + (salaryExpense || 0);
+  const medicineMap = new Map<string, number>(
+    medicineByPeriod.map((row) => [row.period, Number(row.subtotal) || 0])
+  );
+  const salaryMap = new Map<number, number>(
+    salaryByMonth.map((row) => [Number(row.month), Number(row.netSalary) || 0])
+  );
 
-  
-  const expenseOverTime: any[] = [];
+  let medicineExpense = 0;
+  for (const value of medicineMap.values()) {
+    medicineExpense += value;
+  }
+  let salaryExpense = 0;
+  for (const value of salaryMap.values()) {
+    salaryExpense += value;
+  }
 
-  if (month) {
-    
-    const daysInMonth = new Date(year, month, 0).getDate();
-    for (let day = 1; day <= daysInMonth; day++) {
-      const dayStart = new Date(year, month - 1, day);
-      const dayEnd = new Date(year, month - 1, day + 1);
-
-      const medicineExp = await InvoiceItem.sum("subtotal", {
-        where: {
-          itemType: "MEDICINE",
-          createdAt: {
-            [Op.gte]: dayStart,
-            [Op.lt]: dayEnd,
-          },
-        },
-      });
+  const totalExpense = medicineExpense + salaryExpense;
 
-      
-      
-      let salaryExp = 0;
-      if (day === daysInMonth) {
-        salaryExp = salaryExpense || 0;
-      }
-
-      expenseOverTime.push({
-        period: `${year}-${String(month).padStart(2, "0")}-${String(day).padStart(2, "0")}`,
-        medicineExpense: medicineExp || 0,
-        salaryExpense: salaryExp,
-        totalExpense: (medicineExp || 0) + salaryExp,
-      });
-    }
-  } else {
-    
-    for (let m = 1; m <= 12; m++) {
-      const monthStart = new Date(year, m - 1, 1);
-      const monthEnd = new Date(year, m, 1);
-
-      const medicineExp = await InvoiceItem.sum("subtotal", {
-        where: {
-          itemType: "MEDICINE",
-          createdAt: {
-            [Op.gte]: monthStart,
-            [Op.lt]: monthEnd,
-          },
-        },
-      });
-
-      const salaryExp = await Payroll.sum("netSalary", {
-        where: {
-          year: year,
-          month: m,
-          status: {
-            [Op.in]: ["APPROVED", "PAID"],
-          },
-        },
-      });
-
-      expenseOverTime.push({
-        period: `${year}-${String(m).padStart(2, "0")}`,
-        medicineExpense: medicineExp || 0,
-        salaryExpense: salaryExp || 0,
-        totalExpense: (medicineExp || 0) + (salaryExp || 0),
-      });
+  const periods = listPeriods(year, month);
+  const expenseOverTime = periods.map((period, index) => {
+    const medicineExp = medicineMap.get(period) || 0;
+
+    let salaryExp = 0;
+    if (!month) {
+      salaryExp = salaryMap.get(index + 1) || 0;
+    } else if (index === periods.length - 1) {
+      salaryExp = salaryExpense;
     }
-  }
 
-  
-  const salaryExpenseByRole = await Payroll.findAll({
-    attributes: [
-      [col("user.role.name"), "roleName"],
-      [fn("SUM", col("Payroll.netSalary")), "totalSalary"],
-      [fn("COUNT", col("Payroll.id")), "count"],
-    ],
-    where: {
-      year,
-      ...(month && { month }),
-      status: {
-        [Op.in]: ["APPROVED", "PAID"],
-      },
-    },
-    include: [
-      {
-        model: User,
-        as: "user",
-        attributes: [], 
-        include: [
-          {
-            model: Role,
-            as: "role",
-            attributes: [], 
-          },
-        ],
-      },
-    ],
-    group: ["user.role.name"],
-    subQuery: false,
-    raw: true,
+    return {
+      period,
+      medicineExpense: medicineExp,
+      salaryExpense: salaryExp,
+      totalExpense: medicineExp + salaryExp,
+    };
   });
 
   return {
     summary: {
       totalExpense,
-      medicineExpense: medicineExpense || 0,
-      salaryExpense: salaryExpense || 0,
-      medicinePercentage: totalExpense > 0 ? ((medicineExpense || 0) / totalExpense) * 100 : 0,
-      salaryPercentage: totalExpense > 0 ? ((salaryExpense || 0) / totalExpense) * 100 : 0,
+      medicineExpense,
+      salaryExpense,
+      medicinePercentage: totalExpense > 0 ? (medicineExpense / totalExpense) * 100 : 0,
+      salaryPercentage: totalExpense > 0 ? (salaryExpense / totalExpense) * 100 : 0,
     },
     overTime: expenseOverTime,
     expenseTrends: expenseOverTime.map(item => ({
@@ -556,109 +536,73 @@ export const getProfitReportService = async (filters: { year: number; month?: nu
 
 export const getAppointmentReportService = async (filters: { year: number; month?: number }) => {
   const { year, month } = filters;
-
-  const where: any = {
-    date: month 
-      ? { [Op.between]: [new Date(year, month - 1, 1), new Date(year, month, 0)] }
-      : { [Op.between]: [new Date(year, 0, 1), new Date(year, 11, 31)] }
-  };
-
-  
-  const totalAppointments = await Appointment.count({ where });
-
-  
-  const appointmentsByStatus = await Appointment.findAll({
-    attributes: [
-      "status",
-      [fn("COUNT", col("id")), "count"],
-    ],
-    where,
-    group: ["status"],
-    raw: true,
-  });
-
-  
-  const appointmentsByDoctor = await Appointment.findAll({
-    attributes: [
-      [col("doctor.user.fullName"), "doctorName"],
-      [fn("COUNT", col("Appointment.id")), "count"],
-    ],
-    include: [
-      {
-        model: Doctor,
-        as: "doctor",
-        attributes: [],
-        include: [
-          {
-            model: User,
-            as: "user",
-            attributes: [],
-          }
-        ]
-      }
-    ],
-    where,
-    group: ["doctor.user.fullName"],
-    raw: true,
-  });
-
-  
-  const overTimeRaw = await Appointment.findAll({
-    attributes: [
-      month 
-        ? [fn("DATE_FORMAT", col("date"), "%Y-%m-%d"), "period"]
-        : [fn("DATE_FORMAT", col("date"), "%Y-%m"), "period"],
-      [fn("COUNT", col("id")), "total"],
-      [fn("SUM", literal("CASE WHEN status = 'COMPLETED' THEN 1 ELSE 0 END")), "completed"],
-      [fn("SUM", literal("CASE WHEN status = 'CANCELLED' THEN 1 ELSE 0 END")), "cancelled"],
-      [fn("SUM", literal("CASE WHEN status = 'NO_SHOW' THEN 1 ELSE 0 END")), "noShow"],
-    ],
-    where,
-    group: ["period"],
-    order: [[col("period"), "ASC"]],
-    raw: true,
-  });
-
-  
-  const allPeriods: any[] = [];
-  if (month) {
-    const daysInMonth = new Date(year, month, 0).getDate();
-    for (let d = 1; d <= daysInMonth; d++) {
-      const dayStr = d.toString().padStart(2, '0');
-      const monthStr = month.toString().padStart(2, '0');
-      allPeriods.push(`${year}-${monthStr}-${dayStr}`);
-    }
-  } else {
-    for (let m = 1; m <= 12; m++) {
-      const monthStr = m.toString().padStart(2, '0');
-      allPeriods.push(`${year}-${monthStr}`);
+  const { startDay, endDay } = getPeriodBounds(year, month);
+  const where = { day: { [Op.between]: [startDay, endDay] } };
+
+  const [byPeriodAndStatus, byDoctorId] = await Promise.all([
+    ReportDailyAppointment.findAll({
+      attributes: [
+        [periodOf(month), "period"],
+        "status",
+        [fn("SUM", col("appointmentCount")), "count"],
+      ],
+      where,
+      group: ["period", "status"],
+      raw: true,
+    }) as unknown as Promise<any[]>,
+    ReportDailyAppointment.findAll({
+      attributes: ["doctorId", [fn("SUM", col("appointmentCount")), "count"]],
+      where,
+      group: ["doctorId"],
+      raw: true,
+    }) as unknown as Promise<any[]>,
+  ]);
+
+  const statusCounts = new Map<string, number>();
+  const periodCounts = new Map<string, { total: number; completed: number; cancelled: number; noShow: number }>();
+  let totalAppointments = 0;
+
+  for (const row of byPeriodAndStatus) {
+    const count = Number(row.count) || 0;
+    totalAppointments += count;
+    statusCounts.set(row.status, (statusCounts.get(row.status) || 0) + count);
+
+    let bucket = periodCounts.get(row.period);
+    if (!bucket) {
+      bucket = { total: 0, completed: 0, cancelled: 0, noShow: 0 };
+      periodCounts.set(row.period, bucket);
     }
+    bucket.total += count;
+    if (row.status === "COMPLETED") bucket.completed += count;
+    if (row.status === "CANCELLED") bucket.cancelled += count;
+    if (row.status === "NO_SHOW") bucket.noShow += count;
   }
 
-  
-  const overTime = allPeriods.map(p => {
-    const found: any = overTimeRaw.find((item: any) => item.period === p);
-    return {
-      period: p,
-      total: found ? parseInt(found.total) : 0,
-      completed: found ? parseInt(found.completed) : 0,
-      cancelled: found ? parseInt(found.cancelled) : 0,
-      noShow: found ? parseInt(found.noShow) : 0,
-    };
-  });
+  const overTime = listPeriods(year, month).map((period) => ({
+    period,
+    ...(periodCounts.get(period) || { total: 0, completed: 0, cancelled: 0, noShow: 0 }),
+  }));
 
-  
-  const completedCount = await Appointment.count({
-    where: { ...where, status: "COMPLETED" },
-  });
+  const doctors = byDoctorId.length
+    ? await Doctor.findAll({
+        attributes: ["id"],
+        where: { id: { [Op.in]: byDoctorId.map((row) => row.doctorId) } },
+        include: [{ model: User, as: "user", attributes: ["fullName"] }],
+      })
+    : [];
+  const doctorNames = new Map<number, string | null>(
+    doctors.map((doctor: any) => [doctor.id, doctor.user?.fullName ?? null])
+  );
 
-  const cancelledCount = await Appointment.count({
-    where: { ...where, status: "CANCELLED" },
-  });
+  const appointmentsByDoctor = new Map<string | null, number>();
+  for (const row of byDoctorId) {
+    const name = doctorNames.get(row.doctorId) ?? null;
+    appointmentsByDoctor.set(name, (appointmentsByDoctor.get(name) || 0) + (Number(row.count) || 0));
+  }
 
-  const noShowCount = await Appointment.count({
-    where: { ...where, status: "NO_SHOW" },
-  });
+  const completedCount = statusCounts.get("COMPLETED") || 0;
+  const cancelledCount = statusCounts.get("CANCELLED") || 0;
+  const noShowCount = statusCounts.get("NO_SHOW") || 0;
 
   
   const daysInPeriod = month 
@@ -677,60 +621,27 @@ export const getAppointmentReportService = async (filters: { year: number; month
       completionRate: totalAppointments > 0 ? (completedCount / totalAppointments) * 100 : 0,
     },
     overTime,
-    byStatus: appointmentsByStatus.map((item: any) => ({
-      status: item.status,
-      count: parseInt(item.count),
-      percentage: totalAppointments > 0 ? (parseInt(item.count) / totalAppointments) * 100 : 0,
+    byStatus: [...statusCounts].map(([status, count]) => ({
+      status,
+      count,
+      percentage: totalAppointments > 0 ? (count / totalAppointments) * 100 : 0,
     })),
-    byDoctor: appointmentsByDoctor.map((item: any) => ({
-      doctorName: item.doctorName || "Bác sĩ ẩn danh",
-      count: parseInt(item.count),
-      percentage: totalAppointments > 0 ? (parseInt(item.count) / totalAppointments) * 100 : 0,
+    byDoctor: [...appointmentsByDoctor].map(([doctorName, count]) => ({
+      doctorName: doctorName || "Bác sĩ ẩn danh",
+      count,
+      percentage: totalAppointments > 0 ? (count / totalAppointments) * 100 : 0,
     })),
   };
 };
 
 
 export const getPatientStatisticsService = async (year: number, month?: number) => {
-  const userWhere: any = {};
-
+  const rollupWhere: any = {};
   if (year) {
-    if (month) {
-      const startDate = new Date(year, month - 1, 1);
-      const endDate = new Date(year, month, 0, 23, 59, 59);
-      userWhere.createdAt = { [Op.between]: [startDate, endDate] };
-    } else {
-      const startDate = new Date(year, 0, 1);
-      const endDate = new Date(year, 11, 31, 23, 59, 59);
-      userWhere.createdAt = { [Op.between]: [startDate, endDate] };
-    }
+    const { startDay, endDay } = getPeriodBounds(year, month);
+    rollupWhere.day = { [Op.between]: [startDay, endDay] };
   }
 
-  
-  const totalPatients = await Patient.count();
-  
-  const activePatients = await Patient.count({
-    include: [{ model: User, as: "user", where: { isActive: true }, attributes: [] }]
-  });
-
-  const inactivePatients = totalPatients - activePatients;
-
-  
-  const newPatients = await Patient.count({
-    include: [{ model: User, as: "user", where: userWhere, attributes: [] }]
-  });
-
-  
-  const genderStats = await Patient.findAll({
-    attributes: [
-      "gender",
-      [fn("COUNT", col("Patient.id")), "count"],
-    ],
-    group: ["gender"],
-    raw: true,
-  });
-
-  
   const ageGroups = [
     { name: "0-18", min: 0, max: 18 },
     { name: "19-30", min: 19, max: 30 },
@@ -740,100 +651,109 @@ export const getPatientStatisticsService = async (year: number, month?: number)
   ];
 
   const currentYear = new Date().getFullYear();
-  const ageStats = await Promise.all(
-    ageGroups.map(async (group) => {
-      const maxBirthYear = currentYear - group.min;
-      const minBirthYear = currentYear - group.max;
-
-      const count = await Patient.count({
-        where: {
-          dateOfBirth: {
-            [Op.gte]: new Date(minBirthYear, 0, 1),
-            [Op.lte]: new Date(maxBirthYear, 11, 31),
-          },
-        },
-      });
 
-      return {
-        ageRange: group.name,
-        count,
-      };
-    })
-  );
+  const [
+    totalPatients,
+    activePatients,
+    genderStats,
+    birthYearStats,
+    overTimeRaw,
+    topPatientsByVisits,
+  ] = await Promise.all([
+    Patient.count(),
+    Patient.count({
+      include: [{ model: User, as: "user", where: { isActive: true }, attributes: [] }]
+    }),
+    Patient.findAll({
+      attributes: [
+        "gender",
+        [fn("COUNT", col("Patient.id")), "count"],
+      ],
+      group: ["gender"],
+      raw: true,
+    }),
+    Patient.findAll({
+      attributes: [
+        [fn("YEAR", col("dateOfBirth")), "birthYear"],
+        [fn("COUNT", col("id")), "count"],
+      ],
+      where: {
+        dateOfBirth: {
+          [Op.gte]: new Date(currentYear - 150, 0, 1),
+          [Op.lte]: new Date(currentYear, 11, 31),
+        },
+      },
+      group: ["birthYear"],
+      raw: true,
+    }) as unknown as Promise<any[]>,
+    ReportDailyPatient.findAll({
+      attributes: [
+        [periodOf(month), "period"],
+        [fn("SUM", col("newPatients")), "count"],
+      ],
+      where: rollupWhere,
+      group: ["period"],
+      raw: true,
+    }) as unknown as Promise<any[]>,
+    Visit.findAll({
+      attributes: [
+        "patientId",
+        [fn("COUNT", col("Visit.id")), "visitCount"],
+      ],
+      group: ["patientId", "patient.id", "patient.user.id"],
+      include: [
+        {
+          model: Patient,
+          as: "patient",
+          attributes: ["id"],
+          include: [
+            {
+              model: User,
+              as: "user",
+              attributes: ["fullName"],
+            },
+          ],
+        },
+      ],
+      order: [[literal("visitCount"), "DESC"]],
+      limit: 10,
+      subQuery: false,
+      raw: true,
+      nest: true
+    }),
+  ]);
 
-  
-  const overTimeRaw = await Patient.findAll({
-    attributes: [
-      month 
-        ? [fn("DATE_FORMAT", col("user.createdAt"), "%Y-%m-%d"), "period"]
-        : [fn("DATE_FORMAT", col("user.createdAt"), "%Y-%m"), "period"],
-      [fn("COUNT", col("Patient.id")), "count"],
-    ],
-    include: [{
-      model: User,
-      as: "user",
-      attributes: [],
-      where: userWhere
-    }],
-    group: ["period"],
-    raw: true,
-  });
+  const inactivePatients = totalPatients - activePatients;
 
-  
-  const patientsOverTime: any[] = [];
-  if (year) {
-    if (month) {
-      const daysInMonth = new Date(year, month, 0).getDate();
-      for (let d = 1; d <= daysInMonth; d++) {
-        const p = `${year}-${month.toString().padStart(2, '0')}-${d.toString().padStart(2, '0')}`;
-        const found: any = overTimeRaw.find((item: any) => item.period === p);
-        patientsOverTime.push({
-          period: p,
-          newPatients: found ? parseInt(found.count) : 0,
-          totalPatients: totalPatients, 
-        });
-      }
-    } else {
-      for (let m = 1; m <= 12; m++) {
-        const p = `${year}-${m.toString().padStart(2, '0')}`;
-        const found: any = overTimeRaw.find((item: any) => item.period === p);
-        patientsOverTime.push({
-          period: p,
-          newPatients: found ? parseInt(found.count) : 0,
-          totalPatients: totalPatients,
-        });
-      }
-    }
+  const newPatientsByPeriod = new Map<string, number>(
+    overTimeRaw.map((row) => [row.period, Number(row.count) || 0])
+  );
+  let newPatients = 0;
+  for (const count of newPatientsByPeriod.values()) {
+    newPatients += count;
   }
 
-  
-  const topPatientsByVisits = await Visit.findAll({
-    attributes: [
-      "patientId",
-      [fn("COUNT", col("Visit.id")), "visitCount"],
-    ],
-    group: ["patientId", "patient.id", "patient.user.id"],
-    include: [
-      {
-        model: Patient,
-        as: "patient",
-        attributes: ["id"],
-        include: [
-          {
-            model: User,
-            as: "user",
-            attributes: ["fullName"],
-          },
-        ],
-      },
-    ],
-    order: [[literal("visitCount"), "DESC"]],
-    limit: 10,
-    subQuery: false,
-    raw: true,
-    nest: true
+  const ageStats = ageGroups.map((group) => {
+    const maxBirthYear = currentYear - group.min;
+    const minBirthYear = currentYear - group.max;
+    const count = birthYearStats
+      .filter((row) => Number(row.birthYear) >= minBirthYear && Number(row.birthYear) <= maxBirthYear)
+      .reduce((sum, row) => sum + (Number(row.count) || 0), 0);
+
+    return {
+      ageRange: group.name,
+      count,
+    };
   });
 
+  const patientsOverTime = year
+    ? listPeriods(year, month).map((period) => ({
+        period,
+        newPatients: newPatientsByPeriod.get(period) || 0,
+        totalPatients,
+      }))
+    : [];
+
   return {
     totalPatients,
     newPatients,
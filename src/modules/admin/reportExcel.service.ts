@@ -1,6 +1,16 @@
 import { Response } from "express";
-import { setupExcelResponse } from "../../utils/excelGenerator";
-import { getRevenueReportService, getExpenseReportService, getProfitReportService, getAppointmentReportService, getPatientStatisticsService } from "./report.service";
+import { once } from "events";
+import { Writable } from "stream";
+import { createStreamingWorkbook, setExcelHeaders, setupExcelResponse } from "../../utils/excelGenerator";
+import {
+  getRevenueReportService,
+  getExpenseReportService,
+  getProfitReportService,
+  getAppointmentReportService,
+  getPatientStatisticsService,
+  streamInvoiceDetailRows,
+  InvoiceDetailRow,
+} from "./report.service";
 
 const CLIEN_INFO = {
   name: "PHÒNG KHÁM ĐA KHOA QUỐC TẾ QLBV",
@@ -35,6 +45,20 @@ const STYLES = {
   }
 };
 
+const INVOICE_DETAIL_COLUMNS = [
+  { header: 'Mã hóa đơn', key: 'invoiceCode', width: 20 },
+  { header: 'Ngày lập', key: 'createdAt', width: 18, style: { numFmt: 'dd/mm/yyyy hh:mm' } },
+  { header: 'Mã BN', key: 'patientCode', width: 12 },
+  { header: 'Bệnh nhân', key: 'patientName', width: 28 },
+  { header: 'Bác sĩ', key: 'doctorName', width: 28 },
+  { header: 'Phí khám', key: 'examinationFee', width: 16, style: { numFmt: STYLES.cellNumber.numFmt } },
+  { header: 'Tiền thuốc', key: 'medicineTotalAmount', width: 16, style: { numFmt: STYLES.cellNumber.numFmt } },
+  { header: 'Giảm giá', key: 'discount', width: 14, style: { numFmt: STYLES.cellNumber.numFmt } },
+  { header: 'Tổng tiền', key: 'totalAmount', width: 16, style: { numFmt: STYLES.cellNumber.numFmt } },
+  { header: 'Đã thanh toán', key: 'paidAmount', width: 16, style: { numFmt: STYLES.cellNumber.numFmt } },
+  { header: 'Trạng thái', key: 'paymentStatus', width: 14 },
+];
+
 const addClinicHeader = (sheet: any) => {
   sheet.mergeCells('A1:C1');
   sheet.getCell('A1').value = CLIEN_INFO.name;
@@ -465,3 +489,56 @@ export const generatePatientStatisticsExcel = async (
   await workbook.xlsx.write(res);
   res.end();
 };
+
+
+export const writeInvoiceDetailWorkbook = async (
+  stream: Writable,
+  chunks: AsyncIterable<InvoiceDetailRow[]>,
+  sheetName: string
+): Promise<number> => {
+  const workbook = createStreamingWorkbook(stream);
+  const sheet = workbook.addWorksheet(sheetName, { views: [{ state: 'frozen', ySplit: 1 }] });
+  sheet.columns = INVOICE_DETAIL_COLUMNS;
+  sheet.getRow(1).eachCell(cell => cell.style = STYLES.tableHeader);
+  sheet.getRow(1).commit();
+
+  let written = 0;
+  for await (const rows of chunks) {
+    for (const row of rows) {
+      sheet.addRow({
+        invoiceCode: row.invoiceCode,
+        createdAt: new Date(row.createdAt),
+        patientCode: row.patientCode,
+        patientName: row.patientName,
+        doctorName: row.doctorName,
+        examinationFee: Number(row.examinationFee),
+        medicineTotalAmount: Number(row.medicineTotalAmount),
+        discount: Number(row.discount),
+        totalAmount: Number(row.totalAmount),
+        paidAmount: Number(row.paidAmount),
+        paymentStatus: row.paymentStatus,
+      }).commit();
+    }
+    written += rows.length;
+
+    if (stream.writableNeedDrain) {
+      await once(stream, 'drain');
+    }
+  }
+
+  sheet.commit();
+  await workbook.commit();
+  return written;
+};
+
+
+export const generateInvoiceDetailExcel = async (
+  res: Response,
+  filters: { year: number; month?: number }
+) => {
+  const { year, month } = filters;
+  const period = month ? `${year}_${month}` : `${year}`;
+
+  setExcelHeaders(res, `Invoice_Detail_${period}.xlsx`);
+  await writeInvoiceDetailWorkbook(res, streamInvoiceDetailRows(filters), `Invoices ${period}`);
+};
@@ -3,6 +3,7 @@ import SystemSettings from "../../models/SystemSettings";
 import { asyncHandler, sendSuccess } from "../../utils/response.utils";
 import logger from "../../utils/logger";
 import { clearMaintenanceCache } from "../../middlewares/maintenance.middlewares";
+import { CacheService } from "../../services/cache.service";
 
 
 export const getSystemSettings = asyncHandler(
@@ -155,3 +156,11 @@ export const updateSystemSettings = asyncHandler(
     sendSuccess(res, settings, "Cập nhật cài đặt hệ thống thành công");
   }
 );
+
+
+export const getCacheStats = asyncHandler(
+  async (req: Request, res: Response) => {
+    const stats = await CacheService.getStats();
+    sendSuccess(res, stats, "Lấy thống kê cache thành công");
+  }
+);
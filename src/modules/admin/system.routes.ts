@@ -2,6 +2,7 @@ import express from "express";
 import {
   getSystemSettings,
   updateSystemSettings,
+  getCacheStats,
 } from "./system.controller";
 import { verifyToken } from "../../middlewares/auth.middlewares";
 import { requireRole } from "../../middlewares/roleCheck.middlewares";
@@ -26,5 +27,13 @@ router.put(
   updateSystemSettings
 );
 
+
+router.get(
+  "/cache-stats",
+  verifyToken,
+  requireRole(RoleCode.ADMIN),
+  getCacheStats
+);
+
 export default router;
 
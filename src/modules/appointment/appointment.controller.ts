@@ -7,12 +7,12 @@ import {
   notifyAppointmentCreated,
   notifyAppointmentCancelled,
   notifyDoctorChanged,
+  notifyAppointmentRescheduled,
 } from "../../events/appointmentEvents";
 import { getDisplayStatus } from "../../utils/statusMapper";
 import * as auditLogService from "../admin/auditLog.service";
 import { AppointmentStateMachine } from "../../utils/stateMachine";
 import { AppointmentStatus } from "../../constant/appointment";
-import { sendAppointmentRescheduleNotification } from "../notification/notification.service";
 
 export const createAppointment = async (req: Request, res: Response) => {
   try {
@@ -381,15 +381,16 @@ export const updateAppointment = async (req: Request, res: Response) => {
           const newDateStr = newDate.toISOString().split("T")[0];
 
           
-          const ds = await DoctorShift.findOne({
+          const dayShifts = await DoctorShift.findAll({
             where: {
               doctorId: newDoctorId,
-              shiftId: newShiftId,
               workDate: newDateStr,
             },
+            order: [["id", "ASC"]],
             transaction: t,
             lock: t.LOCK.UPDATE,
           });
+          const ds = dayShifts.find((dayShift) => Number(dayShift.shiftId) === newShiftId);
 
           if (!ds) throw new Error("DOCTOR_NOT_ON_DUTY");
 
@@ -502,12 +503,12 @@ export const updateAppointment = async (req: Request, res: Response) => {
       console.log(`   New: Doctor ${newData.doctorId}, Shift ${newData.shiftId}, Date ${newData.date}`);
 
       try {
-        await sendAppointmentRescheduleNotification(result.appointment.id, {
+        notifyAppointmentRescheduled(result.appointment.id, {
           doctorId: oldData.doctorId,
           shiftId: oldData.shiftId,
           date: oldData.date,
         });
-        console.log(` Reschedule notification sent successfully`);
+        console.log(` Reschedule notification queued`);
       } catch (notifyErr) {
         console.error(" Failed to send reschedule notification:", notifyErr);
       }
@@ -516,13 +517,13 @@ export const updateAppointment = async (req: Request, res: Response) => {
       if (doctorChanged) {
         console.log(` Doctor changed from ${oldData.doctorId} to ${newData.doctorId}. Sending notifications...`);
         try {
-          await notifyDoctorChanged(
+          notifyDoctorChanged(
             result.appointment.id,
             oldData.doctorId,
             newData.doctorId,
             "Lịch hẹn đã được chuyển sang bác sĩ khác"
           );
-          console.log(` Doctor change notification sent successfully`);
+          console.log(` Doctor change notification queued`);
         } catch (err) {
           console.error(" Failed to send doctor change notification:", err);
         }
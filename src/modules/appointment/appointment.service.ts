@@ -6,6 +6,10 @@ import Patient from "../../models/Patient";
 import { sequelize } from "../../models/index";
 import { BOOKING_CONFIG } from "../../config/booking.config";
 import { generateAppointmentCode } from "../../utils/codeGenerator";
+import {
+  SlotAvailabilityService,
+  SlotReservation,
+} from "../../services/slotAvailability.service";
 
 interface CreateAppointmentInput {
   patientId: number;
@@ -24,6 +28,19 @@ interface CreateAppointmentInput {
 export const createAppointmentService = async (
   input: CreateAppointmentInput
 ) => {
+  try {
+    return await bookAppointment(input);
+  } catch (error: any) {
+    if (error?.name !== "SequelizeUniqueConstraintError") {
+      throw error;
+    }
+
+    await SlotAvailabilityService.rebuildDay(input.date);
+    return await bookAppointment(input);
+  }
+};
+
+const bookAppointment = async (input: CreateAppointmentInput) => {
   const {
     patientId,
     doctorId,
@@ -38,8 +55,8 @@ export const createAppointmentService = async (
     patientGender,
   } = input;
 
-  
-  
+  let reservation: SlotReservation | null = null;
+
   return await sequelize.transaction(
     { isolationLevel: Transaction.ISOLATION_LEVELS.READ_COMMITTED },
     async (t) => {
@@ -66,11 +83,13 @@ export const createAppointmentService = async (
       }
 
       
-      const ds = await DoctorShift.findOne({
-        where: { doctorId, shiftId, workDate: date },
-        transaction: t,
+      const dayShifts = await DoctorShift.findAll({
+        where: { doctorId, workDate: date },
+        order: [["id", "ASC"]],
         lock: t.LOCK.UPDATE,
+        transaction: t,
       });
+      const ds = dayShifts.find((dayShift) => Number(dayShift.shiftId) === Number(shiftId));
       if (!ds) throw new Error("DOCTOR_NOT_ON_DUTY");
 
       
@@ -92,9 +111,6 @@ export const createAppointmentService = async (
         }
       }
 
-      const effectiveMaxSlots =
-        ds.maxSlots || BOOKING_CONFIG.MAX_SLOTS_PER_SHIFT;
-
       
       
       const patientAppointments = await Appointment.findAll({
@@ -166,21 +182,8 @@ export const createAppointmentService = async (
         throw new Error("DAY_FULL");
 
       
-      const last = await Appointment.findOne({
-        where: {
-          doctorId,
-          shiftId,
-          date,
-          status: { [Op.ne]: "CANCELLED" },
-        },
-        order: [["slotNumber", "DESC"]],
-        transaction: t,
-        lock: t.LOCK.UPDATE,
-      });
-
-      let nextSlot = last ? Number(last.slotNumber) + 1 : 1;
-      if (nextSlot > effectiveMaxSlots) throw new Error("SHIFT_FULL");
-
+      reservation = await SlotAvailabilityService.reserve(doctorId, shiftId, date);
+      const nextSlot = reservation.slotNumber;
       
       const Shift = (await import("../../models/Shift")).default;
       const shift = await Shift.findByPk(shiftId, { transaction: t });
@@ -218,44 +221,33 @@ export const createAppointmentService = async (
       
       const appointmentCode = await generateAppointmentCode();
 
-      
-      while (nextSlot <= effectiveMaxSlots) {
-        try {
-
-          
-          
-          const lastQueueNumber = last?.queueNumber ?? last?.slotNumber ?? 0;
-          
-          const appt = await Appointment.create(
-            {
-              appointmentCode,
-              patientId,
-              doctorId,
-              shiftId,
-              date,
-              slotNumber: nextSlot,
-              queueNumber: lastQueueNumber + 1,
-              bookingType,
-              bookedBy,
-              symptomInitial,
-              patientName,
-              patientPhone,
-              patientDob,
-              patientGender,
-              status: "WAITING",
-            },
-            { transaction: t }
-          );
-          return appt;
-        } catch (err: any) {
-          if (err?.name === "SequelizeUniqueConstraintError") {
-            nextSlot += 1;
-            continue;
-          }
-          throw err;
-        }
-      }
-      throw new Error("SHIFT_FULL");
+      return await Appointment.create(
+        {
+          appointmentCode,
+          patientId,
+          doctorId,
+          shiftId,
+          date,
+          slotNumber: nextSlot,
+          queueNumber: reservation.queueNumber,
+          bookingType,
+          bookedBy,
+          symptomInitial,
+          patientName,
+          patientPhone,
+          patientDob,
+          patientGender,
+          status: "WAITING",
+        },
+        { transaction: t, slotReserved: true } as any
+      );
+    }
+  ).catch(async (error: any) => {
+    if (reservation) {
+      await SlotAvailabilityService.release(reservation).catch((releaseError) => {
+        console.error("Failed to release slot reservation:", releaseError);
+      });
     }
-  );
+    throw error;
+  });
 };
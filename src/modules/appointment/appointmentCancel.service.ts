@@ -5,7 +5,7 @@ import { RoleCode } from "../../constant/role";
 import { AppointmentStateMachine } from "../../utils/stateMachine";
 import { AppointmentStatus } from "../../constant/appointment";
 
-import { Op, Transaction } from "sequelize";
+import { Transaction } from "sequelize";
 import { sequelize } from "../../models/index";
 
 
@@ -70,27 +70,11 @@ export const cancelAppointmentService = async (input: {
 
       if (new Date() > cancelDeadline) throw new Error("CANCEL_TOO_LATE");
 
-      const currentQueue = appt.queueNumber;
-
       
       appt.status = AppointmentStatus.CANCELLED;
       appt.queueNumber = null as any; 
       await appt.save({ transaction: t });
 
-      
-      if (currentQueue) {
-        await Appointment.decrement("queueNumber", {
-          where: {
-            doctorId: appt.doctorId,
-            shiftId: appt.shiftId,
-            date: appt.date,
-            queueNumber: { [Op.gt]: currentQueue },
-            status: { [Op.ne]: "CANCELLED" },
-          },
-          transaction: t,
-        });
-      }
-
       return appt;
     }
   );
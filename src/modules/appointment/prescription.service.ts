@@ -15,9 +15,11 @@ import Invoice, { PaymentStatus } from "../../models/Invoice";
 import InvoiceItem, { ItemType } from "../../models/InvoiceItem";
 import {
   generatePrescriptionCode,
-  generateExportCode,
+  generateExportCodes,
   generateInvoiceCode,
 } from "../../utils/codeGenerator";
+import { CacheService, CacheTags } from "../../services/cache.service";
+import { StockReservationService } from "../../services/stockReservation.service";
 
 
 interface MedicineInput {
@@ -42,13 +44,55 @@ interface UpdatePrescriptionInput {
   note?: string;
 }
 
+const buildPrescriptionLines = async (
+  prescriptionId: number,
+  prescriptionCode: string,
+  items: MedicineInput[],
+  medicines: Map<number, Medicine>,
+  userId: number
+) => {
+  const exportCodes = await generateExportCodes(items.length);
+  const exportDate = new Date();
+  let totalAmount = 0;
+
+  const details = items.map((item) => {
+    const medicine = medicines.get(Number(item.medicineId))!;
+    totalAmount += medicine.salePrice * item.quantity;
+    return {
+      prescriptionId,
+      medicineId: medicine.id,
+      medicineName: medicine.name,
+      quantity: item.quantity,
+      unit: medicine.unit,
+      unitPrice: medicine.salePrice,
+      dosageMorning: item.dosageMorning,
+      dosageNoon: item.dosageNoon,
+      dosageAfternoon: item.dosageAfternoon,
+      dosageEvening: item.dosageEvening,
+      instruction: item.instruction,
+      days: item.days || 1,
+    };
+  });
+
+  const exports = items.map((item, index) => ({
+    exportCode: exportCodes[index],
+    medicineId: Number(item.medicineId),
+    quantity: item.quantity,
+    exportDate,
+    userId,
+    reason: `PRESCRIPTION_${prescriptionCode}`,
+  }));
+
+  return { details, exports, totalAmount };
+};
+
 
 export const createPrescriptionService = async (
   doctorId: number,
   patientId: number,
   input: CreatePrescriptionInput
 ) => {
-  return await sequelize.transaction(
+  const result = await sequelize.transaction(
     {
       isolationLevel: Transaction.ISOLATION_LEVELS.READ_COMMITTED,
     },
@@ -95,7 +139,7 @@ export const createPrescriptionService = async (
       }
 
       
-      const prescriptionCode = await generatePrescriptionCode(t);
+      const prescriptionCode = await generatePrescriptionCode();
       const doctorUser = await Doctor.findByPk(doctorId, { transaction: t });
       const doctorUserId = doctorUser?.userId || doctorId;
 
@@ -113,72 +157,16 @@ export const createPrescriptionService = async (
         { transaction: t }
       );
 
-      let totalAmount = 0;
-
-      
-      for (const item of input.medicines) {
-        
-        const medicine = await Medicine.findByPk(item.medicineId, {
-          transaction: t,
-          lock: t.LOCK.UPDATE, 
-        });
-
-        if (!medicine) {
-          throw new Error(`MEDICINE_NOT_FOUND_${item.medicineId}`);
-        }
-
-        if (medicine.status !== "ACTIVE") {
-          throw new Error(`MEDICINE_NOT_ACTIVE_${medicine.name}`);
-        }
-
-        
-        if (medicine.quantity < item.quantity) {
-          throw new Error(
-            `INSUFFICIENT_STOCK_${medicine.name}_Available:${medicine.quantity}_Requested:${item.quantity}`
-          );
-        }
-
-        
-        medicine.quantity -= item.quantity;
-        await medicine.save({ transaction: t });
-
-        
-        const itemTotal = medicine.salePrice * item.quantity;
-        totalAmount += itemTotal;
-
-        
-        await PrescriptionDetail.create(
-          {
-            prescriptionId: prescription.id,
-            medicineId: medicine.id,
-            medicineName: medicine.name, 
-            quantity: item.quantity,
-            unit: medicine.unit, 
-            unitPrice: medicine.salePrice, 
-            dosageMorning: item.dosageMorning,
-            dosageNoon: item.dosageNoon,
-            dosageAfternoon: item.dosageAfternoon,
-            dosageEvening: item.dosageEvening,
-            instruction: item.instruction,
-            days: item.days || 1,
-          },
-          { transaction: t }
-        );
-
-        
-        const exportCode = await generateExportCode(t);
-        await MedicineExport.create(
-          {
-            exportCode,
-            medicineId: medicine.id,
-            quantity: item.quantity,
-            exportDate: new Date(),
-            userId: doctorId,
-            reason: `PRESCRIPTION_${prescriptionCode}`,
-          },
-          { transaction: t }
-        );
-      }
+      const medicines = await StockReservationService.apply(input.medicines, [], t);
+      const { details, exports, totalAmount } = await buildPrescriptionLines(
+        prescription.id,
+        prescriptionCode,
+        input.medicines,
+        medicines,
+        doctorId
+      );
+      await PrescriptionDetail.bulkCreate(details, { transaction: t });
+      await MedicineExport.bulkCreate(exports, { transaction: t });
 
       
       prescription.totalAmount = totalAmount;
@@ -204,6 +192,8 @@ export const createPrescriptionService = async (
       return prescription;
     }
   );
+  await CacheService.invalidateTags([CacheTags.MEDICINES]);
+  return result;
 };
 
 
@@ -212,7 +202,7 @@ export const updatePrescriptionService = async (
   doctorId: number,
   input: UpdatePrescriptionInput
 ) => {
-  return await sequelize.transaction(
+  const result = await sequelize.transaction(
     {
       isolationLevel: Transaction.ISOLATION_LEVELS.READ_COMMITTED,
     },
@@ -262,16 +252,7 @@ export const updatePrescriptionService = async (
           transaction: t,
         });
 
-        for (const oldDetail of oldDetails) {
-          const medicine = await Medicine.findByPk(oldDetail.medicineId, {
-            transaction: t,
-            lock: t.LOCK.UPDATE,
-          });
-          if (medicine) {
-            medicine.quantity += oldDetail.quantity; 
-            await medicine.save({ transaction: t });
-          }
-        }
+        const medicines = await StockReservationService.apply(input.medicines, oldDetails, t);
 
         
         await PrescriptionDetail.destroy({
@@ -283,68 +264,15 @@ export const updatePrescriptionService = async (
           transaction: t,
         });
 
-        
-        let totalAmount = 0;
-        const newDetails = [];
-
-        for (const item of input.medicines) {
-          const medicine = await Medicine.findByPk(item.medicineId, {
-            transaction: t,
-            lock: t.LOCK.UPDATE,
-          });
-
-          if (!medicine) {
-            throw new Error(`MEDICINE_NOT_FOUND_${item.medicineId}`);
-          }
-
-          if (medicine.status !== "ACTIVE") {
-            throw new Error(`MEDICINE_NOT_ACTIVE_${medicine.name}`);
-          }
-
-          if (medicine.quantity < item.quantity) {
-            throw new Error(
-              `INSUFFICIENT_STOCK_${medicine.name}_Available:${medicine.quantity}_Requested:${item.quantity}`
-            );
-          }
-
-          medicine.quantity -= item.quantity;
-          await medicine.save({ transaction: t });
-
-          const itemTotal = medicine.salePrice * item.quantity;
-          totalAmount += itemTotal;
-
-          const detail = await PrescriptionDetail.create(
-            {
-              prescriptionId: prescription.id,
-              medicineId: medicine.id,
-              medicineName: medicine.name,
-              quantity: item.quantity,
-              unit: medicine.unit,
-              unitPrice: medicine.salePrice,
-              dosageMorning: item.dosageMorning,
-              dosageNoon: item.dosageNoon,
-              dosageAfternoon: item.dosageAfternoon,
-              dosageEvening: item.dosageEvening,
-              instruction: item.instruction,
-              days: item.days || 1,
-            },
-            { transaction: t }
-          );
-          newDetails.push(detail);
-
-          const exportCode = await generateExportCode(t);
-          await MedicineExport.create(
-            {
-              exportCode,
-              medicineId: medicine.id,
-              quantity: item.quantity,
-              exportDate: new Date(),
-              userId: doctorId,
-              reason: `PRESCRIPTION_${prescription.prescriptionCode}`,
-            },
-            { transaction: t }
-          );
-        }
+        const { details, exports, totalAmount } = await buildPrescriptionLines(
+          prescription.id,
+          prescription.prescriptionCode,
+          input.medicines,
+          medicines,
+          doctorId
+        );
+        const newDetails = await PrescriptionDetail.bulkCreate(details, { transaction: t });
+        await MedicineExport.bulkCreate(exports, { transaction: t });
 
         prescription.totalAmount = totalAmount;
 
@@ -352,23 +280,20 @@ export const updatePrescriptionService = async (
         if (invoice) {
           let medicineTotalAmount = 0;
 
-          for (const detail of newDetails) {
+          const items = newDetails.map((detail) => {
             const subtotal = Number(detail.quantity) * Number(detail.unitPrice);
             medicineTotalAmount += subtotal;
-
-            await InvoiceItem.create(
-              {
-                invoiceId: invoice.id,
-                itemType: ItemType.MEDICINE,
-                prescriptionDetailId: detail.id,
-                medicineName: detail.medicineName,
-                quantity: detail.quantity,
-                unitPrice: detail.unitPrice,
-                subtotal,
-              },
-              { transaction: t }
-            );
-          }
+            return {
+              invoiceId: invoice.id,
+              itemType: ItemType.MEDICINE,
+              prescriptionDetailId: detail.id,
+              medicineName: detail.medicineName,
+              quantity: detail.quantity,
+              unitPrice: detail.unitPrice,
+              subtotal,
+            };
+          });
+          await InvoiceItem.bulkCreate(items, { transaction: t });
 
           invoice.medicineTotalAmount = medicineTotalAmount;
           invoice.totalAmount =
@@ -389,6 +314,8 @@ export const updatePrescriptionService = async (
       return prescription;
     }
   );
+  await CacheService.invalidateTags([CacheTags.MEDICINES]);
+  return result;
 };
 
 
@@ -396,7 +323,7 @@ export const cancelPrescriptionService = async (
   prescriptionId: number,
   doctorId: number
 ) => {
-  return await sequelize.transaction(
+  const result = await sequelize.transaction(
     {
       isolationLevel: Transaction.ISOLATION_LEVELS.READ_COMMITTED,
     },
@@ -428,16 +355,7 @@ export const cancelPrescriptionService = async (
         transaction: t,
       });
 
-      for (const detail of details) {
-        const medicine = await Medicine.findByPk(detail.medicineId, {
-          transaction: t,
-          lock: t.LOCK.UPDATE,
-        });
-        if (medicine) {
-          medicine.quantity += detail.quantity;
-          await medicine.save({ transaction: t });
-        }
-      }
+      await StockReservationService.apply([], details, t);
 
       
       prescription.status = PrescriptionStatus.CANCELLED;
@@ -446,6 +364,8 @@ export const cancelPrescriptionService = async (
       return prescription;
     }
   );
+  await CacheService.invalidateTags([CacheTags.MEDICINES]);
+  return result;
 };
 
 
@@ -8,6 +8,7 @@ import {
   generateAccessToken,
   generateRefreshToken,
   verifyAccessToken,
+  resolveIdentityClaims,
 } from "../../utils/jwt";
 import jwt from "jsonwebtoken";
 import { TokenBlacklistService } from "../../config/redis.config";
@@ -191,11 +192,20 @@ export const refreshToken = async (req: Request, res: Response) => {
       doctorId?: number | null;
     };
 
+    let patientId = decoded.patientId ?? null;
+    let doctorId = decoded.doctorId ?? null;
+    if (
+      (decoded.roleId === RoleCode.PATIENT && patientId === null) ||
+      (decoded.roleId === RoleCode.DOCTOR && doctorId === null)
+    ) {
+      ({ patientId, doctorId } = await resolveIdentityClaims(decoded.userId, decoded.roleId));
+    }
+
     const newAccessToken = generateAccessToken({
       userId: decoded.userId,
       roleId: decoded.roleId,
-      patientId: decoded.patientId ?? null,
-      doctorId: decoded.doctorId ?? null,
+      patientId: patientId ?? null,
+      doctorId: doctorId ?? null,
     });
 
     return res.json({
@@ -1,5 +1,6 @@
 import { Request, Response } from "express";
 import jwt from "jsonwebtoken";
+import { resolveIdentityClaims } from "../../utils/jwt";
 
 
 export const oauthCallback = async (req: Request, res: Response) => {
@@ -18,6 +19,7 @@ export const oauthCallback = async (req: Request, res: Response) => {
       userId: user.id,
       email: user.email,
       roleId: user.roleId,
+      ...(await resolveIdentityClaims(user.id, user.roleId)),
     };
 
     const jwtSecret = process.env.JWT_SECRET;
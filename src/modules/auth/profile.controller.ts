@@ -4,6 +4,8 @@ import Role from "../../models/Role";
 import Patient from "../../models/Patient";
 import Doctor from "../../models/Doctor";
 import bcrypt from "bcrypt";
+import { CacheService, CacheTags } from "../../services/cache.service";
+import { PatientSearchIndex } from "../../services/patientSearch.service";
 
 
 export const getMyProfile = async (req: Request, res: Response) => {
@@ -132,6 +134,9 @@ export const updateMyProfile = async (req: Request, res: Response) => {
     if (avatar) user.avatar = avatar;
     if (email) user.email = email;
     await user.save();
+    if (user.roleId === 4) {
+      await CacheService.invalidateTags([CacheTags.DOCTORS]);
+    }
 
     
     if (user.roleId === 3) {
@@ -178,6 +183,7 @@ export const updateMyProfile = async (req: Request, res: Response) => {
             });
           }
         }
+        await PatientSearchIndex.refreshContacts([patient.id]);
       }
     } else if ([1, 2, 4].includes(user.roleId)) {
       
@@ -282,6 +288,9 @@ export const uploadMyAvatar = async (req: Request, res: Response) => {
     const avatarUrl = `/uploads/avatars/${req.file.filename}`;
     user.avatar = avatarUrl;
     await user.save();
+    if (user.roleId === 4) {
+      await CacheService.invalidateTags([CacheTags.DOCTORS]);
+    }
 
     
     try {
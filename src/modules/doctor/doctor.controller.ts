@@ -2,7 +2,7 @@ import { Request, Response } from "express";
 import Doctor from "../../models/Doctor";
 import User from "../../models/User";
 import Specialty from "../../models/Specialty";
-import { CacheService, CacheKeys } from "../../services/cache.service";
+import { CacheService, CacheKeys, CacheTags } from "../../services/cache.service";
 import { createDoctor } from "./doctor.service";
 import Employee from "../../models/Employee";
 
@@ -102,6 +102,7 @@ export const updateDoctor = async (req: Request, res: Response) => {
         .status(404)
         .json({ success: false, message: "Doctor not found" });
     await doctor.update({ specialtyId, position, degree, description });
+    await CacheService.invalidateTags([CacheTags.DOCTORS]);
     return res.json({ success: true, data: doctor });
   } catch (error) {
     return res
@@ -119,6 +120,7 @@ export const deleteDoctor = async (req: Request, res: Response) => {
         .status(404)
         .json({ success: false, message: "Doctor not found" });
     await doctor.destroy();
+    await CacheService.invalidateTags([CacheTags.DOCTORS]);
     return res.json({ success: true, message: "Doctor deleted" });
   } catch (error) {
     return res
@@ -245,6 +247,7 @@ export const updateSpecialtyById = async (req: Request, res: Response) => {
 
     await specialty.update(updateData);
     await CacheService.invalidate(CacheKeys.SPECIALTIES);
+    await CacheService.invalidateTags([CacheTags.SPECIALTIES]);
 
     return res.json({ success: true, data: specialty });
   } catch (error) {
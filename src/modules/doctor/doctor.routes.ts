@@ -13,12 +13,18 @@ import { requireRole } from "../../middlewares/roleCheck.middlewares";
 import { RoleCode } from "../../constant/role";
 import { verifyToken } from "../../middlewares/auth.middlewares";
 import { getShiftsByDoctor } from "./doctorShift.controller";
+import { cacheMiddleware } from "../../middlewares/cache.middlewares";
+import { CacheTags } from "../../services/cache.service";
 
 const router = Router();
 
 
-router.get("/public-list", getPublicDoctorsList);
-router.get("/specialties", getAllSpecialties);
+router.get(
+  "/public-list",
+  cacheMiddleware({ shared: true, tags: [CacheTags.DOCTORS, CacheTags.SPECIALTIES] }),
+  getPublicDoctorsList
+);
+router.get("/specialties", cacheMiddleware({ shared: true, tags: [CacheTags.SPECIALTIES] }), getAllSpecialties);
 
 router.use(verifyToken);
 
@@ -30,13 +36,23 @@ router.get(
 );
 
 
-router.get("/", requireRole(RoleCode.ADMIN, RoleCode.RECEPTIONIST, RoleCode.DOCTOR), getAllDoctors);
+router.get(
+  "/",
+  requireRole(RoleCode.ADMIN, RoleCode.RECEPTIONIST, RoleCode.DOCTOR),
+  cacheMiddleware({ shared: true, tags: [CacheTags.DOCTORS, CacheTags.SPECIALTIES] }),
+  getAllDoctors
+);
 
 
 router.get("/:doctorId/shifts", getShiftsByDoctor);
 
 
-router.get("/:id", requireRole(RoleCode.ADMIN), getDoctorById);
+router.get(
+  "/:id",
+  requireRole(RoleCode.ADMIN),
+  cacheMiddleware({ shared: true, tags: [CacheTags.DOCTORS, CacheTags.SPECIALTIES] }),
+  getDoctorById
+);
 
 
 router.post("/", requireRole(RoleCode.ADMIN), createDoctorController);
@@ -1,22 +1,9 @@
 import Doctor from "../../models/Doctor";
+import { nextCode } from "../../utils/codeGenerator";
+import { CacheService, CacheTags } from "../../services/cache.service";
 
 export async function generateDoctorCode(): Promise<string> {
-  
-  const lastDoctor = await Doctor.findOne({
-    order: [["doctorCode", "DESC"]],
-  });
-
-  let nextNumber = 1;
-  if (lastDoctor && lastDoctor.doctorCode) {
-    
-    const match = lastDoctor.doctorCode.match(/BS(\d{6})/);
-    if (match) {
-      nextNumber = parseInt(match[1], 10) + 1;
-    }
-  }
-
-  
-  return `BS${nextNumber.toString().padStart(6, "0")}`;
+  return nextCode(Doctor, "doctorCode", "BS", 6);
 }
 
 export async function createDoctor(data: {
@@ -27,8 +14,10 @@ export async function createDoctor(data: {
   description?: string;
 }) {
   const doctorCode = await generateDoctorCode();
-  return Doctor.create({
+  const doctor = await Doctor.create({
     doctorCode,
     ...data,
   });
+  await CacheService.invalidateTags([CacheTags.DOCTORS]);
+  return doctor;
 }
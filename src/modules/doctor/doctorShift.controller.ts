@@ -1,5 +1,4 @@
 import { Request, Response } from "express";
-import { Op } from "sequelize";
 import DoctorShift from "../../models/DoctorShift";
 import Doctor from "../../models/Doctor";
 import Shift from "../../models/Shift";
@@ -9,7 +8,9 @@ import Employee from "../../models/Employee";
 import { cancelDoctorShiftAndReschedule } from "../appointment/appointmentReschedule.service";
 import { assignDoctorToShiftService } from "./doctorShift.service";
 import * as auditLogService from "../admin/auditLog.service";
-import Appointment from "../../models/Appointment";
+import { BOOKING_CONFIG } from "../../config/booking.config";
+import { CacheService, CacheKeys } from "../../services/cache.service";
+import { SlotAvailabilityService } from "../../services/slotAvailability.service";
 
 export const assignDoctorToShift = async (req: Request, res: Response) => {
   try {
@@ -345,8 +346,18 @@ export const getAvailableShifts = async (req: Request, res: Response) => {
       });
     }
 
-    
-    const allShifts = await Shift.findAll();
+    const [allShifts, roster, availability] = await Promise.all([
+      CacheService.getOrSet(
+        CacheKeys.SHIFTS,
+        () => Shift.findAll({ order: [["id", "ASC"]], raw: true }),
+        3600
+      ),
+      SlotAvailabilityService.getRoster(String(workDate)),
+      SlotAvailabilityService.getDay(String(workDate)),
+    ]);
+    const remainingByShift = new Map(
+      availability.map((slot) => [slot.doctorShiftId, slot.remaining])
+    );
 
     
     const today = new Date().toLocaleDateString("en-CA");
@@ -356,45 +367,33 @@ export const getAvailableShifts = async (req: Request, res: Response) => {
     if (isToday) {
       const now = new Date();
       currentTime = `${String(now.getHours()).padStart(2, "0")}:${String(now.getMinutes()).padStart(2, "0")}:00`;
-      console.log(`⏰ Querying shifts for today. Current time: ${currentTime}`);
     }
 
     
-    const whereCondition: any = { workDate: String(workDate) };
-
-    const doctorShifts = await DoctorShift.findAll({
-      where: whereCondition,
-      include: [
-        {
-          model: Doctor,
-          as: "doctor",
-          where: specialtyId ? { specialtyId: Number(specialtyId) } : undefined,
-        },
-        { model: Shift, as: "shift" },
-      ],
-    });
-
-    
     const shiftMap = new Map<number, any>();
 
     allShifts.forEach((shift: any) => {
       
       if (isToday && currentTime >= shift.endTime) {
-        console.log(`⏰ Skipping shift "${shift.name}" (${shift.endTime}) - already ended`);
         return; 
       }
 
       shiftMap.set(shift.id, {
-        shift: shift.toJSON(),
+        shift,
         doctorCount: 0,
+        remainingSlots: 0,
         doctors: [],
       });
     });
 
-    doctorShifts.forEach((ds: any) => {
+    roster.forEach((ds: any) => {
+      if (specialtyId && ds.doctor?.specialtyId !== Number(specialtyId)) {
+        return;
+      }
       const shiftData = shiftMap.get(ds.shiftId);
       if (shiftData) {
         shiftData.doctorCount += 1;
+        shiftData.remainingSlots += remainingByShift.get(ds.id) ?? 0;
         shiftData.doctors.push(ds.doctor);
       }
     });
@@ -420,8 +419,6 @@ export const getAvailableShifts = async (req: Request, res: Response) => {
 export const getAvailableDoctorsByDate = async (req: Request, res: Response) => {
   try {
     const { workDate, specialtyId } = req.query;
-    
-    console.log("getAvailableDoctorsByDate called with:", { workDate, specialtyId });
 
     if (!workDate) {
       return res.status(400).json({
@@ -439,89 +436,23 @@ export const getAvailableDoctorsByDate = async (req: Request, res: Response) =>
     }
 
     
-    const whereCondition: any = {
-      workDate: String(workDate),
-      status: "ACTIVE" 
-    };
-
-    
-    const doctorWhere: any = {};
-    if (specialtyId) {
-      doctorWhere.specialtyId = Number(specialtyId);
-    }
-
-    
-    const doctorShifts = await DoctorShift.findAll({
-      where: whereCondition,
-      include: [
-        {
-          model: Doctor,
-          as: "doctor",
-          where: Object.keys(doctorWhere).length > 0 ? doctorWhere : undefined,
-          include: [
-            {
-              model: User,
-              as: "user",
-              attributes: ["id", "fullName", "email", "avatar", "isActive"],
-              include: [
-                {
-                  model: Employee,
-                  as: "employee",
-                  attributes: ["phone", "gender", "dateOfBirth", "address"],
-                },
-              ],
-            },
-            {
-              model: Specialty,
-              as: "specialty",
-              attributes: ["id", "name", "description"],
-            },
-          ],
-        },
-        {
-          model: Shift,
-          as: "shift",
-          attributes: ["id", "name", "startTime", "endTime"],
-        },
-      ],
-    });
-    
-    console.log(`Found ${doctorShifts.length} doctor shifts for date ${workDate}`);
-
-    
-    
-    const bookings = await Appointment.findAll({
-      where: {
-        date: String(workDate),
-        status: {
-            [Op.ne]: "CANCELLED"
-        }
-      },
-      attributes: ["doctorId", "shiftId", "status"]
-    });
-
-    
-    const bookingMap = new Map<string, number>();
-    bookings.forEach((booking: any) => {
-        if (booking.status !== "CANCELLED" && booking.status !== "NO_SHOW") { 
-            const key = `${booking.doctorId}_${booking.shiftId}`;
-            bookingMap.set(key, (bookingMap.get(key) || 0) + 1);
-        }
-    });
+    const [roster, availability] = await Promise.all([
+      SlotAvailabilityService.getRoster(String(workDate)),
+      SlotAvailabilityService.getDay(String(workDate)),
+    ]);
+    const slotMap = new Map(availability.map((slot) => [slot.doctorShiftId, slot]));
 
     
     const doctorMap = new Map<number, any>();
 
-    doctorShifts.forEach((ds: any) => {
+    roster.forEach((ds: any) => {
+      if (specialtyId && ds.doctor?.specialtyId !== Number(specialtyId)) {
+        return;
+      }
       const doctorId = ds.doctor.id;
-      const shiftId = ds.shiftId;
-      
-      const currentBookings = bookingMap.get(`${doctorId}_${shiftId}`) || 0;
-      
-      
-      
-      
-      const maxSlots = ds.maxSlots || 10; 
+      const slot = slotMap.get(ds.id);
+      const maxSlots = slot?.capacity ?? (ds.maxSlots || BOOKING_CONFIG.MAX_SLOTS_PER_SHIFT);
+      const currentBookings = slot?.bookedCount ?? 0;
 
       if (!doctorMap.has(doctorId)) {
         doctorMap.set(doctorId, {
@@ -548,6 +479,7 @@ export const getAvailableDoctorsByDate = async (req: Request, res: Response) =>
         status: ds.status,
         maxSlots: maxSlots,
         currentBookings: currentBookings,
+        remainingSlots: Math.max(0, maxSlots - currentBookings),
         isFull: currentBookings >= maxSlots
       });
       doctorData.shiftCount += 1;
@@ -9,16 +9,28 @@ import { validateNumericId } from "../../middlewares/validators/common.validator
 import { verifyToken } from "../../middlewares/auth.middlewares";
 import { requireRole } from "../../middlewares/roleCheck.middlewares";
 import { RoleCode } from "../../constant/role";
+import { cacheMiddleware } from "../../middlewares/cache.middlewares";
+import { CacheTags } from "../../services/cache.service";
 
 const router = Router();
 
-router.get("/", getAllSpecialties);
+router.get("/", cacheMiddleware({ shared: true, tags: [CacheTags.SPECIALTIES] }), getAllSpecialties);
 
 
-router.get("/:id", validateNumericId("id"), getSpecialtyById);
+router.get(
+  "/:id",
+  validateNumericId("id"),
+  cacheMiddleware({ shared: true, tags: [CacheTags.SPECIALTIES] }),
+  getSpecialtyById
+);
 
 
-router.get("/:id/doctors", validateNumericId("id"), getDoctorsBySpecialty);
+router.get(
+  "/:id/doctors",
+  validateNumericId("id"),
+  cacheMiddleware({ shared: true, tags: [CacheTags.SPECIALTIES, CacheTags.DOCTORS] }),
+  getDoctorsBySpecialty
+);
 
 
 router.use(verifyToken);
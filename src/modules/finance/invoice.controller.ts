@@ -1,6 +1,7 @@
 ﻿import { Request, Response } from "express";
 import {
   createInvoiceFromVisit,
+  createInvoicesForCompletedVisitsService,
   getInvoicesService,
   getInvoiceByIdService,
   updateInvoiceService,
@@ -21,6 +22,7 @@ import * as auditLogService from "../admin/auditLog.service";
 import Invoice from "../../models/Invoice";
 import Patient from "../../models/Patient";
 import { RoleCode } from "../../constant/role";
+import { toDayKey } from "../../services/reportRollup.service";
 
 
 export const createInvoice = async (req: Request, res: Response) => {
@@ -55,6 +57,45 @@ export const createInvoice = async (req: Request, res: Response) => {
 };
 
 
+export const createDailyInvoices = async (req: Request, res: Response) => {
+  try {
+    const { date, examinationFee } = req.body;
+    const createdBy = req.user!.userId;
+
+    if (!examinationFee || Number(examinationFee) <= 0) {
+      return res.status(400).json({
+        success: false,
+        message: "examinationFee is required",
+      });
+    }
+
+    if (date !== undefined && !/^\d{4}-\d{2}-\d{2}$/.test(String(date))) {
+      return res.status(400).json({
+        success: false,
+        message: "date must be in YYYY-MM-DD format",
+      });
+    }
+
+    const result = await createInvoicesForCompletedVisitsService(
+      date || toDayKey(new Date()),
+      createdBy,
+      Number(examinationFee)
+    );
+
+    return res.status(201).json({
+      success: true,
+      message: `Created ${result.createdCount} invoices`,
+      data: result,
+    });
+  } catch (error: any) {
+    return res.status(500).json({
+      success: false,
+      message: error?.message || "Failed to create invoices",
+    });
+  }
+};
+
+
 export const getInvoices = async (req: Request, res: Response) => {
   try {
     const {
@@ -77,6 +118,7 @@ export const getInvoices = async (req: Request, res: Response) => {
       toDate: toDate ? new Date(toDate as string) : undefined,
       keyword: req.query.keyword as string,
       invoiceCode: req.query.invoiceCode as string,
+      cursor: typeof req.query.cursor === "string" ? req.query.cursor : undefined,
     };
 
     
@@ -100,7 +142,7 @@ export const getInvoices = async (req: Request, res: Response) => {
       pagination: result.pagination,
     });
   } catch (error: any) {
-    return res.status(500).json({
+    return res.status(error?.status || 500).json({
       success: false,
       message: error?.message || "Failed to retrieve invoices",
     });
@@ -283,7 +325,7 @@ export const getInvoicePayments = async (req: Request, res: Response) => {
     const invoiceId = parseInt(req.params.id);
 
     
-    const invoice = await getInvoiceByIdService(invoiceId);
+    const invoice = await getInvoiceByIdService(invoiceId, "list");
 
     
     if (req.user!.roleId === RoleCode.DOCTOR) {
@@ -321,7 +363,7 @@ export const getInvoicePayments = async (req: Request, res: Response) => {
 export const exportInvoicePDF = async (req: Request, res: Response) => {
   try {
     const invoiceId = parseInt(req.params.id);
-    const invoice = await getInvoiceByIdService(invoiceId);
+    const invoice = await getInvoiceByIdService(invoiceId, "pdf");
 
     
     const user = (req as any).user;
@@ -1,6 +1,7 @@
 import { Router } from "express";
 import {
   createInvoice,
+  createDailyInvoices,
   getInvoices,
   getInvoiceById,
   updateInvoice,
@@ -63,6 +64,12 @@ router.post(
   createInvoice
 );
 
+router.post(
+  "/bulk/daily",
+  requireRole(RoleCode.ADMIN, RoleCode.RECEPTIONIST),
+  createDailyInvoices
+);
+
 router.get(
   "/",
   requireRole(RoleCode.ADMIN, RoleCode.RECEPTIONIST, RoleCode.DOCTOR),
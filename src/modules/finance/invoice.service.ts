@@ -1,4 +1,4 @@
-import { Transaction, Op } from "sequelize";
+import { Transaction, Op, literal } from "sequelize";
 import Invoice, { PaymentStatus } from "../../models/Invoice";
 import InvoiceItem, { ItemType } from "../../models/InvoiceItem";
 import Payment, { PaymentMethod } from "../../models/Payment";
@@ -12,123 +12,105 @@ import Appointment from "../../models/Appointment";
 import Shift from "../../models/Shift";
 import Specialty from "../../models/Specialty";
 import sequelize from "../../config/database";
-import { generateInvoiceCode } from "../../utils/codeGenerator";
+import { generateInvoiceCodes } from "../../utils/codeGenerator";
+import { InvoiceView, loadInvoiceViews } from "./invoiceProjection";
 import { VisitStateMachine, AppointmentStateMachine } from "../../utils/stateMachine";
 import { AppointmentStatus } from "../../constant/appointment";
+import {
+  applyKeyset,
+  buildKeysetPage,
+  cachedCount,
+  decodeCursor,
+  keysetOrder,
+} from "../../utils/keysetPagination";
+
+const patientInclude = {
+  model: Patient,
+  as: "patient",
+  attributes: [
+    "id",
+    "patientCode",
+    "fullName",
+    "gender",
+    "dateOfBirth",
+    "avatar",
+  ],
+  include: [
+    {
+      model: User,
+      as: "user",
+      attributes: ["id", "fullName", "email", "avatar"],
+    },
+  ],
+};
 
-export const invoiceAssociations = [
+const doctorInclude = {
+  model: Doctor,
+  as: "doctor",
+  attributes: ["id", "doctorCode", "specialtyId"],
+  include: [
+    {
+      model: User,
+      as: "user",
+      attributes: ["id", "fullName", "email", "avatar"],
+    },
+    {
+      model: Specialty,
+      as: "specialty",
+      attributes: ["id", "name"],
+    },
+  ],
+};
+
+const visitAttributes = [
+  "id",
+  "appointmentId",
+  "patientId",
+  "doctorId",
+  "checkInTime",
+  "checkOutTime",
+  "diagnosis",
+  "symptoms",
+  "status",
+  "note",
+  "createdAt",
+];
+
+const visitInclude = [
+  patientInclude,
+  doctorInclude,
   {
-    model: Visit,
-    as: "visit",
+    model: Appointment,
+    as: "appointment",
     attributes: [
       "id",
-      "appointmentId",
-      "patientId",
-      "doctorId",
-      "checkInTime",
-      "checkOutTime",
-      "diagnosis",
-      "symptoms",
+      "date",
+      "slotNumber",
       "status",
-      "note",
-      "createdAt",
-    ],
-    include: [
-      {
-        model: Patient,
-        as: "patient",
-        attributes: [
-          "id",
-          "patientCode",
-          "fullName",
-          "gender",
-          "dateOfBirth",
-          "avatar",
-        ],
-        include: [
-          {
-            model: User,
-            as: "user",
-            attributes: ["id", "fullName", "email", "avatar"],
-          },
-        ],
-      },
-      {
-        model: Doctor,
-        as: "doctor",
-        attributes: ["id", "doctorCode", "specialtyId"],
-        include: [
-          {
-            model: User,
-            as: "user",
-            attributes: ["id", "fullName", "email", "avatar"],
-          },
-          {
-            model: Specialty,
-            as: "specialty",
-            attributes: ["id", "name"],
-          },
-        ],
-      },
-      {
-        model: Appointment,
-        as: "appointment",
-        attributes: [
-          "id",
-          "date",
-          "slotNumber",
-          "status",
-          "patientName",
-          "patientPhone",
-          "patientDob",
-          "patientGender",
-        ],
-        include: [
-          {
-            model: Shift,
-            as: "shift",
-            attributes: ["id", "name", "startTime", "endTime"],
-          },
-        ],
-      },
-    ],
-  },
-  {
-    model: Patient,
-    as: "patient",
-    attributes: [
-      "id",
-      "patientCode",
-      "fullName",
-      "gender",
-      "dateOfBirth",
-      "avatar",
+      "patientName",
+      "patientPhone",
+      "patientDob",
+      "patientGender",
     ],
     include: [
       {
-        model: User,
-        as: "user",
-        attributes: ["id", "fullName", "email", "avatar"],
+        model: Shift,
+        as: "shift",
+        attributes: ["id", "name", "startTime", "endTime"],
       },
     ],
   },
+];
+
+export const invoiceAssociations = [
   {
-    model: Doctor,
-    as: "doctor",
-    attributes: ["id", "doctorCode", "specialtyId"],
-    include: [
-      {
-        model: User,
-        as: "user",
-        attributes: ["id", "fullName", "email", "avatar"],
-      },
-      {
-        model: Specialty,
-        as: "specialty",
-        attributes: ["id", "name"],
-      },
-    ],
+    model: Visit,
+    as: "visit",
+    attributes: visitAttributes,
+    include: visitInclude,
   },
+  patientInclude,
+  doctorInclude,
   { model: User, as: "creator", attributes: ["id", "fullName", "email"] },
   {
     model: InvoiceItem,
@@ -185,119 +167,150 @@ export const formatInvoice = (invoice: any) => {
 };
 
 
-export const createInvoiceFromVisit = async (
-  visitId: number,
-  createdBy: number,
-  examinationFee: number,
-  transaction?: Transaction
-) => {
-  const t = transaction || (await sequelize.transaction());
-
-  try {
-    
-    const visit = await Visit.findByPk(visitId, {
-      include: [
-        { association: "patient" },
-        { association: "doctor" },
-        {
-          association: "prescription",
-          include: [{ association: "details" }],
-        },
-      ],
-      transaction: t,
-    });
-
-    if (!visit) {
-      throw new Error("Visit not found");
-    }
+const BULK_INVOICE_BATCH_SIZE = 100;
 
-    
-    const existingInvoice = await Invoice.findOne({
-      where: { visitId },
-      transaction: t,
-    });
+const visitForInvoiceInclude = [
+  ...visitInclude,
+  { association: "prescription", include: [{ association: "details" }] },
+];
 
-    if (existingInvoice) {
-      throw new Error("Invoice already exists for this visit");
-    }
 
-    
-    const invoiceCode = await generateInvoiceCode();
+const materializeInvoices = async (
+  visits: Visit[],
+  createdBy: number,
+  examinationFee: number,
+  t: Transaction
+) => {
+  const fee = Number(examinationFee);
+  const [invoiceCodes, creator] = await Promise.all([
+    generateInvoiceCodes(visits.length),
+    User.findByPk(createdBy, { attributes: ["id", "fullName", "email"], transaction: t }),
+  ]);
+
+  const drafts = visits.map((visit, index) => {
+    const details = (visit as any).prescription?.details || [];
+    const medicineItems = details.map((detail: any) => ({
+      itemType: ItemType.MEDICINE,
+      prescriptionDetailId: detail.id,
+      medicineName: detail.medicineName,
+      medicineCode: detail.medicineCode,
+      quantity: detail.quantity,
+      unitPrice: detail.unitPrice,
+      subtotal: Number(detail.quantity) * Number(detail.unitPrice),
+    }));
+    const medicineTotalAmount = medicineItems.reduce(
+      (sum: number, item: { subtotal: number }) => sum + item.subtotal,
+      0
+    );
 
-    
-    const invoice = await Invoice.create(
-      {
-        invoiceCode,
+    return {
+      visit,
+      invoice: {
+        invoiceCode: invoiceCodes[index],
         visitId: visit.id,
         patientId: visit.patientId,
         doctorId: visit.doctorId,
-        examinationFee,
-        medicineTotalAmount: 0,
+        examinationFee: fee,
+        medicineTotalAmount,
         discount: 0,
-        totalAmount: examinationFee,
+        totalAmount: fee + medicineTotalAmount,
         paymentStatus: PaymentStatus.UNPAID,
         paidAmount: 0,
         createdBy,
       },
-      { transaction: t }
-    );
+      items: [
+        {
+          itemType: ItemType.EXAMINATION,
+          description: `Khám bệnh`,
+          quantity: 1,
+          unitPrice: fee,
+          subtotal: fee,
+        },
+        ...medicineItems,
+      ],
+    };
+  });
 
-    
-    await InvoiceItem.create(
-      {
-        invoiceId: invoice.id,
-        itemType: ItemType.EXAMINATION,
-        description: `Khám bệnh`,
-        quantity: 1,
-        unitPrice: examinationFee,
-        subtotal: examinationFee,
-      },
-      { transaction: t }
+  const invoices = await Invoice.bulkCreate(
+    drafts.map((draft) => draft.invoice),
+    { transaction: t }
+  );
+  const items = await InvoiceItem.bulkCreate(
+    drafts.flatMap((draft, index) =>
+      draft.items.map((item) => ({ ...item, invoiceId: invoices[index].id }))
+    ),
+    { transaction: t }
+  );
+
+  const itemsByInvoice = new Map<number, InvoiceItem[]>();
+  for (const item of items) {
+    itemsByInvoice.set(item.invoiceId, [...(itemsByInvoice.get(item.invoiceId) || []), item]);
+  }
+
+  return drafts.map((draft, index) => {
+    const invoice = invoices[index];
+    const { prescription, ...visit } = draft.visit.toJSON() as any;
+    const detailsById = new Map<number, any>(
+      (prescription?.details || []).map((detail: any) => [detail.id, detail])
     );
 
+    return formatInvoice({
+      ...invoice.toJSON(),
+      visit,
+      patient: visit.patient ? { ...visit.patient } : null,
+      doctor: visit.doctor ? { ...visit.doctor } : null,
+      creator: creator ? creator.toJSON() : null,
+      items: (itemsByInvoice.get(invoice.id) || []).map((item) => ({
+        ...item.toJSON(),
+        prescriptionDetail: item.prescriptionDetailId
+          ? detailsById.get(item.prescriptionDetailId) || null
+          : null,
+      })),
+      payments: [],
+    });
+  });
+};
+
+
+export const createInvoiceFromVisit = async (
+  visitId: number,
+  createdBy: number,
+  examinationFee: number,
+  transaction?: Transaction
+) => {
+  const t = transaction || (await sequelize.transaction());
+
+  try {
     
-    let medicineTotalAmount = 0;
-
-    if ((visit as any).prescription && (visit as any).prescription.details) {
-      const prescriptionDetails = (visit as any).prescription.details;
-
-      for (const detail of prescriptionDetails) {
-        const subtotal = detail.quantity * detail.unitPrice;
-
-        await InvoiceItem.create(
-          {
-            invoiceId: invoice.id,
-            itemType: ItemType.MEDICINE,
-            prescriptionDetailId: detail.id,
-            medicineName: detail.medicineName,
-            medicineCode: detail.medicineCode,
-            quantity: detail.quantity,
-            unitPrice: detail.unitPrice,
-            subtotal,
-          },
-          { transaction: t }
-        );
+    const [visit, existingInvoice] = await Promise.all([
+      Visit.findByPk(visitId, {
+        attributes: visitAttributes,
+        include: visitForInvoiceInclude,
+        transaction: t,
+      }),
+      Invoice.findOne({
+        where: { visitId },
+        attributes: ["id"],
+        transaction: t,
+      }),
+    ]);
 
-        medicineTotalAmount += subtotal;
-      }
+    if (!visit) {
+      throw new Error("Visit not found");
     }
 
-    
-    invoice.medicineTotalAmount = medicineTotalAmount;
-    invoice.totalAmount = examinationFee + medicineTotalAmount - invoice.discount;
-    await invoice.save({ transaction: t });
+    if (existingInvoice) {
+      throw new Error("Invoice already exists for this visit");
+    }
+
+    const [invoice] = await materializeInvoices([visit], createdBy, examinationFee, t);
 
     
     if (!transaction) {
       await t.commit();
     }
 
-    
-    const hydrated = await Invoice.findByPk(invoice.id, {
-      include: invoiceAssociations,
-    });
-
-    return formatInvoice(hydrated);
+    return invoice;
   } catch (error) {
     if (!transaction) {
       await t.rollback();
@@ -307,6 +320,70 @@ export const createInvoiceFromVisit = async (
 };
 
 
+export const createInvoicesForCompletedVisitsService = async (
+  date: string,
+  createdBy: number,
+  examinationFee: number
+) => {
+  const start = new Date(`${date}T00:00:00`);
+  const end = new Date(start);
+  end.setDate(end.getDate() + 1);
+
+  const created: Array<{ id: number; invoiceCode: string; visitId: number; totalAmount: number }> = [];
+  const failed: Array<{ visitIds: number[]; error: string }> = [];
+  let lastId = 0;
+
+  for (;;) {
+    const visits = await Visit.findAll({
+      attributes: visitAttributes,
+      where: {
+        id: {
+          [Op.gt]: lastId,
+          [Op.notIn]: literal("(SELECT `visitId` FROM `invoices`)"),
+        },
+        status: "COMPLETED",
+        checkInTime: { [Op.gte]: start, [Op.lt]: end },
+      },
+      include: visitForInvoiceInclude,
+      order: [["id", "ASC"]],
+      limit: BULK_INVOICE_BATCH_SIZE,
+    });
+    if (visits.length === 0) {
+      break;
+    }
+    lastId = visits[visits.length - 1].id;
+
+    try {
+      const invoices = await sequelize.transaction((t) =>
+        materializeInvoices(visits, createdBy, examinationFee, t)
+      );
+      created.push(
+        ...invoices.map((invoice: any) => ({
+          id: invoice.id,
+          invoiceCode: invoice.invoiceCode,
+          visitId: invoice.visitId,
+          totalAmount: invoice.totalAmount,
+        }))
+      );
+    } catch (error: any) {
+      failed.push({ visitIds: visits.map((visit) => visit.id), error: error.message });
+    }
+
+    if (visits.length < BULK_INVOICE_BATCH_SIZE) {
+      break;
+    }
+  }
+
+  return {
+    date,
+    createdCount: created.length,
+    totalAmount: created.reduce((sum, invoice) => sum + invoice.totalAmount, 0),
+    invoices: created,
+    failed,
+  };
+};
+
+
 export const getInvoicesService = async (filters: {
   page?: number;
   limit?: number;
@@ -317,6 +394,7 @@ export const getInvoicesService = async (filters: {
   toDate?: Date;
   keyword?: string;
   invoiceCode?: string;
+  cursor?: string;
 }) => {
   const page = filters.page || 1;
   const limit = filters.limit || 20;
@@ -356,17 +434,39 @@ export const getInvoicesService = async (filters: {
     }
   }
 
-  const { count, rows } = await Invoice.findAndCountAll({
-    where,
-    include: invoiceAssociations,
-    order: [["createdAt", "DESC"]],
-    limit,
-    offset,
-    distinct: true,
-  });
+  if (filters.cursor !== undefined) {
+    const cursor = decodeCursor(filters.cursor);
+    const [total, keys] = await Promise.all([
+      cachedCount("invoices", where, () => Invoice.count({ where })),
+      Invoice.findAll({
+        where: applyKeyset(where, cursor),
+        attributes: ["id", "createdAt"],
+        order: keysetOrder(),
+        limit: limit + 1,
+        raw: true,
+      }),
+    ]);
+    const result = buildKeysetPage(keys, limit, "createdAt", total);
+    return {
+      invoices: await loadInvoiceViews(result.rows.map((row) => row.id), "list"),
+      pagination: result.pagination,
+    };
+  }
+
+  const [count, keys] = await Promise.all([
+    Invoice.count({ where }),
+    Invoice.findAll({
+      where,
+      attributes: ["id"],
+      order: [["createdAt", "DESC"], ["id", "DESC"]],
+      limit,
+      offset,
+      raw: true,
+    }),
+  ]);
 
   return {
-    invoices: rows.map((row) => formatInvoice(row)),
+    invoices: await loadInvoiceViews(keys.map((row) => row.id), "list"),
     pagination: {
       total: count,
       page,
@@ -377,10 +477,8 @@ export const getInvoicesService = async (filters: {
 };
 
 
-export const getInvoiceByIdService = async (invoiceId: number) => {
-  const invoice = await Invoice.findByPk(invoiceId, {
-    include: invoiceAssociations,
-  });
+export const getInvoiceByIdService = async (invoiceId: number, view: InvoiceView = "detail") => {
+  const [invoice] = await loadInvoiceViews([invoiceId], view);
 
   if (!invoice) {
     throw new Error("Invoice not found");
@@ -404,11 +502,14 @@ export const getInvoiceByIdService = async (invoiceId: number) => {
          invoice.paymentStatus = PaymentStatus.PAID;
        }
 
-       await invoice.save();
+       await Invoice.update(
+         { paidAmount: invoice.paidAmount, paymentStatus: invoice.paymentStatus },
+         { where: { id: invoiceId } }
+       );
     }
   }
 
-  return formatInvoice(invoice);
+  return view === "detail" ? formatInvoice(invoice) : invoice;
 };
 
 
@@ -607,12 +708,14 @@ export const getInvoicePaymentsService = async (invoiceId: number) => {
 
 
 export const getInvoicesByPatientService = async (patientId: number) => {
-  const invoices = await Invoice.findAll({
+  const keys = await Invoice.findAll({
     where: { patientId },
-    include: invoiceAssociations,
-    order: [["createdAt", "DESC"]],
+    attributes: ["id"],
+    order: [["createdAt", "DESC"], ["id", "DESC"]],
+    raw: true,
   });
 
+  const invoices = await loadInvoiceViews(keys.map((row) => row.id), "detail");
   return invoices.map((item) => formatInvoice(item));
 };
 
@@ -0,0 +1,296 @@
+import { QueryTypes } from "sequelize";
+import sequelize from "../../config/database";
+
+export type InvoiceView = "list" | "detail" | "pdf";
+
+interface ViewSpec {
+  columns: string[];
+  joins: string[];
+  items: "none" | "plain" | "withPrescriptionDetail";
+  payments: "none" | "plain" | "withCreator";
+}
+
+const INVOICE_COLUMNS = [
+  "i.id",
+  "i.invoiceCode",
+  "i.visitId",
+  "i.patientId",
+  "i.doctorId",
+  "i.examinationFee",
+  "i.medicineTotalAmount",
+  "i.discount",
+  "i.totalAmount",
+  "i.paymentStatus",
+  "i.paidAmount",
+  "i.createdAt",
+  "i.updatedAt",
+];
+
+const USER_COLUMNS = (alias: string, path: string) => [
+  `${alias}.id AS \`${path}.id\``,
+  `${alias}.fullName AS \`${path}.fullName\``,
+  `${alias}.email AS \`${path}.email\``,
+  `${alias}.avatar AS \`${path}.avatar\``,
+];
+
+const PATIENT_COLUMNS = [
+  "p.id AS `patient.id`",
+  "p.patientCode AS `patient.patientCode`",
+  "p.fullName AS `patient.fullName`",
+  "p.gender AS `patient.gender`",
+  "p.dateOfBirth AS `patient.dateOfBirth`",
+  "p.avatar AS `patient.avatar`",
+];
+
+const DOCTOR_COLUMNS = [
+  "d.id AS `doctor.id`",
+  "d.doctorCode AS `doctor.doctorCode`",
+  "d.specialtyId AS `doctor.specialtyId`",
+];
+
+const APPOINTMENT_COLUMNS = [
+  "a.id AS `visit.appointment.id`",
+  "a.appointmentCode AS `visit.appointment.appointmentCode`",
+  "a.date AS `visit.appointment.date`",
+  "a.slotNumber AS `visit.appointment.slotNumber`",
+  "a.status AS `visit.appointment.status`",
+  "a.patientName AS `visit.appointment.patientName`",
+  "a.patientPhone AS `visit.appointment.patientPhone`",
+  "a.patientDob AS `visit.appointment.patientDob`",
+  "a.patientGender AS `visit.appointment.patientGender`",
+];
+
+const JOINS = {
+  patient: "LEFT JOIN patients p ON p.id = i.patientId",
+  patientUser: "LEFT JOIN users pu ON pu.id = p.userId",
+  doctor: "LEFT JOIN doctors d ON d.id = i.doctorId",
+  doctorUser: "LEFT JOIN users du ON du.id = d.userId",
+  specialty: "LEFT JOIN specialties s ON s.id = d.specialtyId",
+  creator: "LEFT JOIN users cu ON cu.id = i.createdBy",
+  visit: "LEFT JOIN visits v ON v.id = i.visitId",
+  appointment: "LEFT JOIN appointments a ON a.id = v.appointmentId",
+  shift: "LEFT JOIN shifts sh ON sh.id = a.shiftId",
+};
+
+const VIEWS: Record<InvoiceView, ViewSpec> = {
+  list: {
+    columns: [
+      ...INVOICE_COLUMNS,
+      "p.id AS `patient.id`",
+      "p.patientCode AS `patient.patientCode`",
+      "p.fullName AS `patient.fullName`",
+      "d.id AS `doctor.id`",
+      "d.doctorCode AS `doctor.doctorCode`",
+      "du.fullName AS `doctor.fullName`",
+    ],
+    joins: [JOINS.patient, JOINS.doctor, JOINS.doctorUser],
+    items: "none",
+    payments: "none",
+  },
+  detail: {
+    columns: [
+      ...INVOICE_COLUMNS,
+      "i.note",
+      "i.createdBy",
+      ...PATIENT_COLUMNS,
+      ...USER_COLUMNS("pu", "patient.user"),
+      ...DOCTOR_COLUMNS,
+      ...USER_COLUMNS("du", "doctor.user"),
+      "s.id AS `doctor.specialty.id`",
+      "s.name AS `doctor.specialty.name`",
+      "cu.id AS `creator.id`",
+      "cu.fullName AS `creator.fullName`",
+      "cu.email AS `creator.email`",
+      "v.id AS `visit.id`",
+      "v.visitCode AS `visit.visitCode`",
+      "v.appointmentId AS `visit.appointmentId`",
+      "v.patientId AS `visit.patientId`",
+      "v.doctorId AS `visit.doctorId`",
+      "v.checkInTime AS `visit.checkInTime`",
+      "v.checkOutTime AS `visit.checkOutTime`",
+      "v.diagnosis AS `visit.diagnosis`",
+      "v.symptoms AS `visit.symptoms`",
+      "v.status AS `visit.status`",
+      "v.note AS `visit.note`",
+      "v.createdAt AS `visit.createdAt`",
+      ...APPOINTMENT_COLUMNS,
+      "sh.id AS `visit.appointment.shift.id`",
+      "sh.name AS `visit.appointment.shift.name`",
+      "sh.startTime AS `visit.appointment.shift.startTime`",
+      "sh.endTime AS `visit.appointment.shift.endTime`",
+    ],
+    joins: [
+      JOINS.patient,
+      JOINS.patientUser,
+      JOINS.doctor,
+      JOINS.doctorUser,
+      JOINS.specialty,
+      JOINS.creator,
+      JOINS.visit,
+      JOINS.appointment,
+      JOINS.shift,
+    ],
+    items: "withPrescriptionDetail",
+    payments: "withCreator",
+  },
+  pdf: {
+    columns: [
+      ...INVOICE_COLUMNS,
+      "i.note",
+      "p.id AS `patient.id`",
+      "p.patientCode AS `patient.patientCode`",
+      "p.fullName AS `patient.fullName`",
+      "d.id AS `doctor.id`",
+      "du.fullName AS `doctor.fullName`",
+      "s.name AS `doctor.specialty`",
+      ...APPOINTMENT_COLUMNS,
+    ],
+    joins: [JOINS.patient, JOINS.doctor, JOINS.doctorUser, JOINS.specialty, JOINS.visit, JOINS.appointment],
+    items: "plain",
+    payments: "plain",
+  },
+};
+
+const ITEM_COLUMNS = [
+  "ii.id",
+  "ii.invoiceId",
+  "ii.itemType",
+  "ii.description",
+  "ii.prescriptionDetailId",
+  "ii.medicineName",
+  "ii.medicineCode",
+  "ii.quantity",
+  "ii.unitPrice",
+  "ii.subtotal",
+  "ii.createdAt",
+  "ii.updatedAt",
+];
+
+const PRESCRIPTION_DETAIL_COLUMNS = [
+  "id",
+  "prescriptionId",
+  "medicineId",
+  "medicineName",
+  "quantity",
+  "unit",
+  "unitPrice",
+  "dosageMorning",
+  "dosageNoon",
+  "dosageAfternoon",
+  "dosageEvening",
+  "instruction",
+  "days",
+].map((column) => `pd.${column} AS \`prescriptionDetail.${column}\``);
+
+const PAYMENT_COLUMNS = [
+  "pm.id",
+  "pm.invoiceId",
+  "pm.amount",
+  "pm.paymentMethod",
+  "pm.paymentDate",
+  "pm.reference",
+  "pm.note",
+  "pm.createdBy",
+  "pm.createdAt",
+  "pm.updatedAt",
+];
+
+
+const dropEmptyRelations = (row: any): any => {
+  for (const [key, value] of Object.entries(row)) {
+    if (value && typeof value === "object" && !(value instanceof Date)) {
+      row[key] = "id" in value && value.id === null ? null : dropEmptyRelations(value);
+    }
+  }
+  return row;
+};
+
+const selectByInvoice = (sql: string, ids: number[]) =>
+  sequelize.query<any>(sql, {
+    replacements: { ids },
+    type: QueryTypes.SELECT,
+    nest: true,
+  });
+
+const groupByInvoice = (rows: any[]) => {
+  const groups = new Map<number, any[]>();
+  for (const row of rows) {
+    groups.set(row.invoiceId, [...(groups.get(row.invoiceId) || []), dropEmptyRelations(row)]);
+  }
+  return groups;
+};
+
+const loadItems = async (ids: number[], mode: ViewSpec["items"]) => {
+  if (mode === "none") {
+    return null;
+  }
+  const withDetail = mode === "withPrescriptionDetail";
+  const rows = await selectByInvoice(
+    `SELECT ${[...ITEM_COLUMNS, ...(withDetail ? PRESCRIPTION_DETAIL_COLUMNS : [])].join(", ")}
+     FROM invoice_items ii
+     ${withDetail ? "LEFT JOIN prescription_details pd ON pd.id = ii.prescriptionDetailId" : ""}
+     WHERE ii.invoiceId IN (:ids)
+     ORDER BY ii.invoiceId, ii.id`,
+    ids
+  );
+  return groupByInvoice(rows);
+};
+
+const loadPayments = async (ids: number[], mode: ViewSpec["payments"]) => {
+  if (mode === "none") {
+    return null;
+  }
+  const withCreator = mode === "withCreator";
+  const rows = await selectByInvoice(
+    `SELECT ${[
+      ...PAYMENT_COLUMNS,
+      ...(withCreator
+        ? ["u.id AS `creator.id`", "u.fullName AS `creator.fullName`", "u.email AS `creator.email`"]
+        : []),
+    ].join(", ")}
+     FROM payments pm
+     ${withCreator ? "LEFT JOIN users u ON u.id = pm.createdBy" : ""}
+     WHERE pm.invoiceId IN (:ids)
+     ORDER BY pm.invoiceId, pm.id`,
+    ids
+  );
+  return groupByInvoice(rows);
+};
+
+
+export const loadInvoiceViews = async (ids: number[], view: InvoiceView = "list"): Promise<any[]> => {
+  if (ids.length === 0) {
+    return [];
+  }
+
+  const spec = VIEWS[view];
+  const [rows, items, payments] = await Promise.all([
+    selectByInvoice(
+      `SELECT ${spec.columns.join(", ")}
+       FROM invoices i
+       ${spec.joins.join("\n       ")}
+       WHERE i.id IN (:ids)`,
+      ids
+    ),
+    loadItems(ids, spec.items),
+    loadPayments(ids, spec.payments),
+  ]);
+
+  const byId = new Map<number, any>();
+  for (const row of rows) {
+    const invoice = dropEmptyRelations(row);
+    if (items) {
+      invoice.items = items.get(invoice.id) || [];
+    }
+    if (payments) {
+      invoice.payments = payments.get(invoice.id) || [];
+    }
+    if (view === "detail" && invoice.visit) {
+      invoice.visit.patient = invoice.patient ? { ...invoice.patient } : null;
+      invoice.visit.doctor = invoice.doctor ? { ...invoice.doctor } : null;
+    }
+    byId.set(invoice.id, invoice);
+  }
+
+  return ids.filter((id) => byId.has(id)).map((id) => byId.get(id));
+};
@@ -81,6 +81,7 @@ export const getPayrolls = async (req: Request, res: Response) => {
       year: year ? parseInt(year as string) : undefined,
       userId: userId ? parseInt(userId as string) : undefined,
       status: status as PayrollStatus,
+      cursor: typeof req.query.cursor === "string" ? req.query.cursor : undefined,
     };
 
     const result = await getPayrollsService(filters);
@@ -92,7 +93,7 @@ export const getPayrolls = async (req: Request, res: Response) => {
       pagination: result.pagination,
     });
   } catch (error: any) {
-    return res.status(500).json({
+    return res.status(error?.status || 500).json({
       success: false,
       message: error?.message || "Failed to retrieve payrolls",
     });
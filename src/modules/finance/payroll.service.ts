@@ -10,6 +10,13 @@ import { generatePayrollCode } from "../../utils/codeGenerator";
 import { RoleCode } from "../../constant/role";
 import { createNotification } from "../notification/notification.service";
 import { NotificationType } from "../../models/Notification";
+import {
+  applyKeyset,
+  buildKeysetPage,
+  cachedCount,
+  decodeCursor,
+  keysetOrder,
+} from "../../utils/keysetPagination";
 
 
 
@@ -334,6 +341,7 @@ export const getPayrollsService = async (filters: {
   year?: number;
   userId?: number;
   status?: PayrollStatus;
+  cursor?: string;
 }) => {
   const page = filters.page || 1;
   const limit = filters.limit || 20;
@@ -357,12 +365,29 @@ export const getPayrollsService = async (filters: {
     where.status = filters.status;
   }
 
+  const include = [
+    { association: "user", include: [{ model: Role, as: "role" }, { model: Employee, as: "employee" }] },
+    { association: "approver" },
+  ];
+
+  if (filters.cursor !== undefined) {
+    const cursor = decodeCursor(filters.cursor);
+    const [total, rows] = await Promise.all([
+      cachedCount("payrolls", where, () => Payroll.count({ where })),
+      Payroll.findAll({
+        where: applyKeyset(where, cursor),
+        include,
+        order: keysetOrder(),
+        limit: limit + 1,
+      }),
+    ]);
+    const result = buildKeysetPage(rows, limit, "createdAt", total);
+    return { payrolls: result.rows, pagination: result.pagination };
+  }
+
   const { count, rows } = await Payroll.findAndCountAll({
     where,
-    include: [
-      { association: "user", include: [{ model: Role, as: "role" }, { model: Employee, as: "employee" }] },
-      { association: "approver" },
-    ],
+    include,
     order: [
       ["year", "DESC"],
       ["month", "DESC"],
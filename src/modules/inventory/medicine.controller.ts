@@ -103,29 +103,33 @@ export const importMedicine = async (req: Request, res: Response) => {
 };
 
 
+export const buildMedicineListResponse = async (query: Request["query"]) => {
+  const { status, group, lowStock, search, page, limit } = query;
+
+  const result = await getAllMedicinesService({
+    status: status as any,
+    group: group as string,
+    lowStock: lowStock === "true",
+    search: search as string,
+    page: page ? parseInt(page as string) : undefined,
+    limit: limit ? parseInt(limit as string) : undefined,
+  });
+
+  return {
+    success: true,
+    data: result.medicines,
+    pagination: {
+      total: result.total,
+      page: result.page,
+      limit: result.limit,
+      totalPages: result.totalPages,
+    },
+  };
+};
+
 export const getAllMedicines = async (req: Request, res: Response) => {
   try {
-    const { status, group, lowStock, search, page, limit } = req.query;
-
-    const result = await getAllMedicinesService({
-      status: status as any,
-      group: group as string,
-      lowStock: lowStock === "true",
-      search: search as string,
-      page: page ? parseInt(page as string) : undefined,
-      limit: limit ? parseInt(limit as string) : undefined,
-    });
-
-    return res.json({
-      success: true,
-      data: result.medicines,
-      pagination: {
-        total: result.total,
-        page: result.page,
-        limit: result.limit,
-        totalPages: result.totalPages,
-      },
-    });
+    return res.json(await buildMedicineListResponse(req.query));
   } catch (error: any) {
     return res.status(500).json({
       success: false,
@@ -135,16 +139,20 @@ export const getAllMedicines = async (req: Request, res: Response) => {
 };
 
 
+export const buildMedicineResponse = async (id: number) => {
+  const medicine = await getMedicineByIdService(id);
+
+  return {
+    success: true,
+    data: medicine,
+  };
+};
+
 export const getMedicineById = async (req: Request, res: Response) => {
   try {
     const { id } = req.params;
 
-    const medicine = await getMedicineByIdService(Number(id));
-
-    return res.json({
-      success: true,
-      data: medicine,
-    });
+    return res.json(await buildMedicineResponse(Number(id)));
   } catch (error: any) {
     const errorMessage = error?.message || "Failed to get medicine";
 
@@ -1,5 +1,7 @@
 import { Router } from "express";
 import {
+  buildMedicineListResponse,
+  buildMedicineResponse,
   createMedicine,
   updateMedicine,
   importMedicine,
@@ -26,6 +28,8 @@ import {
 } from "../../middlewares/validateMedicine.middlewares";
 import { validateExportMedicine } from "../../middlewares/validators/medicine.validators";
 import { validateNumericId, validatePagination } from "../../middlewares/validators/common.validators";
+import { cacheMiddleware } from "../../middlewares/cache.middlewares";
+import { CacheTags } from "../../services/cache.service";
 
 const router = Router();
 
@@ -73,7 +77,25 @@ router.post("/:id/mark-expired", validateNumericId("id"), requireRole(RoleCode.A
 router.delete("/:id", validateNumericId("id"), requireRole(RoleCode.ADMIN), removeMedicine);
 
 
-router.get("/", validatePagination, getAllMedicines);
-router.get("/:id", validateNumericId("id"), getMedicineById);
+router.get(
+  "/",
+  validatePagination,
+  cacheMiddleware({
+    shared: true,
+    tags: [CacheTags.MEDICINES],
+    load: (req) => buildMedicineListResponse(req.query),
+  }),
+  getAllMedicines
+);
+router.get(
+  "/:id",
+  validateNumericId("id"),
+  cacheMiddleware({
+    shared: true,
+    tags: [CacheTags.MEDICINES],
+    load: (req) => buildMedicineResponse(Number(req.params.id)),
+  }),
+  getMedicineById
+);
 
 export default router;
@@ -3,8 +3,13 @@ import { sequelize } from "../../models/index";
 import Medicine, { MedicineStatus, MedicineUnit } from "../../models/Medicine";
 import MedicineImport from "../../models/MedicineImport";
 import MedicineExport from "../../models/MedicineExport";
-import { generateMedicineCode } from "../../utils/codeGenerator";
+import {
+  generateMedicineCode,
+  generateImportCode,
+  generateExportCode,
+} from "../../utils/codeGenerator";
 import User from "../../models/User";
+import { CacheService, CacheTags } from "../../services/cache.service";
 
 interface CreateMedicineInput {
   name: string;
@@ -62,6 +67,7 @@ export const createMedicineService = async (input: CreateMedicineInput) => {
     ...input,
     status: MedicineStatus.ACTIVE,
   });
+  await CacheService.invalidateTags([CacheTags.MEDICINES]);
 
   return medicine;
 };
@@ -77,12 +83,13 @@ export const updateMedicineService = async (
   }
 
   await medicine.update(input);
+  await CacheService.invalidateTags([CacheTags.MEDICINES]);
 
   return medicine;
 };
 
 export const importMedicineService = async (input: ImportMedicineInput) => {
-  return await sequelize.transaction(
+  const result = await sequelize.transaction(
     {
       isolationLevel: Transaction.ISOLATION_LEVELS.READ_COMMITTED,
     },
@@ -103,28 +110,7 @@ export const importMedicineService = async (input: ImportMedicineInput) => {
       await medicine.save({ transaction: t });
 
       
-      const today = new Date();
-      const dateStr = today.toISOString().slice(0, 10).replace(/-/g, "");
-      const latestImport = await MedicineImport.findOne({
-        where: {
-          importCode: {
-            [Op.like]: `IMP-${dateStr}-%`,
-          },
-        },
-        order: [["importCode", "DESC"]],
-        transaction: t,
-      });
-
-      let sequence = 1;
-      if (latestImport && latestImport.importCode) {
-        const lastCode = latestImport.importCode;
-        const lastSequence = parseInt(lastCode.split("-")[2], 10);
-        sequence = lastSequence + 1;
-      }
-
-      const importCode = `IMP-${dateStr}-${sequence
-        .toString()
-        .padStart(5, "0")}`;
+      const importCode = await generateImportCode();
 
       
       const importRecord = await MedicineImport.create(
@@ -146,6 +132,8 @@ export const importMedicineService = async (input: ImportMedicineInput) => {
       return { medicine, importRecord };
     }
   );
+  await CacheService.invalidateTags([CacheTags.MEDICINES]);
+  return result;
 };
 
 export const getAllMedicinesService = async (filters?: {
@@ -262,6 +250,7 @@ export const markMedicineAsExpiredService = async (medicineId: number) => {
 
   medicine.status = MedicineStatus.EXPIRED;
   await medicine.save();
+  await CacheService.invalidateTags([CacheTags.MEDICINES]);
 
   return medicine;
 };
@@ -279,6 +268,7 @@ export const removeMedicineService = async (medicineId: number) => {
 
   medicine.status = MedicineStatus.REMOVED;
   await medicine.save();
+  await CacheService.invalidateTags([CacheTags.MEDICINES]);
 
   return medicine;
 };
@@ -355,6 +345,9 @@ export const autoMarkExpiredMedicinesService = async () => {
     await medicine.save();
     markedCount++;
   }
+  if (markedCount > 0) {
+    await CacheService.invalidateTags([CacheTags.MEDICINES]);
+  }
 
   return {
     markedCount,
@@ -363,7 +356,7 @@ export const autoMarkExpiredMedicinesService = async () => {
 };
 
 export const exportMedicineService = async (input: ExportMedicineInput) => {
-  return await sequelize.transaction(
+  const result = await sequelize.transaction(
     {
       isolationLevel: Transaction.ISOLATION_LEVELS.READ_COMMITTED,
     },
@@ -390,28 +383,7 @@ export const exportMedicineService = async (input: ExportMedicineInput) => {
       }
 
       
-      const today = new Date();
-      const dateStr = today.toISOString().slice(0, 10).replace(/-/g, "");
-      const latestExport = await MedicineExport.findOne({
-        where: {
-          exportCode: {
-            [Op.like]: `EXP-${dateStr}-%`,
-          },
-        },
-        order: [["exportCode", "DESC"]],
-        transaction: t,
-      });
-
-      let sequence = 1;
-      if (latestExport && latestExport.exportCode) {
-        const lastCode = latestExport.exportCode;
-        const lastSequence = parseInt(lastCode.split("-")[2], 10);
-        sequence = lastSequence + 1;
-      }
-
-      const exportCode = `EXP-${dateStr}-${sequence
-        .toString()
-        .padStart(5, "0")}`;
+      const exportCode = await generateExportCode();
 
       
       medicine.quantity -= input.quantity;
@@ -434,6 +406,8 @@ export const exportMedicineService = async (input: ExportMedicineInput) => {
       return { medicine, exportRecord };
     }
   );
+  await CacheService.invalidateTags([CacheTags.MEDICINES]);
+  return result;
 };
 
 export const getAllMedicineImportsService = async (params?: {
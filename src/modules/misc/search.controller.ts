@@ -55,6 +55,7 @@ export const searchPatients = async (req: Request, res: Response) => {
       createdTo,
       page,
       limit,
+      cursor,
     } = req.body || {};
 
     const parsedDobFrom = parseOptionalDate(dateOfBirthFrom);
@@ -85,6 +86,7 @@ export const searchPatients = async (req: Request, res: Response) => {
       createdTo: parsedCreatedTo || undefined,
       page: parseOptionalNumber(page),
       limit: parseOptionalNumber(limit),
+      cursor: typeof cursor === "string" ? cursor : undefined,
     };
 
     const result = await searchPatientsService(filters);
@@ -96,7 +98,7 @@ export const searchPatients = async (req: Request, res: Response) => {
       pagination: result.pagination,
     });
   } catch (error: any) {
-    return res.status(500).json({
+    return res.status(error?.status || 500).json({
       success: false,
       message: error?.message || "Failed to search patients",
     });
@@ -120,6 +122,7 @@ export const searchAppointments = async (req: Request, res: Response) => {
       createdTo,
       page,
       limit,
+      cursor,
     } = req.body || {};
 
     const parsedDateFrom = parseOptionalDate(dateFrom);
@@ -153,6 +156,7 @@ export const searchAppointments = async (req: Request, res: Response) => {
       createdTo: parsedCreatedTo || undefined,
       page: parseOptionalNumber(page),
       limit: parseOptionalNumber(limit),
+      cursor: typeof cursor === "string" ? cursor : undefined,
     };
 
     const result = await searchAppointmentsService(filters);
@@ -164,7 +168,7 @@ export const searchAppointments = async (req: Request, res: Response) => {
       pagination: result.pagination,
     });
   } catch (error: any) {
-    return res.status(500).json({
+    return res.status(error?.status || 500).json({
       success: false,
       message: error?.message || "Failed to search appointments",
     });
@@ -186,6 +190,7 @@ export const searchInvoices = async (req: Request, res: Response) => {
       createdTo,
       page,
       limit,
+      cursor,
     } = req.body || {};
 
     const parsedCreatedFrom = parseOptionalDate(createdFrom);
@@ -210,6 +215,7 @@ export const searchInvoices = async (req: Request, res: Response) => {
       createdTo: parsedCreatedTo || undefined,
       page: parseOptionalNumber(page),
       limit: parseOptionalNumber(limit),
+      cursor: typeof cursor === "string" ? cursor : undefined,
     };
 
     const result = await searchInvoicesService(filters);
@@ -221,7 +227,7 @@ export const searchInvoices = async (req: Request, res: Response) => {
       pagination: result.pagination,
     });
   } catch (error: any) {
-    return res.status(500).json({
+    return res.status(error?.status || 500).json({
       success: false,
       message: error?.message || "Failed to search invoices",
     });
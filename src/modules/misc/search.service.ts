@@ -1,4 +1,5 @@
-import { Op } from "sequelize";
+import { Op, literal } from "sequelize";
+import sequelize from "../../config/database";
 import Appointment from "../../models/Appointment";
 import Doctor from "../../models/Doctor";
 import Invoice, { PaymentStatus } from "../../models/Invoice";
@@ -6,7 +7,15 @@ import Patient from "../../models/Patient";
 import PatientProfile from "../../models/PatientProfile";
 import Shift from "../../models/Shift";
 import User from "../../models/User";
-import { invoiceAssociations, formatInvoice } from "../finance/invoice.service";
+import { loadInvoiceViews } from "../finance/invoiceProjection";
+import { PatientSearchIndex } from "../../services/patientSearch.service";
+import {
+  applyKeyset,
+  buildKeysetPage,
+  cachedCount,
+  decodeCursor,
+  keysetOrder,
+} from "../../utils/keysetPagination";
 
 const DEFAULT_PAGE = 1;
 const DEFAULT_LIMIT = 20;
@@ -20,6 +29,9 @@ const normalizePagination = (page?: number, limit?: number) => {
   return { page: safePage, limit: safeLimit, offset };
 };
 
+const doctorIdsSql = (keyword: string) =>
+  `SELECT \`d\`.\`id\` FROM \`doctors\` AS \`d\` INNER JOIN \`users\` AS \`u\` ON \`u\`.\`id\` = \`d\`.\`userId\` WHERE \`u\`.\`fullName\` LIKE ${sequelize.escape(`%${keyword.trim()}%`)}`;
+
 export const searchPatientsService = async (filters: {
   keyword?: string;
   profileKeyword?: string;
@@ -31,6 +43,7 @@ export const searchPatientsService = async (filters: {
   createdTo?: Date;
   page?: number;
   limit?: number;
+  cursor?: string;
 }) => {
   const { page, limit, offset } = normalizePagination(filters.page, filters.limit);
   const where: any = {};
@@ -63,33 +76,58 @@ export const searchPatientsService = async (filters: {
     }
   }
 
+  const conditions: string[] = [];
+  let score: string | null = null;
+
   if (filters.keyword) {
-    const keyword = `%${filters.keyword}%`;
-    where[Op.or] = [
-      { fullName: { [Op.like]: keyword } },
-      { patientCode: { [Op.like]: keyword } },
-      { cccd: { [Op.like]: keyword } },
-    ];
+    const match = PatientSearchIndex.matchPatients(filters.keyword, "Patient");
+    conditions.push(match.condition);
+    score = match.score;
   }
 
-  const profileInclude: any = {
-    model: PatientProfile,
-    as: "profiles",
-  };
-
   if (filters.profileKeyword) {
-    profileInclude.where = { value: { [Op.like]: `%${filters.profileKeyword}%` } };
-    profileInclude.required = true;
+    conditions.push(PatientSearchIndex.matchContacts(filters.profileKeyword, "Patient"));
   }
 
-  const { count, rows } = await Patient.findAndCountAll({
-    where,
-    include: [profileInclude],
-    order: [["createdAt", "DESC"]],
-    limit,
-    offset,
-    distinct: true,
-  });
+  if (conditions.length > 0) {
+    where[Op.and] = conditions.map((condition) => literal(condition));
+  }
+
+  const include = [{ model: PatientProfile, as: "profiles" }];
+
+  if (filters.cursor !== undefined) {
+    const cursor = decodeCursor(filters.cursor);
+    const [total, rows] = await Promise.all([
+      cachedCount("patients", where, () => Patient.count({ where })),
+      Patient.findAll({
+        where: applyKeyset(where, cursor),
+        include,
+        order: keysetOrder(),
+        limit: limit + 1,
+      }),
+    ]);
+    const result = buildKeysetPage(rows, limit, "createdAt", total);
+    return { patients: result.rows, pagination: result.pagination };
+  }
+
+  const [count, ranked] = await Promise.all([
+    Patient.count({ where }),
+    Patient.findAll({
+      attributes: ["id"],
+      where,
+      order: score ? [[literal(score), "DESC"], ["createdAt", "DESC"]] : [["createdAt", "DESC"]],
+      limit,
+      offset,
+      raw: true,
+    }),
+  ]);
+
+  const ids = ranked.map((row) => row.id);
+  const rows = ids.length
+    ? await Patient.findAll({ where: { id: { [Op.in]: ids } }, include })
+    : [];
+  const position = new Map(ids.map((id, index) => [id, index]));
+  rows.sort((a, b) => position.get(a.id)! - position.get(b.id)!);
 
   return {
     patients: rows,
@@ -116,6 +154,7 @@ export const searchAppointmentsService = async (filters: {
   createdTo?: Date;
   page?: number;
   limit?: number;
+  cursor?: string;
 }) => {
   const { page, limit, offset } = normalizePagination(filters.page, filters.limit);
   const where: any = {};
@@ -165,26 +204,43 @@ export const searchAppointmentsService = async (filters: {
   }
 
   if (filters.keyword) {
-    const keyword = `%${filters.keyword}%`;
     where[Op.or] = [
-      { "$patient.fullName$": { [Op.like]: keyword } },
-      { "$patient.patientCode$": { [Op.like]: keyword } },
-      { "$doctor.user.fullName$": { [Op.like]: keyword } },
+      { patientId: { [Op.in]: literal(`(${PatientSearchIndex.patientIdsSql(filters.keyword)})`) } },
+      { doctorId: { [Op.in]: literal(`(${doctorIdsSql(filters.keyword)})`) } },
     ];
   }
 
+  const include = [
+    { model: Patient, as: "patient", attributes: ["id", "fullName", "patientCode"] },
+    {
+      model: Doctor,
+      as: "doctor",
+      attributes: ["id"],
+      include: [{ model: User, as: "user", attributes: ["fullName"] }],
+    },
+    { model: Shift, as: "shift" },
+  ];
+
+  if (filters.cursor !== undefined) {
+    const cursor = decodeCursor(filters.cursor);
+    const [total, rows] = await Promise.all([
+      cachedCount("appointments", where, () =>
+        Appointment.count({ where })
+      ),
+      Appointment.findAll({
+        where: applyKeyset(where, cursor),
+        include,
+        order: keysetOrder(),
+        limit: limit + 1,
+      }),
+    ]);
+    const result = buildKeysetPage(rows, limit, "createdAt", total);
+    return { appointments: result.rows, pagination: result.pagination };
+  }
+
   const { count, rows } = await Appointment.findAndCountAll({
     where,
-    include: [
-      { model: Patient, as: "patient", attributes: ["id", "fullName", "patientCode"] },
-      {
-        model: Doctor,
-        as: "doctor",
-        attributes: ["id"],
-        include: [{ model: User, as: "user", attributes: ["fullName"] }],
-      },
-      { model: Shift, as: "shift" },
-    ],
+    include,
     order: [["date", "DESC"], ["shiftId", "ASC"], ["slotNumber", "ASC"]],
     limit,
     offset,
@@ -214,6 +270,7 @@ export const searchInvoicesService = async (filters: {
   createdTo?: Date;
   page?: number;
   limit?: number;
+  cursor?: string;
 }) => {
   const { page, limit, offset } = normalizePagination(filters.page, filters.limit);
   const where: any = {};
@@ -258,23 +315,44 @@ export const searchInvoicesService = async (filters: {
     const keyword = `%${filters.keyword}%`;
     where[Op.or] = [
       { invoiceCode: { [Op.like]: keyword } },
-      { "$patient.fullName$": { [Op.like]: keyword } },
-      { "$patient.patientCode$": { [Op.like]: keyword } },
-      { "$doctor.user.fullName$": { [Op.like]: keyword } },
+      { patientId: { [Op.in]: literal(`(${PatientSearchIndex.patientIdsSql(filters.keyword)})`) } },
+      { doctorId: { [Op.in]: literal(`(${doctorIdsSql(filters.keyword)})`) } },
     ];
   }
 
-  const { count, rows } = await Invoice.findAndCountAll({
-    where,
-    include: invoiceAssociations,
-    order: [["createdAt", "DESC"]],
-    limit,
-    offset,
-    distinct: true,
-  });
+  if (filters.cursor !== undefined) {
+    const cursor = decodeCursor(filters.cursor);
+    const [total, keys] = await Promise.all([
+      cachedCount("invoices", where, () => Invoice.count({ where })),
+      Invoice.findAll({
+        where: applyKeyset(where, cursor),
+        attributes: ["id", "createdAt"],
+        order: keysetOrder(),
+        limit: limit + 1,
+        raw: true,
+      }),
+    ]);
+    const result = buildKeysetPage(keys, limit, "createdAt", total);
+    return {
+      invoices: await loadInvoiceViews(result.rows.map((row) => row.id), "list"),
+      pagination: result.pagination,
+    };
+  }
+
+  const [count, keys] = await Promise.all([
+    Invoice.count({ where }),
+    Invoice.findAll({
+      where,
+      attributes: ["id"],
+      order: [["createdAt", "DESC"], ["id", "DESC"]],
+      limit,
+      offset,
+      raw: true,
+    }),
+  ]);
 
   return {
-    invoices: rows.map((row) => formatInvoice(row)),
+    invoices: await loadInvoiceViews(keys.map((row) => row.id), "list"),
     pagination: {
       total: count,
       page,
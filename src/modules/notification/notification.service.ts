@@ -1,3 +1,4 @@
+import { Op } from "sequelize";
 import Notification, { NotificationType } from "../../models/Notification";
 import Appointment from "../../models/Appointment";
 import Patient from "../../models/Patient";
@@ -5,8 +6,8 @@ import Doctor from "../../models/Doctor";
 import Shift from "../../models/Shift";
 import User from "../../models/User";
 import Specialty from "../../models/Specialty";
-import { sendEmail } from "../../services/email.service";
-import { emailTemplates } from "../../templates/emailTemplates";
+import { EmailJobPayload, emailService, enqueueEmail } from "../../services/email.service";
+import { emailRenderers } from "../../templates/emailTemplates";
 import {
   calculateAppointmentTime,
   formatShiftTime,
@@ -37,9 +38,60 @@ export async function createNotification(
 }
 
 
+export interface NotificationDelivery {
+  since?: Date;
+  sendEmail?: (payload: EmailJobPayload) => Promise<void>;
+}
+
+const CLOCK_SKEW_MS = 5000;
+
+
+async function findOrCreateNotification(
+  params: CreateNotificationParams,
+  since: Date
+): Promise<Notification> {
+  const existing = await Notification.findOne({
+    where: {
+      userId: params.userId,
+      type: params.type,
+      relatedAppointmentId: params.relatedAppointmentId ?? null,
+      createdAt: { [Op.gte]: new Date(since.getTime() - CLOCK_SKEW_MS) },
+    },
+    order: [["createdAt", "DESC"]],
+  });
+
+  return existing || createNotification(params);
+}
+
+async function deliverEmail(
+  notification: Notification,
+  payload: EmailJobPayload,
+  delivery: NotificationDelivery
+): Promise<boolean> {
+  if (notification.emailSent) {
+    return false;
+  }
+  await (delivery.sendEmail || enqueueEmail)(payload);
+  return true;
+}
+
+
+export async function sendEmailNow(payload: EmailJobPayload): Promise<void> {
+  const sent = await emailService.sendEmail(payload);
+  if (sent && payload.notificationIds?.length) {
+    await Notification.update(
+      { emailSent: true, emailSentAt: new Date() },
+      { where: { id: { [Op.in]: payload.notificationIds } } }
+    );
+  }
+}
+
+
 export async function sendAppointmentConfirmation(
-  appointmentId: number
+  appointmentId: number,
+  delivery: NotificationDelivery = {}
 ): Promise<void> {
+  const since = delivery.since || new Date();
   try {
     
     const appointment = await Appointment.findByPk(appointmentId, {
@@ -80,19 +132,22 @@ export async function sendAppointmentConfirmation(
     const specialty = doctor.specialty;
 
     
-    const notification = await createNotification({
-      userId: patientUser.id,
-      type: NotificationType.APPOINTMENT_CREATED,
-      title: "Lịch khám mới được tạo",
-      message: `Bạn có lịch khám với ${doctorUser.fullName} vào ${shift.name} ngày ${appointment.date}`,
-      relatedAppointmentId: appointmentId,
-    });
+    const notification = await findOrCreateNotification(
+      {
+        userId: patientUser.id,
+        type: NotificationType.APPOINTMENT_CREATED,
+        title: "Lịch khám mới được tạo",
+        message: `Bạn có lịch khám với ${doctorUser.fullName} vào ${shift.name} ngày ${appointment.date}`,
+        relatedAppointmentId: appointmentId,
+      },
+      since
+    );
 
     
     const appointmentTime = calculateAppointmentTime(shift.startTime, appointment.slotNumber);
     const shiftTime = formatShiftTime(shift.startTime, shift.endTime);
 
-    const emailHtml = emailTemplates.appointmentConfirmation({
+    const email = emailRenderers.appointmentConfirmation({
       patientName: patientUser.fullName,
       doctorName: doctorUser.fullName,
       doctorSpecialty: specialty?.name || "Chưa xác định",
@@ -105,30 +160,34 @@ export async function sendAppointmentConfirmation(
     });
 
     
-    const emailSent = await sendEmail({
-      to: patientUser.email,
-      subject: "Xác nhận lịch khám - Hệ thống Phòng khám",
-      html: emailHtml,
-    });
-
-    
-    if (emailSent) {
-      await notification.update({
-        emailSent: true,
-        emailSentAt: new Date(),
-      });
-      console.log(`Sent appointment confirmation to ${patientUser.email}`);
+    const queued = await deliverEmail(
+      notification,
+      {
+        to: patientUser.email,
+        subject: "Xác nhận lịch khám - Hệ thống Phòng khám",
+        html: email.html,
+        text: email.text,
+        content: email.content,
+        notificationIds: [notification.id],
+      },
+      delivery
+    );
+    if (queued) {
+      console.log(`Queued appointment confirmation to ${patientUser.email}`);
     }
   } catch (error) {
     console.error("Error in sendAppointmentConfirmation:", error);
+    throw error;
   }
 }
 
 
 export async function sendAppointmentCancellation(
   appointmentId: number,
-  reason?: string
+  reason?: string,
+  delivery: NotificationDelivery = {}
 ): Promise<void> {
+  const since = delivery.since || new Date();
   try {
     
     const appointment = await Appointment.findByPk(appointmentId, {
@@ -165,21 +224,24 @@ export async function sendAppointmentCancellation(
     const doctorUser = doctor.user;
 
     
-    const notification = await createNotification({
-      userId: patientUser.id,
-      type: NotificationType.APPOINTMENT_CANCELLED,
-      title: "Lịch khám đã bị hủy",
-      message: `Lịch khám với ${doctorUser.fullName} vào ${shift.name} ngày ${
-        appointment.date
-      } đã bị hủy${reason ? `: ${reason}` : ""}`,
-      relatedAppointmentId: appointmentId,
-    });
+    const notification = await findOrCreateNotification(
+      {
+        userId: patientUser.id,
+        type: NotificationType.APPOINTMENT_CANCELLED,
+        title: "Lịch khám đã bị hủy",
+        message: `Lịch khám với ${doctorUser.fullName} vào ${shift.name} ngày ${
+          appointment.date
+        } đã bị hủy${reason ? `: ${reason}` : ""}`,
+        relatedAppointmentId: appointmentId,
+      },
+      since
+    );
 
     
     const appointmentTime = calculateAppointmentTime(shift.startTime, appointment.slotNumber);
     const shiftTime = formatShiftTime(shift.startTime, shift.endTime);
 
-    const emailHtml = emailTemplates.appointmentCancellation({
+    const email = emailRenderers.appointmentCancellation({
       patientName: patientUser.fullName,
       doctorName: doctorUser.fullName,
       appointmentDate: appointment.date.toString(),
@@ -191,22 +253,24 @@ export async function sendAppointmentCancellation(
     });
 
     
-    const emailSent = await sendEmail({
-      to: patientUser.email,
-      subject: "Thông báo hủy lịch khám - Hệ thống Phòng khám",
-      html: emailHtml,
-    });
-
-    
-    if (emailSent) {
-      await notification.update({
-        emailSent: true,
-        emailSentAt: new Date(),
-      });
-      console.log(` Sent cancellation notification to ${patientUser.email}`);
+    const queued = await deliverEmail(
+      notification,
+      {
+        to: patientUser.email,
+        subject: "Thông báo hủy lịch khám - Hệ thống Phòng khám",
+        html: email.html,
+        text: email.text,
+        content: email.content,
+        notificationIds: [notification.id],
+      },
+      delivery
+    );
+    if (queued) {
+      console.log(` Queued cancellation notification to ${patientUser.email}`);
     }
   } catch (error) {
     console.error("Error in sendAppointmentCancellation:", error);
+    throw error;
   }
 }
 
@@ -215,8 +279,10 @@ export async function sendDoctorChangeNotification(
   appointmentId: number,
   oldDoctorId: number,
   newDoctorId: number,
-  reason?: string
+  reason?: string,
+  delivery: NotificationDelivery = {}
 ): Promise<void> {
+  const since = delivery.since || new Date();
   try {
     
     const appointment = await Appointment.findByPk(appointmentId, {
@@ -268,19 +334,22 @@ export async function sendDoctorChangeNotification(
     const specialty = newDoctor.specialty;
 
     
-    const notification = await createNotification({
-      userId: patientUser.id,
-      type: NotificationType.DOCTOR_CHANGED,
-      title: "Bác sĩ khám đã thay đổi",
-      message: `Bác sĩ khám của bạn đã thay đổi từ ${oldDoctorUser.fullName} sang ${newDoctorUser.fullName}`,
-      relatedAppointmentId: appointmentId,
-    });
+    const notification = await findOrCreateNotification(
+      {
+        userId: patientUser.id,
+        type: NotificationType.DOCTOR_CHANGED,
+        title: "Bác sĩ khám đã thay đổi",
+        message: `Bác sĩ khám của bạn đã thay đổi từ ${oldDoctorUser.fullName} sang ${newDoctorUser.fullName}`,
+        relatedAppointmentId: appointmentId,
+      },
+      since
+    );
 
     
     const appointmentTime = calculateAppointmentTime(shift.startTime, appointment.slotNumber);
     const shiftTime = formatShiftTime(shift.startTime, shift.endTime);
 
-    const emailHtml = emailTemplates.doctorChanged({
+    const email = emailRenderers.doctorChanged({
       patientName: patientUser.fullName,
       oldDoctorName: oldDoctorUser.fullName,
       newDoctorName: newDoctorUser.fullName,
@@ -295,30 +364,34 @@ export async function sendDoctorChangeNotification(
     });
 
     
-    const emailSent = await sendEmail({
-      to: patientUser.email,
-      subject: " Thông báo thay đổi bác sĩ - Hệ thống Phòng khám",
-      html: emailHtml,
-    });
-
-    
-    if (emailSent) {
-      await notification.update({
-        emailSent: true,
-        emailSentAt: new Date(),
-      });
-      console.log(` Sent doctor change notification to ${patientUser.email}`);
+    const queued = await deliverEmail(
+      notification,
+      {
+        to: patientUser.email,
+        subject: " Thông báo thay đổi bác sĩ - Hệ thống Phòng khám",
+        html: email.html,
+        text: email.text,
+        content: email.content,
+        notificationIds: [notification.id],
+      },
+      delivery
+    );
+    if (queued) {
+      console.log(` Queued doctor change notification to ${patientUser.email}`);
     }
   } catch (error) {
     console.error("Error in sendDoctorChangeNotification:", error);
+    throw error;
   }
 }
 
 
 export async function sendAppointmentRescheduleNotification(
   appointmentId: number,
-  oldDetails: { doctorId: number; shiftId: number; date: Date }
+  oldDetails: { doctorId: number; shiftId: number; date: Date },
+  delivery: NotificationDelivery = {}
 ): Promise<void> {
+  const since = delivery.since || new Date();
   try {
     const appointment = await Appointment.findByPk(appointmentId, {
       include: [
@@ -366,13 +439,16 @@ export async function sendAppointmentRescheduleNotification(
       return;
     }
 
-    const notification = await createNotification({
-      userId: patientUser.id,
-      type: NotificationType.APPOINTMENT_RESCHEDULED,
-      title: "Lịch khám đã được cập nhật",
-      message: `Lịch #${appointmentId} đã chuyển từ ${oldShift.name} ngày ${oldDetails.date.toDateString()} sang ${shift.name} ngày ${appointment.date}`,
-      relatedAppointmentId: appointmentId,
-    });
+    const notification = await findOrCreateNotification(
+      {
+        userId: patientUser.id,
+        type: NotificationType.APPOINTMENT_RESCHEDULED,
+        title: "Lịch khám đã được cập nhật",
+        message: `Lịch #${appointmentId} đã chuyển từ ${oldShift.name} ngày ${oldDetails.date.toDateString()} sang ${shift.name} ngày ${appointment.date}`,
+        relatedAppointmentId: appointmentId,
+      },
+      since
+    );
 
     
     const oldAppointmentTime = calculateAppointmentTime(oldShift.startTime, appointment.slotNumber);
@@ -380,7 +456,7 @@ export async function sendAppointmentRescheduleNotification(
     const oldShiftTime = formatShiftTime(oldShift.startTime, oldShift.endTime);
     const newShiftTime = formatShiftTime(shift.startTime, shift.endTime);
 
-    const emailHtml = emailTemplates.appointmentRescheduled({
+    const email = emailRenderers.appointmentRescheduled({
       patientName: patientUser.fullName,
       oldDate: oldDetails.date.toString(),
       newDate: appointment.date.toString(),
@@ -395,21 +471,24 @@ export async function sendAppointmentRescheduleNotification(
       appointmentId: appointment.id,
     });
 
-    const emailSent = await sendEmail({
-      to: patientUser.email,
-      subject: "Thông báo đổi lịch khám - Hệ thống Phòng khám",
-      html: emailHtml,
-    });
-
-    if (emailSent) {
-      await notification.update({
-        emailSent: true,
-        emailSentAt: new Date(),
-      });
-      console.log(`Sent reschedule notification to ${patientUser.email}`);
+    const queued = await deliverEmail(
+      notification,
+      {
+        to: patientUser.email,
+        subject: "Thông báo đổi lịch khám - Hệ thống Phòng khám",
+        html: email.html,
+        text: email.text,
+        content: email.content,
+        notificationIds: [notification.id],
+      },
+      delivery
+    );
+    if (queued) {
+      console.log(`Queued reschedule notification to ${patientUser.email}`);
     }
   } catch (error) {
     console.error("Error in sendAppointmentRescheduleNotification:", error);
+    throw error;
   }
 }
 
@@ -1,7 +1,8 @@
 import sequelize from "../../config/database";
 import Patient from "../../models/Patient";
 import PatientProfile from "../../models/PatientProfile";
-import { Op } from "sequelize";
+import { Op, literal } from "sequelize";
+import { PatientSearchIndex } from "../../services/patientSearch.service";
 
 interface ProfileInput {
   type: "phone" | "email" | "address";
@@ -115,6 +116,7 @@ export const setupPatientProfileService = async (
     if (profiles.length > 0) {
       await PatientProfile.bulkCreate(profiles, { transaction });
     }
+    await PatientSearchIndex.refreshContacts([patient.id], transaction);
 
     
     await patient.reload({
@@ -212,6 +214,7 @@ export const createPatientService = async (
     if (profiles.length > 0) {
       await PatientProfile.bulkCreate(profiles, { transaction });
     }
+    await PatientSearchIndex.refreshContacts([patient.id], transaction);
 
     
     await patient.reload({
@@ -269,36 +272,23 @@ export const getPatientsService = async (
   }
 
   const search = filters.search;
-  if (search) {
-    where[Op.or] = [
-      { cccd: { [Op.like]: `%${search}%` } },
-      { fullName: { [Op.like]: `%${search}%` } },
-      { patientCode: { [Op.like]: `%${search}%` } },
-      { phone: { [Op.like]: `%${search}%` } },
+  if (search && search.trim()) {
+    where[Op.and] = [literal(PatientSearchIndex.matchPatients(search, "Patient").condition)];
+  }
+
+  if (filters.profileKeyword && filters.profileKeyword.trim()) {
+    where[Op.and] = [
+      ...(where[Op.and] || []),
+      literal(PatientSearchIndex.matchContacts(filters.profileKeyword, "Patient")),
     ];
   }
 
-  // Handle profileKeyword - search in User email or Profiles
-  // This is complex because profiles are in a separate table/association.
-  // Ideally we would add to the where clause, but it requires including models with where.
-  // For simplicity, if profileKeyword is provided, we might interpret it as just part of general search 
-  // or add specific logic.
-  // Given the current structure, we can try to search in profiles if needed, 
-  // but let's stick to the requested simple mapping if possible or just ignore profileKeyword for now 
-  // unless we want to do a join search. 
-  // Since `search` already checks `phone` (which is a profile value effectively or cached on patient), 
-  // maybe we just rely on `search` for now and map `profileKeyword` to `search` in controller if needed, 
-  // or merge them.
-  // Let's refine the search block to include profile values if possible or just keep "search" doing the heavy lifting.
-  
   return Patient.findAndCountAll({
     where,
     include: [
       { 
         model: PatientProfile, 
         as: "profiles",
-        // If we wanted to filter by profileKeyword:
-        // where: filters.profileKeyword ? { value: { [Op.like]: `%${filters.profileKeyword}%` } } : undefined
       },
       { model: require( "../../models/User").default, as: "user", attributes: ["email"] },
     ],
@@ -417,6 +407,7 @@ export const updatePatientService = async (id: number, data: any) => {
       if (profiles.length > 0) {
         await PatientProfile.bulkCreate(profiles, { transaction: t });
       }
+      await PatientSearchIndex.refreshContacts([id], t);
     }
 
     
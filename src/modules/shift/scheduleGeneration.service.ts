@@ -1,163 +1,79 @@
-import { Transaction } from "sequelize";
-import { ShiftTemplate, DoctorShift, sequelize } from "../../models/index";
+import { Op, Transaction } from "sequelize";
+import { ShiftTemplate, DoctorShift, Shift, sequelize } from "../../models/index";
 import { DoctorShiftStatus } from "../../models/DoctorShift";
 import { AppError } from "../../utils/AppError";
-import { validateNoOverlappingShifts } from "../doctor/doctorShift.service";
+import { checkTimeOverlap } from "../doctor/doctorShift.service";
+import { toDayKey } from "../../services/reportRollup.service";
+
+interface ShiftWindow {
+  shiftId: number;
+  name: string;
+  startTime: string;
+  endTime: string;
+}
 
-export class ScheduleGenerationService {
-  
-  static async generateMonthlySchedule() {
-    const transaction: Transaction = await sequelize.transaction();
+interface PlannedShift {
+  date: string;
+  doctorId: number;
+  shiftId: number;
+  exists: boolean;
+  overlap: boolean;
+  reason?: string;
+}
 
-    try {
-      
-      const { startDate, endDate, year, month } = this.getNextMonthRange();
+interface SchedulePlan {
+  templates: number;
+  shifts: PlannedShift[];
+  toCreate: Array<{ doctorId: number; shiftId: number; workDate: string; status: DoctorShiftStatus }>;
+}
 
-      console.log(
-        `Generating schedule for ${year}-${month
-          .toString()
-          .padStart(2, "0")} (${startDate} to ${endDate})`
-      );
+const CREATE_CHUNK_SIZE = 500;
 
-      
-      const templates = await ShiftTemplate.findAll({
-        where: { isActive: true },
-        transaction,
-      });
 
-      if (templates.length === 0) {
-        throw new AppError(
-          "NO_ACTIVE_TEMPLATES",
-          "No active shift templates found. Please create templates first.",
-          400
-        );
-      }
-
-      console.log(` Found ${templates.length} active templates`);
-
-      
-      let generatedCount = 0;
-      let skippedCount = 0;
+class DoctorDayIntervals {
+  private readonly days = new Map<string, ShiftWindow[]>();
 
-      const current = new Date(startDate);
-      while (current <= endDate) {
-        const dayOfWeek = current.getDay(); 
-        
-        const dayOfWeekAdjusted = dayOfWeek === 0 ? 7 : dayOfWeek;
+  add(doctorId: number, date: string, window: ShiftWindow): void {
+    const key = `${doctorId}_${date}`;
+    const windows = this.days.get(key) || [];
+    windows.push(window);
+    this.days.set(key, windows);
+  }
 
-        
-        const dayTemplates = templates.filter(
-          (t) => t.dayOfWeek === dayOfWeekAdjusted
-        );
+  findOverlap(doctorId: number, date: string, window: ShiftWindow): ShiftWindow | undefined {
+    return (this.days.get(`${doctorId}_${date}`) || []).find(
+      (existing) =>
+        existing.shiftId !== window.shiftId &&
+        checkTimeOverlap(window.startTime, window.endTime, existing.startTime, existing.endTime)
+    );
+  }
+}
 
-        
-        for (const template of dayTemplates) {
-          const dateStr = current.toISOString().split("T")[0];
-
-          
-          const existing = await DoctorShift.findOne({
-            where: {
-              doctorId: template.doctorId,
-              shiftId: template.shiftId,
-              workDate: dateStr,
-            },
-            transaction,
-          });
-
-          if (existing) {
-            skippedCount++;
-            console.log(
-              `Skipping existing: Doctor ${template.doctorId}, Shift ${template.shiftId} on ${dateStr}`
-            );
-            continue;
-          }
-
-          
-          try {
-            await validateNoOverlappingShifts(
-              template.doctorId,
-              template.shiftId,
-              dateStr,
-              transaction
-            );
-          } catch (error: any) {
-            console.warn(
-              `️  Skipping Doctor ${template.doctorId}, Shift ${template.shiftId} on ${dateStr}: ${error.message}`
-            );
-            skippedCount++;
-            continue;
-          }
-
-          
-          await DoctorShift.create(
-            {
-              doctorId: template.doctorId,
-              shiftId: template.shiftId,
-              workDate: dateStr,
-              status: DoctorShiftStatus.ACTIVE,
-            },
-            { transaction }
-          );
+export class ScheduleGenerationService {
 
-          generatedCount++;
-        }
+  static async generateMonthlySchedule() {
+    const { year, month } = this.getNextMonthRange();
+    return this.generateScheduleForMonth(year, month);
+  }
 
-        
-        current.setDate(current.getDate() + 1);
-      }
 
-      await transaction.commit();
+  static async generateScheduleForMonth(year: number, month: number) {
+    if (month < 1 || month > 12) {
+      throw new AppError("INVALID_MONTH", "Month must be between 1 and 12", 400);
+    }
 
-      console.log(
-        `Schedule generation complete: ${generatedCount} shifts created, ${skippedCount} skipped`
-      );
+    const { startDate, endDate } = this.getMonthRange(year, month);
+    const label = `${year}-${month.toString().padStart(2, "0")}`;
+    const startedAt = Date.now();
 
-      return {
-        success: true,
-        message: `Successfully generated schedule for ${year}-${month
-          .toString()
-          .padStart(2, "0")}`,
-        generated: generatedCount,
-        skipped: skippedCount,
-        period: {
-          year,
-          month,
-          startDate: startDate.toISOString().split("T")[0],
-          endDate: endDate.toISOString().split("T")[0],
-        },
-      };
-    } catch (error) {
-      await transaction.rollback();
-      console.error("Schedule generation failed:", error);
-      throw error;
-    }
-  }
+    console.log(`Generating schedule for ${label} (${startDate} to ${endDate})`);
 
-  
-  static async generateScheduleForMonth(year: number, month: number) {
     const transaction: Transaction = await sequelize.transaction();
 
     try {
-      
-      if (month < 1 || month > 12) {
-        throw new AppError("INVALID_MONTH", "Month must be between 1 and 12", 400);
-      }
-
-      
-      const startDate = new Date(year, month - 1, 1);
-      const endDate = new Date(year, month, 0); 
+      const plan = await this.planMonth(startDate, endDate, transaction);
 
-      console.log(
-        `Generating schedule for ${year}-${month.toString().padStart(2, "0")}`
-      );
-
-      
-      const templates = await ShiftTemplate.findAll({
-        where: { isActive: true },
-        transaction,
-      });
-
-      if (templates.length === 0) {
+      if (plan.templates === 0) {
         throw new AppError(
           "NO_ACTIVE_TEMPLATES",
           "No active shift templates found. Please create templates first.",
@@ -165,149 +81,176 @@ export class ScheduleGenerationService {
         );
       }
 
-      let generatedCount = 0;
-      let skippedCount = 0;
-
-      const current = new Date(startDate);
-      while (current <= endDate) {
-        const dayOfWeek = current.getDay();
-        const dayOfWeekAdjusted = dayOfWeek === 0 ? 7 : dayOfWeek;
-
-        const dayTemplates = templates.filter(
-          (t) => t.dayOfWeek === dayOfWeekAdjusted
-        );
-
-        for (const template of dayTemplates) {
-          const dateStr = current.toISOString().split("T")[0];
-
-          const existing = await DoctorShift.findOne({
-            where: {
-              doctorId: template.doctorId,
-              shiftId: template.shiftId,
-              workDate: dateStr,
-            },
-            transaction,
-          });
-
-          if (existing) {
-            skippedCount++;
-            continue;
-          }
-
-          
-          try {
-            await validateNoOverlappingShifts(
-              template.doctorId,
-              template.shiftId,
-              dateStr,
-              transaction
-            );
-          } catch (error: any) {
-            console.warn(
-              `️  Skipping Doctor ${template.doctorId}, Shift ${template.shiftId} on ${dateStr}: ${error.message}`
-            );
-            skippedCount++;
-            continue;
-          }
-
-          await DoctorShift.create(
-            {
-              doctorId: template.doctorId,
-              shiftId: template.shiftId,
-              workDate: dateStr,
-              status: DoctorShiftStatus.ACTIVE,
-            },
-            { transaction }
-          );
-
-          generatedCount++;
-        }
-
-        current.setDate(current.getDate() + 1);
+      for (let i = 0; i < plan.toCreate.length; i += CREATE_CHUNK_SIZE) {
+        await DoctorShift.bulkCreate(plan.toCreate.slice(i, i + CREATE_CHUNK_SIZE), {
+          ignoreDuplicates: true,
+          transaction,
+        });
       }
 
       await transaction.commit();
 
+      const generatedCount = plan.toCreate.length;
+      const skippedCount = plan.shifts.length - generatedCount;
+
+      console.log(
+        `Schedule generation complete: ${generatedCount} shifts created, ${skippedCount} skipped in ${Date.now() - startedAt}ms`
+      );
+
       return {
         success: true,
-        message: `Successfully generated schedule for ${year}-${month
-          .toString()
-          .padStart(2, "0")}`,
+        message: `Successfully generated schedule for ${label}`,
         generated: generatedCount,
         skipped: skippedCount,
         period: {
           year,
           month,
-          startDate: startDate.toISOString().split("T")[0],
-          endDate: endDate.toISOString().split("T")[0],
+          startDate,
+          endDate,
         },
       };
     } catch (error) {
       await transaction.rollback();
+      console.error("Schedule generation failed:", error);
       throw error;
     }
   }
 
-  
+
+  private static getMonthRange(year: number, month: number) {
+    return {
+      startDate: toDayKey(new Date(year, month - 1, 1)),
+      endDate: toDayKey(new Date(year, month, 0)),
+    };
+  }
+
   private static getNextMonthRange() {
     const now = new Date();
     const year =
       now.getMonth() === 11 ? now.getFullYear() + 1 : now.getFullYear();
     const month = now.getMonth() === 11 ? 1 : now.getMonth() + 2;
 
-    const startDate = new Date(year, month - 1, 1);
-    const endDate = new Date(year, month, 0);
-
-    return { startDate, endDate, year, month };
+    return { ...this.getMonthRange(year, month), year, month };
   }
 
-  
-  static async previewMonthlySchedule() {
-    const { startDate, endDate, year, month } = this.getNextMonthRange();
 
-    const templates = await ShiftTemplate.findAll({
-      where: { isActive: true },
-    });
+  private static async planMonth(
+    startDate: string,
+    endDate: string,
+    transaction?: Transaction
+  ): Promise<SchedulePlan> {
+    const [templates, shifts, existingShifts] = await Promise.all([
+      ShiftTemplate.findAll({
+        attributes: ["doctorId", "shiftId", "dayOfWeek"],
+        where: { isActive: true },
+        transaction,
+      }),
+      Shift.findAll({
+        attributes: ["id", "name", "startTime", "endTime"],
+        transaction,
+      }),
+      DoctorShift.findAll({
+        attributes: ["doctorId", "shiftId", "workDate", "status"],
+        where: { workDate: { [Op.between]: [startDate, endDate] } },
+        raw: true,
+        transaction,
+      }),
+    ]);
 
+    const plan: SchedulePlan = { templates: templates.length, shifts: [], toCreate: [] };
     if (templates.length === 0) {
-      return {
-        success: false,
-        message: "No active templates found",
-        shifts: [],
-      };
+      return plan;
     }
 
-    const shifts: any[] = [];
-    const current = new Date(startDate);
+    const windows = new Map<number, ShiftWindow>(
+      shifts.map((shift) => [
+        shift.id,
+        { shiftId: shift.id, name: shift.name, startTime: shift.startTime, endTime: shift.endTime },
+      ])
+    );
+    const templatesByDay = new Map<number, ShiftTemplate[]>();
+    for (const template of templates) {
+      templatesByDay.set(template.dayOfWeek, [
+        ...(templatesByDay.get(template.dayOfWeek) || []),
+        template,
+      ]);
+    }
+
+    const existingKeys = new Set<string>();
+    const intervals = new DoctorDayIntervals();
+    for (const existing of existingShifts) {
+      existingKeys.add(`${existing.doctorId}_${existing.shiftId}_${existing.workDate}`);
+      const window = windows.get(existing.shiftId);
+      if (window && existing.status === DoctorShiftStatus.ACTIVE) {
+        intervals.add(existing.doctorId, existing.workDate, window);
+      }
+    }
 
-    while (current <= endDate) {
-      const dayOfWeek = current.getDay();
-      const dayOfWeekAdjusted = dayOfWeek === 0 ? 7 : dayOfWeek;
+    const [year, month, day] = startDate.split("-").map(Number);
+    for (
+      const current = new Date(year, month - 1, day);
+      toDayKey(current) <= endDate;
+      current.setDate(current.getDate() + 1)
+    ) {
+      const date = toDayKey(current);
+      const dayOfWeek = current.getDay() === 0 ? 7 : current.getDay();
+
+      for (const template of templatesByDay.get(dayOfWeek) || []) {
+        const entry: PlannedShift = {
+          date,
+          doctorId: template.doctorId,
+          shiftId: template.shiftId,
+          exists: existingKeys.has(`${template.doctorId}_${template.shiftId}_${date}`),
+          overlap: false,
+        };
+        plan.shifts.push(entry);
 
-      const dayTemplates = templates.filter(
-        (t) => t.dayOfWeek === dayOfWeekAdjusted
-      );
+        if (entry.exists) {
+          continue;
+        }
 
-      for (const template of dayTemplates) {
-        const dateStr = current.toISOString().split("T")[0];
+        const window = windows.get(template.shiftId);
+        if (!window) {
+          entry.overlap = true;
+          entry.reason = "Shift not found";
+          continue;
+        }
 
-        const existing = await DoctorShift.findOne({
-          where: {
-            doctorId: template.doctorId,
-            shiftId: template.shiftId,
-            workDate: dateStr,
-          },
-        });
+        const overlap = intervals.findOverlap(template.doctorId, date, window);
+        if (overlap) {
+          entry.overlap = true;
+          entry.reason = `Doctor already assigned to ${overlap.name} (${overlap.startTime}-${overlap.endTime}) which overlaps with ${window.name} (${window.startTime}-${window.endTime})`;
+          console.warn(
+            `️  Skipping Doctor ${template.doctorId}, Shift ${template.shiftId} on ${date}: ${entry.reason}`
+          );
+          continue;
+        }
 
-        shifts.push({
-          date: dateStr,
+        intervals.add(template.doctorId, date, window);
+        existingKeys.add(`${template.doctorId}_${template.shiftId}_${date}`);
+        plan.toCreate.push({
           doctorId: template.doctorId,
           shiftId: template.shiftId,
-          exists: !!existing,
+          workDate: date,
+          status: DoctorShiftStatus.ACTIVE,
         });
       }
+    }
+
+    return plan;
+  }
+
+
+  static async previewMonthlySchedule() {
+    const { startDate, endDate, year, month } = this.getNextMonthRange();
+    const plan = await this.planMonth(startDate, endDate);
 
-      current.setDate(current.getDate() + 1);
+    if (plan.templates === 0) {
+      return {
+        success: false,
+        message: "No active templates found",
+        shifts: [],
+      };
     }
 
     return {
@@ -315,14 +258,15 @@ export class ScheduleGenerationService {
       period: {
         year,
         month,
-        startDate: startDate.toISOString().split("T")[0],
-        endDate: endDate.toISOString().split("T")[0],
+        startDate,
+        endDate,
       },
-      totalTemplates: templates.length,
-      totalShifts: shifts.length,
-      newShifts: shifts.filter((s) => !s.exists).length,
-      existingShifts: shifts.filter((s) => s.exists).length,
-      shifts,
+      totalTemplates: plan.templates,
+      totalShifts: plan.shifts.length,
+      newShifts: plan.toCreate.length,
+      existingShifts: plan.shifts.filter((s) => s.exists).length,
+      overlappingShifts: plan.shifts.filter((s) => s.overlap).length,
+      shifts: plan.shifts,
     };
   }
 }
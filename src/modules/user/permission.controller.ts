@@ -2,6 +2,7 @@ import { Request, Response } from "express";
 import Permission from "../../models/Permission";
 import Role from "../../models/Role";
 import RolePermission from "../../models/RolePermission";
+import { PermissionCacheService } from "../../services/permissionCache.service";
 
 
 export const getAllPermissions = async (req: Request, res: Response) => {
@@ -125,6 +126,7 @@ export const assignPermissionsToRole = async (req: Request, res: Response) => {
     }));
 
     await RolePermission.bulkCreate(rolePermissions);
+    await PermissionCacheService.invalidate();
 
     
     const updatedRole = await Role.findByPk(roleId, {
@@ -201,6 +203,7 @@ export const addPermissionToRole = async (req: Request, res: Response) => {
       roleId: Number(roleId),
       permissionId,
     });
+    await PermissionCacheService.invalidate();
 
     return res.json({
       success: true,
@@ -233,6 +236,7 @@ export const removePermissionFromRole = async (req: Request, res: Response) => {
         message: "Permission not found for this role",
       });
     }
+    await PermissionCacheService.invalidate();
 
     return res.json({
       success: true,
@@ -302,6 +306,7 @@ export const deletePermission = async (req: Request, res: Response) => {
         message: "Permission not found",
       });
     }
+    await PermissionCacheService.invalidate();
 
     return res.json({
       success: true,
@@ -4,6 +4,7 @@ import sequelize from "../../config/database";
 import { User, Role, Employee, Patient, Specialty } from "../../models/index";
 import { Op } from "sequelize";
 import { RoleCode } from "../../constant/role";
+import { CacheService, CacheTags } from "../../services/cache.service";
 import {
   getNotificationSettingsService,
   updateNotificationSettingsService,
@@ -201,6 +202,9 @@ export const createUser = async (req: Request, res: Response) => {
     }
 
     await t.commit();
+    if (rid === RoleCode.DOCTOR) {
+      await CacheService.invalidateTags([CacheTags.DOCTORS]);
+    }
 
     return res.status(201).json({
       success: true,
@@ -246,12 +250,16 @@ export const updateUser = async (req: Request, res: Response) => {
       }
     }
 
+    const wasDoctor = user.roleId === RoleCode.DOCTOR;
     await user.update({
       email: email || user.email,
       fullName: fullName || user.fullName,
       roleId: roleId || user.roleId,
       isActive: isActive !== undefined ? isActive : user.isActive,
     });
+    if (wasDoctor || user.roleId === RoleCode.DOCTOR) {
+      await CacheService.invalidateTags([CacheTags.DOCTORS]);
+    }
 
     return res.json({
       success: true,
@@ -286,6 +294,9 @@ export const deleteUser = async (req: Request, res: Response) => {
     }
 
     await user.update({ isActive: false });
+    if (user.roleId === RoleCode.DOCTOR) {
+      await CacheService.invalidateTags([CacheTags.DOCTORS]);
+    }
 
     return res.json({
       success: true,
@@ -365,6 +376,9 @@ export const uploadAvatar = async (req: Request, res: Response) => {
 
     const avatarPath = `/uploads/avatars/${req.file.filename}`;
     await user.update({ avatar: avatarPath });
+    if (user.roleId === RoleCode.DOCTOR) {
+      await CacheService.invalidateTags([CacheTags.DOCTORS]);
+    }
 
     return res.json({
       success: true,
@@ -403,6 +417,9 @@ export const activateUser = async (req: Request, res: Response) => {
     }
 
     await user.update({ isActive: true });
+    if (user.roleId === RoleCode.DOCTOR) {
+      await CacheService.invalidateTags([CacheTags.DOCTORS]);
+    }
 
     
     await user.reload();
@@ -448,6 +465,9 @@ export const deactivateUser = async (req: Request, res: Response) => {
     }
 
     await user.update({ isActive: false });
+    if (user.roleId === RoleCode.DOCTOR) {
+      await CacheService.invalidateTags([CacheTags.DOCTORS]);
+    }
 
     
     await user.reload();
@@ -561,6 +581,8 @@ export const changeUserRole = async (req: Request, res: Response) => {
       }
     }
 
+    await CacheService.invalidateTags([CacheTags.DOCTORS]);
+
     
     await user.reload({
       include: [{ model: Role, as: "role", attributes: ["id", "name"] }],
@@ -14,26 +14,62 @@ import { startAllMedicineJobs } from "./jobs/medicineExpiryCheck";
 import { setupScheduleGenerationCron } from "./jobs/scheduleGenerationCron";
 import { initializeScheduler } from "./jobs/scheduler";
 import { sequelize } from "./models/index";
+import { PermissionCacheService } from "./services/permissionCache.service";
+import { ReportRollupService } from "./services/reportRollup.service";
+import { SlotAvailabilityService } from "./services/slotAvailability.service";
+import { registerDashboardCacheInvalidation } from "./modules/admin/dashboard.service";
+import { JobQueueService, JobQueues } from "./services/jobQueue.service";
+import { registerNotificationJobHandlers } from "./jobs/notificationQueue.job";
+import { AuditLogWriter } from "./services/auditLogWriter.service";
+import { AccessLogWriter } from "./services/accessLogWriter.service";
 
 const PORT = process.env.PORT || 5000;
+ReportRollupService.registerHooks();
+SlotAvailabilityService.registerHooks();
+registerDashboardCacheInvalidation();
 (async () => {
   try {
     await sequelize.authenticate();
     console.log("Database connected via Sequelize");
 
+    await PermissionCacheService.warmUp();
+
+    ReportRollupService.ensureBackfilled().catch((error) => {
+      console.error("Report rollup backfill failed", error);
+    });
+    SlotAvailabilityService.ensureBackfilled().catch((error) => {
+      console.error("Slot availability backfill failed", error);
+    });
+
     
     startAllMedicineJobs();
     setupScheduleGenerationCron();
     initializeScheduler(); 
+
+    if (process.env.RUN_JOB_WORKER === "true") {
+      registerNotificationJobHandlers();
+      JobQueueService.start([JobQueues.NOTIFICATIONS, JobQueues.EMAILS]);
+    }
   } catch (error) {
     console.error("Database connection failed", error);
   }
 })();
 
-app.listen(PORT, () => {
+const server = app.listen(PORT, () => {
   console.log(`Server is running on port ${PORT}`);
   console.log(`Environment: ${process.env.NODE_ENV || "development"}`);
 
   
   console.log(`Total middleware/routes registered: ${(app as any)._router?.stack?.length || 'unknown'}`);
 });
+
+const shutdown = (signal: string) => {
+  console.log(`Received ${signal}, draining audit and access log buffers...`);
+  server.close();
+  Promise.all([AuditLogWriter.drain(), AccessLogWriter.drain()])
+    .catch((error) => console.error("Log drain failed", error))
+    .finally(() => process.exit(0));
+};
+
+process.on("SIGINT", () => shutdown("SIGINT"));
+process.on("SIGTERM", () => shutdown("SIGTERM"));
@@ -0,0 +1,117 @@
+import fs from "fs";
+import path from "path";
+import { Writable } from "stream";
+import logger from "../utils/logger";
+
+export interface AccessLogEntry {
+  time: string;
+  requestId: string;
+  method: string;
+  url: string;
+  status: number;
+  durationMs: number;
+  contentLength?: number;
+  userId?: number;
+  roleId?: number;
+  ip?: string;
+  sampleRate: number;
+}
+
+export class AccessLogWriter {
+  private static readonly CAPACITY = parseInt(process.env.ACCESS_LOG_BUFFER_SIZE || "20000", 10);
+  private static readonly FLUSH_SIZE = parseInt(process.env.ACCESS_LOG_FLUSH_SIZE || "500", 10);
+  private static readonly FLUSH_INTERVAL_MS = parseInt(process.env.ACCESS_LOG_FLUSH_INTERVAL_MS || "1000", 10);
+
+  private static buffer: string[] = [];
+  private static destination: Writable | null = null;
+  private static blocked = false;
+  private static timer: NodeJS.Timeout | null = null;
+  private static stats = { written: 0, flushes: 0, dropped: 0, backpressureWaits: 0 };
+
+  static setDestination(destination: Writable | null): void {
+    this.destination = destination;
+    this.blocked = false;
+  }
+
+  static write(entry: AccessLogEntry): void {
+    this.start();
+
+    if (this.buffer.length >= this.CAPACITY) {
+      this.stats.dropped++;
+      return;
+    }
+
+    this.buffer.push(JSON.stringify(entry));
+    if (this.buffer.length >= this.FLUSH_SIZE) {
+      this.flush();
+    }
+  }
+
+  static flush(): void {
+    if (this.blocked || this.buffer.length === 0) {
+      return;
+    }
+
+    const destination = this.open();
+    const lines = this.buffer;
+    this.buffer = [];
+    this.stats.written += lines.length;
+    this.stats.flushes++;
+
+    if (!destination.write(`${lines.join("\n")}\n`)) {
+      this.blocked = true;
+      this.stats.backpressureWaits++;
+      destination.once("drain", () => {
+        this.blocked = false;
+        this.flush();
+      });
+    }
+  }
+
+  static async drain(): Promise<void> {
+    if (this.timer) {
+      clearInterval(this.timer);
+      this.timer = null;
+    }
+
+    if (this.buffer.length === 0 && !this.destination) {
+      return;
+    }
+
+    const destination = this.open();
+    const lines = this.buffer;
+    this.buffer = [];
+    this.blocked = false;
+    this.stats.written += lines.length;
+
+    await new Promise<void>((resolve) =>
+      destination.write(lines.length > 0 ? `${lines.join("\n")}\n` : "", () => resolve())
+    );
+  }
+
+  static getStats() {
+    return { ...this.stats, buffered: this.buffer.length, capacity: this.CAPACITY };
+  }
+
+  private static open(): Writable {
+    if (!this.destination) {
+      const target = process.env.ACCESS_LOG_DESTINATION || path.join(__dirname, "../../logs/access.log");
+      if (target === "stdout") {
+        this.destination = process.stdout;
+      } else {
+        fs.mkdirSync(path.dirname(target), { recursive: true });
+        this.destination = fs.createWriteStream(target, { flags: "a" });
+      }
+      this.destination.on("error", (error) => logger.error("[AccessLogWriter] Write failed:", error));
+    }
+    return this.destination;
+  }
+
+  private static start(): void {
+    if (this.timer) {
+      return;
+    }
+    this.timer = setInterval(() => this.flush(), this.FLUSH_INTERVAL_MS);
+    this.timer.unref();
+  }
+}
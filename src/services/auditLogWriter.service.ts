@@ -0,0 +1,134 @@
+import AuditLog, { AuditLogCreationAttributes } from "../models/AuditLog";
+import logger from "../utils/logger";
+
+export class AuditLogWriter {
+  private static readonly CAPACITY = parseInt(process.env.AUDIT_BUFFER_SIZE || "10000", 10);
+  private static readonly FLUSH_SIZE = parseInt(process.env.AUDIT_FLUSH_SIZE || "200", 10);
+  private static readonly FLUSH_INTERVAL_MS = parseInt(process.env.AUDIT_FLUSH_INTERVAL_MS || "1000", 10);
+
+  private static readonly ring: Array<AuditLogCreationAttributes | undefined> = new Array(
+    AuditLogWriter.CAPACITY
+  );
+  private static head = 0;
+  private static size = 0;
+  private static flushing: Promise<void> | null = null;
+  private static lastFlushFailed = false;
+  private static timer: NodeJS.Timeout | null = null;
+  private static waiters: Array<() => void> = [];
+  private static stats = { written: 0, flushes: 0, failedFlushes: 0, dropped: 0, backpressureWaits: 0 };
+
+  static async write(row: AuditLogCreationAttributes): Promise<void> {
+    this.start();
+
+    while (this.size >= this.CAPACITY) {
+      this.stats.backpressureWaits++;
+      await new Promise<void>((resolve) => {
+        this.waiters.push(resolve);
+        this.flush();
+      });
+    }
+
+    this.ring[(this.head + this.size) % this.CAPACITY] = { ...row, timestamp: row.timestamp || new Date() };
+    this.size++;
+
+    if (this.size >= this.FLUSH_SIZE) {
+      this.flush();
+    }
+  }
+
+  static flush(): Promise<void> {
+    if (!this.flushing) {
+      this.flushing = this.flushBatch().finally(() => {
+        this.flushing = null;
+        if (this.lastFlushFailed) {
+          setTimeout(() => this.releaseWaiters(), this.FLUSH_INTERVAL_MS).unref();
+          return;
+        }
+        this.releaseWaiters();
+        if (this.size >= this.FLUSH_SIZE) {
+          this.flush();
+        }
+      });
+    }
+    return this.flushing;
+  }
+
+  static async drain(): Promise<void> {
+    if (this.timer) {
+      clearInterval(this.timer);
+      this.timer = null;
+    }
+
+    while (this.size > 0 || this.flushing) {
+      const before = this.stats.written;
+      await this.flush();
+      if (this.stats.written === before && this.size > 0) {
+        logger.error(`[AuditLogWriter] Drain stopped with ${this.size} rows unwritten`);
+        this.stats.dropped += this.size;
+        this.take(this.size);
+        break;
+      }
+    }
+    this.releaseWaiters();
+  }
+
+  static getStats() {
+    return { ...this.stats, buffered: this.size, capacity: this.CAPACITY };
+  }
+
+  private static start(): void {
+    if (this.timer) {
+      return;
+    }
+    this.timer = setInterval(() => {
+      if (this.size > 0) {
+        this.flush();
+      }
+    }, this.FLUSH_INTERVAL_MS);
+    this.timer.unref();
+  }
+
+  private static take(count: number): AuditLogCreationAttributes[] {
+    const rows: AuditLogCreationAttributes[] = [];
+    for (let i = 0; i < count; i++) {
+      rows.push(this.ring[this.head]!);
+      this.ring[this.head] = undefined;
+      this.head = (this.head + 1) % this.CAPACITY;
+    }
+    this.size -= count;
+    return rows;
+  }
+
+  private static async flushBatch(): Promise<void> {
+    const rows = this.take(Math.min(this.size, this.FLUSH_SIZE * 5));
+    if (rows.length === 0) {
+      return;
+    }
+
+    try {
+      await AuditLog.bulkCreate(rows, { validate: false, hooks: false });
+      this.stats.written += rows.length;
+      this.stats.flushes++;
+      this.lastFlushFailed = false;
+    } catch (error) {
+      this.stats.failedFlushes++;
+      this.lastFlushFailed = true;
+      logger.error(`[AuditLogWriter] Failed to write ${rows.length} audit rows:`, error);
+
+      const room = this.CAPACITY - this.size;
+      const kept = rows.slice(0, room);
+      this.stats.dropped += rows.length - kept.length;
+      for (let i = kept.length - 1; i >= 0; i--) {
+        this.head = (this.head - 1 + this.CAPACITY) % this.CAPACITY;
+        this.ring[this.head] = kept[i];
+        this.size++;
+      }
+    }
+  }
+
+  private static releaseWaiters(): void {
+    const waiters = this.waiters;
+    this.waiters = [];
+    waiters.forEach((resolve) => resolve());
+  }
+}
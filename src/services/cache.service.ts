@@ -1,11 +1,30 @@
+import Redis from "ioredis";
 import { redisClient } from "../config/redis.config";
 import logger from "../utils/logger";
 
+type InvalidationListener = (tags: string[]) => void;
+
+export type CacheMetric = "hits" | "misses" | "sets" | "invalidations";
+
+export type CacheStats = Record<string, Record<CacheMetric, number>>;
+
 
 
 export class CacheService {
   private static readonly DEFAULT_TTL = 300; 
   private static readonly PREFIX = "cache:";
+  private static readonly TAG_PREFIX = "cache:tag:";
+  private static readonly TAG_TTL = 24 * 60 * 60;
+  private static readonly UNLINK_BATCH = 500;
+  private static readonly CHANNEL = "cache:invalidate";
+  private static readonly SCAN_COUNT = 1000;
+  private static readonly STATS_KEY = "cache:stats";
+  private static readonly STATS_FLUSH_MS = 10 * 1000;
+
+  private static readonly listeners: InvalidationListener[] = [];
+  private static subscriber: Redis | null = null;
+  private static pendingStats = new Map<string, number>();
+  private static statsTimer: NodeJS.Timeout | null = null;
 
   
   static async get<T>(key: string): Promise<T | null> {
@@ -13,8 +32,10 @@ export class CacheService {
       const fullKey = this.PREFIX + key;
       const data = await redisClient.get(fullKey);
       if (!data) {
+        this.recordStat(key, "misses");
         return null;
       }
+      this.recordStat(key, "hits");
       return JSON.parse(data) as T;
     } catch (error) {
       logger.error("Cache get error:", error);
@@ -27,6 +48,7 @@ export class CacheService {
     try {
       const fullKey = this.PREFIX + key;
       await redisClient.setex(fullKey, ttl, JSON.stringify(value));
+      this.recordStat(key, "sets");
     } catch (error) {
       logger.error("Cache set error:", error);
       
@@ -34,10 +56,32 @@ export class CacheService {
   }
 
   
+  static async setTagged<T>(
+    key: string,
+    value: T,
+    ttl: number = this.DEFAULT_TTL,
+    tags: string[] = []
+  ): Promise<void> {
+    try {
+      const fullKey = this.PREFIX + key;
+      const pipeline = redisClient.pipeline().setex(fullKey, ttl, JSON.stringify(value));
+      for (const tag of tags) {
+        const tagKey = this.TAG_PREFIX + tag;
+        pipeline.sadd(tagKey, fullKey).expire(tagKey, Math.max(ttl, this.TAG_TTL));
+      }
+      await pipeline.exec();
+      this.recordStat(key, "sets");
+    } catch (error) {
+      logger.error("Cache set tagged error:", error);
+    }
+  }
+
+  
   static async delete(key: string): Promise<void> {
     try {
       const fullKey = this.PREFIX + key;
-      await redisClient.del(fullKey);
+      await redisClient.unlink(fullKey);
+      this.recordStat(key, "invalidations");
     } catch (error) {
       logger.error("Cache delete error:", error);
     }
@@ -46,11 +90,16 @@ export class CacheService {
   
   static async deletePattern(pattern: string): Promise<void> {
     try {
-      const fullPattern = this.PREFIX + pattern;
-      const keys = await redisClient.keys(fullPattern);
-      if (keys.length > 0) {
-        await redisClient.del(...keys);
+      const stream = redisClient.scanStream({
+        match: this.PREFIX + pattern,
+        count: this.SCAN_COUNT,
+      });
+      for await (const keys of stream) {
+        if ((keys as string[]).length > 0) {
+          await redisClient.unlink(...(keys as string[]));
+        }
       }
+      this.recordStat(pattern, "invalidations");
     } catch (error) {
       logger.error("Cache delete pattern error:", error);
     }
@@ -81,6 +130,157 @@ export class CacheService {
   static async invalidatePattern(pattern: string): Promise<void> {
     await this.deletePattern(pattern);
   }
+
+  
+  static async invalidateTags(tags: string[]): Promise<void> {
+    if (tags.length === 0) {
+      return;
+    }
+    this.notify(tags);
+
+    try {
+      const tagKeys = tags.map((tag) => this.TAG_PREFIX + tag);
+      const results = (await redisClient
+        .pipeline(tagKeys.map((tagKey) => ["smembers", tagKey]))
+        .exec()) ?? [];
+
+      const keys = new Set<string>();
+      for (const [error, members] of results) {
+        if (!error) {
+          for (const member of members as string[]) {
+            keys.add(member);
+          }
+        }
+      }
+
+      const pipeline = redisClient.pipeline();
+      const allKeys = [...keys, ...tagKeys];
+      for (let i = 0; i < allKeys.length; i += this.UNLINK_BATCH) {
+        pipeline.unlink(...allKeys.slice(i, i + this.UNLINK_BATCH));
+      }
+      pipeline.publish(this.CHANNEL, JSON.stringify(tags));
+      await pipeline.exec();
+      for (const tag of tags) {
+        this.recordStat(this.TAG_PREFIX + tag, "invalidations");
+      }
+    } catch (error) {
+      logger.error("Cache invalidate tags error:", error);
+    }
+  }
+
+  
+  static recordStat(key: string, metric: CacheMetric, count: number = 1): void {
+    const field = `${this.metricName(key)}:${metric}`;
+    this.pendingStats.set(field, (this.pendingStats.get(field) || 0) + count);
+
+    if (!this.statsTimer) {
+      this.statsTimer = setTimeout(() => {
+        this.statsTimer = null;
+        void this.flushStats();
+      }, this.STATS_FLUSH_MS);
+      this.statsTimer.unref?.();
+    }
+  }
+
+  
+  static async flushStats(): Promise<void> {
+    if (this.pendingStats.size === 0) {
+      return;
+    }
+    const pending = this.pendingStats;
+    this.pendingStats = new Map();
+
+    try {
+      const pipeline = redisClient.pipeline();
+      for (const [field, count] of pending) {
+        pipeline.hincrby(this.STATS_KEY, field, count);
+      }
+      await pipeline.exec();
+    } catch (error) {
+      logger.error("Cache stats flush error:", error);
+    }
+  }
+
+  
+  static async getStats(): Promise<CacheStats> {
+    await this.flushStats();
+
+    let fields: Record<string, string> = {};
+    try {
+      fields = await redisClient.hgetall(this.STATS_KEY);
+    } catch (error) {
+      logger.error("Cache stats read error:", error);
+    }
+
+    const stats: CacheStats = {};
+    for (const [field, value] of Object.entries(fields)) {
+      const separator = field.lastIndexOf(":");
+      const name = field.slice(0, separator);
+      const metric = field.slice(separator + 1) as CacheMetric;
+      stats[name] = stats[name] || { hits: 0, misses: 0, sets: 0, invalidations: 0 };
+      stats[name][metric] = Number(value) || 0;
+    }
+    return stats;
+  }
+
+  
+  static onInvalidate(listener: InvalidationListener): void {
+    this.listeners.push(listener);
+    this.subscribe();
+  }
+
+  private static metricName(key: string): string {
+    if (key.startsWith(this.TAG_PREFIX)) {
+      return `tag:${key.slice(this.TAG_PREFIX.length).split(":")[0]}`;
+    }
+    if (key.startsWith("http:")) {
+      return "HTTP";
+    }
+    for (const [name, entry] of Object.entries(CacheKeys)) {
+      if (typeof entry === "string" ? key === entry : key.startsWith(entry(""))) {
+        return name;
+      }
+    }
+    return "OTHER";
+  }
+
+  private static notify(tags: string[]): void {
+    for (const listener of this.listeners) {
+      try {
+        listener(tags);
+      } catch (error) {
+        logger.error("Cache invalidation listener error:", error);
+      }
+    }
+  }
+
+  private static subscribe(): void {
+    if (this.subscriber) {
+      return;
+    }
+
+    const subscriber = redisClient.duplicate();
+    this.subscriber = subscriber;
+
+    subscriber.on("message", (channel: string, message: string) => {
+      if (channel !== this.CHANNEL) {
+        return;
+      }
+      try {
+        this.notify(JSON.parse(message));
+      } catch (error) {
+        logger.error("Cache invalidation message error:", error);
+      }
+    });
+
+    subscriber.on("error", (err) => {
+      logger.error("Cache invalidation subscriber error:", err.message);
+    });
+
+    subscriber.subscribe(this.CHANNEL).catch((error) => {
+      logger.error("Cache invalidation subscribe error:", error);
+    });
+  }
 }
 
 
@@ -93,4 +293,20 @@ export const CacheKeys = {
   DASHBOARD_ALERTS: "dashboard:alerts",
   DASHBOARD_APPOINTMENTS: (date: string) => `dashboard:appointments:${date}`,
   DASHBOARD_RECENT_ACTIVITIES: "dashboard:recent-activities",
+  SLOT_AVAILABILITY: (date: string) => `slots:availability:${date}`,
+  SHIFT_ROSTER: (date: string) => `slots:roster:${date}`,
+  LIST_COUNT: (scope: string) => `count:${scope}`,
+} as const;
+
+
+export const CacheTags = {
+  HTTP: "http",
+  DOCTORS: "doctors",
+  SPECIALTIES: "specialties",
+  MEDICINES: "medicines",
+  DASHBOARD: "dashboard",
+  APPOINTMENTS: (date: string) => `appointments:${date}`,
+  SLOTS: (date: string) => `slots:${date}`,
+  SCHEDULE: (date: string) => `schedule:${date}`,
+  USER: (userId: number | string) => `user:${userId}`,
 } as const;
@@ -1,4 +1,6 @@
 import nodemailer, { Transporter } from "nodemailer";
+import { JobQueueService, JobQueues } from "./jobQueue.service";
+import { EmailContent, htmlToText } from "../templates/emailTemplates";
 
 
 export interface EmailOptions {
@@ -9,21 +11,76 @@ export interface EmailOptions {
 }
 
 
-class EmailService {
+export interface EmailJobPayload extends EmailOptions {
+  content?: EmailContent;
+  notificationIds?: number[];
+}
+
+
+export const EMAIL_JOB = "email:send";
+const EMAIL_BATCH_WINDOW_MS = 5000;
+
+
+export interface SentEmail {
+  messageId: string;
+  to: string;
+  subject: string;
+  html: string;
+  text: string;
+}
+
+
+export interface SmtpSettings {
+  host?: string;
+  port?: number;
+  user?: string;
+  password?: string;
+  pool: boolean;
+  maxConnections: number;
+  maxMessages: number;
+  rateLimit: number;
+  rateDelta: number;
+}
+
+
+export const readSmtpSettings = (): SmtpSettings => ({
+  host: process.env.EMAIL_HOST,
+  port: process.env.EMAIL_PORT ? parseInt(process.env.EMAIL_PORT, 10) : undefined,
+  user: process.env.EMAIL_USER,
+  password: process.env.EMAIL_PASSWORD,
+  pool: process.env.EMAIL_POOL !== "false",
+  maxConnections: parseInt(process.env.EMAIL_POOL_MAX_CONNECTIONS || "5", 10),
+  maxMessages: parseInt(process.env.EMAIL_POOL_MAX_MESSAGES || "100", 10),
+  rateLimit: parseInt(process.env.EMAIL_RATE_LIMIT_PER_SECOND || "10", 10),
+  rateDelta: 1000,
+});
+
+
+export class EmailService {
   private transporter!: Transporter;
   private isConfigured: boolean;
+  private isStub = false;
+  private readonly settings: SmtpSettings;
+  readonly outbox: SentEmail[] = [];
 
-  constructor() {
+  constructor(settings?: Partial<SmtpSettings>) {
     this.isConfigured = false;
-    this.initializeTransporter();
+    this.settings = { ...readSmtpSettings(), ...settings };
+    this.initializeTransporter(!settings?.host);
   }
 
   
-  private initializeTransporter() {
-    const { EMAIL_HOST, EMAIL_PORT, EMAIL_USER, EMAIL_PASSWORD } = process.env;
+  private initializeTransporter(allowStub: boolean) {
+    const { host, port, user, password } = this.settings;
 
+    if (allowStub && (process.env.EMAIL_TRANSPORT === "stub" || process.env.NODE_ENV === "test")) {
+      this.transporter = nodemailer.createTransport({ jsonTransport: true });
+      this.isStub = true;
+      this.isConfigured = true;
+      return;
+    }
     
-    if (!EMAIL_HOST || !EMAIL_PORT || !EMAIL_USER || !EMAIL_PASSWORD) {
+    if (!host || !port || !user || !password) {
       console.warn(
         "️  Email credentials not configured. Email service will be disabled."
       );
@@ -32,17 +89,28 @@ class EmailService {
 
     try {
       this.transporter = nodemailer.createTransport({
-        host: EMAIL_HOST,
-        port: parseInt(EMAIL_PORT, 10),
-        secure: parseInt(EMAIL_PORT, 10) === 465, 
+        host,
+        port,
+        secure: port === 465, 
         auth: {
-          user: EMAIL_USER,
-          pass: EMAIL_PASSWORD,
+          user,
+          pass: password,
         },
-      });
+        pool: this.settings.pool,
+        maxConnections: this.settings.maxConnections,
+        maxMessages: this.settings.maxMessages,
+        rateLimit: this.settings.rateLimit,
+        rateDelta: this.settings.rateDelta,
+      } as any);
 
       this.isConfigured = true;
-      console.log(" Email service initialized successfully");
+      console.log(
+        ` Email service initialized successfully${
+          this.settings.pool
+            ? ` (pool: ${this.settings.maxConnections} connections, ${this.settings.rateLimit} msg/${this.settings.rateDelta}ms)`
+            : ""
+        }`
+      );
     } catch (error) {
       console.error(" Failed to initialize email service:", error);
     }
@@ -50,33 +118,43 @@ class EmailService {
 
   
   async sendEmail(options: EmailOptions): Promise<boolean> {
-    if (!this.isConfigured) {
-      console.warn("Email service not configured. Skipping email send.");
+    try {
+      return await this.deliver(options);
+    } catch (error) {
+      console.error(" Failed to send email:", error);
       return false;
     }
+  }
 
-    try {
-      const { to, subject, html, text } = options;
 
-      const info = await this.transporter.sendMail({
-        from: `"Hệ thống Phòng khám" <${process.env.EMAIL_USER}>`,
-        to: Array.isArray(to) ? to.join(", ") : to,
-        subject,
-        html,
-        text: text || this.stripHtml(html), 
-      });
+  async deliver(options: EmailOptions): Promise<boolean> {
+    if (!this.isConfigured) {
+      console.warn("Email service not configured. Skipping email send.");
+      return false;
+    }
 
-      console.log(` Email sent successfully: ${info.messageId}`);
+    const { to, subject, html } = options;
+    const recipients = Array.isArray(to) ? to.join(", ") : to;
+    const text = options.text || htmlToText(html);
+
+    const info = await this.transporter.sendMail({
+      from: `"Hệ thống Phòng khám" <${this.settings.user}>`,
+      to: recipients,
+      subject,
+      html,
+      text,
+    });
+
+    if (this.isStub) {
+      this.outbox.push({ messageId: info.messageId, to: recipients, subject, html, text });
+      if (this.outbox.length > 1000) {
+        this.outbox.shift();
+      }
       return true;
-    } catch (error) {
-      console.error(" Failed to send email:", error);
-      return false;
     }
-  }
 
-  
-  private stripHtml(html: string): string {
-    return html.replace(/<[^>]*>/g, "");
+    console.log(` Email sent successfully: ${info.messageId}`);
+    return true;
   }
 
   
@@ -94,6 +172,13 @@ class EmailService {
       return false;
     }
   }
+
+  
+  close(): void {
+    if (this.isConfigured) {
+      this.transporter.close();
+    }
+  }
 }
 
 
@@ -103,3 +188,10 @@ export const emailService = new EmailService();
 export async function sendEmail(options: EmailOptions): Promise<boolean> {
   return emailService.sendEmail(options);
 }
+
+
+export async function enqueueEmail(payload: EmailJobPayload): Promise<void> {
+  await JobQueueService.enqueue(JobQueues.EMAILS, EMAIL_JOB, payload, {
+    delayMs: EMAIL_BATCH_WINDOW_MS,
+  });
+}
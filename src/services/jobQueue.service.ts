@@ -0,0 +1,283 @@
+import { randomUUID } from "crypto";
+import { redisClient } from "../config/redis.config";
+import logger from "../utils/logger";
+
+export interface Job<T = any> {
+  id: string;
+  queue: string;
+  type: string;
+  payload: T;
+  attempts: number;
+  maxAttempts: number;
+  createdAt: number;
+  lastError?: string;
+}
+
+export interface EnqueueOptions {
+  delayMs?: number;
+  maxAttempts?: number;
+}
+
+export interface WorkerOptions {
+  batchSize?: number;
+  pollIntervalMs?: number;
+  visibilityTimeoutMs?: number;
+}
+
+export type JobHandler<T = any> = (payload: T, job: Job<T>) => Promise<void>;
+
+export type BatchJobHandler<T = any> = (jobs: Job<T>[]) => Promise<Map<string, Error>>;
+
+export const JobQueues = {
+  NOTIFICATIONS: "notifications",
+  EMAILS: "emails",
+} as const;
+
+interface ClaimedJob {
+  raw: string;
+  job: Job;
+}
+
+const CLAIM_SCRIPT = `
+local due = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1], 'LIMIT', 0, ARGV[4])
+for _, job in ipairs(due) do
+  redis.call('ZREM', KEYS[2], job)
+  redis.call('LPUSH', KEYS[1], job)
+end
+local expired = redis.call('ZRANGEBYSCORE', KEYS[3], '-inf', ARGV[1], 'LIMIT', 0, ARGV[4])
+for _, job in ipairs(expired) do
+  redis.call('ZREM', KEYS[3], job)
+  redis.call('RPUSH', KEYS[1], job)
+end
+local claimed = {}
+for i = 1, tonumber(ARGV[3]) do
+  local job = redis.call('RPOP', KEYS[1])
+  if not job then
+    break
+  end
+  redis.call('ZADD', KEYS[3], ARGV[2], job)
+  claimed[#claimed + 1] = job
+end
+return claimed
+`;
+
+export class JobQueueService {
+  private static readonly PREFIX = "jobs:";
+  private static readonly DEFAULT_MAX_ATTEMPTS = 5;
+  private static readonly BASE_BACKOFF_MS = 2000;
+  private static readonly MAX_BACKOFF_MS = 10 * 60 * 1000;
+  private static readonly DEAD_LETTER_LIMIT = 10000;
+  private static readonly PROMOTE_LIMIT = 500;
+
+  private static readonly handlers = new Map<string, JobHandler>();
+  private static readonly batchHandlers = new Map<string, BatchJobHandler>();
+  private static running = false;
+  private static loops: Promise<void>[] = [];
+
+  static keys(queue: string) {
+    const base = `${this.PREFIX}${queue}`;
+    return {
+      waiting: `${base}:waiting`,
+      delayed: `${base}:delayed`,
+      active: `${base}:active`,
+      dead: `${base}:dead`,
+    };
+  }
+
+  static registerHandler<T>(type: string, handler: JobHandler<T>): void {
+    this.handlers.set(type, handler as JobHandler);
+  }
+
+  static registerBatchHandler<T>(type: string, handler: BatchJobHandler<T>): void {
+    this.batchHandlers.set(type, handler as BatchJobHandler);
+  }
+
+  static async enqueue<T>(
+    queue: string,
+    type: string,
+    payload: T,
+    options: EnqueueOptions = {}
+  ): Promise<Job<T>> {
+    const job: Job<T> = {
+      id: randomUUID(),
+      queue,
+      type,
+      payload,
+      attempts: 0,
+      maxAttempts: options.maxAttempts ?? this.DEFAULT_MAX_ATTEMPTS,
+      createdAt: Date.now(),
+    };
+    const keys = this.keys(queue);
+    const raw = JSON.stringify(job);
+
+    if (options.delayMs && options.delayMs > 0) {
+      await redisClient.zadd(keys.delayed, Date.now() + options.delayMs, raw);
+    } else {
+      await redisClient.lpush(keys.waiting, raw);
+    }
+    return job;
+  }
+
+  static async claim(
+    queue: string,
+    count: number,
+    visibilityTimeoutMs: number
+  ): Promise<ClaimedJob[]> {
+    const keys = this.keys(queue);
+    const now = Date.now();
+    const claimed = (await redisClient.eval(
+      CLAIM_SCRIPT,
+      3,
+      keys.waiting,
+      keys.delayed,
+      keys.active,
+      now,
+      now + visibilityTimeoutMs,
+      count,
+      this.PROMOTE_LIMIT
+    )) as string[];
+
+    return claimed.map((raw) => ({ raw, job: JSON.parse(raw) as Job }));
+  }
+
+  static async process(claimed: ClaimedJob[]): Promise<{ completed: number; retried: number; dead: number }> {
+    const failures = new Map<string, Error>();
+    const byType = new Map<string, Job[]>();
+    for (const { job } of claimed) {
+      byType.set(job.type, [...(byType.get(job.type) || []), job]);
+    }
+
+    for (const [type, jobs] of byType) {
+      const batchHandler = this.batchHandlers.get(type);
+      const handler = this.handlers.get(type);
+
+      if (batchHandler) {
+        try {
+          for (const [id, error] of await batchHandler(jobs)) {
+            failures.set(id, error);
+          }
+        } catch (error: any) {
+          jobs.forEach((job) => failures.set(job.id, error));
+        }
+        continue;
+      }
+
+      const results = await Promise.allSettled(
+        jobs.map((job) =>
+          handler
+            ? handler(job.payload, job)
+            : Promise.reject(new Error(`No handler registered for job type ${type}`))
+        )
+      );
+      results.forEach((result, index) => {
+        if (result.status === "rejected") {
+          failures.set(jobs[index].id, result.reason);
+        }
+      });
+    }
+
+    const pipeline = redisClient.pipeline();
+    const stats = { completed: 0, retried: 0, dead: 0 };
+
+    for (const { raw, job } of claimed) {
+      const keys = this.keys(job.queue);
+      pipeline.zrem(keys.active, raw);
+
+      const error = failures.get(job.id);
+      if (!error) {
+        stats.completed++;
+        continue;
+      }
+
+      const failed: Job = {
+        ...job,
+        attempts: job.attempts + 1,
+        lastError: error?.message || String(error),
+      };
+
+      if (failed.attempts >= failed.maxAttempts) {
+        stats.dead++;
+        pipeline.lpush(keys.dead, JSON.stringify(failed));
+        pipeline.ltrim(keys.dead, 0, this.DEAD_LETTER_LIMIT - 1);
+        logger.error(
+          `[JobQueue] ${job.queue}/${job.type} ${job.id} dead-lettered after ${failed.attempts} attempts: ${failed.lastError}`
+        );
+      } else {
+        stats.retried++;
+        pipeline.zadd(keys.delayed, Date.now() + this.backoff(failed.attempts), JSON.stringify(failed));
+        logger.warn(
+          `[JobQueue] ${job.queue}/${job.type} ${job.id} failed (attempt ${failed.attempts}/${failed.maxAttempts}): ${failed.lastError}`
+        );
+      }
+    }
+
+    await pipeline.exec();
+    return stats;
+  }
+
+  static backoff(attempts: number): number {
+    const delay = Math.min(this.MAX_BACKOFF_MS, this.BASE_BACKOFF_MS * 2 ** (attempts - 1));
+    return Math.round(delay / 2 + Math.random() * (delay / 2));
+  }
+
+  static start(queues: string[], options: WorkerOptions = {}): void {
+    if (this.running) {
+      return;
+    }
+    this.running = true;
+
+    const batchSize = options.batchSize ?? 50;
+    const pollIntervalMs = options.pollIntervalMs ?? 1000;
+    const visibilityTimeoutMs = options.visibilityTimeoutMs ?? 5 * 60 * 1000;
+
+    this.loops = queues.map(async (queue) => {
+      while (this.running) {
+        try {
+          const claimed = await this.claim(queue, batchSize, visibilityTimeoutMs);
+          if (claimed.length > 0) {
+            await this.process(claimed);
+            continue;
+          }
+        } catch (error) {
+          logger.error(`[JobQueue] Worker loop for ${queue} failed:`, error);
+        }
+        await new Promise((resolve) => setTimeout(resolve, pollIntervalMs));
+      }
+    });
+    logger.info(`[JobQueue] Worker started for queues: ${queues.join(", ")}`);
+  }
+
+  static async stop(): Promise<void> {
+    this.running = false;
+    await Promise.all(this.loops);
+    this.loops = [];
+  }
+
+  static async getStats(queue: string) {
+    const keys = this.keys(queue);
+    const [[, waiting], [, delayed], [, active], [, dead]] = (await redisClient
+      .pipeline()
+      .llen(keys.waiting)
+      .zcard(keys.delayed)
+      .zcard(keys.active)
+      .llen(keys.dead)
+      .exec()) as Array<[Error | null, number]>;
+
+    return { waiting, delayed, active, dead };
+  }
+
+  static async retryDeadLetters(queue: string, limit = 100): Promise<number> {
+    const keys = this.keys(queue);
+    let moved = 0;
+    while (moved < limit) {
+      const raw = await redisClient.rpop(keys.dead);
+      if (!raw) {
+        break;
+      }
+      const job = JSON.parse(raw) as Job;
+      await redisClient.lpush(keys.waiting, JSON.stringify({ ...job, attempts: 0 }));
+      moved++;
+    }
+    return moved;
+  }
+}
@@ -0,0 +1,126 @@
+import { Op, Transaction } from "sequelize";
+import sequelize from "../config/database";
+import Patient from "../models/Patient";
+import PatientProfile from "../models/PatientProfile";
+import { normalizePhonePrefix, normalizeSearchText } from "../utils/searchText";
+
+export interface PatientMatch {
+  kind: "code" | "number" | "text";
+  condition: string;
+  score: string;
+}
+
+export class PatientSearchIndex {
+  private static readonly NGRAM_SIZE = 2;
+  private static readonly NAME_PREFIX_BOOST = 10;
+
+  static classify(keyword: string): PatientMatch["kind"] {
+    const trimmed = keyword.trim();
+    if (/^[a-z]{1,4}\d+$/i.test(trimmed)) {
+      return "code";
+    }
+    if (/^\+?\d[\d\s.-]*$/.test(trimmed)) {
+      return "number";
+    }
+    return "text";
+  }
+
+  static buildContacts(profiles: Array<Pick<PatientProfile, "value" | "ward" | "city">>): string {
+    return profiles
+      .map((profile) => normalizeSearchText([profile.value, profile.ward, profile.city].filter(Boolean).join(" ")))
+      .filter(Boolean)
+      .join(" ");
+  }
+
+  static async refreshContacts(patientIds: number[], transaction?: Transaction): Promise<void> {
+    if (patientIds.length === 0) {
+      return;
+    }
+
+    const profiles = await PatientProfile.findAll({
+      where: { patientId: { [Op.in]: patientIds } },
+      attributes: ["patientId", "value", "ward", "city"],
+      raw: true,
+      transaction,
+    });
+
+    const byPatient = new Map<number, typeof profiles>(patientIds.map((id) => [id, []]));
+    for (const profile of profiles) {
+      byPatient.get(profile.patientId)?.push(profile);
+    }
+
+    for (const [patientId, rows] of byPatient) {
+      await Patient.update(
+        { searchContacts: this.buildContacts(rows) },
+        { where: { id: patientId }, hooks: false, transaction }
+      );
+    }
+  }
+
+  static matchPatients(keyword: string, alias: string): PatientMatch {
+    const column = (name: string) => `\`${alias}\`.\`${name}\``;
+    const kind = this.classify(keyword);
+
+    if (kind === "code") {
+      const code = keyword.trim().toUpperCase();
+      return {
+        kind,
+        condition: `${column("patientCode")} LIKE ${sequelize.escape(`${code}%`)}`,
+        score: `(${column("patientCode")} = ${sequelize.escape(code)})`,
+      };
+    }
+
+    if (kind === "number") {
+      const digits = normalizePhonePrefix(keyword);
+      return {
+        kind,
+        condition: `(${column("cccd")} LIKE ${sequelize.escape(`${digits}%`)} OR ${column("id")} IN (${this.phonePrefixSql(digits)}))`,
+        score: `(${column("cccd")} = ${sequelize.escape(digits)})`,
+      };
+    }
+
+    const text = normalizeSearchText(keyword);
+    const prefix = `${column("searchName")} LIKE ${sequelize.escape(`${text}%`)}`;
+    const query = this.booleanQuery(text);
+    if (!query) {
+      return { kind, condition: prefix, score: `(${prefix})` };
+    }
+
+    const match = `MATCH(${column("searchName")}) AGAINST(${sequelize.escape(query)} IN BOOLEAN MODE)`;
+    return {
+      kind,
+      condition: match,
+      score: `(${match} + (${prefix}) * ${this.NAME_PREFIX_BOOST})`,
+    };
+  }
+
+  static matchContacts(keyword: string, alias: string): string {
+    const column = (name: string) => `\`${alias}\`.\`${name}\``;
+
+    if (this.classify(keyword) === "number") {
+      return `${column("id")} IN (${this.phonePrefixSql(normalizePhonePrefix(keyword))})`;
+    }
+
+    const text = normalizeSearchText(keyword);
+    const query = this.booleanQuery(text);
+    return query
+      ? `MATCH(${column("searchContacts")}) AGAINST(${sequelize.escape(query)} IN BOOLEAN MODE)`
+      : `${column("searchContacts")} LIKE ${sequelize.escape(`%${text}%`)}`;
+  }
+
+  static patientIdsSql(keyword: string): string {
+    return `SELECT \`p\`.\`id\` FROM \`patients\` AS \`p\` WHERE ${this.matchPatients(keyword, "p").condition}`;
+  }
+
+  private static phonePrefixSql(digits: string): string {
+    return `SELECT \`pp\`.\`patient_id\` FROM \`patient_profiles\` AS \`pp\` WHERE \`pp\`.\`type\` = 'phone' AND \`pp\`.\`value\` LIKE ${sequelize.escape(`${digits}%`)}`;
+  }
+
+  private static booleanQuery(text: string): string {
+    return text
+      .split(" ")
+      .filter((term) => term.length >= this.NGRAM_SIZE)
+      .map((term) => `+"${term}"`)
+      .join(" ");
+  }
+}
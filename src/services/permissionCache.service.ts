@@ -0,0 +1,159 @@
+import Redis from "ioredis";
+import { redisClient } from "../config/redis.config";
+import Role from "../models/Role";
+import Permission from "../models/Permission";
+import logger from "../utils/logger";
+
+type PermissionTable = Map<number, Set<string>>;
+
+
+export class PermissionCacheService {
+  private static readonly VERSION_KEY = "permissions:version";
+  private static readonly CHANNEL = "permissions:invalidate";
+  private static readonly MAX_AGE_MS = 5 * 60 * 1000;
+
+  private static table: PermissionTable | null = null;
+  private static loadedAt = 0;
+  private static version = 0;
+  private static generation = 0;
+  private static loading: Promise<PermissionTable> | null = null;
+  private static subscriber: Redis | null = null;
+
+
+  static async warmUp(): Promise<void> {
+    this.subscribe();
+    try {
+      await this.getTable();
+      logger.info(`Permission cache warmed (${this.table?.size ?? 0} roles, version ${this.version})`);
+    } catch (error) {
+      logger.error("Permission cache warm-up error:", error);
+    }
+  }
+
+
+  static async getRolePermissions(roleId: number): Promise<Set<string> | null> {
+    const table = await this.getTable();
+    return table.get(Number(roleId)) ?? null;
+  }
+
+
+  static async hasPermission(roleId: number, permissionName: string): Promise<boolean> {
+    const permissions = await this.getRolePermissions(roleId);
+    return permissions?.has(permissionName) ?? false;
+  }
+
+
+  static async invalidate(): Promise<void> {
+    this.drop();
+    try {
+      const version = await redisClient.incr(this.VERSION_KEY);
+      await redisClient.publish(this.CHANNEL, String(version));
+    } catch (error) {
+      logger.error("Permission cache invalidation publish error:", error);
+    }
+  }
+
+
+  static reset(): void {
+    this.drop();
+    this.version = 0;
+    if (this.subscriber) {
+      this.subscriber.disconnect();
+      this.subscriber = null;
+    }
+  }
+
+  private static drop(): void {
+    this.generation += 1;
+    this.table = null;
+    this.loading = null;
+  }
+
+  private static async getTable(): Promise<PermissionTable> {
+    if (this.table && Date.now() - this.loadedAt < this.MAX_AGE_MS) {
+      return this.table;
+    }
+    let loading = this.loading;
+    if (!loading) {
+      const generation = this.generation;
+      const pending = this.load().then(({ table, version }) => {
+        if (generation === this.generation) {
+          this.table = table;
+          this.version = version;
+          this.loadedAt = Date.now();
+        }
+        return table;
+      });
+      loading = pending;
+      this.loading = pending;
+      pending
+        .catch(() => undefined)
+        .finally(() => {
+          if (this.loading === pending) {
+            this.loading = null;
+          }
+        });
+    }
+    return loading;
+  }
+
+  private static async load(): Promise<{ table: PermissionTable; version: number }> {
+    const version = await this.readVersion();
+    const roles = await Role.findAll({
+      attributes: ["id"],
+      include: [
+        {
+          model: Permission,
+          as: "permissions",
+          attributes: ["name"],
+          through: { attributes: [] },
+        },
+      ],
+    });
+
+    const table: PermissionTable = new Map();
+    for (const role of roles) {
+      const names = ((role as any).permissions || []).map((p: Permission) => p.name);
+      table.set(role.id, new Set(names));
+    }
+    return { table, version };
+  }
+
+  private static async readVersion(): Promise<number> {
+    try {
+      return Number(await redisClient.get(this.VERSION_KEY)) || 0;
+    } catch (error) {
+      logger.error("Permission cache version read error:", error);
+      return this.version;
+    }
+  }
+
+  private static subscribe(): void {
+    if (this.subscriber) {
+      return;
+    }
+
+    const subscriber = redisClient.duplicate();
+    this.subscriber = subscriber;
+
+    subscriber.on("message", (channel: string, message: string) => {
+      if (channel === this.CHANNEL && Number(message) !== this.version) {
+        this.drop();
+      }
+    });
+
+    subscriber.on("ready", async () => {
+      if ((await this.readVersion()) !== this.version) {
+        this.drop();
+      }
+    });
+
+    subscriber.on("error", (err) => {
+      logger.error("Permission cache subscriber error:", err.message);
+    });
+
+    subscriber.subscribe(this.CHANNEL).catch((error) => {
+      logger.error("Permission cache subscribe error:", error);
+    });
+  }
+}
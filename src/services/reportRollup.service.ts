@@ -0,0 +1,335 @@
+import { Op, Model, ModelStatic, Transaction, fn, col } from "sequelize";
+import sequelize from "../config/database";
+import Invoice from "../models/Invoice";
+import InvoiceItem from "../models/InvoiceItem";
+import Appointment from "../models/Appointment";
+import Patient from "../models/Patient";
+import User from "../models/User";
+import ReportDailyInvoice from "../models/ReportDailyInvoice";
+import ReportDailyInvoiceItem from "../models/ReportDailyInvoiceItem";
+import ReportDailyAppointment from "../models/ReportDailyAppointment";
+import ReportDailyPatient from "../models/ReportDailyPatient";
+import logger from "../utils/logger";
+
+type DayValue = Date | string | null | undefined;
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+
+export const DB_TIMEZONE = "+07:00";
+
+
+export const toDayKey = (value: Date | string): string => {
+  if (typeof value === "string" && /^\d{4}-\d{2}-\d{2}$/.test(value)) {
+    return value;
+  }
+  const date = new Date(value);
+  const month = String(date.getMonth() + 1).padStart(2, "0");
+  const day = String(date.getDate()).padStart(2, "0");
+  return `${date.getFullYear()}-${month}-${day}`;
+};
+
+export const dbDayStart = (day: string): Date => new Date(`${day}T00:00:00${DB_TIMEZONE}`);
+
+const DB_OFFSET_MS = -dbDayStart("1970-01-01").getTime();
+
+export const toDbDayKey = (value: Date | string): string => {
+  if (typeof value === "string" && /^\d{4}-\d{2}-\d{2}$/.test(value)) {
+    return value;
+  }
+  return new Date(new Date(value).getTime() + DB_OFFSET_MS).toISOString().slice(0, 10);
+};
+
+const addDays = (day: string, amount: number): string =>
+  new Date(dbDayStart(day).getTime() + amount * DAY_MS + DB_OFFSET_MS).toISOString().slice(0, 10);
+
+const dayFormat = (column: string) => fn("DATE_FORMAT", col(column), "%Y-%m-%d");
+
+
+export class ReportRollupService {
+  private static readonly FLUSH_DELAY_MS = 2000;
+  private static readonly CHUNK_DAYS = 31;
+
+  private static dirty = new Set<string>();
+  private static timer: NodeJS.Timeout | null = null;
+  private static flushing: Promise<void> | null = null;
+  private static hooksRegistered = false;
+
+
+  static registerHooks(): void {
+    if (this.hooksRegistered) {
+      return;
+    }
+    this.hooksRegistered = true;
+
+    const trackCreatedAt = (instance: any, options: any) =>
+      this.track(options, [instance.createdAt]);
+
+    for (const model of [Invoice, InvoiceItem] as ModelStatic<Model>[]) {
+      model.addHook("afterCreate", "reportRollup", trackCreatedAt);
+      model.addHook("afterUpdate", "reportRollup", trackCreatedAt);
+      model.addHook("afterDestroy", "reportRollup", trackCreatedAt);
+      model.addHook("afterBulkCreate", "reportRollup", (instances: any[], options: any) =>
+        this.track(options, instances.map((instance) => instance.createdAt))
+      );
+      model.addHook("beforeBulkUpdate", "reportRollup", (options: any) =>
+        this.trackBulk(model, "createdAt", options)
+      );
+      model.addHook("beforeBulkDestroy", "reportRollup", (options: any) =>
+        this.trackBulk(model, "createdAt", options)
+      );
+    }
+
+    const trackAppointment = (appointment: any, options: any) =>
+      this.track(options, [appointment.date, appointment.previous("date")]);
+
+    Appointment.addHook("afterCreate", "reportRollup", trackAppointment);
+    Appointment.addHook("afterUpdate", "reportRollup", trackAppointment);
+    Appointment.addHook("afterDestroy", "reportRollup", trackAppointment);
+    Appointment.addHook("afterBulkCreate", "reportRollup", (appointments: any[], options: any) =>
+      this.track(options, appointments.map((appointment) => appointment.date))
+    );
+    Appointment.addHook("beforeBulkUpdate", "reportRollup", (options: any) =>
+      this.trackBulk(Appointment, "date", options, [options.attributes?.date])
+    );
+    Appointment.addHook("beforeBulkDestroy", "reportRollup", (options: any) =>
+      this.trackBulk(Appointment, "date", options)
+    );
+
+    const trackPatient = async (patient: any, options: any) => {
+      if (!patient.userId) {
+        return;
+      }
+      const user = await User.findByPk(patient.userId, {
+        attributes: ["createdAt"],
+        transaction: options.transaction,
+        paranoid: false,
+      });
+      this.track(options, [user?.createdAt ?? new Date()]);
+    };
+
+    Patient.addHook("afterCreate", "reportRollup", trackPatient);
+    Patient.addHook("afterDestroy", "reportRollup", trackPatient);
+  }
+
+
+  static markDirty(days: string[]): void {
+    for (const day of days) {
+      this.dirty.add(day);
+    }
+    if (!this.timer && this.dirty.size > 0) {
+      this.timer = setTimeout(() => {
+        this.timer = null;
+        this.flush().catch((error) => {
+          logger.error("Report rollup flush error:", error);
+        });
+      }, this.FLUSH_DELAY_MS);
+      this.timer.unref?.();
+    }
+  }
+
+
+  static async flush(): Promise<void> {
+    while (this.flushing) {
+      await this.flushing.catch(() => undefined);
+    }
+    if (this.dirty.size === 0) {
+      return;
+    }
+
+    const days = [...this.dirty].sort();
+    this.dirty.clear();
+
+    const pending = this.refreshDays(days).catch((error) => {
+      for (const day of days) {
+        this.dirty.add(day);
+      }
+      throw error;
+    });
+    this.flushing = pending.finally(() => {
+      this.flushing = null;
+    });
+    await this.flushing;
+  }
+
+
+  static async refreshDays(days: string[]): Promise<void> {
+    const sorted = [...new Set(days)].sort();
+    let start = sorted[0];
+    let end = sorted[0];
+
+    for (const day of sorted.slice(1)) {
+      if (day === addDays(end, 1)) {
+        end = day;
+        continue;
+      }
+      await this.refreshRange(start, end);
+      start = day;
+      end = day;
+    }
+    if (start) {
+      await this.refreshRange(start, end);
+    }
+  }
+
+
+  static async refreshRange(startDay: string, endDay: string): Promise<void> {
+    for (let chunkStart = startDay; chunkStart <= endDay; chunkStart = addDays(chunkStart, this.CHUNK_DAYS)) {
+      const chunkEnd = addDays(chunkStart, this.CHUNK_DAYS - 1);
+      await this.refreshChunk(chunkStart, chunkEnd < endDay ? chunkEnd : endDay);
+    }
+  }
+
+
+  static async ensureBackfilled(): Promise<void> {
+    const [invoiceRollup, appointmentRollup] = await Promise.all([
+      ReportDailyInvoice.findOne({ attributes: ["day"] }),
+      ReportDailyAppointment.findOne({ attributes: ["day"] }),
+    ]);
+    if (invoiceRollup || appointmentRollup) {
+      return;
+    }
+
+    const [firstInvoice, firstAppointment, firstUser] = await Promise.all([
+      Invoice.min("createdAt") as Promise<Date | null>,
+      Appointment.min("date") as Promise<string | null>,
+      User.min("createdAt") as Promise<Date | null>,
+    ]);
+    const starts = [firstInvoice, firstAppointment, firstUser]
+      .filter((value): value is Date | string => !!value)
+      .map(toDbDayKey)
+      .sort();
+    if (starts.length === 0) {
+      return;
+    }
+
+    const startedAt = Date.now();
+    const lastAppointment = (await Appointment.max("date")) as string | null;
+    const today = toDbDayKey(new Date());
+    const endDay = lastAppointment && toDbDayKey(lastAppointment) > today ? toDbDayKey(lastAppointment) : today;
+
+    await this.refreshRange(starts[0], endDay);
+    logger.info(`Report rollups backfilled ${starts[0]}..${endDay} in ${Date.now() - startedAt}ms`);
+  }
+
+
+  static reset(): void {
+    if (this.timer) {
+      clearTimeout(this.timer);
+      this.timer = null;
+    }
+    this.dirty.clear();
+    this.flushing = null;
+  }
+
+  private static track(options: any, values: DayValue[]): void {
+    const days = values
+      .filter((value): value is Date | string => !!value)
+      .map(toDbDayKey);
+    if (days.length === 0) {
+      return;
+    }
+
+    const transaction = options?.transaction as Transaction | undefined;
+    if (transaction) {
+      transaction.afterCommit(() => this.markDirty(days));
+    } else {
+      this.markDirty(days);
+    }
+  }
+
+  private static async trackBulk(
+    model: ModelStatic<Model>,
+    column: string,
+    options: any,
+    extra: DayValue[] = []
+  ): Promise<void> {
+    const rows = (await model.findAll({
+      attributes: [[fn("DISTINCT", dayFormat(column)), "day"]],
+      where: options.where,
+      transaction: options.transaction,
+      raw: true,
+    })) as unknown as Array<{ day: string | null }>;
+
+    this.track(options, [...rows.map((row) => row.day), ...extra]);
+  }
+
+  private static async refreshChunk(startDay: string, endDay: string): Promise<void> {
+    const from = dbDayStart(startDay);
+    const to = new Date(dbDayStart(endDay).getTime() + DAY_MS);
+    const dayRange = { [Op.between]: [startDay, endDay] };
+
+    await sequelize.transaction(async (transaction) => {
+      const [invoices, items, appointments, patients] = await Promise.all([
+        Invoice.findAll({
+          attributes: [
+            [dayFormat("createdAt"), "day"],
+            "doctorId",
+            "paymentStatus",
+            [fn("COUNT", col("id")), "invoiceCount"],
+            [fn("SUM", col("totalAmount")), "totalAmount"],
+            [fn("SUM", col("paidAmount")), "paidAmount"],
+          ],
+          where: { createdAt: { [Op.gte]: from, [Op.lt]: to } },
+          group: ["day", "doctorId", "paymentStatus"],
+          raw: true,
+          transaction,
+        }),
+        InvoiceItem.findAll({
+          attributes: [
+            [dayFormat("createdAt"), "day"],
+            "itemType",
+            [fn("COUNT", col("id")), "itemCount"],
+            [fn("SUM", col("subtotal")), "subtotal"],
+          ],
+          where: { createdAt: { [Op.gte]: from, [Op.lt]: to } },
+          group: ["day", "itemType"],
+          raw: true,
+          transaction,
+        }),
+        Appointment.findAll({
+          attributes: [
+            [dayFormat("date"), "day"],
+            "doctorId",
+            "status",
+            [fn("COUNT", col("id")), "appointmentCount"],
+          ],
+          where: { date: dayRange },
+          group: ["day", "doctorId", "status"],
+          raw: true,
+          transaction,
+        }),
+        Patient.findAll({
+          attributes: [
+            [dayFormat("user.createdAt"), "day"],
+            [fn("COUNT", col("Patient.id")), "newPatients"],
+          ],
+          include: [
+            {
+              model: User,
+              as: "user",
+              attributes: [],
+              where: { createdAt: { [Op.gte]: from, [Op.lt]: to } },
+            },
+          ],
+          group: ["day"],
+          raw: true,
+          transaction,
+        }),
+      ]);
+
+      await Promise.all([
+        ReportDailyInvoice.destroy({ where: { day: dayRange }, transaction }),
+        ReportDailyInvoiceItem.destroy({ where: { day: dayRange }, transaction }),
+        ReportDailyAppointment.destroy({ where: { day: dayRange }, transaction }),
+        ReportDailyPatient.destroy({ where: { day: dayRange }, transaction }),
+      ]);
+
+      await Promise.all([
+        ReportDailyInvoice.bulkCreate(invoices as any[], { transaction }),
+        ReportDailyInvoiceItem.bulkCreate(items as any[], { transaction }),
+        ReportDailyAppointment.bulkCreate(appointments as any[], { transaction }),
+        ReportDailyPatient.bulkCreate(patients as any[], { transaction }),
+      ]);
+    });
+  }
+}
@@ -0,0 +1,90 @@
+import sequelize from "../config/database";
+import CodeSequence from "../models/CodeSequence";
+import { LRUCache } from "../utils/lruCache";
+
+interface SequenceBlock {
+  next: number;
+  last: number;
+}
+
+
+export class SequenceService {
+  private static readonly BLOCK_SIZE = Math.max(1, Number(process.env.CODE_SEQUENCE_BLOCK_SIZE) || 10);
+
+  private static readonly blocks = new LRUCache<string, SequenceBlock>(1000);
+  private static readonly refills = new Map<string, Promise<void>>();
+
+
+  static async next(
+    scope: string,
+    seed: () => Promise<number>,
+    blockSize: number = this.BLOCK_SIZE
+  ): Promise<number> {
+    for (;;) {
+      const block = this.blocks.get(scope);
+      if (block && block.next <= block.last) {
+        return block.next++;
+      }
+
+      let refill = this.refills.get(scope);
+      if (!refill) {
+        refill = this.reserve(scope, blockSize, seed)
+          .then((first) => {
+            this.blocks.set(scope, { next: first, last: first + blockSize - 1 });
+          })
+          .finally(() => {
+            this.refills.delete(scope);
+          });
+        this.refills.set(scope, refill);
+      }
+      await refill;
+    }
+  }
+
+
+  static async nextMany(
+    scope: string,
+    count: number,
+    seed: () => Promise<number>
+  ): Promise<number[]> {
+    const block = this.blocks.get(scope);
+    if (block && block.last - block.next + 1 >= count) {
+      const first = block.next;
+      block.next += count;
+      return Array.from({ length: count }, (_, index) => first + index);
+    }
+
+    const first = await this.reserve(scope, count, seed);
+    return Array.from({ length: count }, (_, index) => first + index);
+  }
+
+
+  static reset(): void {
+    this.blocks.clear();
+    this.refills.clear();
+  }
+
+  // Runs as one short autocommit UPDATE on its own pooled connection, never on the caller's
+  // transaction, so a rollback cannot hand back numbers that are already cached in memory.
+  private static async reserve(
+    scope: string,
+    size: number,
+    seed: () => Promise<number>
+  ): Promise<number> {
+    if (!(await CodeSequence.findByPk(scope, { attributes: ["scope"] }))) {
+      const lastValue = await seed();
+      await CodeSequence.bulkCreate([{ scope, lastValue }], { ignoreDuplicates: true });
+    }
+
+    const [result] = await sequelize.query(
+      "UPDATE code_sequences SET lastValue = LAST_INSERT_ID(lastValue + :size), updatedAt = NOW() WHERE scope = :scope",
+      { replacements: { scope, size } }
+    );
+    const { affectedRows, insertId } = result as { affectedRows: number; insertId: number };
+    if (affectedRows === 0) {
+      throw new Error(`SEQUENCE_NOT_FOUND: ${scope}`);
+    }
+
+    return insertId - size + 1;
+  }
+}
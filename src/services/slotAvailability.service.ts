@@ -0,0 +1,572 @@
+import { Op, Model, ModelStatic, Transaction, fn, col } from "sequelize";
+import sequelize from "../config/database";
+import Appointment from "../models/Appointment";
+import Doctor from "../models/Doctor";
+import DoctorShift, { DoctorShiftStatus } from "../models/DoctorShift";
+import Employee from "../models/Employee";
+import Shift from "../models/Shift";
+import ShiftAvailability, { ShiftAvailabilityAttributes } from "../models/ShiftAvailability";
+import Specialty from "../models/Specialty";
+import User from "../models/User";
+import { BOOKING_CONFIG } from "../config/booking.config";
+import { CacheService, CacheKeys, CacheTags } from "./cache.service";
+import { toDayKey } from "./reportRollup.service";
+import logger from "../utils/logger";
+
+export const RELEASED_APPOINTMENT_STATUSES = ["CANCELLED", "NO_SHOW"];
+
+export interface SlotAvailability {
+  doctorShiftId: number;
+  doctorId: number;
+  shiftId: number;
+  workDate: string;
+  specialtyId: number | null;
+  capacity: number;
+  bookedCount: number;
+  remaining: number;
+}
+
+export interface SlotReservation {
+  doctorShiftId: number;
+  doctorId: number;
+  shiftId: number;
+  workDate: string;
+  slotNumber: number;
+  queueNumber: number;
+}
+
+interface SlotKey {
+  doctorId: number;
+  shiftId: number;
+  workDate: string;
+}
+
+interface BookingState {
+  doctorId: number;
+  shiftId: number;
+  date: Date | string;
+  slotNumber: number;
+  status: string;
+}
+
+interface ReservationWaiter {
+  resolve: (reservation: SlotReservation) => void;
+  reject: (error: Error) => void;
+}
+
+interface SlotChange extends SlotKey {
+  delta: number;
+  slots: Map<number, number>;
+}
+
+const holdsSlot = (status: string | undefined): boolean =>
+  !!status && !RELEASED_APPOINTMENT_STATUSES.includes(status);
+
+const occupiesSlotNumber = (status: string | undefined): boolean => status !== "CANCELLED";
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+
+
+export class SlotAvailabilityService {
+  private static readonly INDEX_TTL = 30;
+  private static readonly ROSTER_TTL = 10 * 60;
+  private static readonly MAX_ATTEMPTS = 50;
+  private static readonly BACKOFF_MS = 5;
+
+  private static hooksRegistered = false;
+  private static readonly waiting = new Map<string, ReservationWaiter[]>();
+
+
+  static registerHooks(): void {
+    if (this.hooksRegistered) {
+      return;
+    }
+    this.hooksRegistered = true;
+
+    Appointment.addHook("afterCreate", "slotAvailability", (appointment: any, options: any) => {
+      if (options?.slotReserved) {
+        return;
+      }
+      return this.applyChanges(options, [[null, this.stateOf(appointment)]]);
+    });
+    Appointment.addHook("afterUpdate", "slotAvailability", (appointment: any, options: any) =>
+      this.applyChanges(options, [[this.stateOf(appointment, true), this.stateOf(appointment)]])
+    );
+    Appointment.addHook("afterDestroy", "slotAvailability", (appointment: any, options: any) =>
+      this.applyChanges(options, [[this.stateOf(appointment), null]])
+    );
+    Appointment.addHook("afterBulkCreate", "slotAvailability", (appointments: any[], options: any) =>
+      this.applyChanges(
+        options,
+        appointments.map((appointment) => [null, this.stateOf(appointment)])
+      )
+    );
+    Appointment.addHook("beforeBulkUpdate", "slotAvailability", (options: any) =>
+      this.trackBulk(Appointment, "date", options)
+    );
+    Appointment.addHook("beforeBulkDestroy", "slotAvailability", (options: any) =>
+      this.trackBulk(Appointment, "date", options)
+    );
+
+    const trackDoctorShift = (doctorShift: any, options: any) =>
+      this.afterCommit(options, () =>
+        this.rebuildDays([doctorShift.workDate, doctorShift.previous("workDate")])
+      );
+
+    DoctorShift.addHook("afterCreate", "slotAvailability", trackDoctorShift);
+    DoctorShift.addHook("afterUpdate", "slotAvailability", trackDoctorShift);
+    DoctorShift.addHook("afterDestroy", "slotAvailability", trackDoctorShift);
+    DoctorShift.addHook("afterBulkCreate", "slotAvailability", (doctorShifts: any[], options: any) =>
+      this.afterCommit(options, () =>
+        this.rebuildDays(doctorShifts.map((doctorShift) => doctorShift.workDate))
+      )
+    );
+    DoctorShift.addHook("beforeBulkUpdate", "slotAvailability", (options: any) =>
+      this.trackBulk(DoctorShift, "workDate", options)
+    );
+    DoctorShift.addHook("beforeBulkDestroy", "slotAvailability", (options: any) =>
+      this.trackBulk(DoctorShift, "workDate", options)
+    );
+  }
+
+
+  static async getDay(workDate: string): Promise<SlotAvailability[]> {
+    const cacheKey = CacheKeys.SLOT_AVAILABILITY(workDate);
+    const cached = await CacheService.get<SlotAvailability[]>(cacheKey);
+    if (cached) {
+      return cached;
+    }
+
+    const rows = (await ShiftAvailability.findAll({
+      where: { workDate },
+      raw: true,
+    })) as unknown as Omit<SlotAvailability, "remaining">[];
+
+    const result = rows.map((row) => ({
+      ...row,
+      remaining: Math.max(0, row.capacity - row.bookedCount),
+    }));
+    await CacheService.setTagged(cacheKey, result, this.INDEX_TTL, [CacheTags.SLOTS(workDate)]);
+    return result;
+  }
+
+
+  static async getRoster(workDate: string): Promise<any[]> {
+    const cacheKey = CacheKeys.SHIFT_ROSTER(workDate);
+    const cached = await CacheService.get<any[]>(cacheKey);
+    if (cached) {
+      return cached;
+    }
+
+    const doctorShifts = await DoctorShift.findAll({
+      where: { workDate, status: DoctorShiftStatus.ACTIVE },
+      include: [
+        {
+          model: Doctor,
+          as: "doctor",
+          include: [
+            {
+              model: User,
+              as: "user",
+              attributes: ["id", "fullName", "email", "avatar", "isActive"],
+              include: [
+                {
+                  model: Employee,
+                  as: "employee",
+                  attributes: ["phone", "gender", "dateOfBirth", "address"],
+                },
+              ],
+            },
+            {
+              model: Specialty,
+              as: "specialty",
+              attributes: ["id", "name", "description"],
+            },
+          ],
+        },
+        {
+          model: Shift,
+          as: "shift",
+          attributes: ["id", "name", "startTime", "endTime"],
+        },
+      ],
+    });
+
+    const result = doctorShifts.map((doctorShift) => doctorShift.toJSON());
+    await CacheService.setTagged(cacheKey, result, this.ROSTER_TTL, [
+      CacheTags.DOCTORS,
+      CacheTags.SCHEDULE(workDate),
+    ]);
+    return result;
+  }
+
+
+  static reserve(doctorId: number, shiftId: number, workDate: string): Promise<SlotReservation> {
+    const key = `${doctorId}_${shiftId}_${workDate}`;
+    return new Promise((resolve, reject) => {
+      const waiters = this.waiting.get(key);
+      if (waiters) {
+        waiters.push({ resolve, reject });
+        return;
+      }
+      this.waiting.set(key, [{ resolve, reject }]);
+      void this.drain(key, { doctorId, shiftId, workDate });
+    });
+  }
+
+
+  static async release(reservation: SlotReservation): Promise<void> {
+    await this.applyChanges({}, [
+      [
+        {
+          doctorId: reservation.doctorId,
+          shiftId: reservation.shiftId,
+          date: reservation.workDate,
+          slotNumber: reservation.slotNumber,
+          status: "WAITING",
+        },
+        null,
+      ],
+    ]);
+  }
+
+
+  static async mutate(
+    where: SlotKey,
+    mutator: (row: ShiftAvailability) => Partial<ShiftAvailabilityAttributes>,
+    transaction?: Transaction
+  ): Promise<boolean> {
+    for (let attempt = 0; attempt < this.MAX_ATTEMPTS; attempt++) {
+      const row = await ShiftAvailability.findOne({
+        where: { ...where },
+        transaction,
+        lock: transaction ? transaction.LOCK.UPDATE : undefined,
+      });
+      if (!row) {
+        return false;
+      }
+
+      const values = mutator(row);
+      const [updated] = await ShiftAvailability.update(
+        { ...values, version: row.version + 1 },
+        { where: { doctorShiftId: row.doctorShiftId, version: row.version }, transaction }
+      );
+      if (updated > 0) {
+        return true;
+      }
+
+      await sleep(Math.random() * Math.min(100, this.BACKOFF_MS * (attempt + 1)));
+    }
+    throw new Error("SLOT_RESERVATION_CONFLICT");
+  }
+
+
+  static async rebuildDays(days: Array<Date | string | null | undefined>): Promise<void> {
+    const keys = [...new Set(days.filter((day): day is Date | string => !!day).map(toDayKey))];
+    for (const day of keys) {
+      try {
+        await this.rebuildDay(day);
+      } catch (error) {
+        logger.error(`Slot availability rebuild failed for ${day}:`, error);
+      }
+    }
+  }
+
+
+  static async rebuildDay(workDate: string): Promise<void> {
+    await sequelize.transaction(async (transaction) => {
+
+      const current = await ShiftAvailability.findAll({
+        attributes: ["doctorShiftId", "version"],
+        where: { workDate },
+        lock: transaction.LOCK.UPDATE,
+        transaction,
+      });
+      const versions = new Map(current.map((row) => [row.doctorShiftId, row.version]));
+
+      const [doctorShifts, appointments] = await Promise.all([
+        DoctorShift.findAll({
+          attributes: ["id", "doctorId", "shiftId", "maxSlots"],
+          where: { workDate, status: DoctorShiftStatus.ACTIVE },
+          include: [{ model: Doctor, as: "doctor", attributes: ["specialtyId"] }],
+          transaction,
+        }),
+        Appointment.findAll({
+          attributes: ["doctorId", "shiftId", "slotNumber", "queueNumber", "status"],
+          where: { date: workDate },
+          raw: true,
+          transaction,
+        }) as unknown as Promise<
+          Array<{ doctorId: number; shiftId: number; slotNumber: number; queueNumber: number | null; status: string }>
+        >,
+      ]);
+
+      const usage = new Map<string, { bookedCount: number; lastQueueNumber: number; slots: Set<number> }>();
+      for (const appointment of appointments) {
+        const key = `${appointment.doctorId}_${appointment.shiftId}`;
+        const entry = usage.get(key) || { bookedCount: 0, lastQueueNumber: 0, slots: new Set<number>() };
+        if (holdsSlot(appointment.status)) {
+          entry.bookedCount += 1;
+        }
+        if (occupiesSlotNumber(appointment.status)) {
+          entry.slots.add(appointment.slotNumber);
+        }
+        entry.lastQueueNumber = Math.max(entry.lastQueueNumber, appointment.queueNumber || 0);
+        usage.set(key, entry);
+      }
+
+      const rows = doctorShifts.map((doctorShift: any) => {
+        const entry = usage.get(`${doctorShift.doctorId}_${doctorShift.shiftId}`);
+        const lastSlotNumber = entry ? Math.max(0, ...entry.slots) : 0;
+        const freeSlots: number[] = [];
+        for (let slot = 1; slot < lastSlotNumber; slot++) {
+          if (!entry!.slots.has(slot)) {
+            freeSlots.push(slot);
+          }
+        }
+        return {
+          doctorShiftId: doctorShift.id,
+          doctorId: doctorShift.doctorId,
+          shiftId: doctorShift.shiftId,
+          workDate,
+          specialtyId: doctorShift.doctor?.specialtyId ?? null,
+          capacity: doctorShift.maxSlots || BOOKING_CONFIG.MAX_SLOTS_PER_SHIFT,
+          bookedCount: entry?.bookedCount || 0,
+          lastSlotNumber,
+          lastQueueNumber: entry?.lastQueueNumber || 0,
+          freeSlots,
+          version: (versions.get(doctorShift.id) || 0) + 1,
+        };
+      });
+
+      await ShiftAvailability.destroy({
+        where: {
+          workDate,
+          ...(rows.length > 0
+            ? { doctorShiftId: { [Op.notIn]: rows.map((row) => row.doctorShiftId) } }
+            : {}),
+        },
+        transaction,
+      });
+      if (rows.length > 0) {
+        await ShiftAvailability.bulkCreate(rows, {
+          updateOnDuplicate: [
+            "doctorId",
+            "shiftId",
+            "specialtyId",
+            "capacity",
+            "bookedCount",
+            "lastSlotNumber",
+            "lastQueueNumber",
+            "freeSlots",
+            "version",
+          ],
+          transaction,
+        });
+      }
+    });
+
+    await CacheService.invalidateTags([CacheTags.SLOTS(workDate), CacheTags.SCHEDULE(workDate)]);
+  }
+
+
+  static async rebuildUpcoming(): Promise<number> {
+    const rows = (await DoctorShift.findAll({
+      attributes: [[fn("DISTINCT", col("workDate")), "workDate"]],
+      where: { workDate: { [Op.gte]: toDayKey(new Date()) } },
+      raw: true,
+    })) as unknown as Array<{ workDate: string }>;
+
+    await this.rebuildDays(rows.map((row) => row.workDate));
+    return rows.length;
+  }
+
+
+  static async ensureBackfilled(): Promise<void> {
+    if (await ShiftAvailability.findOne({ attributes: ["doctorShiftId"] })) {
+      return;
+    }
+    const startedAt = Date.now();
+    const days = await this.rebuildUpcoming();
+    logger.info(`Slot availability backfilled ${days} days in ${Date.now() - startedAt}ms`);
+  }
+
+  private static async drain(key: string, where: SlotKey): Promise<void> {
+    const waiters = this.waiting.get(key)!;
+    let rebuilt = false;
+
+    while (waiters.length > 0) {
+      const batch = waiters.splice(0, waiters.length);
+      let reservations: SlotReservation[] = [];
+
+      try {
+        const found = await this.mutate(where, (row) => {
+          const freeSlots = [...(row.freeSlots || [])].sort((a, b) => a - b);
+          let { bookedCount, lastSlotNumber, lastQueueNumber } = row;
+
+          reservations = [];
+          while (reservations.length < batch.length && bookedCount < row.capacity) {
+            const slotNumber = freeSlots.length > 0 ? freeSlots.shift()! : lastSlotNumber + 1;
+            if (slotNumber > row.capacity) {
+              break;
+            }
+            bookedCount += 1;
+            lastQueueNumber += 1;
+            lastSlotNumber = Math.max(lastSlotNumber, slotNumber);
+            reservations.push({
+              doctorShiftId: row.doctorShiftId,
+              ...where,
+              slotNumber,
+              queueNumber: lastQueueNumber,
+            });
+          }
+          if (reservations.length === 0) {
+            throw new Error("SHIFT_FULL");
+          }
+          return { bookedCount, lastSlotNumber, lastQueueNumber, freeSlots };
+        });
+
+        if (!found) {
+          if (rebuilt) {
+            throw new Error("DOCTOR_NOT_ON_DUTY");
+          }
+          rebuilt = true;
+          await this.rebuildDay(where.workDate);
+          waiters.unshift(...batch);
+          continue;
+        }
+      } catch (error: any) {
+        batch.forEach((waiter) => waiter.reject(error));
+        continue;
+      }
+
+      batch.forEach((waiter, index) =>
+        index < reservations.length
+          ? waiter.resolve(reservations[index])
+          : waiter.reject(new Error("SHIFT_FULL"))
+      );
+      void CacheService.invalidateTags([CacheTags.SLOTS(where.workDate)]);
+    }
+
+    this.waiting.delete(key);
+  }
+
+  private static stateOf(appointment: any, previous: boolean = false): BookingState {
+    const read = (key: string) => (previous ? appointment.previous(key) : appointment[key]);
+    return {
+      doctorId: read("doctorId"),
+      shiftId: read("shiftId"),
+      date: read("date"),
+      slotNumber: read("slotNumber"),
+      status: read("status"),
+    };
+  }
+
+  private static async applyChanges(
+    options: any,
+    transitions: Array<[BookingState | null, BookingState | null]>
+  ): Promise<void> {
+    const changes = new Map<string, SlotChange>();
+    const record = (state: BookingState, sign: number) => {
+      if (!state.date) {
+        return;
+      }
+      const workDate = toDayKey(state.date);
+      const key = `${state.doctorId}_${state.shiftId}_${workDate}`;
+      const change = changes.get(key) || {
+        doctorId: state.doctorId,
+        shiftId: state.shiftId,
+        workDate,
+        delta: 0,
+        slots: new Map<number, number>(),
+      };
+      if (holdsSlot(state.status)) {
+        change.delta += sign;
+      }
+      if (occupiesSlotNumber(state.status) && state.slotNumber) {
+        change.slots.set(state.slotNumber, (change.slots.get(state.slotNumber) || 0) + sign);
+      }
+      changes.set(key, change);
+    };
+
+    for (const [before, after] of transitions) {
+      if (before) {
+        record(before, -1);
+      }
+      if (after) {
+        record(after, 1);
+      }
+    }
+
+    const days = new Set<string>();
+    for (const { doctorId, shiftId, workDate, delta, slots } of changes.values()) {
+      const moved = [...slots].filter(([, net]) => net !== 0);
+      if (delta === 0 && moved.length === 0) {
+        continue;
+      }
+
+      await this.mutate(
+        { doctorId, shiftId, workDate },
+        (row) => {
+          const freeSlots = new Set(row.freeSlots || []);
+          let lastSlotNumber = row.lastSlotNumber;
+          for (const [slot, net] of moved) {
+            if (net > 0) {
+              freeSlots.delete(slot);
+              lastSlotNumber = Math.max(lastSlotNumber, slot);
+            } else if (slot <= lastSlotNumber) {
+              freeSlots.add(slot);
+            }
+          }
+          while (lastSlotNumber > 0 && freeSlots.has(lastSlotNumber)) {
+            freeSlots.delete(lastSlotNumber);
+            lastSlotNumber -= 1;
+          }
+          return {
+            bookedCount: Math.max(0, row.bookedCount + delta),
+            lastSlotNumber,
+            freeSlots: [...freeSlots].sort((a, b) => a - b),
+          };
+        },
+        options?.transaction
+      );
+      days.add(workDate);
+    }
+
+    if (days.size > 0) {
+      this.afterCommit(options, () =>
+        CacheService.invalidateTags([...days].map((day) => CacheTags.SLOTS(day)))
+      );
+    }
+  }
+
+  private static async trackBulk(
+    model: ModelStatic<Model>,
+    column: string,
+    options: any
+  ): Promise<void> {
+    const rows = (await model.findAll({
+      attributes: [[fn("DISTINCT", col(column)), "day"]],
+      where: options.where,
+      transaction: options.transaction,
+      raw: true,
+    })) as unknown as Array<{ day: string | null }>;
+
+    const days = [...rows.map((row) => row.day), options.attributes?.[column]];
+    this.afterCommit(options, () => this.rebuildDays(days));
+  }
+
+  private static afterCommit(options: any, task: () => Promise<unknown>): void {
+    const run = () => {
+      task().catch((error) => {
+        logger.error("Slot availability update error:", error);
+      });
+    };
+    const transaction = options?.transaction as Transaction | undefined;
+    if (transaction) {
+      transaction.afterCommit(run);
+    } else {
+      run();
+    }
+  }
+}
@@ -0,0 +1,93 @@
+import { Op, Transaction } from "sequelize";
+import sequelize from "../config/database";
+import Medicine from "../models/Medicine";
+
+export interface StockLine {
+  medicineId: number;
+  quantity: number;
+}
+
+export class StockReservationService {
+  static totals(lines: StockLine[]): Map<number, number> {
+    const totals = new Map<number, number>();
+    for (const line of lines) {
+      const medicineId = Number(line.medicineId);
+      const quantity = Number(line.quantity);
+      if (!Number.isSafeInteger(quantity)) {
+        throw new Error(`INVALID_QUANTITY_${medicineId}`);
+      }
+      totals.set(medicineId, (totals.get(medicineId) || 0) + quantity);
+    }
+    return totals;
+  }
+
+  static async lock(medicineIds: number[], transaction: Transaction): Promise<Map<number, Medicine>> {
+    const ids = [...new Set(medicineIds.map(Number))].sort((a, b) => a - b);
+    if (ids.length === 0) {
+      return new Map();
+    }
+
+    const medicines = await Medicine.findAll({
+      where: { id: { [Op.in]: ids } },
+      order: [["id", "ASC"]],
+      lock: transaction.LOCK.UPDATE,
+      transaction,
+    });
+    return new Map(medicines.map((medicine) => [medicine.id, medicine]));
+  }
+
+  static async apply(
+    reserve: StockLine[],
+    release: StockLine[],
+    transaction: Transaction
+  ): Promise<Map<number, Medicine>> {
+    const requested = this.totals(reserve);
+    const returned = this.totals(release);
+    const medicines = await this.lock([...requested.keys(), ...returned.keys()], transaction);
+
+    for (const [medicineId, quantity] of requested) {
+      const medicine = medicines.get(medicineId);
+      if (!medicine) {
+        throw new Error(`MEDICINE_NOT_FOUND_${medicineId}`);
+      }
+      if (medicine.status !== "ACTIVE") {
+        throw new Error(`MEDICINE_NOT_ACTIVE_${medicine.name}`);
+      }
+
+      const available = medicine.quantity + (returned.get(medicineId) || 0);
+      if (available < quantity) {
+        throw new Error(
+          `INSUFFICIENT_STOCK_${medicine.name}_Available:${available}_Requested:${quantity}`
+        );
+      }
+    }
+
+    const deltas = new Map<number, number>();
+    for (const medicineId of medicines.keys()) {
+      const delta = (returned.get(medicineId) || 0) - (requested.get(medicineId) || 0);
+      if (delta !== 0) {
+        deltas.set(medicineId, delta);
+      }
+    }
+    if (deltas.size === 0) {
+      return medicines;
+    }
+
+    const ids = [...deltas.keys()];
+    const delta = `CASE id ${ids.map(() => "WHEN ? THEN ?").join(" ")} END`;
+    const cases = ids.flatMap((id) => [id, deltas.get(id)!]);
+    const [result] = await sequelize.query(
+      `UPDATE medicines SET quantity = quantity + ${delta}, updatedAt = NOW() WHERE id IN (?) AND quantity + ${delta} >= 0`,
+      { replacements: [...cases, ids, ...cases], transaction }
+    );
+    const updated = (result as { affectedRows: number }).affectedRows;
+    if (updated !== ids.length) {
+      throw new Error("INSUFFICIENT_STOCK_CONCURRENT_UPDATE");
+    }
+
+    for (const [medicineId, change] of deltas) {
+      medicines.get(medicineId)!.quantity += change;
+    }
+    return medicines;
+  }
+}
@@ -1,5 +1,23 @@
-﻿function baseTemplate(content: string): string {
-  return `
+﻿export interface EmailContent {
+  html: string;
+  text: string;
+}
+
+export interface RenderedEmail {
+  html: string;
+  text: string;
+  content: EmailContent;
+}
+
+export interface CompiledTemplate<T> {
+  (data: T): RenderedEmail;
+  html(data: T): string;
+}
+
+const CONTENT_SLOT = "{{content}}";
+const YEAR_SLOT = "{{year}}";
+
+const LAYOUT_SOURCE = `
 <!DOCTYPE html>
 <html lang="vi">
 <head>
@@ -424,7 +442,7 @@
 <body>
   <div class="email-wrapper">
     <div class="email-container">
-      ${content}
+      ${CONTENT_SLOT}
       <div class="footer">
         <div class="footer-logo">Healos</div>
         <div class="footer-divider"></div>
@@ -445,7 +463,7 @@
         
         <p style="font-size: 11px; color: #9ca3af;">Đây là email tự động, vui lòng không trả lời email này.</p>
         <p style="margin-top: 12px; font-size: 11px; color: #9ca3af;">
-          © ${new Date().getFullYear()} Healos Healthcare. All rights reserved.
+          © ${YEAR_SLOT} Healos Healthcare. All rights reserved.
         </p>
       </div>
     </div>
@@ -453,21 +471,151 @@
 </body>
 </html>
   `;
+
+
+export function htmlToText(html: string): string {
+  return html
+    .replace(/<(head|style|script)[^>]*>[\s\S]*?<\/\1>/gi, "")
+    .replace(/\s+/g, " ")
+    .replace(/<br\s*\/?>/gi, "\n")
+    .replace(/<\/(p|div|tr|li|h[1-6]|table|ul)>/gi, "\n")
+    .replace(/<[^>]+>/g, "")
+    .replace(/&nbsp;/g, " ")
+    .replace(/&lt;/g, "<")
+    .replace(/&gt;/g, ">")
+    .replace(/&quot;/g, '"')
+    .replace(/&amp;/g, "&")
+    .replace(/ {2,}/g, " ")
+    .replace(/ *\n[\n ]*/g, "\n")
+    .trim();
+}
+
+
+const [LAYOUT_HEAD, LAYOUT_TAIL] = LAYOUT_SOURCE.split(CONTENT_SLOT);
+const [FOOTER_BEFORE_YEAR, FOOTER_AFTER_YEAR] = LAYOUT_TAIL.split(YEAR_SLOT);
+const FOOTER_TEXT = htmlToText(LAYOUT_TAIL);
+
+let footerYear = 0;
+let footerHtml = "";
+let footerText = "";
+
+function footerFor(year: number) {
+  if (year !== footerYear) {
+    footerYear = year;
+    footerHtml = `${FOOTER_BEFORE_YEAR}${year}${FOOTER_AFTER_YEAR}`;
+    footerText = FOOTER_TEXT.replace(YEAR_SLOT, String(year));
+  }
+  return { html: footerHtml, text: footerText };
+}
+
+function baseTemplate(content: string): string {
+  return LAYOUT_HEAD + content + footerFor(new Date().getFullYear()).html;
+}
+
+
+const TEXT_TOKEN = "\u0000";
+const DATE_SUFFIX = ":date";
+const TEXT_TOKEN_PATTERN = /\u0000([^\u0000:]+)(:date)?\u0000/;
+
+function textShape(data: Record<string, unknown>) {
+  const owners = new Map<unknown, string>();
+  const tokens: Record<string, unknown> = {};
+  const shape: string[] = [];
+  for (const key of Object.keys(data).sort()) {
+    const value = data[key];
+    if (value === undefined) continue;
+    if (!value) {
+      tokens[key] = value;
+      shape.push(`${key}=${typeof value}:${String(value)}`);
+      continue;
+    }
+    const owner = owners.get(value) ?? key;
+    owners.set(value, owner);
+    tokens[key] = `${TEXT_TOKEN}${owner}${TEXT_TOKEN}`;
+    shape.push(`${key}>${owner}`);
+  }
+  return { key: shape.join("|"), tokens };
+}
+
+function compileText<T>(content: (data: T) => string): (data: T) => string {
+  const compiled = new Map<string, string[]>();
+  return (data: T): string => {
+    const values = data as unknown as Record<string, unknown>;
+    const { key, tokens } = textShape(values);
+    let parts = compiled.get(key);
+    if (!parts) {
+      parts = htmlToText(content(tokens as unknown as T)).split(TEXT_TOKEN_PATTERN);
+      compiled.set(key, parts);
+    }
+
+    let text = parts[0];
+    for (let i = 1; i < parts.length; i += 3) {
+      const value = values[parts[i]];
+      text += htmlToText(String(parts[i + 1] ? formatDate(value as string) : value)) + parts[i + 2];
+    }
+    return text;
+  };
+}
+
+
+export function compileTemplate<T>(content: (data: T) => string): CompiledTemplate<T> {
+  const renderText = compileText(content);
+  const render = (data: T): RenderedEmail => {
+    const body = { html: content(data), text: renderText(data) };
+    const footer = footerFor(new Date().getFullYear());
+    return {
+      html: LAYOUT_HEAD + body.html + footer.html,
+      text: `${body.text}\n\n${footer.text}`,
+      content: body,
+    };
+  };
+  return Object.assign(render, { html: (data: T) => baseTemplate(content(data)) });
+}
+
+
+const DIGEST_SEPARATOR_HTML = '<hr style="margin: 32px 0; border: none; border-top: 1px solid #e5e7eb;">';
+const DIGEST_SEPARATOR_TEXT = "\n\n----------\n\n";
+
+export function renderDigest(contents: EmailContent[]): RenderedEmail {
+  const footer = footerFor(new Date().getFullYear());
+  const body = {
+    html: contents.map((content) => content.html).join(DIGEST_SEPARATOR_HTML),
+    text: contents.map((content) => content.text).join(DIGEST_SEPARATOR_TEXT),
+  };
+  return {
+    html: LAYOUT_HEAD + body.html + footer.html,
+    text: `${body.text}\n\n${footer.text}`,
+    content: body,
+  };
+}
+
+
+export function contentOf(html: string): EmailContent {
+  const footerAt = html.lastIndexOf(FOOTER_BEFORE_YEAR);
+  const body =
+    html.startsWith(LAYOUT_HEAD) && footerAt >= LAYOUT_HEAD.length
+      ? html.slice(LAYOUT_HEAD.length, footerAt)
+      : /<body[^>]*>([\s\S]*)<\/body>/i.exec(html)?.[1] ?? html;
+  return { html: body, text: htmlToText(body) };
 }
 
 
+const dateFormatter = new Intl.DateTimeFormat("vi-VN", {
+  weekday: "long",
+  year: "numeric",
+  month: "long",
+  day: "numeric",
+});
+
 function formatDate(dateString: string): string {
-  const date = new Date(dateString);
-  return date.toLocaleDateString("vi-VN", {
-    weekday: "long",
-    year: "numeric",
-    month: "long",
-    day: "numeric",
-  });
+  if (typeof dateString === "string" && dateString.startsWith(TEXT_TOKEN)) {
+    return dateString.slice(0, -1) + DATE_SUFFIX + TEXT_TOKEN;
+  }
+  return dateFormatter.format(new Date(dateString));
 }
 
 
-export function appointmentConfirmationTemplate(data: {
+function appointmentConfirmationContent(data: {
   patientName: string;
   doctorName: string;
   doctorSpecialty: string;
@@ -559,11 +707,11 @@ export function appointmentConfirmationTemplate(data: {
     </div>
   `;
 
-  return baseTemplate(content);
+  return content;
 }
 
 
-export function appointmentCancellationTemplate(data: {
+function appointmentCancellationContent(data: {
   patientName: string;
   doctorName: string;
   appointmentDate: string;
@@ -649,11 +797,11 @@ export function appointmentCancellationTemplate(data: {
     </div>
   `;
 
-  return baseTemplate(content);
+  return content;
 }
 
 
-export function doctorChangedTemplate(data: {
+function doctorChangedContent(data: {
   patientName: string;
   oldDoctorName: string;
   newDoctorName: string;
@@ -764,11 +912,11 @@ export function doctorChangedTemplate(data: {
     </div>
   `;
 
-  return baseTemplate(content);
+  return content;
 }
 
 
-export function appointmentRescheduledTemplate(data: {
+function appointmentRescheduledContent(data: {
   patientName: string;
   oldDate: string;
   newDate: string;
@@ -903,11 +1051,11 @@ export function appointmentRescheduledTemplate(data: {
     </div>
   `;
 
-  return baseTemplate(content);
+  return content;
 }
 
 
-export function appointmentReminderTemplate(data: {
+function appointmentReminderContent(data: {
   patientName: string;
   doctorName: string;
   doctorSpecialty: string;
@@ -1001,9 +1149,23 @@ export function appointmentReminderTemplate(data: {
     </div>
   `;
 
-  return baseTemplate(content);
+  return content;
 }
 
+export const emailRenderers = {
+  appointmentRescheduled: compileTemplate(appointmentRescheduledContent),
+  appointmentConfirmation: compileTemplate(appointmentConfirmationContent),
+  appointmentCancellation: compileTemplate(appointmentCancellationContent),
+  doctorChanged: compileTemplate(doctorChangedContent),
+  appointmentReminder: compileTemplate(appointmentReminderContent),
+};
+
+export const appointmentConfirmationTemplate = emailRenderers.appointmentConfirmation.html;
+export const appointmentCancellationTemplate = emailRenderers.appointmentCancellation.html;
+export const doctorChangedTemplate = emailRenderers.doctorChanged.html;
+export const appointmentRescheduledTemplate = emailRenderers.appointmentRescheduled.html;
+export const appointmentReminderTemplate = emailRenderers.appointmentReminder.html;
+
 export const emailTemplates = {
   appointmentRescheduled: appointmentRescheduledTemplate,
   appointmentConfirmation: appointmentConfirmationTemplate,
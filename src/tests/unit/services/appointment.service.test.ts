@@ -3,11 +3,27 @@
 import { createAppointmentService } from "../../../modules/appointment/appointment.service";
 import Appointment from "../../../models/Appointment";
 import DoctorShift from "../../../models/DoctorShift";
+import Doctor from "../../../models/Doctor";
+import Patient from "../../../models/Patient";
+import { Op } from "sequelize";
+import { SlotAvailabilityService } from "../../../services/slotAvailability.service";
 import { sequelize } from "../../../models/index";
+import { SequenceService } from "../../../services/sequence.service";
 
 
 jest.mock("../../../models/Appointment");
 jest.mock("../../../models/DoctorShift");
+jest.mock("../../../models/Doctor");
+jest.mock("../../../models/Patient");
+jest.mock("../../../models/Shift");
+jest.mock("../../../services/slotAvailability.service", () => ({
+  SlotAvailabilityService: {
+    reserve: jest.fn(),
+    release: jest.fn(),
+    rebuildDay: jest.fn(),
+  },
+}));
+jest.mock("../../../services/sequence.service");
 jest.mock("../../../models", () => ({
   sequelize: {
     transaction: jest.fn(),
@@ -17,6 +33,11 @@ jest.mock("../../../models", () => ({
 describe("Appointment Service", () => {
   beforeEach(() => {
     jest.clearAllMocks();
+    (SequenceService.next as jest.Mock).mockResolvedValue(1);
+    (Doctor.findByPk as jest.Mock).mockResolvedValue({ id: 1, isActive: true });
+    (Patient.findByPk as jest.Mock).mockResolvedValue({ id: 1, noShowCount: 0 });
+    (Appointment.findAll as jest.Mock).mockResolvedValue([]);
+    (SlotAvailabilityService.release as jest.Mock).mockResolvedValue(undefined);
   });
 
   describe("createAppointmentService", () => {
@@ -25,11 +46,7 @@ describe("Appointment Service", () => {
         id: 1,
         doctorId: 1,
         shiftId: 1,
-        workDate: "2025-01-10",
-      };
-
-      const mockLastAppointment = {
-        slotNumber: 5,
+        workDate: "2099-01-10",
       };
 
       const mockAppointment = {
@@ -37,7 +54,7 @@ describe("Appointment Service", () => {
         patientId: 1,
         doctorId: 1,
         shiftId: 1,
-        date: "2025-01-10",
+        date: "2099-01-10",
         slotNumber: 6,
         status: "WAITING",
       };
@@ -52,16 +69,23 @@ describe("Appointment Service", () => {
         }
       );
 
-      (DoctorShift.findOne as jest.Mock).mockResolvedValue(mockDoctorShift);
+      (DoctorShift.findAll as jest.Mock).mockResolvedValue([mockDoctorShift]);
       (Appointment.count as jest.Mock).mockResolvedValue(10); 
-      (Appointment.findOne as jest.Mock).mockResolvedValue(mockLastAppointment);
+      (SlotAvailabilityService.reserve as jest.Mock).mockResolvedValue({
+        doctorShiftId: 1,
+        doctorId: 1,
+        shiftId: 1,
+        workDate: "2099-01-10",
+        slotNumber: 6,
+        queueNumber: 8,
+      });
       (Appointment.create as jest.Mock).mockResolvedValue(mockAppointment);
 
       const result = await createAppointmentService({
         patientId: 1,
         doctorId: 1,
         shiftId: 1,
-        date: "2025-01-10",
+        date: "2099-01-10",
         bookingType: "ONLINE",
         bookedBy: "PATIENT",
       });
@@ -70,11 +94,53 @@ describe("Appointment Service", () => {
       expect(Appointment.create).toHaveBeenCalledWith(
         expect.objectContaining({
           slotNumber: 6, 
+          queueNumber: 8,
         }),
-        expect.any(Object)
+        expect.objectContaining({ transaction: mockTransaction, slotReserved: true })
+      );
+      expect(DoctorShift.findAll).toHaveBeenCalledWith(
+        expect.objectContaining({
+          where: { doctorId: 1, workDate: "2099-01-10" },
+          lock: "UPDATE",
+          transaction: mockTransaction,
+        })
+      );
+      expect((DoctorShift.findAll as jest.Mock).mock.invocationCallOrder[0]).toBeLessThan(
+        (Appointment.count as jest.Mock).mock.invocationCallOrder[0]
       );
     });
 
+    it("should hand the slot back when the booking transaction fails", async () => {
+      const reservation = {
+        doctorShiftId: 1,
+        doctorId: 1,
+        shiftId: 1,
+        workDate: "2099-01-10",
+        slotNumber: 3,
+        queueNumber: 3,
+      };
+
+      (sequelize.transaction as jest.Mock).mockImplementation(
+        async (options: any, callback: any) => callback({ LOCK: { UPDATE: "UPDATE" } })
+      );
+      (DoctorShift.findAll as jest.Mock).mockResolvedValue([{ id: 1, shiftId: 1 }]);
+      (Appointment.count as jest.Mock).mockResolvedValue(0);
+      (SlotAvailabilityService.reserve as jest.Mock).mockResolvedValue(reservation);
+      (Appointment.create as jest.Mock).mockRejectedValue(new Error("Deadlock"));
+
+      await expect(
+        createAppointmentService({
+          patientId: 1,
+          doctorId: 1,
+          shiftId: 1,
+          date: "2099-01-10",
+          bookingType: "ONLINE",
+          bookedBy: "PATIENT",
+        })
+      ).rejects.toThrow("Deadlock");
+      expect(SlotAvailabilityService.release).toHaveBeenCalledWith(reservation);
+    });
+
     it("should throw error if doctor not on duty", async () => {
       const mockTransaction = {
         LOCK: { UPDATE: "UPDATE" },
@@ -86,14 +152,14 @@ describe("Appointment Service", () => {
         }
       );
 
-      (DoctorShift.findOne as jest.Mock).mockResolvedValue(null);
+      (DoctorShift.findAll as jest.Mock).mockResolvedValue([]);
 
       await expect(
         createAppointmentService({
           patientId: 1,
           doctorId: 1,
           shiftId: 1,
-          date: "2025-01-10",
+          date: "2099-01-10",
           bookingType: "ONLINE",
           bookedBy: "PATIENT",
         })
@@ -105,7 +171,7 @@ describe("Appointment Service", () => {
         id: 1,
         doctorId: 1,
         shiftId: 1,
-        workDate: "2025-01-10",
+        workDate: "2099-01-10",
       };
 
       const mockTransaction = {
@@ -118,7 +184,7 @@ describe("Appointment Service", () => {
         }
       );
 
-      (DoctorShift.findOne as jest.Mock).mockResolvedValue(mockDoctorShift);
+      (DoctorShift.findAll as jest.Mock).mockResolvedValue([mockDoctorShift]);
       (Appointment.count as jest.Mock).mockResolvedValue(40); 
 
       await expect(
@@ -126,11 +192,55 @@ describe("Appointment Service", () => {
           patientId: 1,
           doctorId: 1,
           shiftId: 1,
-          date: "2025-01-10",
+          date: "2099-01-10",
           bookingType: "ONLINE",
           bookedBy: "PATIENT",
         })
       ).rejects.toThrow("DAY_FULL");
+      expect(Appointment.count).toHaveBeenCalledWith(
+        expect.objectContaining({
+          where: { doctorId: 1, date: "2099-01-10", status: { [Op.ne]: "CANCELLED" } },
+        })
+      );
+      expect(SlotAvailabilityService.reserve).not.toHaveBeenCalled();
+    });
+
+    it("should release the slot and rebuild the day after a unique conflict", async () => {
+      const reservation = {
+        doctorShiftId: 1,
+        doctorId: 1,
+        shiftId: 1,
+        workDate: "2099-01-10",
+        slotNumber: 2,
+        queueNumber: 2,
+      };
+      const conflict = Object.assign(new Error("Duplicate entry"), {
+        name: "SequelizeUniqueConstraintError",
+      });
+
+      (sequelize.transaction as jest.Mock).mockImplementation(
+        async (options: any, callback: any) => callback({ LOCK: { UPDATE: "UPDATE" } })
+      );
+      (DoctorShift.findAll as jest.Mock).mockResolvedValue([{ id: 1, shiftId: 1 }]);
+      (Appointment.count as jest.Mock).mockResolvedValue(0);
+      (SlotAvailabilityService.reserve as jest.Mock).mockResolvedValue(reservation);
+      (Appointment.create as jest.Mock)
+        .mockRejectedValueOnce(conflict)
+        .mockResolvedValueOnce({ id: 7, slotNumber: 2 });
+
+      const result = await createAppointmentService({
+        patientId: 1,
+        doctorId: 1,
+        shiftId: 1,
+        date: "2099-01-10",
+        bookingType: "ONLINE",
+        bookedBy: "PATIENT",
+      });
+
+      expect(result).toEqual({ id: 7, slotNumber: 2 });
+      expect(SlotAvailabilityService.release).toHaveBeenCalledWith(reservation);
+      expect(SlotAvailabilityService.rebuildDay).toHaveBeenCalledWith("2099-01-10");
+      expect(Appointment.create).toHaveBeenCalledTimes(2);
     });
   });
 });
@@ -0,0 +1,92 @@
+import { AuditLogWriter } from "../../../services/auditLogWriter.service";
+import AuditLog, { AuditAction } from "../../../models/AuditLog";
+
+
+jest.mock("../../../models/AuditLog", () => ({
+  __esModule: true,
+  default: { bulkCreate: jest.fn() },
+  AuditAction: { VIEW: "VIEW", UPDATE: "UPDATE" },
+}));
+jest.mock("../../../utils/logger");
+
+const row = (recordId: number) => ({
+  userId: 1,
+  action: AuditAction.VIEW,
+  tableName: "patients",
+  recordId,
+});
+
+describe("AuditLogWriter", () => {
+  beforeEach(() => {
+    (AuditLog.bulkCreate as jest.Mock).mockResolvedValue([]);
+  });
+
+  afterEach(async () => {
+    (AuditLog.bulkCreate as jest.Mock).mockResolvedValue([]);
+    await AuditLogWriter.drain();
+  });
+
+  it("should buffer writes and insert them with one bulkCreate", async () => {
+    await Promise.all([1, 2, 3].map((id) => AuditLogWriter.write(row(id))));
+
+    expect(AuditLog.bulkCreate).not.toHaveBeenCalled();
+    expect(AuditLogWriter.getStats().buffered).toBe(3);
+
+    await AuditLogWriter.flush();
+
+    expect(AuditLog.bulkCreate).toHaveBeenCalledTimes(1);
+    const [rows] = (AuditLog.bulkCreate as jest.Mock).mock.calls[0];
+    expect(rows.map((r: any) => r.recordId)).toEqual([1, 2, 3]);
+    expect(rows[0].timestamp).toBeInstanceOf(Date);
+  });
+
+  it("should flush on its own once the size threshold is reached", async () => {
+    for (let id = 1; id <= 200; id++) {
+      await AuditLogWriter.write(row(id));
+    }
+
+    expect(AuditLog.bulkCreate).toHaveBeenCalledTimes(1);
+    expect((AuditLog.bulkCreate as jest.Mock).mock.calls[0][0]).toHaveLength(200);
+  });
+
+  it("should keep rows buffered when a flush fails and write them on drain", async () => {
+    (AuditLog.bulkCreate as jest.Mock).mockRejectedValueOnce(new Error("Too many connections"));
+    await AuditLogWriter.write(row(1));
+    await AuditLogWriter.write(row(2));
+
+    await AuditLogWriter.flush();
+    expect(AuditLogWriter.getStats().buffered).toBe(2);
+
+    await AuditLogWriter.drain();
+
+    expect(AuditLog.bulkCreate).toHaveBeenCalledTimes(2);
+    expect((AuditLog.bulkCreate as jest.Mock).mock.calls[1][0].map((r: any) => r.recordId)).toEqual([1, 2]);
+    expect(AuditLogWriter.getStats().buffered).toBe(0);
+  });
+
+  it("should make writers wait while the buffer is full", async () => {
+    let release!: () => void;
+    (AuditLog.bulkCreate as jest.Mock).mockReturnValueOnce(
+      new Promise((resolve) => {
+        release = () => resolve([]);
+      })
+    );
+
+    const { capacity } = AuditLogWriter.getStats();
+    for (let id = 1; id <= capacity + 200; id++) {
+      await AuditLogWriter.write(row(id));
+    }
+
+    let written = false;
+    const blocked = AuditLogWriter.write(row(capacity + 201)).then(() => {
+      written = true;
+    });
+    await new Promise((resolve) => setImmediate(resolve));
+    expect(written).toBe(false);
+    expect(AuditLogWriter.getStats().backpressureWaits).toBeGreaterThan(0);
+
+    release();
+    await blocked;
+    expect(written).toBe(true);
+  });
+});
@@ -0,0 +1,106 @@
+import { Op } from "sequelize";
+import { runAutoNoShowJob } from "../../../jobs/autoNoShow.job";
+import Appointment from "../../../models/Appointment";
+import Patient from "../../../models/Patient";
+import Shift from "../../../models/Shift";
+import sequelize from "../../../config/database";
+
+
+jest.mock("../../../models/Appointment");
+jest.mock("../../../models/Patient");
+jest.mock("../../../models/Shift");
+jest.mock("../../../services/reportRollup.service", () => ({
+  toDayKey: (value: Date | string) => {
+    if (typeof value === "string") {
+      return value;
+    }
+    return `${value.getFullYear()}-${String(value.getMonth() + 1).padStart(2, "0")}-${String(value.getDate()).padStart(2, "0")}`;
+  },
+}));
+
+describe("runAutoNoShowJob", () => {
+  const transaction = { LOCK: { UPDATE: "UPDATE" } };
+
+  beforeEach(() => {
+    jest.useFakeTimers().setSystemTime(new Date(2026, 9, 18, 12, 0, 0));
+    jest.spyOn(console, "log").mockImplementation(() => undefined);
+    jest
+      .spyOn(sequelize, "transaction")
+      .mockImplementation((async (callback: any) => callback(transaction)) as any);
+
+    (Shift.findAll as jest.Mock).mockResolvedValue([
+      { id: 1, startTime: "07:00" },
+      { id: 2, startTime: "13:00" },
+    ]);
+    (Appointment.findAll as jest.Mock)
+      .mockResolvedValueOnce([
+        { id: 10, shiftId: 1, date: "2026-10-17", slotNumber: 30 },
+        { id: 11, shiftId: 1, date: "2026-10-18", slotNumber: 1 },
+        { id: 12, shiftId: 1, date: "2026-10-18", slotNumber: 2 },
+        { id: 13, shiftId: 2, date: "2026-10-18", slotNumber: 1 },
+        { id: 14, shiftId: 9, date: "2026-10-18", slotNumber: 1 },
+      ])
+      .mockResolvedValueOnce([
+        { id: 10, patientId: 100 },
+        { id: 11, patientId: 100 },
+        { id: 12, patientId: 200 },
+      ]);
+    (Appointment.update as jest.Mock).mockResolvedValue([3]);
+    (Patient.update as jest.Mock).mockImplementation(async (_values: any, options: any) => [
+      options.where.id[Op.in].length,
+    ]);
+  });
+
+  afterEach(() => {
+    jest.useRealTimers();
+  });
+
+  it("should flip every overdue appointment with one update", async () => {
+    const result = await runAutoNoShowJob();
+
+    expect(Shift.findAll).toHaveBeenCalledTimes(1);
+    expect(Appointment.update).toHaveBeenCalledTimes(1);
+
+    const [values, options] = (Appointment.update as jest.Mock).mock.calls[0];
+    expect(values).toEqual({ status: "NO_SHOW" });
+    expect(options.transaction).toBe(transaction);
+    expect(options.where.id[Op.in]).toEqual([10, 11, 12]);
+
+    expect(result).toEqual(
+      expect.objectContaining({
+        success: true,
+        processedCount: 5,
+        markedAsNoShow: 3,
+        patientsUpdated: 2,
+        errors: ["Appointment 14: Shift not found"],
+      })
+    );
+    expect(result.durationMs).toEqual(expect.any(Number));
+  });
+
+  it("should increment no-show counters with one update per distinct count", async () => {
+    await runAutoNoShowJob();
+
+    expect(Patient.update).toHaveBeenCalledTimes(2);
+    const calls = (Patient.update as jest.Mock).mock.calls.map(([values, options]) => ({
+      increment: values.noShowCount.val,
+      patients: options.where.id[Op.in],
+    }));
+    expect(calls).toEqual([
+      { increment: "COALESCE(noShowCount, 0) + 2", patients: [100] },
+      { increment: "COALESCE(noShowCount, 0) + 1", patients: [200] },
+    ]);
+  });
+
+  it("should skip the transaction when nothing is overdue", async () => {
+    (Appointment.findAll as jest.Mock).mockReset().mockResolvedValue([
+      { id: 13, shiftId: 2, date: "2026-10-18", slotNumber: 1 },
+    ]);
+
+    const result = await runAutoNoShowJob();
+
+    expect(sequelize.transaction).not.toHaveBeenCalled();
+    expect(Appointment.update).not.toHaveBeenCalled();
+    expect(result.markedAsNoShow).toBe(0);
+  });
+});
@@ -0,0 +1,141 @@
+import { CacheService } from "../../../services/cache.service";
+import { redisClient } from "../../../config/redis.config";
+
+
+jest.mock("../../../utils/logger");
+jest.mock("../../../config/redis.config", () => ({
+  redisClient: {
+    get: jest.fn(),
+    unlink: jest.fn(),
+    hgetall: jest.fn(),
+    scanStream: jest.fn(),
+    pipeline: jest.fn(),
+    duplicate: jest.fn(),
+  },
+}));
+
+const createPipeline = (results: Array<[Error | null, unknown]> = []) => {
+  const commands: Array<[string, ...unknown[]]> = [];
+  const pipeline: any = {
+    commands,
+    exec: jest.fn().mockResolvedValue(results),
+  };
+  for (const command of ["setex", "sadd", "expire", "unlink", "publish", "hincrby"]) {
+    pipeline[command] = jest.fn((...args: unknown[]) => {
+      commands.push([command, ...args]);
+      return pipeline;
+    });
+  }
+  return pipeline;
+};
+
+describe("CacheService", () => {
+  beforeEach(() => {
+    jest.clearAllMocks();
+    clearTimeout((CacheService as any).statsTimer);
+    (CacheService as any).statsTimer = null;
+    (CacheService as any).pendingStats = new Map();
+  });
+
+  it("should register tagged keys in one pipeline", async () => {
+    const pipeline = createPipeline();
+    (redisClient.pipeline as jest.Mock).mockReturnValue(pipeline);
+
+    await CacheService.setTagged("http:abc", { ok: true }, 60, ["doctors", "http"]);
+
+    expect(pipeline.commands).toEqual([
+      ["setex", "cache:http:abc", 60, JSON.stringify({ ok: true })],
+      ["sadd", "cache:tag:doctors", "cache:http:abc"],
+      ["expire", "cache:tag:doctors", 86400],
+      ["sadd", "cache:tag:http", "cache:http:abc"],
+      ["expire", "cache:tag:http", 86400],
+    ]);
+    expect(pipeline.exec).toHaveBeenCalledTimes(1);
+  });
+
+  it("should unlink every member of the invalidated tags and notify listeners", async () => {
+    const lookup = createPipeline([
+      [null, ["cache:http:a", "cache:http:b"]],
+      [null, ["cache:http:b"]],
+    ]);
+    const removal = createPipeline();
+    (redisClient.pipeline as jest.Mock)
+      .mockReturnValueOnce(lookup)
+      .mockReturnValueOnce(removal);
+
+    const listener = jest.fn();
+    (CacheService as any).listeners.push(listener);
+
+    await CacheService.invalidateTags(["doctors", "specialties"]);
+
+    expect(redisClient.pipeline).toHaveBeenNthCalledWith(1, [
+      ["smembers", "cache:tag:doctors"],
+      ["smembers", "cache:tag:specialties"],
+    ]);
+    expect(removal.commands).toEqual([
+      ["unlink", "cache:http:a", "cache:http:b", "cache:tag:doctors", "cache:tag:specialties"],
+      ["publish", "cache:invalidate", JSON.stringify(["doctors", "specialties"])],
+    ]);
+    expect(listener).toHaveBeenCalledWith(["doctors", "specialties"]);
+  });
+
+  it("should delete pattern matches with SCAN and UNLINK instead of KEYS", async () => {
+    (redisClient.scanStream as jest.Mock).mockReturnValue(
+      (async function* () {
+        yield ["cache:doctor:1", "cache:doctor:2"];
+        yield [];
+        yield ["cache:doctor:3"];
+      })()
+    );
+    (redisClient.unlink as jest.Mock).mockResolvedValue(1);
+
+    await CacheService.deletePattern("doctor:*");
+
+    expect(redisClient.scanStream).toHaveBeenCalledWith({ match: "cache:doctor:*", count: 1000 });
+    expect(redisClient.unlink).toHaveBeenCalledTimes(2);
+    expect(redisClient.unlink).toHaveBeenNthCalledWith(1, "cache:doctor:1", "cache:doctor:2");
+    expect(redisClient.unlink).toHaveBeenNthCalledWith(2, "cache:doctor:3");
+  });
+
+  it("should count hits and misses per cache key family", async () => {
+    (redisClient.get as jest.Mock)
+      .mockResolvedValueOnce(JSON.stringify({ id: 7 }))
+      .mockResolvedValueOnce(null)
+      .mockResolvedValueOnce(JSON.stringify([]));
+    const pipeline = createPipeline();
+    (redisClient.pipeline as jest.Mock).mockReturnValue(pipeline);
+
+    await CacheService.get("dashboard:appointments:2026-10-18");
+    await CacheService.get("dashboard:appointments:2026-10-19");
+    await CacheService.get("specialties:all");
+    await CacheService.flushStats();
+
+    expect(pipeline.commands).toEqual([
+      ["hincrby", "cache:stats", "DASHBOARD_APPOINTMENTS:hits", 1],
+      ["hincrby", "cache:stats", "DASHBOARD_APPOINTMENTS:misses", 1],
+      ["hincrby", "cache:stats", "SPECIALTIES:hits", 1],
+    ]);
+  });
+
+  it("should report stored counters grouped by key family", async () => {
+    (redisClient.hgetall as jest.Mock).mockResolvedValue({
+      "DASHBOARD_STATS:hits": "5",
+      "DASHBOARD_STATS:misses": "2",
+      "tag:medicines:invalidations": "3",
+    });
+
+    const stats = await CacheService.getStats();
+
+    expect(stats.DASHBOARD_STATS).toEqual({ hits: 5, misses: 2, sets: 0, invalidations: 0 });
+    expect(stats["tag:medicines"].invalidations).toBe(3);
+  });
+
+  it("should not throw when Redis is unavailable", async () => {
+    (redisClient.pipeline as jest.Mock).mockImplementation(() => {
+      throw new Error("ECONNREFUSED");
+    });
+
+    await expect(CacheService.invalidateTags(["medicines"])).resolves.toBeUndefined();
+    await expect(CacheService.setTagged("k", 1, 60, ["medicines"])).resolves.toBeUndefined();
+  });
+});
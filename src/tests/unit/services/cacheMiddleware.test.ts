@@ -0,0 +1,110 @@
+import { cacheMiddleware } from "../../../middlewares/cache.middlewares";
+import { CacheService } from "../../../services/cache.service";
+
+jest.mock("../../../services/cache.service", () => ({
+  CacheService: {
+    get: jest.fn(),
+    setTagged: jest.fn(),
+    recordStat: jest.fn(),
+    onInvalidate: jest.fn(),
+  },
+  CacheTags: { HTTP: "http", USER: (id: number | string) => `user:${id}` },
+}));
+
+const createReq = (query: Record<string, string>): any => ({
+  method: "GET",
+  baseUrl: "/api/medicines",
+  path: "/",
+  query,
+  headers: {},
+});
+
+const createRes = (): any => {
+  const res: any = { statusCode: 200, headers: {} as Record<string, string> };
+  res.setHeader = jest.fn((name: string, value: string) => {
+    res.headers[name] = value;
+    return res;
+  });
+  res.status = jest.fn((code: number) => {
+    res.statusCode = code;
+    return res;
+  });
+  res.json = jest.fn(() => res);
+  res.end = jest.fn(() => res);
+  return res;
+};
+
+const flush = () => new Promise((resolve) => setImmediate(resolve));
+
+describe("cacheMiddleware", () => {
+  let now: number;
+
+  beforeEach(() => {
+    jest.clearAllMocks();
+    now = 1_000_000;
+    jest.spyOn(Date, "now").mockImplementation(() => now);
+    (CacheService.get as jest.Mock).mockResolvedValue(null);
+    (CacheService.setTagged as jest.Mock).mockResolvedValue(undefined);
+  });
+
+  afterEach(() => {
+    jest.restoreAllMocks();
+  });
+
+  const prime = async (middleware: any, query: Record<string, string>, body: any) => {
+    const res = createRes();
+    await middleware(createReq(query), res, () => res.json(body));
+    return res;
+  };
+
+  it("serves stale entries and refreshes them through the registered loader", async () => {
+    const load = jest.fn().mockResolvedValue({ success: true, data: ["fresh"] });
+    const middleware = cacheMiddleware({ shared: true, ttl: 1000, staleTtl: 5000, load });
+    await prime(middleware, { page: "1" }, { success: true, data: ["old"] });
+
+    now += 2000;
+    const staleRes = createRes();
+    const next = jest.fn();
+    await middleware(createReq({ page: "1" }), staleRes, next);
+
+    expect(next).not.toHaveBeenCalled();
+    expect(staleRes.headers["X-Cache"]).toBe("STALE");
+    expect(staleRes.json).toHaveBeenCalledWith({ success: true, data: ["old"] });
+    expect(load).toHaveBeenCalledTimes(1);
+
+    await flush();
+    const hitRes = createRes();
+    await middleware(createReq({ page: "1" }), hitRes, next);
+
+    expect(hitRes.headers["X-Cache"]).toBe("HIT");
+    expect(hitRes.json).toHaveBeenCalledWith({ success: true, data: ["fresh"] });
+    expect(next).not.toHaveBeenCalled();
+  });
+
+  it("runs one refresh per key while it is in flight", async () => {
+    let resolve: (body: any) => void = () => undefined;
+    const load = jest.fn(() => new Promise((done) => (resolve = done)));
+    const middleware = cacheMiddleware({ shared: true, ttl: 1000, staleTtl: 5000, load });
+    await prime(middleware, { page: "2" }, { success: true, data: [] });
+
+    now += 2000;
+    await middleware(createReq({ page: "2" }), createRes(), jest.fn());
+    await middleware(createReq({ page: "2" }), createRes(), jest.fn());
+
+    expect(load).toHaveBeenCalledTimes(1);
+    resolve({ success: true, data: [1] });
+  });
+
+  it("falls through to the handler when no loader is registered", async () => {
+    const middleware = cacheMiddleware({ shared: true, ttl: 1000, staleTtl: 5000 });
+    await prime(middleware, { page: "3" }, { success: true, data: [] });
+
+    now += 2000;
+    const res = createRes();
+    const next = jest.fn(() => res.json({ success: true, data: [2] }));
+    await middleware(createReq({ page: "3" }), res, next);
+
+    expect(next).toHaveBeenCalledTimes(1);
+    expect(res.headers["X-Cache"]).toBe("MISS");
+  });
+});
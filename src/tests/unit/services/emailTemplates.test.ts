@@ -0,0 +1,117 @@
+import nodemailer from "nodemailer";
+import { emailRenderers, emailTemplates, htmlToText } from "../../../templates/emailTemplates";
+import { EmailService } from "../../../services/email.service";
+
+
+jest.mock("nodemailer");
+jest.mock("../../../config/redis.config", () => ({ redisClient: {} }));
+
+const reminder = {
+  patientName: "Nguyễn Văn B",
+  doctorName: "BS. Trần C",
+  doctorSpecialty: "Nội tổng quát",
+  appointmentDate: "2026-10-20",
+  shiftName: "Ca sáng",
+  shiftTime: "07:00 - 11:30",
+  appointmentTime: "08:15",
+  slotNumber: 7,
+  appointmentId: 4521,
+};
+
+describe("email templates", () => {
+  it("should render the same html through the compiled renderer", () => {
+    const rendered = emailRenderers.appointmentReminder(reminder);
+
+    expect(rendered.html).toBe(emailTemplates.appointmentReminder(reminder));
+    expect(rendered.html).toContain("<style>");
+    expect(rendered.html).toContain("Nguyễn Văn B");
+    expect(rendered.html).toContain(`© ${new Date().getFullYear()} Healos`);
+    expect(rendered.html).not.toContain("{{");
+  });
+
+  it("should precompute a readable text part without the stylesheet", () => {
+    const { text } = emailRenderers.appointmentReminder(reminder);
+
+    expect(text).toContain("Xin chào Nguyễn Văn B,");
+    expect(text).toContain("Mã lịch hẹn #4521");
+    expect(text).toContain(`© ${new Date().getFullYear()} Healos Healthcare`);
+    expect(text).not.toMatch(/font-family|@media|<\w/);
+  });
+
+  it("should reuse the compiled text part across data shapes", () => {
+    const variants = [
+      reminder,
+      { ...reminder, patientName: "Lê <b>Thị</b> D", appointmentId: 77 },
+      { ...reminder, appointmentTime: undefined },
+      { ...reminder, appointmentTime: undefined, shiftTime: "" },
+    ];
+
+    for (const data of variants) {
+      const { content } = emailRenderers.appointmentReminder(data);
+      expect(content.text).toBe(htmlToText(content.html));
+    }
+  });
+
+  it("should keep field comparisons intact in the compiled text part", () => {
+    const change = {
+      patientName: "Nguyễn Văn B",
+      oldDate: "2026-10-20",
+      newDate: "2026-10-22",
+      oldShiftName: "Ca sáng",
+      newShiftName: "Ca chiều",
+      oldDoctorName: "BS. Trần C",
+      newDoctorName: "BS. Trần C",
+      appointmentId: 4521,
+    };
+
+    for (const data of [change, { ...change, newDoctorName: "BS. Lê E" }]) {
+      const { content } = emailRenderers.appointmentRescheduled(data);
+      expect(content.text).toBe(htmlToText(content.html));
+    }
+  });
+
+  it("should convert block-level markup to line breaks", () => {
+    expect(htmlToText("<p>Line&nbsp;1</p><div>A &amp; B</div><br/>end")).toBe("Line 1\nA & B\nend");
+  });
+});
+
+describe("EmailService", () => {
+  beforeEach(() => {
+    (nodemailer.createTransport as jest.Mock).mockReturnValue({ sendMail: jest.fn(), close: jest.fn() });
+  });
+
+  it("should create a pooled, rate-limited transport", () => {
+    new EmailService({
+      host: "smtp.example.com",
+      port: 587,
+      user: "clinic@example.com",
+      password: "secret",
+      pool: true,
+      maxConnections: 8,
+      maxMessages: 200,
+      rateLimit: 20,
+    });
+
+    expect(nodemailer.createTransport).toHaveBeenCalledWith(
+      expect.objectContaining({
+        host: "smtp.example.com",
+        pool: true,
+        maxConnections: 8,
+        maxMessages: 200,
+        rateLimit: 20,
+        rateDelta: 1000,
+      })
+    );
+  });
+
+  it("should send the precomputed text part instead of re-deriving it", async () => {
+    const transport = { sendMail: jest.fn().mockResolvedValue({ messageId: "m1" }), close: jest.fn() };
+    (nodemailer.createTransport as jest.Mock).mockReturnValue(transport);
+    const service = new EmailService();
+
+    await service.deliver({ to: "a@example.com", subject: "Hi", html: "<p>Hi</p>", text: "Hi there" });
+
+    expect(nodemailer.createTransport).toHaveBeenCalledWith({ jsonTransport: true });
+    expect(transport.sendMail).toHaveBeenCalledWith(expect.objectContaining({ text: "Hi there" }));
+  });
+});
@@ -0,0 +1,118 @@
+import {
+  createInvoiceFromVisit,
+  createInvoicesForCompletedVisitsService,
+} from "../../../modules/finance/invoice.service";
+import Invoice from "../../../models/Invoice";
+import InvoiceItem from "../../../models/InvoiceItem";
+import Visit from "../../../models/Visit";
+import User from "../../../models/User";
+import sequelize from "../../../config/database";
+import { generateInvoiceCodes } from "../../../utils/codeGenerator";
+
+
+jest.mock("../../../models/Invoice");
+jest.mock("../../../models/InvoiceItem");
+jest.mock("../../../models/Visit");
+jest.mock("../../../models/User");
+jest.mock("../../../utils/codeGenerator");
+jest.mock("../../../services/cache.service", () => ({
+  CacheService: { getOrSet: jest.fn() },
+  CacheKeys: { LIST_COUNT: (scope: string) => `count:${scope}` },
+}));
+
+const asInstances = (rows: any[], firstId: number) =>
+  rows.map((row, index) => {
+    const data = { ...row, id: firstId + index };
+    return { ...data, toJSON: () => ({ ...data }) };
+  });
+
+const visitWith = (id: number, details: any[]) => {
+  const data = {
+    id,
+    patientId: 100 + id,
+    doctorId: 3,
+    status: "COMPLETED",
+    checkInTime: new Date(2026, 9, 18, 8),
+    patient: { id: 100 + id, fullName: "Nguyễn Văn An", user: null },
+    doctor: { id: 3, user: { fullName: "Trần Thị Bình", email: "binh@example.com" } },
+    appointment: { id: 50 + id },
+    prescription: { id: 9, details },
+  };
+  return { ...data, toJSON: () => JSON.parse(JSON.stringify(data)) };
+};
+
+describe("invoice materialization", () => {
+  const transaction = { commit: jest.fn(), rollback: jest.fn(), LOCK: { UPDATE: "UPDATE" } };
+
+  beforeEach(() => {
+    jest
+      .spyOn(sequelize, "transaction")
+      .mockImplementation((async (callback?: any) =>
+        typeof callback === "function" ? callback(transaction) : transaction) as any);
+    (generateInvoiceCodes as jest.Mock).mockImplementation(async (count: number) =>
+      Array.from({ length: count }, (_, index) => `INV-20261018-0000${index + 1}`)
+    );
+    (User.findByPk as jest.Mock).mockResolvedValue({
+      toJSON: () => ({ id: 5, fullName: "Thu ngân", email: "cashier@example.com" }),
+    });
+    (Invoice.findOne as jest.Mock).mockResolvedValue(null);
+    (Invoice.bulkCreate as jest.Mock).mockImplementation(async (rows: any[]) => asInstances(rows, 70));
+    (InvoiceItem.bulkCreate as jest.Mock).mockImplementation(async (rows: any[]) => asInstances(rows, 900));
+  });
+
+  it("should write the invoice and all its items in two statements and answer from memory", async () => {
+    (Visit.findByPk as jest.Mock).mockResolvedValue(
+      visitWith(1, [
+        { id: 11, medicineName: "Paracetamol", quantity: 10, unitPrice: "1500.00" },
+        { id: 12, medicineName: "Vitamin C", quantity: 2, unitPrice: "20000.00" },
+      ])
+    );
+
+    const invoice = await createInvoiceFromVisit(1, 5, 100000);
+
+    expect(Invoice.bulkCreate).toHaveBeenCalledTimes(1);
+    expect((Invoice.bulkCreate as jest.Mock).mock.calls[0][0]).toEqual([
+      expect.objectContaining({ medicineTotalAmount: 55000, totalAmount: 155000, examinationFee: 100000 }),
+    ]);
+    expect(InvoiceItem.bulkCreate).toHaveBeenCalledTimes(1);
+    expect((InvoiceItem.bulkCreate as jest.Mock).mock.calls[0][0]).toHaveLength(3);
+    expect(Invoice.findByPk).not.toHaveBeenCalled();
+    expect(transaction.commit).toHaveBeenCalled();
+
+    expect(invoice.id).toBe(70);
+    expect(invoice.doctor.fullName).toBe("Trần Thị Bình");
+    expect(invoice.creator.fullName).toBe("Thu ngân");
+    expect(invoice.items.map((item: any) => item.prescriptionDetail?.id ?? null)).toEqual([null, 11, 12]);
+    expect(invoice.payments).toEqual([]);
+    expect(invoice.visit.prescription).toBeUndefined();
+  });
+
+  it("should refuse to invoice a visit twice", async () => {
+    (Visit.findByPk as jest.Mock).mockResolvedValue(visitWith(1, []));
+    (Invoice.findOne as jest.Mock).mockResolvedValue({ id: 1 });
+
+    await expect(createInvoiceFromVisit(1, 5, 100000)).rejects.toThrow("Invoice already exists for this visit");
+    expect(Invoice.bulkCreate).not.toHaveBeenCalled();
+    expect(transaction.rollback).toHaveBeenCalled();
+  });
+
+  it("should invoice every uninvoiced completed visit of the day in one batch", async () => {
+    (Visit.findAll as jest.Mock).mockResolvedValue([
+      visitWith(1, [{ id: 11, quantity: 10, unitPrice: "1500.00" }]),
+      visitWith(2, []),
+    ]);
+
+    const result = await createInvoicesForCompletedVisitsService("2026-10-18", 5, 100000);
+
+    expect(Visit.findAll).toHaveBeenCalledTimes(1);
+    expect(generateInvoiceCodes).toHaveBeenCalledWith(2);
+    expect(Invoice.bulkCreate).toHaveBeenCalledTimes(1);
+    expect(InvoiceItem.bulkCreate).toHaveBeenCalledTimes(1);
+    expect((InvoiceItem.bulkCreate as jest.Mock).mock.calls[0][0].map((item: any) => item.invoiceId)).toEqual([
+      70, 70, 71,
+    ]);
+    expect(result).toEqual(
+      expect.objectContaining({ date: "2026-10-18", createdCount: 2, totalAmount: 215000, failed: [] })
+    );
+  });
+});
@@ -0,0 +1,103 @@
+import { loadInvoiceViews } from "../../../modules/finance/invoiceProjection";
+import { getInvoiceByIdService } from "../../../modules/finance/invoice.service";
+import Invoice from "../../../models/Invoice";
+import sequelize from "../../../config/database";
+
+
+jest.mock("../../../models/Invoice");
+jest.mock("../../../services/cache.service", () => ({
+  CacheService: { getOrSet: jest.fn() },
+  CacheKeys: { LIST_COUNT: (scope: string) => `count:${scope}` },
+}));
+
+const invoiceRow = (id: number, extra: any = {}) => ({
+  id,
+  invoiceCode: `INV-${id}`,
+  patientId: 100 + id,
+  doctorId: 3,
+  totalAmount: "250000.00",
+  paidAmount: "0.00",
+  paymentStatus: "UNPAID",
+  patient: { id: 100 + id, fullName: "Nguyễn Văn An" },
+  doctor: { id: 3, fullName: "Trần Thị Bình" },
+  ...extra,
+});
+
+describe("invoice projections", () => {
+  let query: jest.SpyInstance;
+  let tables: Record<string, any[]>;
+
+  beforeEach(() => {
+    tables = { invoices: [], invoice_items: [], payments: [] };
+    query = jest.spyOn(sequelize, "query").mockImplementation((async (sql: string) => {
+      const table = sql.match(/FROM (\w+)/)![1];
+      return JSON.parse(JSON.stringify(tables[table]));
+    }) as any);
+  });
+
+  it("skips the database when there are no ids", async () => {
+    await expect(loadInvoiceViews([], "detail")).resolves.toEqual([]);
+    expect(query).not.toHaveBeenCalled();
+  });
+
+  it("loads the list view with a single query and keeps the requested order", async () => {
+    tables.invoices = [invoiceRow(1), invoiceRow(2, { doctor: { id: null, fullName: null } })];
+
+    const invoices = await loadInvoiceViews([2, 9, 1], "list");
+
+    expect(query).toHaveBeenCalledTimes(1);
+    const [sql, options] = query.mock.calls[0];
+    expect(sql).not.toMatch(/invoice_items|payments|visits/);
+    expect(options).toMatchObject({ replacements: { ids: [2, 9, 1] }, nest: true });
+    expect(invoices.map((invoice) => invoice.id)).toEqual([2, 1]);
+    expect(invoices[0].doctor).toBeNull();
+    expect(invoices[1]).not.toHaveProperty("items");
+  });
+
+  it("batches items and payments for the detail view", async () => {
+    tables.invoices = [
+      invoiceRow(1, { visit: { id: 11, appointment: { id: null } } }),
+      invoiceRow(2, { visit: { id: 12, appointment: { id: 5, shift: { id: 1 } } } }),
+    ];
+    tables.invoice_items = [
+      { id: 1, invoiceId: 1, subtotal: "200000.00", prescriptionDetail: { id: null } },
+      { id: 2, invoiceId: 1, subtotal: "50000.00", prescriptionDetail: { id: 7, medicineName: "Paracetamol" } },
+      { id: 3, invoiceId: 2, subtotal: "250000.00", prescriptionDetail: { id: null } },
+    ];
+    tables.payments = [{ id: 4, invoiceId: 2, amount: "100000.00", creator: { id: 5 } }];
+
+    const [first, second] = await loadInvoiceViews([1, 2], "detail");
+
+    expect(query).toHaveBeenCalledTimes(3);
+    query.mock.calls.forEach(([sql]) => expect(sql).toContain("IN (:ids)"));
+    expect(first.items.map((item: any) => item.id)).toEqual([1, 2]);
+    expect(first.items[0].prescriptionDetail).toBeNull();
+    expect(first.payments).toEqual([]);
+    expect(first.visit.appointment).toBeNull();
+    expect(first.visit.patient).toEqual(first.patient);
+    expect(second.payments).toHaveLength(1);
+    expect(second.visit.appointment.shift).toEqual({ id: 1 });
+  });
+
+  it("repairs a stale paidAmount without reloading the invoice", async () => {
+    tables.invoices = [invoiceRow(1)];
+    tables.payments = [
+      { id: 1, invoiceId: 1, amount: "100000.00" },
+      { id: 2, invoiceId: 1, amount: "150000.00" },
+    ];
+    jest.spyOn(console, "warn").mockImplementation(() => undefined);
+
+    const invoice = await getInvoiceByIdService(1, "pdf");
+
+    expect(invoice).toMatchObject({ paidAmount: 250000, paymentStatus: "PAID" });
+    expect(Invoice.update).toHaveBeenCalledWith(
+      { paidAmount: 250000, paymentStatus: "PAID" },
+      { where: { id: 1 } }
+    );
+    expect(Invoice.findByPk).not.toHaveBeenCalled();
+  });
+
+  it("reports a missing invoice", async () => {
+    await expect(getInvoiceByIdService(404)).rejects.toThrow("Invoice not found");
+  });
+});
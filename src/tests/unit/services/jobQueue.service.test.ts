@@ -0,0 +1,162 @@
+import { Op } from "sequelize";
+import { JobQueueService, JobQueues, Job } from "../../../services/jobQueue.service";
+import { emailService, enqueueEmail, EMAIL_JOB } from "../../../services/email.service";
+import { mergeEmails, sendEmailBatch } from "../../../jobs/notificationQueue.job";
+import { emailRenderers } from "../../../templates/emailTemplates";
+import { redisClient } from "../../../config/redis.config";
+import Notification from "../../../models/Notification";
+
+
+jest.mock("../../../config/redis.config", () => ({
+  redisClient: {
+    lpush: jest.fn(),
+    zadd: jest.fn(),
+    eval: jest.fn(),
+    pipeline: jest.fn(),
+  },
+}));
+jest.mock("../../../models/Notification");
+jest.mock("../../../utils/logger");
+jest.mock("../../../modules/notification/notification.service", () => ({
+  sendAppointmentConfirmation: jest.fn(),
+  sendAppointmentCancellation: jest.fn(),
+  sendDoctorChangeNotification: jest.fn(),
+  sendAppointmentRescheduleNotification: jest.fn(),
+}));
+
+const createJob = (values: Partial<Job>): Job => ({
+  id: "job-1",
+  queue: JobQueues.NOTIFICATIONS,
+  type: "test:job",
+  payload: {},
+  attempts: 0,
+  maxAttempts: 3,
+  createdAt: 0,
+  ...values,
+});
+
+const claimed = (job: Job) => ({ raw: JSON.stringify(job), job });
+
+describe("JobQueueService", () => {
+  const pipeline = {
+    zrem: jest.fn(),
+    zadd: jest.fn(),
+    lpush: jest.fn(),
+    ltrim: jest.fn(),
+    exec: jest.fn(),
+  };
+
+  beforeEach(() => {
+    (redisClient.pipeline as jest.Mock).mockReturnValue(pipeline);
+    pipeline.exec.mockResolvedValue([]);
+    (redisClient.lpush as jest.Mock).mockResolvedValue(1);
+    (redisClient.zadd as jest.Mock).mockResolvedValue(1);
+    (Notification.update as jest.Mock).mockResolvedValue([1]);
+    emailService.outbox.length = 0;
+  });
+
+  it("should push immediate jobs to the waiting list and delayed jobs to the schedule", async () => {
+    await JobQueueService.enqueue(JobQueues.NOTIFICATIONS, "appointment:created", { appointmentId: 5 });
+    await enqueueEmail({ to: "a@example.com", subject: "Hi", html: "<p>Hi</p>" });
+
+    expect(redisClient.lpush).toHaveBeenCalledWith(
+      "jobs:notifications:waiting",
+      expect.stringContaining('"appointmentId":5')
+    );
+    expect(redisClient.zadd).toHaveBeenCalledWith(
+      "jobs:emails:delayed",
+      expect.any(Number),
+      expect.stringContaining(`"type":"${EMAIL_JOB}"`)
+    );
+  });
+
+  it("should acknowledge completed jobs and reschedule failures with backoff", async () => {
+    const ok = createJob({ id: "ok" });
+    const failing = createJob({ id: "failing", payload: { fail: true } });
+    JobQueueService.registerHandler<{ fail?: boolean }>("test:job", async (payload) => {
+      if (payload.fail) {
+        throw new Error("SMTP timeout");
+      }
+    });
+
+    const stats = await JobQueueService.process([claimed(ok), claimed(failing)]);
+
+    expect(stats).toEqual({ completed: 1, retried: 1, dead: 0 });
+    expect(pipeline.zrem).toHaveBeenCalledTimes(2);
+    const [key, runAt, raw] = pipeline.zadd.mock.calls[0];
+    expect(key).toBe("jobs:notifications:delayed");
+    expect(runAt).toBeGreaterThan(Date.now());
+    expect(JSON.parse(raw)).toEqual(
+      expect.objectContaining({ id: "failing", attempts: 1, lastError: "SMTP timeout" })
+    );
+  });
+
+  it("should dead-letter jobs that ran out of attempts", async () => {
+    const exhausted = createJob({ id: "exhausted", type: "unknown:job", attempts: 2 });
+
+    const stats = await JobQueueService.process([claimed(exhausted)]);
+
+    expect(stats).toEqual({ completed: 0, retried: 0, dead: 1 });
+    expect(pipeline.lpush).toHaveBeenCalledWith(
+      "jobs:notifications:dead",
+      expect.stringContaining('"attempts":3')
+    );
+    expect(pipeline.zadd).not.toHaveBeenCalled();
+  });
+
+  it("should send one email per recipient and mark every notification as emailed", async () => {
+    const email = (id: string, to: string, subject: string, notificationId: number) =>
+      createJob({
+        id,
+        queue: JobQueues.EMAILS,
+        type: EMAIL_JOB,
+        payload: { to, subject, html: `<p>${subject}</p>`, notificationIds: [notificationId] },
+      });
+
+    const failures = await sendEmailBatch([
+      email("1", "patient@example.com", "Confirmed", 10),
+      email("2", "Patient@example.com", "Doctor changed", 11),
+      email("3", "other@example.com", "Cancelled", 12),
+    ]);
+
+    expect(failures.size).toBe(0);
+    expect(emailService.outbox).toHaveLength(2);
+    expect(emailService.outbox[0].subject).toContain("2 thông báo mới");
+    expect(emailService.outbox[0].text).toContain("Doctor changed");
+    expect(Notification.update).toHaveBeenCalledTimes(1);
+    const [, options] = (Notification.update as jest.Mock).mock.calls[0];
+    expect(options.where.id[Op.in]).toEqual([10, 11, 12]);
+  });
+  it("should wrap merged notifications in a single email layout", () => {
+    const appointment = {
+      patientName: "Nguyễn Văn B",
+      doctorName: "BS. Trần C",
+      appointmentDate: "2026-10-20",
+      shiftName: "Ca sáng",
+      appointmentId: 4521,
+    };
+    const confirmation = emailRenderers.appointmentConfirmation({
+      ...appointment,
+      doctorSpecialty: "Nội tổng quát",
+      slotNumber: 7,
+    });
+    const cancellation = emailRenderers.appointmentCancellation({ ...appointment, reason: "Bận việc" });
+    const legacy = emailRenderers.appointmentCancellation({ ...appointment, appointmentId: 4522 });
+
+    const merged = mergeEmails([
+      { to: "a@example.com", subject: "1", html: confirmation.html, content: confirmation.content },
+      { to: "a@example.com", subject: "2", html: cancellation.html, content: cancellation.content },
+      { to: "a@example.com", subject: "3", html: legacy.html },
+    ]);
+
+    const count = (pattern: RegExp) => (merged.html.match(pattern) || []).length;
+    expect(count(/<html/gi)).toBe(1);
+    expect(count(/<head>/gi)).toBe(1);
+    expect(count(/<\/body>/gi)).toBe(1);
+    expect(count(/All rights reserved/g)).toBe(1);
+    expect(merged.html).toContain("Bận việc");
+    expect(merged.html).toContain("#4522");
+    expect(count(/class="header"/g)).toBe(3);
+    expect((merged.text!.match(/All rights reserved/g) || []).length).toBe(1);
+  });
+});
@@ -0,0 +1,84 @@
+import { Op } from "sequelize";
+import {
+  applyKeyset,
+  buildKeysetPage,
+  cachedCount,
+  decodeCursor,
+  encodeCursor,
+  keysetOrder,
+} from "../../../utils/keysetPagination";
+import { CacheService } from "../../../services/cache.service";
+
+
+jest.mock("../../../services/cache.service", () => ({
+  CacheService: { getOrSet: jest.fn() },
+  CacheKeys: { LIST_COUNT: (scope: string) => `count:${scope}` },
+}));
+
+describe("keyset pagination", () => {
+  const createdAt = new Date("2026-10-01T08:30:00.000Z");
+
+  beforeEach(() => {
+    (CacheService.getOrSet as jest.Mock).mockImplementation((_key, fetch) => fetch());
+  });
+
+  it("should round-trip cursors and reject tampered ones", () => {
+    const cursor = encodeCursor(createdAt, 42);
+
+    expect(decodeCursor(cursor)).toEqual({ sortValue: createdAt.toISOString(), id: 42 });
+    expect(decodeCursor("")).toBeNull();
+    expect(() => decodeCursor("not-a-cursor")).toThrow("Invalid pagination cursor");
+    expect(() => decodeCursor(Buffer.from('["x", 1]').toString("base64url"))).toThrow();
+  });
+
+  it("should seek past the cursor without dropping existing filters", () => {
+    const where = {
+      isActive: true,
+      [Op.or]: [{ fullName: { [Op.like]: "%an%" } }],
+    };
+
+    const seek: any = applyKeyset(where, { sortValue: createdAt.toISOString(), id: 42 });
+
+    expect(seek.isActive).toBe(true);
+    expect(seek[Op.or]).toBe(where[Op.or]);
+    expect(seek[Op.and]).toEqual([
+      {
+        [Op.or]: [
+          { createdAt: { [Op.lt]: createdAt } },
+          { createdAt, id: { [Op.lt]: 42 } },
+        ],
+      },
+    ]);
+    expect(applyKeyset(where, null)).toBe(where);
+    expect(keysetOrder("timestamp")).toEqual([["timestamp", "DESC"], ["id", "DESC"]]);
+  });
+
+  it("should trim the look-ahead row and point the next cursor at the last row", () => {
+    const rows = [3, 2, 1].map((id) => ({ id, createdAt }));
+
+    const page = buildKeysetPage(rows, 2, "createdAt", { value: 10, approximate: true });
+
+    expect(page.rows.map((row) => row.id)).toEqual([3, 2]);
+    expect(page.pagination).toEqual(
+      expect.objectContaining({ mode: "cursor", hasMore: true, total: 10, totalIsApproximate: true })
+    );
+    expect(decodeCursor(page.pagination.nextCursor!)).toEqual({ sortValue: createdAt.toISOString(), id: 2 });
+
+    const last = buildKeysetPage(rows.slice(0, 1), 2, "createdAt", { value: 10, approximate: true });
+    expect(last.pagination.hasMore).toBe(false);
+    expect(last.pagination.nextCursor).toBeNull();
+  });
+
+  it("should cache totals per filter set, including operator filters", async () => {
+    const count = jest.fn().mockResolvedValue(1234);
+
+    await cachedCount("patients", { gender: "MALE", [Op.or]: [{ fullName: "a" }] }, count);
+    await cachedCount("patients", { [Op.or]: [{ fullName: "a" }], gender: "MALE" }, count);
+    await cachedCount("patients", { gender: "MALE", [Op.or]: [{ fullName: "b" }] }, count);
+
+    const keys = (CacheService.getOrSet as jest.Mock).mock.calls.map(([key]) => key);
+    expect(keys[0]).toBe(keys[1]);
+    expect(keys[0]).not.toBe(keys[2]);
+    expect((CacheService.getOrSet as jest.Mock).mock.calls[0][2]).toBe(60);
+  });
+});
@@ -0,0 +1,82 @@
+import { LRUCache } from "../../../utils/lruCache";
+
+
+describe("LRUCache", () => {
+  let now: number;
+
+  beforeEach(() => {
+    now = 1_000_000;
+    jest.spyOn(Date, "now").mockImplementation(() => now);
+  });
+
+  afterEach(() => {
+    jest.restoreAllMocks();
+  });
+
+  it("should evict the least recently inserted entry when full", () => {
+    const cache = new LRUCache<string, number>(2);
+    cache.set("a", 1);
+    cache.set("b", 2);
+    cache.set("c", 3);
+
+    expect(cache.get("a")).toBeUndefined();
+    expect(cache.get("b")).toBe(2);
+    expect(cache.get("c")).toBe(3);
+    expect(cache.size).toBe(2);
+  });
+
+  it("should treat get as a use but not peek or has", () => {
+    const cache = new LRUCache<string, number>(2);
+    cache.set("a", 1);
+    cache.set("b", 2);
+    cache.get("a");
+    cache.set("c", 3);
+
+    expect([...cache.keys()]).toEqual(["a", "c"]);
+
+    cache.peek("a");
+    cache.has("a");
+    cache.set("d", 4);
+
+    expect([...cache.keys()]).toEqual(["c", "d"]);
+  });
+
+  it("should move an overwritten key to the most recent position", () => {
+    const cache = new LRUCache<string, number>(2);
+    cache.set("a", 1);
+    cache.set("b", 2);
+    cache.set("a", 10);
+    cache.set("c", 3);
+
+    expect(cache.get("a")).toBe(10);
+    expect(cache.get("b")).toBeUndefined();
+  });
+
+  it("should expire entries after their ttl", () => {
+    const cache = new LRUCache<string, number>(10, 1000);
+    cache.set("default", 1);
+    cache.set("custom", 2, 5000);
+    cache.set("forever", 3, 0);
+
+    now += 999;
+    expect(cache.get("default")).toBe(1);
+
+    now += 1;
+    expect(cache.get("default")).toBeUndefined();
+    expect(cache.has("custom")).toBe(true);
+
+    now += 4000;
+    expect(cache.peek("custom")).toBeUndefined();
+    expect(cache.get("forever")).toBe(3);
+  });
+
+  it("should drop an expired entry on get so it no longer counts toward size", () => {
+    const cache = new LRUCache<string, number>(10, 1000);
+    cache.set("a", 1);
+
+    now += 1000;
+    expect(cache.size).toBe(1);
+    expect(cache.get("a")).toBeUndefined();
+    expect(cache.size).toBe(0);
+  });
+});
@@ -11,11 +11,17 @@ import Medicine from "../../../models/Medicine";
 import MedicineImport from "../../../models/MedicineImport";
 import MedicineExport from "../../../models/MedicineExport";
 import { sequelize } from "../../../models/index";
+import { SequenceService } from "../../../services/sequence.service";
 
 
 jest.mock("../../../models/Medicine");
 jest.mock("../../../models/MedicineImport");
 jest.mock("../../../models/MedicineExport");
+jest.mock("../../../services/sequence.service");
+jest.mock("../../../services/cache.service", () => ({
+  CacheService: { invalidateTags: jest.fn() },
+  CacheTags: { MEDICINES: "medicines" },
+}));
 jest.mock("../../../models", () => ({
   sequelize: {
     transaction: jest.fn(),
@@ -25,6 +31,7 @@ jest.mock("../../../models", () => ({
 describe("Medicine Service", () => {
   beforeEach(() => {
     jest.clearAllMocks();
+    (SequenceService.next as jest.Mock).mockResolvedValue(1);
   });
 
   describe("createMedicineService", () => {
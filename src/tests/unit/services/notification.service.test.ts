@@ -0,0 +1,113 @@
+import { Op } from "sequelize";
+import {
+  sendAppointmentConfirmation,
+  sendEmailNow,
+} from "../../../modules/notification/notification.service";
+import Notification, { NotificationType } from "../../../models/Notification";
+import Appointment from "../../../models/Appointment";
+import { emailService, enqueueEmail } from "../../../services/email.service";
+
+jest.mock("../../../models/Notification", () => ({
+  __esModule: true,
+  default: {
+    findOne: jest.fn(),
+    create: jest.fn(),
+    update: jest.fn(),
+  },
+  NotificationType: { APPOINTMENT_CREATED: "APPOINTMENT_CREATED" },
+}));
+jest.mock("../../../models/Appointment");
+jest.mock("../../../models/Patient");
+jest.mock("../../../models/Doctor");
+jest.mock("../../../models/Shift");
+jest.mock("../../../models/User");
+jest.mock("../../../models/Specialty");
+jest.mock("../../../services/email.service", () => ({
+  emailService: { sendEmail: jest.fn() },
+  enqueueEmail: jest.fn(),
+}));
+
+const appointment = {
+  id: 7,
+  date: "2099-01-10",
+  slotNumber: 3,
+  get: (key: string) =>
+    ({
+      patient: { user: { id: 11, fullName: "Nguyen Van A", email: "a@example.com" } },
+      doctor: { user: { fullName: "Dr. B" }, specialty: { name: "Nội" } },
+      shift: { name: "Sáng", startTime: "08:00", endTime: "12:00" },
+    })[key],
+};
+
+describe("Notification Service", () => {
+  beforeEach(() => {
+    jest.clearAllMocks();
+    (Appointment.findByPk as jest.Mock).mockResolvedValue(appointment);
+    (Notification.findOne as jest.Mock).mockResolvedValue(null);
+    (Notification.create as jest.Mock).mockResolvedValue({ id: 100, emailSent: false });
+    (enqueueEmail as jest.Mock).mockResolvedValue(undefined);
+    (emailService.sendEmail as jest.Mock).mockResolvedValue(true);
+  });
+
+  it("creates a notification and queues the email on first delivery", async () => {
+    const since = new Date("2099-01-01T00:00:10Z");
+
+    await sendAppointmentConfirmation(7, { since });
+
+    expect(Notification.findOne).toHaveBeenCalledWith(
+      expect.objectContaining({
+        where: {
+          userId: 11,
+          type: NotificationType.APPOINTMENT_CREATED,
+          relatedAppointmentId: 7,
+          createdAt: { [Op.gte]: new Date("2099-01-01T00:00:05Z") },
+        },
+      })
+    );
+    expect(Notification.create).toHaveBeenCalledTimes(1);
+    expect(enqueueEmail).toHaveBeenCalledWith(
+      expect.objectContaining({ to: "a@example.com", notificationIds: [100] })
+    );
+  });
+
+  it("reuses the existing notification when a job is retried", async () => {
+    (Notification.findOne as jest.Mock).mockResolvedValue({ id: 100, emailSent: false });
+
+    await sendAppointmentConfirmation(7);
+
+    expect(Notification.create).not.toHaveBeenCalled();
+    expect(enqueueEmail).toHaveBeenCalledWith(
+      expect.objectContaining({ notificationIds: [100] })
+    );
+  });
+
+  it("does not resend once the email has been delivered", async () => {
+    (Notification.findOne as jest.Mock).mockResolvedValue({ id: 100, emailSent: true });
+
+    await sendAppointmentConfirmation(7);
+
+    expect(Notification.create).not.toHaveBeenCalled();
+    expect(enqueueEmail).not.toHaveBeenCalled();
+  });
+
+  it("sends directly and marks the notification when the queue is bypassed", async () => {
+    await sendAppointmentConfirmation(7, { sendEmail: sendEmailNow });
+
+    expect(enqueueEmail).not.toHaveBeenCalled();
+    expect(emailService.sendEmail).toHaveBeenCalledWith(
+      expect.objectContaining({ to: "a@example.com", notificationIds: [100] })
+    );
+    expect(Notification.update).toHaveBeenCalledWith(
+      expect.objectContaining({ emailSent: true }),
+      { where: { id: { [Op.in]: [100] } } }
+    );
+  });
+
+  it("leaves the notification unsent when direct delivery fails", async () => {
+    (emailService.sendEmail as jest.Mock).mockResolvedValue(false);
+
+    await sendEmailNow({ to: "a@example.com", subject: "s", html: "h", notificationIds: [100] });
+
+    expect(Notification.update).not.toHaveBeenCalled();
+  });
+});
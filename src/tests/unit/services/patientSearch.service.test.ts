@@ -0,0 +1,63 @@
+import { PatientSearchIndex } from "../../../services/patientSearch.service";
+import Patient from "../../../models/Patient";
+import PatientProfile from "../../../models/PatientProfile";
+import { normalizeSearchText } from "../../../utils/searchText";
+
+
+jest.mock("../../../config/database", () => ({
+  __esModule: true,
+  default: { escape: (value: string) => `'${value.replace(/'/g, "\\'")}'` },
+}));
+jest.mock("../../../models/Patient", () => ({ __esModule: true, default: { update: jest.fn() } }));
+jest.mock("../../../models/PatientProfile", () => ({ __esModule: true, default: { findAll: jest.fn() } }));
+
+describe("PatientSearchIndex", () => {
+  beforeEach(() => {
+    (Patient.update as jest.Mock).mockResolvedValue([1]);
+  });
+
+  it("should fold Vietnamese diacritics and punctuation", () => {
+    expect(normalizeSearchText("  Nguyễn Văn Đức ")).toBe("nguyen van duc");
+    expect(normalizeSearchText("TRẦN THỊ ÁNH-TUYẾT")).toBe("tran thi anh tuyet");
+    expect(normalizeSearchText("Phạm Thị Hồng, Q.1")).toBe("pham thi hong q 1");
+  });
+
+  it("should route codes and numbers to indexed prefix lookups", () => {
+    const code = PatientSearchIndex.matchPatients("bn0012", "Patient");
+    expect(code.kind).toBe("code");
+    expect(code.condition).toBe("`Patient`.`patientCode` LIKE 'BN0012%'");
+
+    const phone = PatientSearchIndex.matchPatients("+84 912 345", "Patient");
+    expect(phone.kind).toBe("number");
+    expect(phone.condition).toContain("`Patient`.`cccd` LIKE '0912345%'");
+    expect(phone.condition).toContain("`pp`.`type` = 'phone' AND `pp`.`value` LIKE '0912345%'");
+  });
+
+  it("should match names through the ngram index with a prefix boost", () => {
+    const match = PatientSearchIndex.matchPatients("Nguyễn Văn", "p");
+
+    expect(match.kind).toBe("text");
+    expect(match.condition).toBe(`MATCH(\`p\`.\`searchName\`) AGAINST('+"nguyen" +"van"' IN BOOLEAN MODE)`);
+    expect(match.score).toContain("`p`.`searchName` LIKE 'nguyen van%'");
+    expect(PatientSearchIndex.matchPatients("á", "p").condition).toBe("`p`.`searchName` LIKE 'a%'");
+    expect(PatientSearchIndex.patientIdsSql("Lê")).toContain("FROM `patients` AS `p` WHERE MATCH(`p`.`searchName`)");
+  });
+
+  it("should rebuild the contact text for every patient, including ones without profiles", async () => {
+    (PatientProfile.findAll as jest.Mock).mockResolvedValue([
+      { patientId: 1, value: "0912345678", ward: null, city: null },
+      { patientId: 1, value: "12 Lê Lợi", ward: "Bến Nghé", city: "Hồ Chí Minh" },
+    ]);
+
+    await PatientSearchIndex.refreshContacts([1, 2]);
+
+    expect(Patient.update).toHaveBeenCalledWith(
+      { searchContacts: "0912345678 12 le loi ben nghe ho chi minh" },
+      expect.objectContaining({ where: { id: 1 }, hooks: false })
+    );
+    expect(Patient.update).toHaveBeenCalledWith(
+      { searchContacts: "" },
+      expect.objectContaining({ where: { id: 2 } })
+    );
+  });
+});
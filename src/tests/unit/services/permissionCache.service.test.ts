@@ -0,0 +1,75 @@
+import { PermissionCacheService } from "../../../services/permissionCache.service";
+import Role from "../../../models/Role";
+import { redisClient } from "../../../config/redis.config";
+
+
+jest.mock("../../../models/Role");
+jest.mock("../../../models/Permission");
+jest.mock("../../../utils/logger");
+jest.mock("../../../config/redis.config", () => ({
+  redisClient: {
+    get: jest.fn(),
+    incr: jest.fn(),
+    publish: jest.fn(),
+  },
+}));
+
+describe("PermissionCacheService", () => {
+  beforeEach(() => {
+    jest.clearAllMocks();
+    PermissionCacheService.reset();
+
+    (redisClient.get as jest.Mock).mockResolvedValue("1");
+    (redisClient.incr as jest.Mock).mockResolvedValue(2);
+    (redisClient.publish as jest.Mock).mockResolvedValue(1);
+    (Role.findAll as jest.Mock).mockResolvedValue([
+      { id: 1, permissions: [{ name: "users.view" }, { name: "users.edit" }] },
+      { id: 3, permissions: [] },
+    ]);
+  });
+
+  it("should load every role in one query and answer from memory afterwards", async () => {
+    expect(await PermissionCacheService.hasPermission(1, "users.view")).toBe(true);
+    expect(await PermissionCacheService.hasPermission(1, "users.delete")).toBe(false);
+    expect(await PermissionCacheService.hasPermission(3, "users.view")).toBe(false);
+
+    expect(Role.findAll).toHaveBeenCalledTimes(1);
+  });
+
+  it("should return null for unknown roles", async () => {
+    expect(await PermissionCacheService.getRolePermissions(99)).toBeNull();
+  });
+
+  it("should share a single load between concurrent checks", async () => {
+    await Promise.all([
+      PermissionCacheService.hasPermission(1, "users.view"),
+      PermissionCacheService.hasPermission(1, "users.edit"),
+      PermissionCacheService.hasPermission(3, "users.view"),
+    ]);
+
+    expect(Role.findAll).toHaveBeenCalledTimes(1);
+  });
+
+  it("should reload and publish a version bump after invalidation", async () => {
+    await PermissionCacheService.hasPermission(1, "users.view");
+
+    (Role.findAll as jest.Mock).mockResolvedValue([
+      { id: 1, permissions: [{ name: "users.delete" }] },
+    ]);
+    await PermissionCacheService.invalidate();
+
+    expect(redisClient.incr).toHaveBeenCalledWith("permissions:version");
+    expect(redisClient.publish).toHaveBeenCalledWith("permissions:invalidate", "2");
+    expect(await PermissionCacheService.hasPermission(1, "users.view")).toBe(false);
+    expect(await PermissionCacheService.hasPermission(1, "users.delete")).toBe(true);
+    expect(Role.findAll).toHaveBeenCalledTimes(2);
+  });
+
+  it("should keep working when Redis is unavailable", async () => {
+    (redisClient.get as jest.Mock).mockRejectedValue(new Error("ECONNREFUSED"));
+    (redisClient.incr as jest.Mock).mockRejectedValue(new Error("ECONNREFUSED"));
+
+    expect(await PermissionCacheService.hasPermission(1, "users.edit")).toBe(true);
+    await expect(PermissionCacheService.invalidate()).resolves.toBeUndefined();
+  });
+});
@@ -10,7 +10,12 @@ import PrescriptionDetail from "../../../models/PrescriptionDetail";
 import Medicine from "../../../models/Medicine";
 import MedicineExport from "../../../models/MedicineExport";
 import Visit from "../../../models/Visit";
+import Appointment from "../../../models/Appointment";
+import Doctor from "../../../models/Doctor";
 import { sequelize } from "../../../models/index";
+import database from "../../../config/database";
+import { SequenceService } from "../../../services/sequence.service";
+import { Op } from "sequelize";
 
 
 jest.mock("../../../models/Prescription");
@@ -18,6 +23,13 @@ jest.mock("../../../models/PrescriptionDetail");
 jest.mock("../../../models/Medicine");
 jest.mock("../../../models/MedicineExport");
 jest.mock("../../../models/Visit");
+jest.mock("../../../models/Appointment");
+jest.mock("../../../models/Doctor");
+jest.mock("../../../services/sequence.service");
+jest.mock("../../../services/cache.service", () => ({
+  CacheService: { invalidateTags: jest.fn() },
+  CacheTags: { MEDICINES: "medicines" },
+}));
 jest.mock("../../../models", () => ({
   sequelize: {
     transaction: jest.fn(),
@@ -27,6 +39,16 @@ jest.mock("../../../models", () => ({
 describe("Prescription Service", () => {
   beforeEach(() => {
     jest.clearAllMocks();
+    (SequenceService.next as jest.Mock).mockResolvedValue(1);
+    (SequenceService.nextMany as jest.Mock).mockImplementation(async (_scope, count) =>
+      Array.from({ length: count }, (_, index) => index + 1)
+    );
+    (Appointment.findByPk as jest.Mock).mockResolvedValue({ status: "IN_PROGRESS" });
+    (Doctor.findByPk as jest.Mock).mockResolvedValue({ userId: 10 });
+    jest.spyOn(database, "query").mockImplementation((async (_sql: string, options: any) => [
+      { affectedRows: options.replacements.find(Array.isArray).length },
+      undefined,
+    ]) as any);
   });
 
   describe("createPrescriptionService", () => {
@@ -69,10 +91,10 @@ describe("Prescription Service", () => {
 
       (Visit.findByPk as jest.Mock).mockResolvedValue(mockVisit);
       (Prescription.findOne as jest.Mock).mockResolvedValue(null);
-      (Medicine.findByPk as jest.Mock).mockResolvedValue(mockMedicine);
+      (Medicine.findAll as jest.Mock).mockResolvedValue([mockMedicine]);
       (Prescription.create as jest.Mock).mockResolvedValue(mockPrescription);
-      (PrescriptionDetail.create as jest.Mock).mockResolvedValue({});
-      (MedicineExport.create as jest.Mock).mockResolvedValue({});
+      (PrescriptionDetail.bulkCreate as jest.Mock).mockResolvedValue([]);
+      (MedicineExport.bulkCreate as jest.Mock).mockResolvedValue([]);
 
       const result = await createPrescriptionService(
         1, 
@@ -93,10 +115,132 @@ describe("Prescription Service", () => {
       );
 
       expect(mockMedicine.quantity).toBe(80); 
-      expect(mockMedicine.save).toHaveBeenCalled();
+      expect(database.query).toHaveBeenCalledTimes(1);
       expect(Prescription.create).toHaveBeenCalled();
-      expect(PrescriptionDetail.create).toHaveBeenCalled();
-      expect(MedicineExport.create).toHaveBeenCalled();
+      expect(PrescriptionDetail.bulkCreate).toHaveBeenCalledWith(
+        [expect.objectContaining({ medicineId: 1, quantity: 20, unitPrice: 1500 })],
+        { transaction: mockTransaction }
+      );
+      expect(MedicineExport.bulkCreate).toHaveBeenCalledWith(
+        [expect.objectContaining({ medicineId: 1, quantity: 20, reason: "PRESCRIPTION_RX-20250104-00001" })],
+        { transaction: mockTransaction }
+      );
+      expect(mockPrescription.totalAmount).toBe(30000);
+      const [sql, queryOptions] = (database.query as jest.Mock).mock.calls[0];
+      expect(sql).not.toContain("20");
+      expect(queryOptions).toEqual({
+        replacements: [1, -20, [1], 1, -20],
+        transaction: mockTransaction,
+      });
+    });
+
+    it("should reserve a 20-line prescription with a constant number of stock queries", async () => {
+      const mockTransaction = { LOCK: { UPDATE: "UPDATE" } };
+      const medicines = Array.from({ length: 20 }, (_, index) => ({
+        id: 20 - index,
+        name: `Medicine ${20 - index}`,
+        quantity: 100,
+        salePrice: 1000,
+        unit: "VIEN",
+        status: "ACTIVE",
+      }));
+
+      (sequelize.transaction as jest.Mock).mockImplementation(
+        async (options: any, callback: any) => callback(mockTransaction)
+      );
+      (Visit.findByPk as jest.Mock).mockResolvedValue({ id: 1, doctorId: 1, status: "COMPLETED" });
+      (Prescription.findOne as jest.Mock).mockResolvedValue(null);
+      (Medicine.findAll as jest.Mock).mockResolvedValue(medicines);
+      (Prescription.create as jest.Mock).mockResolvedValue({
+        id: 1,
+        prescriptionCode: "RX-1",
+        save: jest.fn(),
+      });
+
+      await createPrescriptionService(1, 1, {
+        visitId: 1,
+        medicines: medicines.map((medicine) => ({
+          medicineId: medicine.id,
+          quantity: 5,
+          dosageMorning: 1,
+          dosageNoon: 0,
+          dosageAfternoon: 0,
+          dosageEvening: 0,
+        })),
+      });
+
+      expect(Medicine.findAll).toHaveBeenCalledTimes(1);
+      const [lockOptions] = (Medicine.findAll as jest.Mock).mock.calls[0];
+      expect(lockOptions.where.id[Op.in]).toEqual(Array.from({ length: 20 }, (_, index) => index + 1));
+      expect(lockOptions).toEqual(expect.objectContaining({ order: [["id", "ASC"]], lock: "UPDATE" }));
+      expect(database.query).toHaveBeenCalledTimes(1);
+      expect(SequenceService.nextMany).toHaveBeenCalledTimes(1);
+      expect((PrescriptionDetail.bulkCreate as jest.Mock).mock.calls[0][0]).toHaveLength(20);
+      expect((MedicineExport.bulkCreate as jest.Mock).mock.calls[0][0]).toHaveLength(20);
+      expect(medicines.every((medicine) => medicine.quantity === 95)).toBe(true);
+    });
+
+    it("should match medicine ids sent as strings", async () => {
+      const mockTransaction = { LOCK: { UPDATE: "UPDATE" } };
+      const mockMedicine = {
+        id: 1,
+        name: "Paracetamol",
+        quantity: 100,
+        salePrice: 1500,
+        unit: "VIEN",
+        status: "ACTIVE",
+      };
+
+      (sequelize.transaction as jest.Mock).mockImplementation(
+        async (options: any, callback: any) => callback(mockTransaction)
+      );
+      (Visit.findByPk as jest.Mock).mockResolvedValue({ id: 1, doctorId: 1, status: "COMPLETED" });
+      (Prescription.findOne as jest.Mock).mockResolvedValue(null);
+      (Medicine.findAll as jest.Mock).mockResolvedValue([mockMedicine]);
+      (Prescription.create as jest.Mock).mockResolvedValue({
+        id: 1,
+        prescriptionCode: "RX-1",
+        save: jest.fn(),
+      });
+
+      const line = { dosageMorning: 1, dosageNoon: 0, dosageAfternoon: 0, dosageEvening: 0 };
+      await createPrescriptionService(1, 1, {
+        visitId: 1,
+        medicines: [
+          { ...line, medicineId: "1" as any, quantity: 5 },
+          { ...line, medicineId: 1, quantity: 10 },
+        ],
+      });
+
+      const [lockOptions] = (Medicine.findAll as jest.Mock).mock.calls[0];
+      expect(lockOptions.where.id[Op.in]).toEqual([1]);
+      expect(mockMedicine.quantity).toBe(85);
+      expect((MedicineExport.bulkCreate as jest.Mock).mock.calls[0][0]).toEqual([
+        expect.objectContaining({ medicineId: 1, quantity: 5 }),
+        expect.objectContaining({ medicineId: 1, quantity: 10 }),
+      ]);
+    });
+
+    it("should reject quantities that are not integers before touching stock", async () => {
+      const mockTransaction = { LOCK: { UPDATE: "UPDATE" } };
+
+      (sequelize.transaction as jest.Mock).mockImplementation(
+        async (options: any, callback: any) => callback(mockTransaction)
+      );
+      (Visit.findByPk as jest.Mock).mockResolvedValue({ id: 1, doctorId: 1, status: "COMPLETED" });
+      (Prescription.findOne as jest.Mock).mockResolvedValue(null);
+
+      const line = { medicineId: 1, dosageMorning: 1, dosageNoon: 0, dosageAfternoon: 0, dosageEvening: 0 };
+      for (const quantity of ["abc", "1e400", 1.5]) {
+        await expect(
+          createPrescriptionService(1, 1, {
+            visitId: 1,
+            medicines: [{ ...line, quantity: quantity as any }],
+          })
+        ).rejects.toThrow("INVALID_QUANTITY_1");
+      }
+      expect(Medicine.findAll).not.toHaveBeenCalled();
+      expect(database.query).not.toHaveBeenCalled();
     });
 
     it("should throw error if visit not found", async () => {
@@ -136,6 +280,7 @@ describe("Prescription Service", () => {
         status: "ACTIVE",
       };
 
+
       const mockTransaction = {
         LOCK: { UPDATE: "UPDATE" },
       };
@@ -148,7 +293,7 @@ describe("Prescription Service", () => {
 
       (Visit.findByPk as jest.Mock).mockResolvedValue(mockVisit);
       (Prescription.findOne as jest.Mock).mockResolvedValue(null);
-      (Medicine.findByPk as jest.Mock).mockResolvedValue(mockMedicine);
+      (Medicine.findAll as jest.Mock).mockResolvedValue([mockMedicine]);
 
       await expect(
         createPrescriptionService(1, 1, {
@@ -164,7 +309,8 @@ describe("Prescription Service", () => {
             },
           ],
         })
-      ).rejects.toThrow("INSUFFICIENT_STOCK");
+      ).rejects.toThrow("INSUFFICIENT_STOCK_Paracetamol_Available:10_Requested:50");
+      expect(database.query).not.toHaveBeenCalled();
     });
   });
 
@@ -185,7 +331,6 @@ describe("Prescription Service", () => {
       const mockMedicine = {
         id: 1,
         quantity: 80,
-        save: jest.fn().mockResolvedValue(true),
       };
 
       const mockTransaction = {
@@ -200,12 +345,12 @@ describe("Prescription Service", () => {
 
       (Prescription.findByPk as jest.Mock).mockResolvedValue(mockPrescription);
       (PrescriptionDetail.findAll as jest.Mock).mockResolvedValue([mockDetail]);
-      (Medicine.findByPk as jest.Mock).mockResolvedValue(mockMedicine);
+      (Medicine.findAll as jest.Mock).mockResolvedValue([mockMedicine]);
 
       const result = await cancelPrescriptionService(1, 1);
 
       expect(mockMedicine.quantity).toBe(100); 
-      expect(mockMedicine.save).toHaveBeenCalled();
+      expect(database.query).toHaveBeenCalledTimes(1);
       expect(mockPrescription.status).toBe("CANCELLED");
       expect(mockPrescription.save).toHaveBeenCalled();
     });
@@ -0,0 +1,54 @@
+import { updateMyProfile } from "../../../modules/auth/profile.controller";
+import User from "../../../models/User";
+import Patient from "../../../models/Patient";
+import PatientProfile from "../../../models/PatientProfile";
+import { PatientSearchIndex } from "../../../services/patientSearch.service";
+
+jest.mock("bcrypt", () => ({ compare: jest.fn(), hash: jest.fn() }));
+jest.mock("../../../models/User");
+jest.mock("../../../models/Role");
+jest.mock("../../../models/Patient");
+jest.mock("../../../models/PatientProfile");
+jest.mock("../../../models/Doctor");
+jest.mock("../../../models/Employee");
+jest.mock("../../../services/cache.service", () => ({
+  CacheService: { invalidateTags: jest.fn() },
+  CacheTags: { DOCTORS: "doctors" },
+}));
+jest.mock("../../../services/patientSearch.service", () => ({
+  PatientSearchIndex: { refreshContacts: jest.fn() },
+}));
+
+describe("updateMyProfile", () => {
+  const res: any = {
+    status: jest.fn().mockReturnThis(),
+    json: jest.fn().mockReturnThis(),
+  };
+
+  beforeEach(() => {
+    jest.clearAllMocks();
+    res.status.mockReturnThis();
+    res.json.mockReturnThis();
+    (User.findByPk as jest.Mock)
+      .mockResolvedValueOnce({ id: 5, roleId: 3, save: jest.fn() })
+      .mockResolvedValueOnce(null);
+    (Patient.findOne as jest.Mock).mockResolvedValue({ id: 9, save: jest.fn() });
+    (PatientProfile.upsert as jest.Mock).mockResolvedValue([{}, true]);
+    (PatientSearchIndex.refreshContacts as jest.Mock).mockResolvedValue(undefined);
+  });
+
+  it("refreshes the patient's search contacts after editing profiles", async () => {
+    const req: any = {
+      user: { userId: 5 },
+      body: { phone: "0912345678", address: "12 Lê Lợi" },
+    };
+
+    await updateMyProfile(req, res);
+
+    expect(PatientProfile.upsert).toHaveBeenCalledTimes(2);
+    expect(PatientSearchIndex.refreshContacts).toHaveBeenCalledWith([9]);
+    const upsertOrder = (PatientProfile.upsert as jest.Mock).mock.invocationCallOrder;
+    const refreshOrder = (PatientSearchIndex.refreshContacts as jest.Mock).mock.invocationCallOrder[0];
+    expect(Math.max(...upsertOrder)).toBeLessThan(refreshOrder);
+  });
+});
@@ -0,0 +1,70 @@
+import ExcelJS from "exceljs";
+import { PassThrough } from "stream";
+import { writeInvoiceDetailWorkbook } from "../../../modules/admin/reportExcel.service";
+import { InvoiceDetailRow } from "../../../modules/admin/report.service";
+
+
+jest.mock("../../../modules/admin/report.service", () => ({
+  streamInvoiceDetailRows: jest.fn(),
+}));
+
+const invoiceRow = (id: number, overrides: Partial<InvoiceDetailRow> = {}): InvoiceDetailRow => ({
+  id,
+  invoiceCode: `HD${id}`,
+  createdAt: new Date(2026, 2, id, 9, 30),
+  patientCode: `BN00000${id}`,
+  patientName: "Nguyễn Văn An",
+  doctorName: "Trần Thị Bình",
+  examinationFee: "150000.00",
+  medicineTotalAmount: "50000.00",
+  discount: "0.00",
+  totalAmount: "200000.00",
+  paidAmount: "200000.00",
+  paymentStatus: "PAID",
+  ...overrides,
+});
+
+async function* chunksOf(...chunks: InvoiceDetailRow[][]) {
+  for (const chunk of chunks) {
+    yield chunk;
+  }
+}
+
+describe("writeInvoiceDetailWorkbook", () => {
+  it("should stream every chunk into a single sheet with typed cells", async () => {
+    const stream = new PassThrough();
+    const buffers: Buffer[] = [];
+    stream.on("data", (chunk) => buffers.push(chunk));
+
+    const written = await writeInvoiceDetailWorkbook(
+      stream,
+      chunksOf([invoiceRow(1), invoiceRow(2)], [invoiceRow(3, { paymentStatus: "UNPAID", paidAmount: "0.00" })]),
+      "Invoices 2026_3"
+    );
+
+    expect(written).toBe(3);
+
+    const workbook = new ExcelJS.Workbook();
+    await workbook.xlsx.load(Buffer.concat(buffers) as any);
+    const sheet = workbook.getWorksheet("Invoices 2026_3")!;
+
+    expect(sheet.rowCount).toBe(4);
+    expect(sheet.getRow(1).getCell(1).value).toBe("Mã hóa đơn");
+    expect(sheet.getRow(2).getCell(1).value).toBe("HD1");
+    expect(sheet.getRow(2).getCell(9).value).toBe(200000);
+    expect(sheet.getRow(4).getCell(10).value).toBe(0);
+    expect(sheet.getRow(4).getCell(11).value).toBe("UNPAID");
+  });
+
+  it("should produce a header-only sheet when the period has no invoices", async () => {
+    const stream = new PassThrough();
+    const buffers: Buffer[] = [];
+    stream.on("data", (chunk) => buffers.push(chunk));
+
+    await expect(writeInvoiceDetailWorkbook(stream, chunksOf(), "Invoices 2026")).resolves.toBe(0);
+
+    const workbook = new ExcelJS.Workbook();
+    await workbook.xlsx.load(Buffer.concat(buffers) as any);
+    expect(workbook.getWorksheet("Invoices 2026")!.rowCount).toBe(1);
+  });
+});
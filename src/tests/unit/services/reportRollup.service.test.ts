@@ -0,0 +1,133 @@
+import {
+  ReportRollupService,
+  dbDayStart,
+  toDayKey,
+  toDbDayKey,
+} from "../../../services/reportRollup.service";
+import sequelize from "../../../config/database";
+import Invoice from "../../../models/Invoice";
+import InvoiceItem from "../../../models/InvoiceItem";
+import { Op } from "sequelize";
+
+
+jest.mock("../../../models/Invoice");
+jest.mock("../../../models/InvoiceItem");
+jest.mock("../../../models/Appointment");
+jest.mock("../../../models/Patient");
+jest.mock("../../../models/User");
+jest.mock("../../../models/ReportDailyInvoice");
+jest.mock("../../../models/ReportDailyInvoiceItem");
+jest.mock("../../../models/ReportDailyAppointment");
+jest.mock("../../../models/ReportDailyPatient");
+jest.mock("../../../utils/logger");
+
+describe("ReportRollupService", () => {
+  let refreshChunk: jest.SpyInstance;
+
+  beforeEach(() => {
+    jest.clearAllMocks();
+    ReportRollupService.reset();
+    refreshChunk = jest
+      .spyOn(ReportRollupService as any, "refreshChunk")
+      .mockResolvedValue(undefined);
+  });
+
+  afterEach(() => {
+    refreshChunk.mockRestore();
+  });
+
+  it("should format dates and keep DATEONLY strings as day keys", () => {
+    expect(toDayKey(new Date(2026, 0, 5, 23, 59))).toBe("2026-01-05");
+    expect(toDayKey("2026-02-28")).toBe("2026-02-28");
+  });
+
+  it("should start database days at midnight in the database timezone", () => {
+    expect(dbDayStart("2026-01-05").toISOString()).toBe("2026-01-04T17:00:00.000Z");
+    expect(dbDayStart("2026-03-01").getTime() - dbDayStart("2026-02-28").getTime()).toBe(24 * 60 * 60 * 1000);
+  });
+
+  it("should refresh contiguous dirty days as one range", async () => {
+    ReportRollupService.markDirty(["2026-01-02", "2026-01-05", "2026-01-01"]);
+    ReportRollupService.markDirty(["2026-01-02"]);
+    await ReportRollupService.flush();
+
+    expect(refreshChunk).toHaveBeenCalledTimes(2);
+    expect(refreshChunk).toHaveBeenNthCalledWith(1, "2026-01-01", "2026-01-02");
+    expect(refreshChunk).toHaveBeenNthCalledWith(2, "2026-01-05", "2026-01-05");
+  });
+
+  it("should split long ranges into bounded chunks", async () => {
+    await ReportRollupService.refreshRange("2026-01-01", "2026-03-15");
+
+    expect(refreshChunk.mock.calls).toEqual([
+      ["2026-01-01", "2026-01-31"],
+      ["2026-02-01", "2026-03-03"],
+      ["2026-03-04", "2026-03-15"],
+    ]);
+  });
+
+  it("should keep days dirty when a refresh fails", async () => {
+    refreshChunk.mockRejectedValueOnce(new Error("Deadlock"));
+
+    ReportRollupService.markDirty(["2026-01-10"]);
+    await expect(ReportRollupService.flush()).rejects.toThrow("Deadlock");
+
+    await ReportRollupService.flush();
+    expect(refreshChunk).toHaveBeenLastCalledWith("2026-01-10", "2026-01-10");
+  });
+
+  describe("outside the database timezone", () => {
+    const originalTz = process.env.TZ;
+
+    beforeAll(() => {
+      process.env.TZ = "America/New_York";
+    });
+
+    afterAll(() => {
+      process.env.TZ = originalTz;
+    });
+
+    it("should key days by the database timezone", () => {
+      expect(toDbDayKey(new Date("2026-01-04T18:30:00Z"))).toBe("2026-01-05");
+      expect(toDbDayKey(new Date("2026-01-04T16:59:59Z"))).toBe("2026-01-04");
+      expect(toDbDayKey("2026-01-04")).toBe("2026-01-04");
+    });
+
+    it("should mark the database day of a late-evening invoice dirty", () => {
+      const markDirty = jest.spyOn(ReportRollupService, "markDirty").mockImplementation(() => undefined);
+
+      (ReportRollupService as any).track(undefined, [new Date("2026-01-04T18:30:00Z")]);
+
+      expect(markDirty).toHaveBeenCalledWith(["2026-01-05"]);
+    });
+
+    it("should split ranges on database days", async () => {
+      await ReportRollupService.refreshRange("2026-01-01", "2026-02-01");
+
+      expect(refreshChunk.mock.calls).toEqual([
+        ["2026-01-01", "2026-01-31"],
+        ["2026-02-01", "2026-02-01"],
+      ]);
+    });
+
+    it("should window createdAt on database midnights", async () => {
+      refreshChunk.mockRestore();
+      jest
+        .spyOn(sequelize, "transaction")
+        .mockImplementation((async (callback: any) => callback({})) as any);
+      for (const model of [Invoice, InvoiceItem]) {
+        (model.findAll as jest.Mock).mockResolvedValue([]);
+      }
+
+      await (ReportRollupService as any).refreshChunk("2026-01-05", "2026-01-06");
+
+      for (const model of [Invoice, InvoiceItem]) {
+        const [options] = (model.findAll as jest.Mock).mock.calls[0];
+        expect(options.where.createdAt).toEqual({
+          [Op.gte]: new Date("2026-01-04T17:00:00.000Z"),
+          [Op.lt]: new Date("2026-01-06T17:00:00.000Z"),
+        });
+      }
+    });
+  });
+});
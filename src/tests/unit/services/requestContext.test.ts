@@ -0,0 +1,134 @@
+import { PassThrough } from "stream";
+import jwt from "jsonwebtoken";
+import { getTokenClaims, requestContext } from "../../../middlewares/requestContext.middlewares";
+import { checkMaintenance, clearMaintenanceCache } from "../../../middlewares/maintenance.middlewares";
+import { verifyToken } from "../../../middlewares/auth.middlewares";
+import { resolveAccessLogFormat, shouldLogRequest } from "../../../middlewares/accessLog.middlewares";
+import { AccessLogWriter } from "../../../services/accessLogWriter.service";
+import SystemSettings from "../../../models/SystemSettings";
+import { TokenBlacklistService } from "../../../config/redis.config";
+import { RoleCode } from "../../../constant/role";
+
+
+jest.mock("../../../models/SystemSettings");
+jest.mock("../../../utils/logger");
+jest.mock("../../../config/redis.config", () => ({
+  TokenBlacklistService: { isBlacklisted: jest.fn() },
+}));
+
+const request = (headers: Record<string, string> = {}): any => ({ headers, method: "GET", path: "/api/x" });
+
+const response = (): any => {
+  const res: any = { setHeader: jest.fn() };
+  res.status = jest.fn(() => res);
+  res.json = jest.fn(() => res);
+  return res;
+};
+
+describe("request context", () => {
+  let verify: jest.SpyInstance;
+
+  beforeEach(() => {
+    clearMaintenanceCache();
+    verify = jest.spyOn(jwt, "verify").mockImplementation((() => ({
+      userId: 1,
+      roleId: RoleCode.ADMIN,
+    })) as any);
+    (TokenBlacklistService.isBlacklisted as jest.Mock).mockResolvedValue(false);
+    (SystemSettings.findOne as jest.Mock).mockResolvedValue({
+      systemSettings: { maintenanceMode: true },
+    });
+  });
+
+  it("verifies the token once across maintenance and auth checks", async () => {
+    const req = request({ authorization: "Bearer abc" });
+    const res = response();
+    const next = jest.fn();
+
+    requestContext(req, res, next);
+    await checkMaintenance(req, res, next);
+    await verifyToken(req, res, next);
+
+    expect(next).toHaveBeenCalledTimes(3);
+    expect(verify).toHaveBeenCalledTimes(1);
+    expect(req.user).toEqual({ userId: 1, roleId: RoleCode.ADMIN });
+    expect(res.setHeader).toHaveBeenCalledWith("X-Request-Id", req.context.requestId);
+  });
+
+  it("keeps a valid incoming request id", () => {
+    const req = request({ "x-request-id": "edge-42" });
+    requestContext(req, response(), jest.fn());
+
+    expect(req.context.requestId).toBe("edge-42");
+  });
+
+  it("caches a failed verification and rejects the request", async () => {
+    verify.mockImplementation(() => {
+      throw new Error("jwt expired");
+    });
+    const req = request({ authorization: "Bearer expired" });
+    const res = response();
+
+    expect(getTokenClaims(req)).toBeNull();
+    await verifyToken(req, res, jest.fn());
+
+    expect(verify).toHaveBeenCalledTimes(1);
+    expect(res.status).toHaveBeenCalledWith(401);
+    expect(res.json).toHaveBeenCalledWith({ success: false, message: "INVALID_TOKEN" });
+  });
+
+  it("rejects requests without a bearer token", async () => {
+    const res = response();
+    await verifyToken(request(), res, jest.fn());
+
+    expect(verify).not.toHaveBeenCalled();
+    expect(res.json).toHaveBeenCalledWith({ success: false, message: "NO_TOKEN" });
+  });
+});
+
+describe("access logging", () => {
+  afterEach(async () => {
+    await AccessLogWriter.drain();
+    AccessLogWriter.setDestination(null);
+  });
+
+  it("picks the log format from the environment", () => {
+    expect(resolveAccessLogFormat({ NODE_ENV: "production" })).toBe("json");
+    expect(resolveAccessLogFormat({ NODE_ENV: "development" })).toBe("dev");
+    expect(resolveAccessLogFormat({ NODE_ENV: "production", ACCESS_LOG_FORMAT: "off" })).toBe("off");
+  });
+
+  it("samples successful requests but always keeps errors and slow requests", () => {
+    expect(shouldLogRequest(200, 5, 0.1, () => 0.5)).toBe(false);
+    expect(shouldLogRequest(200, 5, 0.1, () => 0.05)).toBe(true);
+    expect(shouldLogRequest(500, 5, 0, () => 0.99)).toBe(true);
+    expect(shouldLogRequest(200, 5000, 0, () => 0.99)).toBe(true);
+  });
+
+  it("writes buffered entries as one NDJSON chunk", async () => {
+    const destination = new PassThrough();
+    const chunks: string[] = [];
+    destination.on("data", (chunk) => chunks.push(chunk.toString()));
+    AccessLogWriter.setDestination(destination);
+
+    [200, 404].forEach((status, index) =>
+      AccessLogWriter.write({
+        time: "2026-10-18T08:00:00.000Z",
+        requestId: `r${index}`,
+        method: "GET",
+        url: "/api/patients",
+        status,
+        durationMs: 3,
+        sampleRate: 1,
+      })
+    );
+    expect(chunks).toHaveLength(0);
+
+    AccessLogWriter.flush();
+    await new Promise((resolve) => setImmediate(resolve));
+
+    expect(chunks).toHaveLength(1);
+    const lines = chunks[0].trim().split("\n").map((line) => JSON.parse(line));
+    expect(lines.map((line) => line.status)).toEqual([200, 404]);
+  });
+});
@@ -0,0 +1,59 @@
+import { stripHtml } from "../../../utils/stripHtml";
+import { sanitizeFields, sanitizeObject } from "../../../middlewares/sanitize.middlewares";
+
+
+describe("stripHtml", () => {
+  it.each([
+    ["Tom & Jerry", "Tom & Jerry"],
+    ["<p>Viêm <b>họng</b> cấp</p>", "Viêm họng cấp"],
+    ["huyết áp < 90 & mạch > 100 <br>", "huyết áp &lt; 90 &amp; mạch &gt; 100 "],
+    ["<img src=x onerror=alert(1)>Sốt", "Sốt"],
+    ['<a title="1 > 0">liên kết</a>', "liên kết"],
+    ["<script>alert(1)</script>ok", "ok"],
+    ["<STYLE>p{}</style >Ho", "Ho"],
+    ["<svg><g>ẩn</g></svg>hiện", "hiện"],
+    ["<!-- note -->Đau đầu", "Đau đầu"],
+    ["<i>a</i>&lt;b&gt;&#38;&bogus;&nbsp;", "a&lt;b&gt;&amp;&amp;bogus;&nbsp;"],
+    ["<textarea><b>t</b></textarea>", "&lt;b&gt;t&lt;/b&gt;"],
+    ["dừng <b", "dừng "],
+    ["<p>a\r\nb</p>", "a\nb"],
+  ])("strips %j", (input, expected) => {
+    expect(stripHtml(input)).toBe(expected);
+  });
+});
+
+describe("sanitizeFields", () => {
+  it("only sanitizes allowlisted paths", () => {
+    const req: any = {
+      body: {
+        visitId: 12,
+        unit: "<b>VIEN</b>",
+        note: "<b>Tái khám</b>",
+        medicines: [
+          { medicineId: 1, quantity: 2, instruction: "<i>Sau ăn</i>" },
+          { medicineId: 2, quantity: 1 },
+        ],
+      },
+    };
+    const next = jest.fn();
+
+    sanitizeFields("note", "medicines.*.instruction")(req, {} as any, next);
+
+    expect(next).toHaveBeenCalled();
+    expect(req.body).toEqual({
+      visitId: 12,
+      unit: "<b>VIEN</b>",
+      note: "Tái khám",
+      medicines: [
+        { medicineId: 1, quantity: 2, instruction: "Sau ăn" },
+        { medicineId: 2, quantity: 1 },
+      ],
+    });
+  });
+
+  it("walks nested values of an allowlisted field", () => {
+    expect(sanitizeObject({ vitals: ["<b>120/80</b>", 37.5] }, "fast")).toEqual({
+      vitals: ["120/80", 37.5],
+    });
+  });
+});
@@ -0,0 +1,75 @@
+import { ScheduleGenerationService } from "../../../modules/shift/scheduleGeneration.service";
+import { ShiftTemplate, DoctorShift, Shift, sequelize } from "../../../models/index";
+
+
+jest.mock("../../../models/index", () => ({
+  ShiftTemplate: { findAll: jest.fn() },
+  DoctorShift: { findAll: jest.fn(), findOne: jest.fn(), bulkCreate: jest.fn() },
+  Shift: { findAll: jest.fn() },
+  sequelize: { transaction: jest.fn() },
+}));
+jest.mock("../../../services/reportRollup.service", () => ({
+  toDayKey: (date: Date) =>
+    `${date.getFullYear()}-${String(date.getMonth() + 1).padStart(2, "0")}-${String(date.getDate()).padStart(2, "0")}`,
+}));
+
+describe("ScheduleGenerationService", () => {
+  const transaction = { commit: jest.fn(), rollback: jest.fn() };
+
+  beforeEach(() => {
+    jest.spyOn(console, "log").mockImplementation(() => undefined);
+    jest.spyOn(console, "warn").mockImplementation(() => undefined);
+
+    (sequelize.transaction as jest.Mock).mockResolvedValue(transaction);
+    (ShiftTemplate.findAll as jest.Mock).mockResolvedValue([
+      { doctorId: 1, shiftId: 1, dayOfWeek: 1 },
+      { doctorId: 1, shiftId: 2, dayOfWeek: 1 },
+      { doctorId: 2, shiftId: 1, dayOfWeek: 1 },
+    ]);
+    (Shift.findAll as jest.Mock).mockResolvedValue([
+      { id: 1, name: "Sáng", startTime: "07:00", endTime: "11:30" },
+      { id: 2, name: "Trưa", startTime: "11:00", endTime: "13:00" },
+    ]);
+    (DoctorShift.findAll as jest.Mock).mockResolvedValue([
+      { doctorId: 2, shiftId: 1, workDate: "2026-11-09", status: "CANCELLED" },
+    ]);
+    (DoctorShift.bulkCreate as jest.Mock).mockResolvedValue([]);
+  });
+
+  it("should plan the whole month in memory and insert it in bulk", async () => {
+    const result = await ScheduleGenerationService.generateScheduleForMonth(2026, 11);
+
+    expect(DoctorShift.findAll).toHaveBeenCalledTimes(1);
+    expect(DoctorShift.findOne).not.toHaveBeenCalled();
+    expect(DoctorShift.bulkCreate).toHaveBeenCalledTimes(1);
+
+    const [rows, options] = (DoctorShift.bulkCreate as jest.Mock).mock.calls[0];
+    expect(options).toEqual({ ignoreDuplicates: true, transaction });
+    expect(rows.filter((row: any) => row.doctorId === 1).map((row: any) => row.workDate)).toEqual([
+      "2026-11-02",
+      "2026-11-09",
+      "2026-11-16",
+      "2026-11-23",
+      "2026-11-30",
+    ]);
+    expect(rows.some((row: any) => row.shiftId === 2)).toBe(false);
+    expect(rows.filter((row: any) => row.doctorId === 2)).toHaveLength(4);
+
+    expect(result).toEqual(
+      expect.objectContaining({
+        generated: 9,
+        skipped: 6,
+        period: { year: 2026, month: 11, startDate: "2026-11-01", endDate: "2026-11-30" },
+      })
+    );
+    expect(transaction.commit).toHaveBeenCalled();
+  });
+
+  it("should roll back when there are no active templates", async () => {
+    (ShiftTemplate.findAll as jest.Mock).mockResolvedValue([]);
+
+    await expect(ScheduleGenerationService.generateScheduleForMonth(2026, 11)).rejects.toThrow();
+    expect(DoctorShift.bulkCreate).not.toHaveBeenCalled();
+    expect(transaction.rollback).toHaveBeenCalled();
+  });
+});
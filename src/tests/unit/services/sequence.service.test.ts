@@ -0,0 +1,96 @@
+import { SequenceService } from "../../../services/sequence.service";
+import CodeSequence from "../../../models/CodeSequence";
+import sequelize from "../../../config/database";
+
+
+jest.mock("../../../models/CodeSequence");
+
+describe("SequenceService", () => {
+  let row: { lastValue: number };
+
+  beforeEach(() => {
+    jest.clearAllMocks();
+    SequenceService.reset();
+
+    row = { lastValue: 0 };
+
+    jest.spyOn(sequelize, "query").mockImplementation((async (_sql: string, options: any) => {
+      row.lastValue += options.replacements.size;
+      return [{ affectedRows: 1, insertId: row.lastValue }, undefined];
+    }) as any);
+    (CodeSequence.findByPk as jest.Mock).mockImplementation(async () => row);
+    (CodeSequence.bulkCreate as jest.Mock).mockResolvedValue([]);
+  });
+
+  it("should serve a whole block from memory after one reservation", async () => {
+    const values = [];
+    for (let i = 0; i < 5; i++) {
+      values.push(await SequenceService.next("INV-20261018-", async () => 0, 5));
+    }
+
+    expect(values).toEqual([1, 2, 3, 4, 5]);
+    expect(sequelize.query).toHaveBeenCalledTimes(1);
+    expect(row.lastValue).toBe(5);
+  });
+
+  it("should share one reservation between concurrent callers", async () => {
+    const values = await Promise.all(
+      Array.from({ length: 8 }, () => SequenceService.next("APT-20261018-", async () => 0, 4))
+    );
+
+    expect([...values].sort((a, b) => a - b)).toEqual([1, 2, 3, 4, 5, 6, 7, 8]);
+    expect(sequelize.query).toHaveBeenCalledTimes(2);
+  });
+
+  it("should seed a new counter from existing codes", async () => {
+    (CodeSequence.findByPk as jest.Mock)
+      .mockResolvedValueOnce(null)
+      .mockImplementation(async () => row);
+    (CodeSequence.bulkCreate as jest.Mock).mockImplementation(async ([created]: any[]) => {
+      row.lastValue = created.lastValue;
+      return [];
+    });
+
+    const seed = jest.fn().mockResolvedValue(41);
+    const value = await SequenceService.next("MED-", seed, 1);
+
+    expect(seed).toHaveBeenCalledTimes(1);
+    expect(CodeSequence.bulkCreate).toHaveBeenCalledWith(
+      [{ scope: "MED-", lastValue: 41 }],
+      { ignoreDuplicates: true }
+    );
+    expect(value).toBe(42);
+  });
+
+  it("should reserve with a single autocommit update outside the caller's transaction", async () => {
+    const transaction = jest.spyOn(sequelize, "transaction");
+
+    await SequenceService.next("VIS-20261018-", async () => 0, 10);
+
+    expect(transaction).not.toHaveBeenCalled();
+
+    const [sql, options] = (sequelize.query as unknown as jest.Mock).mock.calls[0];
+    expect(sql).toContain("LAST_INSERT_ID(lastValue + :size)");
+    expect(options).toEqual({ replacements: { scope: "VIS-20261018-", size: 10 } });
+  });
+
+  it("should fail when the counter row is missing", async () => {
+    (sequelize.query as unknown as jest.Mock).mockResolvedValueOnce([{ affectedRows: 0, insertId: 0 }, undefined]);
+
+    await expect(SequenceService.next("PAY-202610-", async () => 0, 1)).rejects.toThrow(
+      "SEQUENCE_NOT_FOUND: PAY-202610-"
+    );
+  });
+
+  it("should reserve a contiguous range for a batch in one statement", async () => {
+    await SequenceService.next("EXP-20261018-", async () => 0, 3);
+
+    const fromBlock = await SequenceService.nextMany("EXP-20261018-", 2, async () => 0);
+    const reserved = await SequenceService.nextMany("EXP-20261018-", 20, async () => 0);
+
+    expect(fromBlock).toEqual([2, 3]);
+    expect(reserved).toEqual(Array.from({ length: 20 }, (_, index) => index + 4));
+    expect(sequelize.query).toHaveBeenCalledTimes(2);
+    expect(row.lastValue).toBe(23);
+  });
+});
@@ -0,0 +1,271 @@
+import { SlotAvailabilityService } from "../../../services/slotAvailability.service";
+import { CacheService } from "../../../services/cache.service";
+import Appointment from "../../../models/Appointment";
+import DoctorShift from "../../../models/DoctorShift";
+import ShiftAvailability from "../../../models/ShiftAvailability";
+import sequelize from "../../../config/database";
+
+
+jest.mock("../../../models/Appointment");
+jest.mock("../../../models/DoctorShift");
+jest.mock("../../../models/ShiftAvailability");
+jest.mock("../../../utils/logger");
+jest.mock("../../../services/cache.service", () => ({
+  CacheService: {
+    get: jest.fn(),
+    setTagged: jest.fn(),
+    invalidateTags: jest.fn(),
+  },
+  CacheKeys: {
+    SLOT_AVAILABILITY: (date: string) => `slots:availability:${date}`,
+    SHIFT_ROSTER: (date: string) => `slots:roster:${date}`,
+  },
+  CacheTags: {
+    DOCTORS: "doctors",
+    SLOTS: (date: string) => `slots:${date}`,
+    SCHEDULE: (date: string) => `schedule:${date}`,
+  },
+}));
+
+const createTransaction = () => {
+  const callbacks: Array<() => void> = [];
+  return {
+    LOCK: { UPDATE: "UPDATE" },
+    afterCommit: jest.fn((callback: () => void) => callbacks.push(callback)),
+    commit: () => callbacks.forEach((callback) => callback()),
+  };
+};
+
+const createRow = (values: Record<string, any>) => ({
+  doctorShiftId: 11,
+  capacity: 10,
+  bookedCount: 0,
+  lastSlotNumber: 0,
+  lastQueueNumber: 0,
+  freeSlots: null,
+  version: 7,
+  ...values,
+});
+
+const createAppointment = (current: Record<string, any>, previous: Record<string, any> = {}) => ({
+  ...current,
+  previous: (key: string) => (key in previous ? previous[key] : current[key]),
+});
+
+describe("SlotAvailabilityService", () => {
+  const hooks = new Map<any, Record<string, any>>();
+  const hook = (model: any, name: string) => hooks.get(model)![name];
+
+  beforeAll(() => {
+    SlotAvailabilityService.registerHooks();
+    for (const model of [Appointment, DoctorShift]) {
+      hooks.set(
+        model,
+        Object.fromEntries(
+          (model.addHook as jest.Mock).mock.calls.map(([name, , fn]) => [name, fn])
+        )
+      );
+    }
+  });
+
+  beforeEach(() => {
+    (CacheService.invalidateTags as jest.Mock).mockResolvedValue(undefined);
+    (CacheService.setTagged as jest.Mock).mockResolvedValue(undefined);
+    (ShiftAvailability.update as jest.Mock).mockResolvedValue([1]);
+  });
+
+  it("should serve remaining capacity for a day from the index and cache it", async () => {
+    (CacheService.get as jest.Mock).mockResolvedValue(null);
+    (ShiftAvailability.findAll as jest.Mock).mockResolvedValue([
+      { doctorShiftId: 1, doctorId: 3, shiftId: 1, workDate: "2026-10-20", specialtyId: 2, capacity: 10, bookedCount: 4 },
+      { doctorShiftId: 2, doctorId: 5, shiftId: 2, workDate: "2026-10-20", specialtyId: 2, capacity: 10, bookedCount: 12 },
+    ]);
+
+    const day = await SlotAvailabilityService.getDay("2026-10-20");
+
+    expect(day.map((slot) => slot.remaining)).toEqual([6, 0]);
+    expect(CacheService.setTagged).toHaveBeenCalledWith(
+      "slots:availability:2026-10-20",
+      day,
+      30,
+      ["slots:2026-10-20"]
+    );
+  });
+
+  it("should release a slot inside the cancelling transaction", async () => {
+    const transaction = createTransaction();
+    (ShiftAvailability.findOne as jest.Mock).mockResolvedValue(
+      createRow({ bookedCount: 4, lastSlotNumber: 4 })
+    );
+    const appointment = createAppointment(
+      { doctorId: 3, shiftId: 1, date: "2026-10-20", slotNumber: 2, status: "CANCELLED" },
+      { status: "WAITING" }
+    );
+
+    await hook(Appointment, "afterUpdate")(appointment, { transaction });
+
+    expect(ShiftAvailability.findOne).toHaveBeenCalledWith(
+      expect.objectContaining({ transaction, lock: "UPDATE" })
+    );
+    expect(ShiftAvailability.update).toHaveBeenCalledWith(
+      { bookedCount: 3, lastSlotNumber: 4, freeSlots: [2], version: 8 },
+      { where: { doctorShiftId: 11, version: 7 }, transaction }
+    );
+    expect(CacheService.invalidateTags).not.toHaveBeenCalled();
+
+    transaction.commit();
+    expect(CacheService.invalidateTags).toHaveBeenCalledWith(["slots:2026-10-20"]);
+  });
+
+  it("should keep the slot number held by a no-show", async () => {
+    (ShiftAvailability.findOne as jest.Mock).mockResolvedValue(
+      createRow({ bookedCount: 4, lastSlotNumber: 4 })
+    );
+    const appointment = createAppointment(
+      { doctorId: 3, shiftId: 1, date: "2026-10-20", slotNumber: 4, status: "NO_SHOW" },
+      { status: "WAITING" }
+    );
+
+    await hook(Appointment, "afterUpdate")(appointment, {});
+
+    expect(ShiftAvailability.update).toHaveBeenCalledWith(
+      expect.objectContaining({ bookedCount: 3, lastSlotNumber: 4, freeSlots: [] }),
+      expect.anything()
+    );
+  });
+
+  it("should not touch the index for updates that keep the slot", async () => {
+    const appointment = createAppointment(
+      { doctorId: 3, shiftId: 1, date: "2026-10-20", slotNumber: 2, status: "CHECKED_IN" },
+      { status: "WAITING" }
+    );
+
+    await hook(Appointment, "afterUpdate")(appointment, {});
+
+    expect(ShiftAvailability.findOne).not.toHaveBeenCalled();
+    expect(ShiftAvailability.update).not.toHaveBeenCalled();
+  });
+
+  it("should skip bookings whose slot was already reserved", async () => {
+    const appointment = createAppointment({
+      doctorId: 3, shiftId: 1, date: "2026-10-20", slotNumber: 5, status: "WAITING",
+    });
+
+    await hook(Appointment, "afterCreate")(appointment, { slotReserved: true });
+
+    expect(ShiftAvailability.update).not.toHaveBeenCalled();
+  });
+
+  it("should reuse the lowest released slot and keep queue numbers increasing", async () => {
+    (ShiftAvailability.findOne as jest.Mock).mockResolvedValue(
+      createRow({ bookedCount: 5, lastSlotNumber: 7, lastQueueNumber: 9, freeSlots: [6, 3] })
+    );
+
+    const reservation = await SlotAvailabilityService.reserve(3, 1, "2026-10-20");
+
+    expect(reservation).toEqual({
+      doctorShiftId: 11,
+      doctorId: 3,
+      shiftId: 1,
+      workDate: "2026-10-20",
+      slotNumber: 3,
+      queueNumber: 10,
+    });
+    expect(ShiftAvailability.update).toHaveBeenCalledWith(
+      { bookedCount: 6, lastSlotNumber: 7, lastQueueNumber: 10, freeSlots: [6], version: 8 },
+      { where: { doctorShiftId: 11, version: 7 }, transaction: undefined }
+    );
+  });
+
+  it("should retry when another booking bumped the version first", async () => {
+    (ShiftAvailability.findOne as jest.Mock)
+      .mockResolvedValueOnce(createRow({ bookedCount: 2, lastSlotNumber: 2, lastQueueNumber: 2 }))
+      .mockResolvedValueOnce(
+        createRow({ bookedCount: 3, lastSlotNumber: 3, lastQueueNumber: 3, version: 8 })
+      );
+    (ShiftAvailability.update as jest.Mock)
+      .mockResolvedValueOnce([0])
+      .mockResolvedValueOnce([1]);
+
+    const reservation = await SlotAvailabilityService.reserve(3, 1, "2026-10-20");
+
+    expect(reservation.slotNumber).toBe(4);
+    expect(ShiftAvailability.update).toHaveBeenCalledTimes(2);
+  });
+
+  it("should batch reservations that queue up behind an in-flight update", async () => {
+    (ShiftAvailability.findOne as jest.Mock)
+      .mockResolvedValueOnce(createRow({ capacity: 3, bookedCount: 1, lastSlotNumber: 1, lastQueueNumber: 1 }))
+      .mockResolvedValueOnce(
+        createRow({ capacity: 3, bookedCount: 2, lastSlotNumber: 2, lastQueueNumber: 2, version: 8 })
+      );
+
+    const results = await Promise.allSettled([
+      SlotAvailabilityService.reserve(3, 1, "2026-10-20"),
+      SlotAvailabilityService.reserve(3, 1, "2026-10-20"),
+      SlotAvailabilityService.reserve(3, 1, "2026-10-20"),
+      SlotAvailabilityService.reserve(3, 1, "2026-10-20"),
+    ]);
+
+    const slots = results
+      .filter((result): result is PromiseFulfilledResult<any> => result.status === "fulfilled")
+      .map((result) => result.value.slotNumber);
+    expect(slots.sort()).toEqual([2, 3]);
+    expect(results.filter((result) => result.status === "rejected")).toHaveLength(2);
+    expect(ShiftAvailability.update).toHaveBeenCalledTimes(2);
+    expect(ShiftAvailability.update).toHaveBeenNthCalledWith(
+      2,
+      { bookedCount: 3, lastSlotNumber: 3, lastQueueNumber: 3, freeSlots: [], version: 9 },
+      expect.anything()
+    );
+  });
+
+  it("should refuse bookings once the shift is at capacity", async () => {
+    (ShiftAvailability.findOne as jest.Mock).mockResolvedValue(
+      createRow({ bookedCount: 10, lastSlotNumber: 10 })
+    );
+
+    await expect(SlotAvailabilityService.reserve(3, 1, "2026-10-20")).rejects.toThrow("SHIFT_FULL");
+    expect(ShiftAvailability.update).not.toHaveBeenCalled();
+  });
+
+  it("should rebuild a day from active doctor shifts and live bookings", async () => {
+    const transaction = createTransaction();
+    jest
+      .spyOn(sequelize, "transaction")
+      .mockImplementation((async (callback: any) => callback(transaction)) as any);
+    (ShiftAvailability.findAll as jest.Mock).mockResolvedValue([{ doctorShiftId: 11, version: 4 }]);
+    (ShiftAvailability.destroy as jest.Mock).mockResolvedValue(0);
+    (ShiftAvailability.bulkCreate as jest.Mock).mockResolvedValue([]);
+    (DoctorShift.findAll as jest.Mock).mockResolvedValue([
+      { id: 11, doctorId: 3, shiftId: 1, maxSlots: null, doctor: { specialtyId: 2 } },
+      { id: 12, doctorId: 4, shiftId: 1, maxSlots: 6, doctor: { specialtyId: 5 } },
+    ]);
+    (Appointment.findAll as jest.Mock).mockResolvedValue([
+      { doctorId: 3, shiftId: 1, slotNumber: 1, queueNumber: 1, status: "COMPLETED" },
+      { doctorId: 3, shiftId: 1, slotNumber: 2, queueNumber: null, status: "CANCELLED" },
+      { doctorId: 3, shiftId: 1, slotNumber: 3, queueNumber: 3, status: "NO_SHOW" },
+      { doctorId: 3, shiftId: 1, slotNumber: 5, queueNumber: 4, status: "WAITING" },
+    ]);
+
+    await SlotAvailabilityService.rebuildDay("2026-10-20");
+
+    expect(ShiftAvailability.bulkCreate).toHaveBeenCalledWith(
+      [
+        {
+          doctorShiftId: 11, doctorId: 3, shiftId: 1, workDate: "2026-10-20", specialtyId: 2,
+          capacity: 10, bookedCount: 2, lastSlotNumber: 5, lastQueueNumber: 4, freeSlots: [2, 4], version: 5,
+        },
+        {
+          doctorShiftId: 12, doctorId: 4, shiftId: 1, workDate: "2026-10-20", specialtyId: 5,
+          capacity: 6, bookedCount: 0, lastSlotNumber: 0, lastQueueNumber: 0, freeSlots: [], version: 1,
+        },
+      ],
+      expect.objectContaining({ transaction })
+    );
+    expect(CacheService.invalidateTags).toHaveBeenCalledWith([
+      "slots:2026-10-20",
+      "schedule:2026-10-20",
+    ]);
+  });
+});
@@ -0,0 +1,113 @@
+import { redisClient, TokenBlacklistService } from "../../../config/redis.config";
+
+
+jest.mock("ioredis", () => {
+  const handlers: Record<string, (...args: any[]) => void> = {};
+  const subscriber = {
+    handlers,
+    on: (event: string, handler: (...args: any[]) => void) => {
+      handlers[event] = handler;
+      return subscriber;
+    },
+    subscribe: () => Promise.resolve(),
+    quit: () => Promise.resolve(),
+  };
+  const client = {
+    on: () => client,
+    get: jest.fn(),
+    pipeline: jest.fn(),
+    duplicate: () => subscriber,
+    subscriber,
+  };
+  return { __esModule: true, default: function Redis() { return client; } };
+});
+
+const subscriber = (redisClient as any).subscriber;
+
+const createPipeline = () => {
+  const pipeline: any = { exec: jest.fn().mockResolvedValue([]) };
+  for (const command of ["setex", "zadd", "zremrangebyscore", "publish", "del", "zrem"]) {
+    pipeline[command] = jest.fn(() => pipeline);
+  }
+  return pipeline;
+};
+
+describe("TokenBlacklistService", () => {
+  let now: number;
+
+  beforeEach(() => {
+    now = 1_000_000;
+    jest.spyOn(Date, "now").mockImplementation(() => now);
+    (redisClient.get as jest.Mock).mockResolvedValue(null);
+    (redisClient.pipeline as jest.Mock).mockImplementation(createPipeline);
+  });
+
+  afterEach(() => {
+    jest.restoreAllMocks();
+  });
+
+  it("should answer revoked tokens from memory after revoking them", async () => {
+    await TokenBlacklistService.addToBlacklist("token-revoked", 3600);
+
+    expect(await TokenBlacklistService.isBlacklisted("token-revoked")).toBe(true);
+    expect(redisClient.get).not.toHaveBeenCalled();
+  });
+
+  it("should cache a revoked lookup from Redis", async () => {
+    (redisClient.get as jest.Mock).mockResolvedValue("revoked");
+
+    expect(await TokenBlacklistService.isBlacklisted("token-remote")).toBe(true);
+    expect(await TokenBlacklistService.isBlacklisted("token-remote")).toBe(true);
+    expect(redisClient.get).toHaveBeenCalledTimes(1);
+    expect(redisClient.get).toHaveBeenCalledWith("blacklist:token:token-remote");
+  });
+
+  it("should cache misses for the negative ttl", async () => {
+    expect(await TokenBlacklistService.isBlacklisted("token-valid")).toBe(false);
+    now += 29_999;
+    expect(await TokenBlacklistService.isBlacklisted("token-valid")).toBe(false);
+    expect(redisClient.get).toHaveBeenCalledTimes(1);
+
+    now += 1;
+    expect(await TokenBlacklistService.isBlacklisted("token-valid")).toBe(false);
+    expect(redisClient.get).toHaveBeenCalledTimes(2);
+  });
+
+  it("should keep a cached miss for at most 30s when the revocation broadcast is lost", async () => {
+    expect(await TokenBlacklistService.isBlacklisted("token-stale")).toBe(false);
+
+    (redisClient.get as jest.Mock).mockResolvedValue("revoked");
+    now += 10_000;
+    expect(await TokenBlacklistService.isBlacklisted("token-stale")).toBe(false);
+
+    now += 20_000;
+    expect(await TokenBlacklistService.isBlacklisted("token-stale")).toBe(true);
+  });
+
+  it("should override a cached miss as soon as the revocation is broadcast", async () => {
+    expect(await TokenBlacklistService.isBlacklisted("token-broadcast")).toBe(false);
+
+    subscriber.handlers.message("blacklist:revoked", "token-broadcast");
+
+    expect(await TokenBlacklistService.isBlacklisted("token-broadcast")).toBe(true);
+    expect(redisClient.get).toHaveBeenCalledTimes(1);
+  });
+
+  it("should drop cached misses when the subscriber reconnects", async () => {
+    expect(await TokenBlacklistService.isBlacklisted("token-reconnect")).toBe(false);
+
+    subscriber.handlers.ready();
+    (redisClient.get as jest.Mock).mockResolvedValue("revoked");
+
+    expect(await TokenBlacklistService.isBlacklisted("token-reconnect")).toBe(true);
+  });
+
+  it("should not cache a miss when Redis fails", async () => {
+    (redisClient.get as jest.Mock).mockRejectedValueOnce(new Error("down"));
+    jest.spyOn(console, "error").mockImplementation(() => undefined);
+
+    expect(await TokenBlacklistService.isBlacklisted("token-error")).toBe(false);
+    expect(await TokenBlacklistService.isBlacklisted("token-error")).toBe(false);
+    expect(redisClient.get).toHaveBeenCalledTimes(2);
+  });
+});
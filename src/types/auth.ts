@@ -10,11 +10,20 @@ export interface JwtUserPayload {
 }
 
 
+export interface RequestContext {
+  requestId: string;
+  startedAt: number;
+  token: string | null;
+  claims?: JwtUserPayload | null;
+}
+
+
 declare global {
   namespace Express {
     interface Request {
       user?: JwtUserPayload;
       patientData?: Patient;
+      context?: RequestContext;
     }
   }
 }
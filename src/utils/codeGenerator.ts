@@ -1,91 +1,83 @@
-import { Op } from "sequelize";
+import { Op, Model, ModelStatic } from "sequelize";
 import Prescription from "../models/Prescription";
 import Medicine from "../models/Medicine";
+import MedicineImport from "../models/MedicineImport";
 import Invoice from "../models/Invoice";
 import Payroll from "../models/Payroll";
 import Appointment from "../models/Appointment";
 import Visit from "../models/Visit";
 import MedicineExport from "../models/MedicineExport";
+import { SequenceService } from "../services/sequence.service";
 
-export const generatePrescriptionCode = async (transaction?: any): Promise<string> => {
-  const today = new Date();
-  const dateStr = today.toISOString().slice(0, 10).replace(/-/g, ""); 
+const todayStamp = (): string => new Date().toISOString().slice(0, 10).replace(/-/g, "");
 
-  
-  const latestPrescription = await Prescription.findOne({
+
+const findLastSequence = async (
+  model: ModelStatic<Model>,
+  field: string,
+  prefix: string
+): Promise<number> => {
+  const latest = await model.findOne({
+    attributes: [field],
     where: {
-      prescriptionCode: {
-        [Op.like]: `RX-${dateStr}-%`,
+      [field]: {
+        [Op.like]: `${prefix}%`,
       },
     },
-    order: [["prescriptionCode", "DESC"]],
-    transaction,
+    order: [[field, "DESC"]],
   });
 
-  let sequence = 1;
-  if (latestPrescription) {
-    
-    const lastCode = latestPrescription.prescriptionCode;
-    const lastSequence = parseInt(lastCode.split("-")[2], 10);
-    sequence = lastSequence + 1;
+  if (!latest) {
+    return 0;
   }
+  return parseInt(String(latest.get(field)).slice(prefix.length), 10) || 0;
+};
 
-  
-  const sequenceStr = sequence.toString().padStart(5, "0");
-  return `RX-${dateStr}-${sequenceStr}`;
+export const nextCode = async (
+  model: ModelStatic<Model>,
+  field: string,
+  prefix: string,
+  width: number
+): Promise<string> => {
+  const sequence = await SequenceService.next(prefix, () =>
+    findLastSequence(model, field, prefix)
+  );
+  return `${prefix}${sequence.toString().padStart(width, "0")}`;
 };
 
+export const nextCodes = async (
+  model: ModelStatic<Model>,
+  field: string,
+  prefix: string,
+  width: number,
+  count: number
+): Promise<string[]> => {
+  if (count <= 0) {
+    return [];
+  }
+  const sequences = await SequenceService.nextMany(prefix, count, () =>
+    findLastSequence(model, field, prefix)
+  );
+  return sequences.map((sequence) => `${prefix}${sequence.toString().padStart(width, "0")}`);
+};
 
-export const generateMedicineCode = async (): Promise<string> => {
-  
-  const latestMedicine = await Medicine.findOne({
-    where: {
-      medicineCode: {
-        [Op.like]: "MED-%",
-      },
-    },
-    order: [["medicineCode", "DESC"]],
-  });
+export const generatePrescriptionCode = async (): Promise<string> => {
+  return nextCode(Prescription, "prescriptionCode", `RX-${todayStamp()}-`, 5);
+};
 
-  let sequence = 1;
-  if (latestMedicine) {
-    
-    const lastCode = latestMedicine.medicineCode;
-    const lastSequence = parseInt(lastCode.split("-")[1], 10);
-    sequence = lastSequence + 1;
-  }
 
-  
-  const sequenceStr = sequence.toString().padStart(6, "0");
-  return `MED-${sequenceStr}`;
+export const generateMedicineCode = async (): Promise<string> => {
+  return nextCode(Medicine, "medicineCode", "MED-", 6);
 };
 
 
 export const generateInvoiceCode = async (): Promise<string> => {
-  const today = new Date();
-  const dateStr = today.toISOString().slice(0, 10).replace(/-/g, ""); 
-
-  
-  const latestInvoice = await Invoice.findOne({
-    where: {
-      invoiceCode: {
-        [Op.like]: `INV-${dateStr}-%`,
-      },
-    },
-    order: [["invoiceCode", "DESC"]],
-  });
+  return nextCode(Invoice, "invoiceCode", `INV-${todayStamp()}-`, 5);
+};
 
-  let sequence = 1;
-  if (latestInvoice) {
-    
-    const lastCode = latestInvoice.invoiceCode;
-    const lastSequence = parseInt(lastCode.split("-")[2], 10);
-    sequence = lastSequence + 1;
-  }
 
-  
-  const sequenceStr = sequence.toString().padStart(5, "0");
-  return `INV-${dateStr}-${sequenceStr}`;
+export const generateInvoiceCodes = async (count: number): Promise<string[]> => {
+  return nextCodes(Invoice, "invoiceCode", `INV-${todayStamp()}-`, 5, count);
 };
 
 
@@ -93,112 +85,31 @@ export const generatePayrollCode = async (
   year: number,
   month: number
 ): Promise<string> => {
-  const yearMonth = `${year}${month.toString().padStart(2, "0")}`; 
-
-  
-  const latestPayroll = await Payroll.findOne({
-    where: {
-      payrollCode: {
-        [Op.like]: `PAY-${yearMonth}-%`,
-      },
-    },
-    order: [["payrollCode", "DESC"]],
-  });
-
-  let sequence = 1;
-  if (latestPayroll) {
-    
-    const lastCode = latestPayroll.payrollCode;
-    const lastSequence = parseInt(lastCode.split("-")[2], 10);
-    sequence = lastSequence + 1;
-  }
-
-  
-  const sequenceStr = sequence.toString().padStart(5, "0");
-  return `PAY-${yearMonth}-${sequenceStr}`;
+  const yearMonth = `${year}${month.toString().padStart(2, "0")}`;
+  return nextCode(Payroll, "payrollCode", `PAY-${yearMonth}-`, 5);
 };
 
 
 export const generateAppointmentCode = async (): Promise<string> => {
-  const today = new Date();
-  const dateStr = today.toISOString().slice(0, 10).replace(/-/g, ""); 
-
-  
-  const latestAppointment = await Appointment.findOne({
-    where: {
-      appointmentCode: {
-        [Op.like]: `APT-${dateStr}-%`,
-      },
-    },
-    order: [["appointmentCode", "DESC"]],
-  });
-
-  let sequence = 1;
-  if (latestAppointment) {
-    
-    const lastCode = latestAppointment.appointmentCode;
-    const lastSequence = parseInt(lastCode.split("-")[2], 10);
-    sequence = lastSequence + 1;
-  }
-
-  
-  const sequenceStr = sequence.toString().padStart(5, "0");
-  return `APT-${dateStr}-${sequenceStr}`;
+  return nextCode(Appointment, "appointmentCode", `APT-${todayStamp()}-`, 5);
 };
 
 
 export const generateVisitCode = async (): Promise<string> => {
-  const today = new Date();
-  const dateStr = today.toISOString().slice(0, 10).replace(/-/g, ""); 
-
-  
-  const latestVisit = await Visit.findOne({
-    where: {
-      visitCode: {
-        [Op.like]: `VIS-${dateStr}-%`,
-      },
-    },
-    order: [["visitCode", "DESC"]],
-  });
+  return nextCode(Visit, "visitCode", `VIS-${todayStamp()}-`, 5);
+};
 
-  let sequence = 1;
-  if (latestVisit) {
-    
-    const lastCode = (latestVisit as any).visitCode;
-    const lastSequence = parseInt(lastCode.split("-")[2], 10);
-    sequence = lastSequence + 1;
-  }
 
-  
-  const sequenceStr = sequence.toString().padStart(5, "0");
-  return `VIS-${dateStr}-${sequenceStr}`;
+export const generateExportCode = async (): Promise<string> => {
+  return nextCode(MedicineExport, "exportCode", `EXP-${todayStamp()}-`, 5);
 };
 
 
-export const generateExportCode = async (transaction?: any): Promise<string> => {
-  const today = new Date();
-  const dateStr = today.toISOString().slice(0, 10).replace(/-/g, ""); 
-
-  
-  const latestExport = await MedicineExport.findOne({
-    where: {
-      exportCode: {
-        [Op.like]: `EXP-${dateStr}-%`,
-      },
-    },
-    order: [["exportCode", "DESC"]],
-    transaction,
-  });
+export const generateExportCodes = async (count: number): Promise<string[]> => {
+  return nextCodes(MedicineExport, "exportCode", `EXP-${todayStamp()}-`, 5, count);
+};
 
-  let sequence = 1;
-  if (latestExport) {
-    
-    const lastCode = (latestExport as any).exportCode;
-    const lastSequence = parseInt(lastCode.split("-")[2], 10);
-    sequence = lastSequence + 1;
-  }
 
-  
-  const sequenceStr = sequence.toString().padStart(5, "0");
-  return `EXP-${dateStr}-${sequenceStr}`;
+export const generateImportCode = async (): Promise<string> => {
+  return nextCode(MedicineImport, "importCode", `IMP-${todayStamp()}-`, 5);
 };
@@ -1,7 +1,8 @@
 import ExcelJS from 'exceljs';
 import { Response } from 'express';
+import { Writable } from 'stream';
 
-export const setupExcelResponse = (res: Response, filename: string) => {
+export const setExcelHeaders = (res: Response, filename: string) => {
   res.setHeader(
     'Content-Type',
     'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
@@ -10,11 +11,22 @@ export const setupExcelResponse = (res: Response, filename: string) => {
     'Content-Disposition',
     `attachment; filename=${filename}`
   );
+};
+
+export const setupExcelResponse = (res: Response, filename: string) => {
+  setExcelHeaders(res, filename);
 
   const workbook = new ExcelJS.Workbook();
   return workbook;
 };
 
+export const createStreamingWorkbook = (stream: Writable) =>
+  new ExcelJS.stream.xlsx.WorkbookWriter({
+    stream,
+    useStyles: true,
+    useSharedStrings: false,
+  });
+
 export const formatCurrencyExcel = (amount: number) => {
   return amount.toLocaleString('vi-VN');
 };
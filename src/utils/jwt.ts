@@ -1,5 +1,7 @@
 import * as jwt from "jsonwebtoken";
 import { RoleCode } from "../constant/role";
+import Patient from "../models/Patient";
+import Doctor from "../models/Doctor";
 
 export interface JwtPayload {
   userId: number;
@@ -36,3 +38,21 @@ export const verifyAccessToken = (token: string): JwtPayload => {
 
   return jwt.verify(token, process.env.JWT_SECRET) as JwtPayload;
 };
+
+
+export const resolveIdentityClaims = async (
+  userId: number,
+  roleId: RoleCode
+): Promise<{ patientId: number | null; doctorId: number | null }> => {
+  if (roleId === RoleCode.PATIENT) {
+    const patient = await Patient.findOne({ where: { userId }, attributes: ["id"] });
+    return { patientId: patient?.id ?? null, doctorId: null };
+  }
+
+  if (roleId === RoleCode.DOCTOR) {
+    const doctor = await Doctor.findOne({ where: { userId }, attributes: ["id"] });
+    return { patientId: null, doctorId: doctor?.id ?? null };
+  }
+
+  return { patientId: null, doctorId: null };
+};
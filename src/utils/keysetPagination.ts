@@ -0,0 +1,126 @@
+import { createHash } from "crypto";
+import { Op, Order, WhereOptions } from "sequelize";
+import { AppError } from "./AppError";
+import { CacheKeys, CacheService } from "../services/cache.service";
+
+export interface KeysetCursor {
+  sortValue: string;
+  id: number;
+}
+
+export interface KeysetPagination {
+  mode: "cursor";
+  limit: number;
+  nextCursor: string | null;
+  hasMore: boolean;
+  total: number;
+  totalIsApproximate: boolean;
+}
+
+const COUNT_TTL_SECONDS = 60;
+
+export const encodeCursor = (sortValue: Date | string, id: number): string =>
+  Buffer.from(
+    JSON.stringify([sortValue instanceof Date ? sortValue.toISOString() : sortValue, id])
+  ).toString("base64url");
+
+export const decodeCursor = (cursor: string): KeysetCursor | null => {
+  if (!cursor) {
+    return null;
+  }
+
+  try {
+    const [sortValue, id] = JSON.parse(Buffer.from(cursor, "base64url").toString("utf8"));
+    if (typeof sortValue !== "string" || !Number.isInteger(id) || Number.isNaN(Date.parse(sortValue))) {
+      throw new Error();
+    }
+    return { sortValue, id };
+  } catch {
+    throw new AppError("INVALID_CURSOR", "Invalid pagination cursor", 400);
+  }
+};
+
+
+export const applyKeyset = (
+  where: any,
+  cursor: KeysetCursor | null,
+  column: string = "createdAt"
+): WhereOptions => {
+  if (!cursor) {
+    return where;
+  }
+
+  const after = new Date(cursor.sortValue);
+  return {
+    ...where,
+    [Op.and]: [
+      ...(where[Op.and] || []),
+      {
+        [Op.or]: [
+          { [column]: { [Op.lt]: after } },
+          { [column]: after, id: { [Op.lt]: cursor.id } },
+        ],
+      },
+    ],
+  };
+};
+
+export const keysetOrder = (column: string = "createdAt"): Order => [
+  [column, "DESC"],
+  ["id", "DESC"],
+];
+
+
+export const buildKeysetPage = <T extends { id: number }>(
+  rows: T[],
+  limit: number,
+  column: string,
+  total: { value: number; approximate: boolean }
+): { rows: T[]; pagination: KeysetPagination } => {
+  const hasMore = rows.length > limit;
+  const page = hasMore ? rows.slice(0, limit) : rows;
+  const last = page[page.length - 1] as any;
+
+  return {
+    rows: page,
+    pagination: {
+      mode: "cursor",
+      limit,
+      nextCursor: hasMore && last ? encodeCursor(last.get ? last.get(column) : last[column], last.id) : null,
+      hasMore,
+      total: total.value,
+      totalIsApproximate: total.approximate,
+    },
+  };
+};
+
+
+const canonicalize = (value: any): any => {
+  if (value instanceof Date) {
+    return value.toISOString();
+  }
+  if (Array.isArray(value)) {
+    return value.map(canonicalize);
+  }
+  if (value && typeof value === "object") {
+    const entries = [
+      ...Object.keys(value).map((key) => [key, value[key]] as const),
+      ...Object.getOwnPropertySymbols(value).map(
+        (symbol) => [`Op.${symbol.description}`, value[symbol]] as const
+      ),
+    ].sort(([a], [b]) => (a < b ? -1 : a > b ? 1 : 0));
+    return entries.map(([key, entry]) => [key, canonicalize(entry)]);
+  }
+  return value;
+};
+
+
+export const cachedCount = async (
+  scope: string,
+  filters: any,
+  count: () => Promise<number>
+): Promise<{ value: number; approximate: boolean }> => {
+  const hash = createHash("sha1").update(JSON.stringify(canonicalize(filters))).digest("hex");
+  const value = await CacheService.getOrSet(CacheKeys.LIST_COUNT(`${scope}:${hash}`), count, COUNT_TTL_SECONDS);
+  return { value, approximate: true };
+};
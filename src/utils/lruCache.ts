@@ -0,0 +1,69 @@
+interface LRUEntry<V> {
+  value: V;
+  expiresAt: number;
+}
+
+export class LRUCache<K, V> {
+  private readonly entries = new Map<K, LRUEntry<V>>();
+
+  constructor(
+    private readonly maxEntries: number,
+    private readonly defaultTtlMs: number = 0
+  ) {}
+
+  get size(): number {
+    return this.entries.size;
+  }
+
+  get(key: K): V | undefined {
+    const entry = this.entries.get(key);
+    if (!entry) {
+      return undefined;
+    }
+    if (entry.expiresAt && entry.expiresAt <= Date.now()) {
+      this.entries.delete(key);
+      return undefined;
+    }
+
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    return entry.value;
+  }
+
+  peek(key: K): V | undefined {
+    const entry = this.entries.get(key);
+    if (!entry || (entry.expiresAt && entry.expiresAt <= Date.now())) {
+      return undefined;
+    }
+    return entry.value;
+  }
+
+  has(key: K): boolean {
+    return this.peek(key) !== undefined;
+  }
+
+  set(key: K, value: V, ttlMs: number = this.defaultTtlMs): void {
+    this.entries.delete(key);
+    this.entries.set(key, {
+      value,
+      expiresAt: ttlMs > 0 ? Date.now() + ttlMs : 0,
+    });
+
+    while (this.entries.size > this.maxEntries) {
+      const oldest = this.entries.keys().next().value as K;
+      this.entries.delete(oldest);
+    }
+  }
+
+  delete(key: K): boolean {
+    return this.entries.delete(key);
+  }
+
+  clear(): void {
+    this.entries.clear();
+  }
+
+  keys(): IterableIterator<K> {
+    return this.entries.keys();
+  }
+}
@@ -0,0 +1,13 @@
+export const normalizeSearchText = (value?: string | null): string =>
+  (value || "")
+    .normalize("NFD")
+    .replace(/[\u0300-\u036f]/g, "")
+    .replace(/[đĐ]/g, "d")
+    .toLowerCase()
+    .replace(/[^a-z0-9]+/g, " ")
+    .trim();
+
+export const normalizePhonePrefix = (value: string): string => {
+  const digits = value.replace(/\D/g, "");
+  return value.trim().startsWith("+84") ? `0${digits.slice(2)}` : digits;
+};
@@ -0,0 +1,244 @@
+const NAMED_ENTITIES: Record<string, string> = {
+  amp: "&",
+  lt: "<",
+  gt: ">",
+  quot: '"',
+  apos: "'",
+  nbsp: "\u00a0",
+  copy: "©",
+  reg: "®",
+  deg: "°",
+  plusmn: "±",
+  middot: "·",
+  times: "×",
+  divide: "÷",
+  ndash: "–",
+  mdash: "—",
+  lsquo: "‘",
+  rsquo: "’",
+  ldquo: "“",
+  rdquo: "”",
+  hellip: "…",
+  euro: "€",
+  le: "≤",
+  ge: "≥",
+};
+
+const DROP_CONTENT = new Set([
+  "annotation-xml",
+  "audio",
+  "colgroup",
+  "desc",
+  "foreignobject",
+  "head",
+  "math",
+  "mi",
+  "mn",
+  "mo",
+  "ms",
+  "mtext",
+  "svg",
+  "thead",
+  "video",
+]);
+
+const RAW_TEXT = new Set([
+  "iframe",
+  "noembed",
+  "noframes",
+  "noscript",
+  "plaintext",
+  "script",
+  "style",
+  "template",
+  "textarea",
+  "title",
+  "xmp",
+]);
+
+const ENTITY = /&(?:#(\d{1,7})|#[xX]([0-9a-fA-F]{1,6})|([A-Za-z][A-Za-z0-9]{1,31}));?/y;
+
+const isAlpha = (code: number) => (code >= 65 && code <= 90) || (code >= 97 && code <= 122);
+
+const escapeText = (text: string): string => {
+  let out = "";
+  let start = 0;
+  for (let i = 0; i < text.length; i++) {
+    const ch = text[i];
+    const escaped =
+      ch === "&" ? "&amp;" : ch === "<" ? "&lt;" : ch === ">" ? "&gt;" : ch === "\u00a0" ? "&nbsp;" : null;
+    if (escaped) {
+      out += text.slice(start, i) + escaped;
+      start = i + 1;
+    }
+  }
+  return start === 0 ? text : out + text.slice(start);
+};
+
+const decodeEntityAt = (input: string, at: number): { text: string; end: number } | null => {
+  ENTITY.lastIndex = at;
+  const match = ENTITY.exec(input);
+  if (!match || (match[3] && !match[0].endsWith(";"))) {
+    return null;
+  }
+  if (match[3]) {
+    const named = NAMED_ENTITIES[match[3]];
+    return named === undefined ? null : { text: named, end: ENTITY.lastIndex };
+  }
+
+  const code = match[1] ? parseInt(match[1], 10) : parseInt(match[2], 16);
+  const valid = code > 0 && code <= 0x10ffff && (code < 0xd800 || code > 0xdfff);
+  return { text: valid ? String.fromCodePoint(code) : "\uFFFD", end: ENTITY.lastIndex };
+};
+
+const decodeText = (text: string): string => {
+  if (text.indexOf("&") === -1) {
+    return escapeText(text);
+  }
+  let out = "";
+  let start = 0;
+  for (let i = text.indexOf("&"); i !== -1; i = text.indexOf("&", start)) {
+    const entity = decodeEntityAt(text, i);
+    if (!entity) {
+      out += escapeText(text.slice(start, i + 1));
+      start = i + 1;
+      continue;
+    }
+    out += escapeText(text.slice(start, i)) + escapeText(entity.text);
+    start = entity.end;
+  }
+  return out + escapeText(text.slice(start));
+};
+
+const tagEnd = (input: string, from: number): number => {
+  for (let i = from; i < input.length; i++) {
+    const ch = input[i];
+    if (ch === ">") {
+      return i;
+    }
+    if (ch === "=") {
+      let j = i + 1;
+      while (j < input.length && /\s/.test(input[j])) {
+        j++;
+      }
+      if (input[j] === '"' || input[j] === "'") {
+        const close = input.indexOf(input[j], j + 1);
+        if (close === -1) {
+          return -1;
+        }
+        i = close;
+      }
+    }
+  }
+  return -1;
+};
+
+const tagName = (input: string, from: number): string => {
+  let end = from;
+  while (end < input.length && !/[\s/>]/.test(input[end])) {
+    end++;
+  }
+  return input.slice(from, end).toLowerCase();
+};
+
+const closingTag = (input: string, name: string, from: number): number => {
+  const lower = input.toLowerCase();
+  for (let at = lower.indexOf(`</${name}`, from); at !== -1; at = lower.indexOf(`</${name}`, at + 1)) {
+    const next = lower[at + name.length + 2];
+    if (next === undefined || next === ">" || next === "/" || /\s/.test(next)) {
+      return at;
+    }
+  }
+  return -1;
+};
+
+
+export const stripHtml = (input: string): string => {
+  if (input.indexOf("<") === -1) {
+    return input;
+  }
+
+  const source = input.indexOf("\r") === -1 ? input : input.replace(/\r\n?/g, "\n");
+  const dropped: string[] = [];
+  let out = "";
+  let text = 0;
+  let i = 0;
+
+  const emit = (end: number) => {
+    if (dropped.length === 0 && end > text) {
+      out += decodeText(source.slice(text, end));
+    }
+  };
+
+  while ((i = source.indexOf("<", i)) !== -1) {
+    const next = source.charCodeAt(i + 1);
+    let resume: number;
+
+    if (isAlpha(next)) {
+      const name = tagName(source, i + 1);
+      const end = tagEnd(source, i + 1 + name.length);
+      emit(i);
+      if (end === -1) {
+        return out;
+      }
+      resume = end + 1;
+
+      const selfClosing = source[end - 1] === "/";
+      if (RAW_TEXT.has(name) && !selfClosing) {
+        const close = name === "plaintext" ? -1 : closingTag(source, name, resume);
+        const contentEnd = close === -1 ? source.length : close;
+        if (name === "textarea" && dropped.length === 0) {
+          out += decodeText(source.slice(resume, contentEnd));
+        }
+        if (close === -1) {
+          return out;
+        }
+        const closeEnd = source.indexOf(">", close);
+        if (closeEnd === -1) {
+          return out;
+        }
+        resume = closeEnd + 1;
+      } else if (DROP_CONTENT.has(name) && !selfClosing) {
+        dropped.push(name);
+      }
+    } else if (next === 47 && isAlpha(source.charCodeAt(i + 2))) {
+      const name = tagName(source, i + 2);
+      const end = tagEnd(source, i + 2 + name.length);
+      emit(i);
+      if (end === -1) {
+        return out;
+      }
+      resume = end + 1;
+      const open = dropped.lastIndexOf(name);
+      if (open !== -1) {
+        dropped.length = open;
+      }
+    } else if (source.startsWith("!--", i + 1)) {
+      emit(i);
+      const close = source.startsWith(">", i + 4)
+        ? i + 4
+        : source.startsWith("->", i + 4)
+          ? i + 5
+          : source.indexOf("-->", i + 4) + 2;
+      if (close < i + 4) {
+        return out;
+      }
+      resume = close + 1;
+    } else if (next === 33 || next === 63 || next === 47) {
+      emit(i);
+      const close = source.indexOf(">", i + 2);
+      if (close === -1) {
+        return out;
+      }
+      resume = close + 1;
+    } else {
+      i++;
+      continue;
+    }
+
+    text = i = resume;
+  }
+
+  emit(source.length);
+  return out;
+};
@@ -0,0 +1,36 @@
+import dotenv from "dotenv";
+dotenv.config();
+
+import { sequelize } from "./models/index";
+import { redisClient } from "./config/redis.config";
+import { JobQueueService, JobQueues } from "./services/jobQueue.service";
+import { registerNotificationJobHandlers } from "./jobs/notificationQueue.job";
+import { emailService } from "./services/email.service";
+
+registerNotificationJobHandlers();
+
+(async () => {
+  try {
+    await sequelize.authenticate();
+    console.log("Worker connected to database");
+
+    JobQueueService.start([JobQueues.NOTIFICATIONS, JobQueues.EMAILS], {
+      batchSize: parseInt(process.env.JOB_WORKER_BATCH_SIZE || "50", 10),
+      pollIntervalMs: parseInt(process.env.JOB_WORKER_POLL_MS || "1000", 10),
+    });
+  } catch (error) {
+    console.error("Worker failed to start", error);
+    process.exit(1);
+  }
+})();
+
+const shutdown = async (signal: string) => {
+  console.log(`Worker received ${signal}, draining...`);
+  await JobQueueService.stop();
+  emailService.close();
+  await Promise.allSettled([sequelize.close(), redisClient.quit()]);
+  process.exit(0);
+};
+
+process.on("SIGINT", () => shutdown("SIGINT"));
+process.on("SIGTERM", () => shutdown("SIGTERM"));